@@ -0,0 +1,419 @@
+"""
+Buffered, batched writer for request audit events.
+
+AuditLoggingMiddleware used to run one synchronous INSERT per audited
+request (two, counting request start and completion). With
+AUDIT_BUFFER_ENABLED, AuditLog.log_event(buffered=True) hands the event to
+a per-process AuditBuffer instead:
+
+- The event is appended as a JSON line to a local spool segment in
+  AUDIT_SPOOL_DIR (flushed, and fsynced with AUDIT_SPOOL_FSYNC) before
+  log_event returns, so a crash after that point can't lose it.
+- A background thread bulk_creates the buffered events every
+  AUDIT_FLUSH_INTERVAL_SECONDS, or as soon as AUDIT_BUFFER_MAX_EVENTS are
+  waiting; the request that fills the buffer flushes it itself, which keeps
+  memory bounded.
+- A segment file is deleted only after its rows are committed. Segments
+  left behind by a failed flush are retried by the flusher on its next
+  cycle, then with a doubling backoff while the database stays down;
+  segments left by a crash are replayed by the next process to start a
+  flusher, or by `manage.py replay_audit_spool`. Each event carries a UUID
+  (AuditLog.event_id) and inserts ignore conflicts on it, so replaying a
+  segment that was partly written is harmless.
+
+The active segment is held under an exclusive flock; recovery only picks
+up segments it can lock, i.e. ones whose writer has sealed them or died.
+A forked child closes its inherited copy of the parent's segment (the lock
+stays with the parent) and opens segments of its own.
+
+With AUDIT_HASH_CHAIN each buffer also chains its events: chain_hash is
+SHA-256 over the previous hash and the event's canonical JSON, numbered by
+chain_seq per writer. verify_audit_chain() recomputes the chains and
+reports edited rows (hash mismatch) and deleted rows (sequence gaps).
+"""
+
+import atexit
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+SPOOL_PREFIX = 'audit-'
+SPOOL_SUFFIX = '.jsonl'
+
+# Upper bound on the wait between retries of segments left by failed flushes
+MAX_RETRY_BACKOFF_SECONDS = 300
+
+# Record keys covered by the hash chain, in AuditLog attname form
+CHAINED_FIELDS = (
+    'event_id', 'timestamp', 'event_type', 'category', 'severity',
+    'user_id', 'username', 'user_email', 'session_key', 'ip_address',
+    'user_agent', 'request_method', 'request_url', 'content_type_id',
+    'object_id', 'description', 'details', 'patient_mrn', 'phi_involved',
+    'success', 'error_message', 'chain_writer', 'chain_seq',
+)
+
+
+def chain_digest(previous_hash: str, record: Dict) -> str:
+    """SHA-256 of the previous hash plus the record's canonical JSON."""
+    payload = json.dumps(
+        {field: record.get(field) for field in CHAINED_FIELDS},
+        sort_keys=True, separators=(',', ':'), default=str,
+    )
+    return hashlib.sha256(f"{previous_hash}:{payload}".encode('utf-8')).hexdigest()
+
+
+def record_from_log(audit_log) -> Dict:
+    """Rebuild the chained record of a saved AuditLog row."""
+    record = {field: getattr(audit_log, field) for field in CHAINED_FIELDS}
+    record['event_id'] = str(audit_log.event_id) if audit_log.event_id else None
+    record['timestamp'] = audit_log.timestamp.isoformat()
+    return record
+
+
+def _fill_defaults(record: Dict) -> Dict:
+    """Add model defaults for missing chained fields so the hash matches the saved row."""
+    from apps.core.models import AuditLog
+
+    for field in CHAINED_FIELDS:
+        if field not in record:
+            record[field] = AuditLog._meta.get_field(field).get_default()
+    return record
+
+
+def insert_records(records: List[Dict]) -> int:
+    """bulk_create AuditLog rows from spooled records, skipping known event_ids."""
+    from apps.core.models import AuditLog
+
+    rows = []
+    for record in records:
+        values = dict(record)
+        values['timestamp'] = parse_datetime(values['timestamp'])
+        rows.append(AuditLog(**values))
+    AuditLog.objects.bulk_create(
+        rows,
+        batch_size=getattr(settings, 'AUDIT_BUFFER_MAX_EVENTS', 500),
+        ignore_conflicts=True,
+    )
+    return len(rows)
+
+
+class AuditBuffer:
+    """
+    Bounded in-process buffer of audit records backed by a spool file.
+
+    append() is called on the request path; flush() runs on the flusher
+    thread, at exit, or inline when the buffer is full.
+    """
+
+    def __init__(self, spool_dir=None, max_events: Optional[int] = None,
+                 flush_interval: Optional[float] = None, hash_chain: Optional[bool] = None,
+                 fsync: Optional[bool] = None):
+        self.spool_dir = Path(spool_dir or settings.AUDIT_SPOOL_DIR)
+        self.max_events = max_events or getattr(settings, 'AUDIT_BUFFER_MAX_EVENTS', 500)
+        self.flush_interval = flush_interval or getattr(settings, 'AUDIT_FLUSH_INTERVAL_SECONDS', 2.0)
+        self.hash_chain = getattr(settings, 'AUDIT_HASH_CHAIN', False) if hash_chain is None else hash_chain
+        self.fsync = getattr(settings, 'AUDIT_SPOOL_FSYNC', True) if fsync is None else fsync
+        self.pid = os.getpid()
+        self.writer_id = f"{socket.gethostname()}-{self.pid}-{uuid.uuid4().hex[:8]}"
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._events: List[Dict] = []
+        self._segment_file = None
+        self._segment_count = 0
+        self._chain_seq = 0
+        self._chain_hash = ''
+        self._retry_failures = 0
+        self._retry_at: Optional[float] = None
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def append(self, record: Dict) -> str:
+        """
+        Durably queue one record (AuditLog attnames, JSON-safe values).
+
+        Returns the event_id once the record is in the spool file.
+        """
+        with self._lock:
+            record['event_id'] = str(uuid.uuid4())
+            if self.hash_chain:
+                _fill_defaults(record)
+                self._chain_seq += 1
+                record['chain_writer'] = self.writer_id
+                record['chain_seq'] = self._chain_seq
+                record['chain_hash'] = chain_digest(self._chain_hash, record)
+                self._chain_hash = record['chain_hash']
+
+            segment = self._active_segment()
+            segment.write(json.dumps(record, default=str) + '\n')
+            segment.flush()
+            if self.fsync:
+                os.fsync(segment.fileno())
+
+            self._events.append(record)
+            full = len(self._events) >= self.max_events
+
+        self._ensure_flusher()
+        if full:
+            self.flush()
+        return record['event_id']
+
+    def flush(self) -> int:
+        """
+        Write buffered records to the database and drop their segment.
+
+        On failure the sealed segment stays on disk and the flusher retries
+        it with replay_spool(). Returns the number of records written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                events, self._events = self._events, []
+                segment_path = self._seal_segment()
+            if not events:
+                if segment_path:
+                    segment_path.unlink(missing_ok=True)
+                return 0
+
+            try:
+                written = insert_records(events)
+            except Exception as exc:
+                logger.error(
+                    f"Audit flush of {len(events)} events failed, kept in {segment_path}: {exc}",
+                    exc_info=True,
+                )
+                self._schedule_retry()
+                return 0
+
+            segment_path.unlink(missing_ok=True)
+            return written
+
+    def replay_spool(self) -> int:
+        """
+        Insert records from segments no live writer holds, then delete them.
+
+        Returns the number of records replayed.
+        """
+        return self._replay_segments()[0]
+
+    def _replay_segments(self):
+        """replay_spool(); returns (records replayed, segments that failed)."""
+        if not self.spool_dir.exists():
+            return 0, 0
+
+        replayed = 0
+        failed = 0
+        for path in sorted(self.spool_dir.glob(f'{SPOOL_PREFIX}*{SPOOL_SUFFIX}')):
+            with self._lock:
+                if self._segment_file and Path(self._segment_file.name) == path:
+                    continue
+            try:
+                handle = open(path, 'r', encoding='utf-8')
+            except FileNotFoundError:
+                continue
+            with handle:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # Still being written by a live process
+                    continue
+                records = []
+                for line in handle:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-write was never acknowledged
+                        logger.warning(f"Skipping unreadable audit spool line in {path}")
+                try:
+                    if records:
+                        replayed += insert_records(records)
+                except Exception as exc:
+                    logger.error(f"Audit spool replay of {path} failed: {exc}", exc_info=True)
+                    failed += 1
+                    continue
+                path.unlink(missing_ok=True)
+
+        if replayed:
+            logger.info(f"Replayed {replayed} audit events from {self.spool_dir}")
+        return replayed, failed
+
+    def close(self):
+        """Stop the flusher thread and flush what is left."""
+        self._stopped.set()
+        self._wakeup.set()
+        self.flush()
+
+    def _active_segment(self):
+        """Open (and lock) the current spool segment. Caller holds _lock."""
+        if self._segment_file is None:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            self._segment_count += 1
+            path = self.spool_dir / f'{SPOOL_PREFIX}{self.writer_id}-{self._segment_count:06d}{SPOOL_SUFFIX}'
+            self._segment_file = open(path, 'a', encoding='utf-8')
+            fcntl.flock(self._segment_file, fcntl.LOCK_EX)
+        return self._segment_file
+
+    def _seal_segment(self) -> Optional[Path]:
+        """Close the current segment so new records start a fresh one. Caller holds _lock."""
+        if self._segment_file is None:
+            return None
+        path = Path(self._segment_file.name)
+        self._segment_file.close()
+        self._segment_file = None
+        return path
+
+    def _schedule_retry(self):
+        """Retry leftover segments on the next cycle, backing off while failures repeat."""
+        self._retry_failures += 1
+        delay = min(
+            self.flush_interval * (2 ** (self._retry_failures - 1) - 1),
+            MAX_RETRY_BACKOFF_SECONDS,
+        )
+        self._retry_at = time.monotonic() + delay
+
+    def _retry_spool(self):
+        """Replay segments left by failed flushes; reschedule if any still fail."""
+        with self._flush_lock:
+            _replayed, failed = self._replay_segments()
+        if failed:
+            self._schedule_retry()
+        else:
+            self._retry_failures = 0
+            self._retry_at = None
+
+    def _flush_cycle(self):
+        """One flusher pass: retry leftover segments when due, then flush."""
+        if self._retry_at is not None and time.monotonic() >= self._retry_at:
+            self._retry_spool()
+        self.flush()
+
+    def _abandon_after_fork(self):
+        """
+        Let go of the parent's state in a forked child.
+
+        Closing the inherited segment only drops the child's descriptor:
+        the flock belongs to the open file the parent still holds, so an
+        explicit unlock here would release the parent's lock. The parent
+        flushes the buffered events itself.
+        """
+        if self._segment_file is not None:
+            self._segment_file.close()
+            self._segment_file = None
+        self._events = []
+        self._stopped.set()
+
+    def _ensure_flusher(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name='audit-flusher', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        try:
+            self.replay_spool()
+        except Exception as exc:
+            logger.error(f"Audit spool recovery failed: {exc}", exc_info=True)
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self._flush_cycle()
+            except Exception as exc:
+                logger.error(f"Audit flusher error: {exc}", exc_info=True)
+        close_old_connections()
+
+
+def verify_audit_chain(writer: Optional[str] = None) -> Dict:
+    """
+    Recompute the hash chain of every (or one) writer.
+
+    Returns {'writers', 'entries', 'problems'}; each problem names the
+    writer, the chain_seq and whether the row was 'modified' or is 'missing'.
+    """
+    from apps.core.models import AuditLog
+
+    logs = AuditLog.objects.exclude(chain_writer='').order_by('chain_writer', 'chain_seq')
+    if writer:
+        logs = logs.filter(chain_writer=writer)
+
+    problems = []
+    writers = set()
+    entries = 0
+    current_writer = None
+    previous_hash = ''
+    expected_seq = 1
+    for audit_log in logs.iterator(chunk_size=1000):
+        if audit_log.chain_writer != current_writer:
+            current_writer = audit_log.chain_writer
+            writers.add(current_writer)
+            previous_hash = ''
+            expected_seq = 1
+        entries += 1
+        if audit_log.chain_seq != expected_seq:
+            problems.append({
+                'writer': current_writer,
+                'chain_seq': expected_seq,
+                'problem': 'missing',
+            })
+        if chain_digest(previous_hash, record_from_log(audit_log)) != audit_log.chain_hash:
+            problems.append({
+                'writer': current_writer,
+                'chain_seq': audit_log.chain_seq,
+                'problem': 'modified',
+            })
+        previous_hash = audit_log.chain_hash
+        expected_seq = audit_log.chain_seq + 1
+
+    return {'writers': len(writers), 'entries': entries, 'problems': problems}
+
+
+_audit_buffer: Optional[AuditBuffer] = None
+_audit_buffer_lock = threading.Lock()
+
+
+def get_audit_buffer() -> AuditBuffer:
+    """Process-wide AuditBuffer, recreated in forked children."""
+    global _audit_buffer
+    if _audit_buffer is None or _audit_buffer.pid != os.getpid():
+        with _audit_buffer_lock:
+            if _audit_buffer is None or _audit_buffer.pid != os.getpid():
+                _audit_buffer = AuditBuffer()
+                atexit.register(_audit_buffer.close)
+    return _audit_buffer
+
+
+def _reset_after_fork():
+    """Drop the parent's buffer in a forked child; the child creates its own."""
+    global _audit_buffer, _audit_buffer_lock
+    # Another parent thread may have held the lock at fork time
+    _audit_buffer_lock = threading.Lock()
+    if _audit_buffer is not None:
+        atexit.unregister(_audit_buffer.close)
+        _audit_buffer._abandon_after_fork()
+        _audit_buffer = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,38 @@
+"""
+Django management command to recover buffered audit events.
+
+Usage:
+    python manage.py replay_audit_spool
+    python manage.py replay_audit_spool --verify-chain
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.audit_buffer import AuditBuffer, verify_audit_chain
+
+
+class Command(BaseCommand):
+    help = 'Insert audit events left in the local spool by a crash or failed flush'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify-chain',
+            action='store_true',
+            help='Also verify the audit hash chain and fail if it is broken',
+        )
+
+    def handle(self, *args, **options):
+        replayed = AuditBuffer().replay_spool()
+        self.stdout.write(self.style.SUCCESS(f'Replayed {replayed} audit events from the spool'))
+
+        if options['verify_chain']:
+            result = verify_audit_chain()
+            for problem in result['problems']:
+                self.stdout.write(self.style.ERROR(
+                    f"{problem['writer']} #{problem['chain_seq']}: {problem['problem']}"
+                ))
+            if result['problems']:
+                raise CommandError(f"Audit hash chain broken ({len(result['problems'])} problems)")
+            self.stdout.write(self.style.SUCCESS(
+                f"Verified {result['entries']} chained entries from {result['writers']} writers"
+            ))
@@ -344,16 +344,17 @@ class Command(BaseCommand):
             # Add FHIR resources
             self.test_patient.add_fhir_resources(test_fhir_resources)
             
-            # Check if FHIR bundle is encrypted
+            # Check if the stored FHIR resources are encrypted
             with connection.cursor() as cursor:
                 cursor.execute(
-                    "SELECT encrypted_fhir_bundle FROM patients WHERE id = %s",
+                    "SELECT resource FROM patient_fhir_resources WHERE patient_id = %s",
                     [self.test_patient.id]
                 )
-                raw_fhir = cursor.fetchone()[0]
+                raw_rows = cursor.fetchall()
+            raw_fhir = b"".join(bytes(row[0]) for row in raw_rows) if raw_rows else None
             
             if raw_fhir:
-                decrypted_fhir = self.test_patient.encrypted_fhir_bundle
+                decrypted_fhir = self.test_patient.get_fhir_resources()
                 is_encrypted = self._appears_encrypted(raw_fhir, json.dumps(decrypted_fhir) if decrypted_fhir else "")
                 
                 self._log_test("fhir_bundle_encryption", is_encrypted, {
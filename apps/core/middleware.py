@@ -99,6 +99,10 @@ class AuditLoggingMiddleware(MiddlewareMixin):
     """
     Automatically log all requests for HIPAA audit trail.
     Captures comprehensive information about user activities.
+    
+    Request start/complete entries go through the audit buffer
+    (apps.core.audit_buffer) when AUDIT_BUFFER_ENABLED; security
+    exceptions are still written synchronously.
     """
     
     def __init__(self, get_response):
@@ -251,7 +255,8 @@ class AuditLoggingMiddleware(MiddlewareMixin):
             request=request,
             description=f"{request.method} request to {request.path}",
             phi_involved=phi_involved,
-            severity='info'
+            severity='info',
+            buffered=True
         )
     
     def _log_request_complete(self, request, response, response_time):
@@ -282,7 +287,8 @@ class AuditLoggingMiddleware(MiddlewareMixin):
             details={'response_time': response_time, 'status_code': response.status_code},
             phi_involved=self._is_phi_request(request),
             severity=severity,
-            success=success
+            success=success,
+            buffered=True
         )
     
     def _determine_event_type(self, request):
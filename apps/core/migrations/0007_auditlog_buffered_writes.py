@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_alter_apiusagelog_provider_alter_auditlog_event_type'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='timestamp',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='event_id',
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='chain_writer',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='chain_seq',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='chain_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
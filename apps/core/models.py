@@ -3,6 +3,7 @@ Core models for the medical document parser.
 Includes audit logging for HIPAA compliance.
 """
 
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
@@ -153,7 +154,7 @@ class AuditLog(models.Model):
     ]
     
     # Core audit fields
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    timestamp = models.DateTimeField(default=timezone.now, db_index=True)
     event_type = models.CharField(max_length=50, choices=EVENT_TYPES, db_index=True)
     category = models.CharField(max_length=50, choices=CATEGORIES, db_index=True)
     severity = models.CharField(max_length=20, choices=SEVERITY_LEVELS, default='info', db_index=True)
@@ -187,6 +188,12 @@ class AuditLog(models.Model):
     success = models.BooleanField(default=True)
     error_message = models.TextField(blank=True)
     
+    # Buffered writes (see apps.core.audit_buffer)
+    event_id = models.UUIDField(null=True, blank=True, unique=True, editable=False)  # Makes spool replay idempotent
+    chain_writer = models.CharField(max_length=100, blank=True, db_index=True, editable=False)
+    chain_seq = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    chain_hash = models.CharField(max_length=64, blank=True, editable=False)  # SHA-256 over previous hash + entry
+    
     class Meta:
         db_table = 'audit_logs'
         ordering = ['-timestamp']
@@ -211,7 +218,8 @@ class AuditLog(models.Model):
     @classmethod
     def log_event(cls, event_type, user=None, request=None, description="", 
                   details=None, patient_mrn=None, phi_involved=False, 
-                  content_object=None, severity='info', success=True, error_message=""):
+                  content_object=None, severity='info', success=True, error_message="",
+                  buffered=False):
         """
         Create an audit log entry with comprehensive information.
         
@@ -227,6 +235,9 @@ class AuditLog(models.Model):
             severity: Severity level
             success: Whether the action succeeded
             error_message: Error message if failed
+            buffered: Queue the entry on the process audit buffer instead of
+                inserting it now (only when AUDIT_BUFFER_ENABLED). Buffered
+                calls return None; use it where the caller doesn't need the row.
         """
         # Determine category based on event type
         category_mapping = {
@@ -284,18 +295,14 @@ class AuditLog(models.Model):
         session_key = ""
         
         if request:
-            ip_address = cls._get_client_ip(request)
-            user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]  # Truncate to avoid issues
-            request_method = request.method
-            request_url = request.build_absolute_uri()
-            session_key = request.session.session_key or ""
+            ip_address, user_agent, request_method, request_url = cls._get_request_info(request)
+            session = getattr(request, 'session', None)
+            session_key = (session.session_key if session is not None else None) or ""
         
-        # Create audit log entry
-        audit_log = cls.objects.create(
+        values = dict(
             event_type=event_type,
             category=category_mapping.get(event_type, 'compliance'),
             severity=severity,
-            user=user,
             username=user.username if user else "",
             user_email=user.email if user else "",
             session_key=session_key,
@@ -303,7 +310,6 @@ class AuditLog(models.Model):
             user_agent=user_agent,
             request_method=request_method,
             request_url=request_url,
-            content_object=content_object,
             description=description,
             details=details or {},
             patient_mrn=patient_mrn or "",
@@ -312,8 +318,49 @@ class AuditLog(models.Model):
             error_message=error_message,
         )
         
+        if buffered and getattr(settings, 'AUDIT_BUFFER_ENABLED', False):
+            from apps.core.audit_buffer import get_audit_buffer
+            
+            # The spool needs plain JSON, so relations go in as ids
+            values.update(
+                timestamp=timezone.now().isoformat(),
+                user_id=user.pk if user else None,
+                content_type_id=(
+                    ContentType.objects.get_for_model(content_object).pk if content_object is not None else None
+                ),
+                object_id=str(content_object.pk) if content_object is not None else None,
+            )
+            get_audit_buffer().append(values)
+            return None
+        
+        # Create audit log entry
+        audit_log = cls.objects.create(
+            user=user,
+            content_object=content_object,
+            **values,
+        )
+        
         return audit_log
     
+    @staticmethod
+    def _get_request_info(request):
+        """
+        Client IP, user agent, method and absolute URL of a request.
+        
+        Memoized on the request: the middleware logs each request twice and
+        build_absolute_uri() re-validates the host every time.
+        """
+        info = getattr(request, '_audit_request_info', None)
+        if info is None:
+            info = (
+                AuditLog._get_client_ip(request),
+                request.META.get('HTTP_USER_AGENT', '')[:500],  # Truncate to avoid issues
+                request.method,
+                request.build_absolute_uri(),
+            )
+            request._audit_request_info = info
+        return info
+    
     @staticmethod
     def _get_client_ip(request):
         """Extract client IP address from request."""
@@ -393,6 +393,26 @@ class PipelineMetricsService:
 
         return cls._cached(cls._cache_key('cost_summary', hours=hours), _build)
 
+    @classmethod
+    def get_extraction_cache_stats(cls, hours: int = 24) -> Dict[str, Any]:
+        """Return chunk extraction cache hit rate, size, and estimated savings."""
+        from apps.documents.services.extraction_cache import get_chunk_extraction_cache
+
+        def _build():
+            return get_chunk_extraction_cache().stats(hours=hours)
+
+        return cls._cached(cls._cache_key('extraction_cache', hours=hours), _build)
+
+    @classmethod
+    def get_prompt_cache_stats(cls, hours: int = 24) -> Dict[str, Any]:
+        """Return Anthropic prompt cache hit ratios per worker and overall."""
+        from apps.documents.services.prompt_cache_scheduler import get_prompt_cache_scheduler
+
+        def _build():
+            return get_prompt_cache_scheduler().stats(hours=hours)
+
+        return cls._cached(cls._cache_key('prompt_cache', hours=hours), _build)
+
     @classmethod
     def get_dashboard_summary(cls, hours: int = 24) -> Dict[str, Any]:
         """Return top-level summary card metrics."""
@@ -483,4 +503,6 @@ class PipelineMetricsService:
             'throughput': cls.get_throughput_timeline(hours=hours),
             'success_rates': cls.get_success_rates_by_stage(hours=hours),
             'recent_completions': cls.get_recent_completions(limit=20),
+            'extraction_cache': cls.get_extraction_cache_stats(hours=hours),
+            'prompt_cache': cls.get_prompt_cache_stats(hours=hours),
         }
@@ -0,0 +1,142 @@
+"""
+Async Redis pub/sub fan-out for the monitor SSE endpoint.
+
+Served under ASGI (meddocparser/asgi.py), every open monitor tab is a
+coroutine rather than a pinned WSGI worker. Each process holds a single
+subscription to MONITOR_EVENTS_CHANNEL and copies every message into a
+small per-client queue, so a hundred dashboards cost one Redis connection.
+A slow client loses its oldest events instead of holding up the others.
+The subscription starts with the first client and closes with the last.
+"""
+
+import asyncio
+import logging
+from contextlib import suppress
+from typing import Callable, Optional, Set
+
+from django.conf import settings
+
+from apps.core.monitor_service import MONITOR_EVENTS_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+CLIENT_QUEUE_SIZE = 100
+RECONNECT_MAX_DELAY_SECONDS = 30
+
+
+def _redis_client():
+    """Async Redis client on the same server the publishers use."""
+    import redis.asyncio as aioredis
+    return aioredis.from_url(settings.REDIS_URL)
+
+
+class MonitorEventBroadcaster:
+    """One async pub/sub subscription fanned out to many SSE clients."""
+
+    def __init__(
+        self,
+        channel: str = MONITOR_EVENTS_CHANNEL,
+        queue_size: int = CLIENT_QUEUE_SIZE,
+        client_factory: Callable = _redis_client,
+    ):
+        self.channel = channel
+        self.queue_size = queue_size
+        self.client_factory = client_factory
+        self.connected = False
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._listener: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a client; returns the queue its events arrive on."""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return queue
+
+    async def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Drop a client; the last one out closes the Redis subscription."""
+        self._subscribers.discard(queue)
+        if not self._subscribers:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop listening and release the Redis connection."""
+        listener, self._listener = self._listener, None
+        if listener is not None and not listener.done():
+            listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await listener
+
+    def publish(self, payload: str) -> None:
+        """Copy one event to every client queue, dropping the oldest when full."""
+        for queue in self._subscribers:
+            if queue.full():
+                with suppress(asyncio.QueueEmpty):
+                    queue.get_nowait()
+            queue.put_nowait(payload)
+
+    async def _listen(self) -> None:
+        delay = 1
+        while self._subscribers:
+            client = None
+            pubsub = None
+            try:
+                client = self.client_factory()
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self.channel)
+                self.connected = True
+                delay = 1
+                logger.debug("SSE broadcaster: subscribed to %s", self.channel)
+                async for message in pubsub.listen():
+                    if message.get('type') != 'message':
+                        continue
+                    payload = message['data']
+                    if isinstance(payload, bytes):
+                        payload = payload.decode('utf-8')
+                    self.publish(payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "SSE broadcaster: pub/sub unavailable (%s), retrying in %ss", exc, delay
+                )
+            finally:
+                self.connected = False
+                await self._release(client, pubsub)
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY_SECONDS)
+
+    async def _release(self, client, pubsub) -> None:
+        try:
+            if pubsub is not None:
+                await pubsub.reset()
+            if client is not None:
+                await client.close()
+        except Exception as exc:
+            logger.debug("SSE broadcaster: error closing Redis connection: %s", exc)
+
+
+_broadcaster: Optional[MonitorEventBroadcaster] = None
+
+
+def get_broadcaster() -> MonitorEventBroadcaster:
+    """The broadcaster for the running event loop (one per ASGI worker)."""
+    global _broadcaster
+    loop = asyncio.get_running_loop()
+    if _broadcaster is None or _broadcaster._loop is not loop:
+        _broadcaster = MonitorEventBroadcaster()
+        _broadcaster._loop = loop
+    return _broadcaster
+
+
+async def shutdown_broadcaster() -> None:
+    """Close the broadcaster's subscription (ASGI lifespan shutdown)."""
+    if _broadcaster is not None:
+        await _broadcaster.close()
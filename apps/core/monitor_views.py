@@ -2,16 +2,20 @@
 Admin-only processing pipeline monitor dashboard views.
 """
 
+import asyncio
 import json
 import logging
 import time
 
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
 from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.views.decorators.http import require_http_methods
 
 from apps.accounts.decorators import moritrac_admin_required
 from apps.core.monitor_service import MONITOR_EVENTS_CHANNEL, PipelineMetricsService
+from apps.core.monitor_stream import get_broadcaster
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +42,8 @@ def monitor_dashboard(request):
         'live_data': PipelineMetricsService.get_live_documents(),
         'recent_completions': PipelineMetricsService.get_recent_completions(limit=20),
         'cost_summary': PipelineMetricsService.get_cost_summary(hours=hours),
+        'extraction_cache': PipelineMetricsService.get_extraction_cache_stats(hours=hours),
+        'prompt_cache': PipelineMetricsService.get_prompt_cache_stats(hours=hours),
     }
     return render(request, 'core/monitor_dashboard.html', context)
 
@@ -83,6 +89,10 @@ def api_cost_summary(request):
 def _monitor_event_stream(hours: int):
     """Yield SSE frames from Redis pub/sub with heartbeat and snapshot support.
 
+    Blocking version for WSGI (runserver, gunicorn): each client holds a
+    worker for as long as the tab is open. ASGI deployments use
+    _monitor_event_stream_async instead.
+
     Falls back to snapshot-only polling if Redis pub/sub is unavailable so the
     connection stays alive and the browser never falls back to HTTP polling.
     """
@@ -155,20 +165,84 @@ def _monitor_event_stream(hours: int):
                 pass
 
 
+async def _monitor_event_stream_async(hours: int):
+    """Async SSE frames for ASGI: the same protocol as _monitor_event_stream.
+
+    Events come from the process-wide MonitorEventBroadcaster, so an open tab
+    costs a queue and a coroutine, not a Redis connection or a worker. If
+    pub/sub is down the broadcaster keeps reconnecting while the client
+    carries on with heartbeats and snapshots.
+    """
+    build_snapshot = sync_to_async(PipelineMetricsService.build_snapshot_payload)
+
+    try:
+        snapshot = await build_snapshot(hours=hours)
+        yield f"data: {json.dumps(snapshot)}\n\n"
+    except Exception as exc:
+        logger.error("SSE initial snapshot failed: %s", exc, exc_info=True)
+        yield f"data: {json.dumps({'type': 'error', 'message': 'snapshot unavailable'})}\n\n"
+
+    broadcaster = get_broadcaster()
+    queue = broadcaster.subscribe()
+    loop = asyncio.get_running_loop()
+    last_heartbeat = last_snapshot = loop.time()
+
+    try:
+        while True:
+            next_due = min(
+                last_heartbeat + HEARTBEAT_INTERVAL_SECONDS,
+                last_snapshot + SNAPSHOT_INTERVAL_SECONDS,
+            )
+            try:
+                payload = await asyncio.wait_for(queue.get(), timeout=max(0, next_due - loop.time()))
+                yield f"data: {payload}\n\n"
+            except asyncio.TimeoutError:
+                pass
+
+            now = loop.time()
+
+            if now - last_heartbeat >= HEARTBEAT_INTERVAL_SECONDS:
+                yield ": heartbeat\n\n"
+                last_heartbeat = now
+
+            if now - last_snapshot >= SNAPSHOT_INTERVAL_SECONDS:
+                try:
+                    snap = await build_snapshot(hours=hours)
+                    yield f"data: {json.dumps(snap)}\n\n"
+                except Exception as exc:
+                    logger.warning("SSE: snapshot refresh failed: %s", exc)
+                last_snapshot = now
+
+    except asyncio.CancelledError:
+        logger.debug("SSE client disconnected")
+        raise
+    finally:
+        await broadcaster.unsubscribe(queue)
+
+
 @require_http_methods(['GET'])
-def sse_pipeline_events(request):
+async def sse_pipeline_events(request):
     """Stream pipeline stage events to the monitor dashboard via SSE.
 
+    Under ASGI (meddocparser/asgi.py) the stream is a coroutine fed by one
+    shared Redis subscription; under WSGI it falls back to the blocking
+    generator.
+
     Uses manual auth check instead of @login_required to avoid 302 redirects
     that break EventSource connections.
     """
-    if not request.user.is_authenticated or not request.user.is_staff:
+    user = await request.auser()
+    if not user.is_authenticated or not user.is_staff:
         return JsonResponse({'error': 'unauthorized'}, status=403)
 
     hours = _parse_hours(request)
+    if isinstance(request, ASGIRequest):
+        stream = _monitor_event_stream_async(hours=hours)
+    else:
+        stream = _monitor_event_stream(hours=hours)
     try:
         response = StreamingHttpResponse(
-            streaming_content=_monitor_event_stream(hours=hours),
+            streaming_content=stream,
             content_type='text/event-stream; charset=utf-8',
         )
         response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
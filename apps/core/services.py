@@ -155,7 +155,7 @@ class APIUsageMonitor:
     def log_api_usage(cls, document, patient, session_id, provider, model,
                      input_tokens, output_tokens, total_tokens,
                      start_time, end_time, success=True, error_message=None,
-                     chunk_number=None, total_chunks=None) -> APIUsageLog:
+                     chunk_number=None, total_chunks=None, cost_usd=None) -> APIUsageLog:
         """
         Log API usage to database with cost calculation.
         
@@ -174,6 +174,8 @@ class APIUsageMonitor:
             error_message: Error message if failed
             chunk_number: For chunked docs, which chunk
             total_chunks: Total chunks for document
+            cost_usd: Precomputed cost (e.g. discounted batch pricing);
+                calculated from the token counts when None
             
         Returns:
             Created APIUsageLog instance
@@ -183,7 +185,9 @@ class APIUsageMonitor:
             duration_ms = int((end_time - start_time).total_seconds() * 1000)
             
             # Calculate cost
-            cost = CostCalculator.calculate_cost(provider, model, input_tokens, output_tokens)
+            cost = cost_usd
+            if cost is None:
+                cost = CostCalculator.calculate_cost(provider, model, input_tokens, output_tokens)
             
             # Create log entry
             usage_log = APIUsageLog.objects.create(
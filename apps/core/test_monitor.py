@@ -4,17 +4,21 @@ Tests for processing monitor dashboard and Textract cost tracking.
 
 from unittest.mock import MagicMock, patch
 
+import asyncio
+import json
 import uuid
 from decimal import Decimal
 
 from django.contrib.auth.models import User
 from django.core.cache import cache
-from django.test import Client, TestCase
+from django.test import Client, SimpleTestCase, TestCase
 from django.urls import reverse
 from django.utils import timezone
 
 from apps.core.models import APIUsageLog
 from apps.core.monitor_service import PipelineMetricsService
+from apps.core.monitor_stream import MonitorEventBroadcaster
+from apps.core.monitor_views import _monitor_event_stream_async
 from apps.core.services import APIUsageMonitor, CostCalculator
 from apps.documents.models import Document
 from apps.patients.models import Patient
@@ -190,3 +194,108 @@ class MonitorRealtimeTests(TestCase):
         )
         live = PipelineMetricsService.get_live_documents()
         self.assertEqual(live['documents'][0]['stage_key'], 'queued')
+
+
+class FakeAsyncPubSub:
+    """redis.asyncio PubSub double fed from an asyncio queue."""
+
+    def __init__(self):
+        self.messages = asyncio.Queue()
+        self.channels = []
+        self.closed = False
+
+    async def subscribe(self, channel):
+        self.channels.append(channel)
+
+    async def listen(self):
+        while True:
+            yield await self.messages.get()
+
+    async def reset(self):
+        self.closed = True
+
+
+class FakeAsyncRedis:
+    def __init__(self):
+        self.pubsubs = []
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        pubsub = FakeAsyncPubSub()
+        self.pubsubs.append(pubsub)
+        return pubsub
+
+    async def close(self):
+        pass
+
+
+class MonitorEventBroadcasterTests(SimpleTestCase):
+    """One Redis subscription per process, fanned out to every SSE client."""
+
+    def setUp(self):
+        self.redis = FakeAsyncRedis()
+        self.broadcaster = MonitorEventBroadcaster(client_factory=lambda: self.redis)
+
+    async def _deliver(self, payload):
+        await self.redis.pubsubs[0].messages.put({'type': 'message', 'data': payload.encode()})
+        await asyncio.sleep(0)
+
+    async def test_clients_share_one_subscription(self):
+        first = self.broadcaster.subscribe()
+        second = self.broadcaster.subscribe()
+        await asyncio.sleep(0)
+
+        await self._deliver('{"type": "stage_change"}')
+
+        self.assertEqual(len(self.redis.pubsubs), 1)
+        self.assertEqual(self.redis.pubsubs[0].channels, ['monitor:events'])
+        self.assertEqual(await first.get(), '{"type": "stage_change"}')
+        self.assertEqual(await second.get(), '{"type": "stage_change"}')
+        await self.broadcaster.close()
+
+    async def test_last_client_closes_subscription(self):
+        first = self.broadcaster.subscribe()
+        second = self.broadcaster.subscribe()
+        await asyncio.sleep(0)
+
+        await self.broadcaster.unsubscribe(first)
+        self.assertFalse(self.redis.pubsubs[0].closed)
+        await self.broadcaster.unsubscribe(second)
+
+        self.assertTrue(self.redis.pubsubs[0].closed)
+        self.assertEqual(self.broadcaster.subscriber_count, 0)
+
+    async def test_slow_client_drops_oldest_events(self):
+        broadcaster = MonitorEventBroadcaster(queue_size=2, client_factory=lambda: self.redis)
+        queue = broadcaster.subscribe()
+
+        for payload in ('1', '2', '3'):
+            broadcaster.publish(payload)
+
+        self.assertEqual([queue.get_nowait(), queue.get_nowait()], ['2', '3'])
+        await broadcaster.close()
+
+
+class AsyncMonitorStreamTests(SimpleTestCase):
+    """The ASGI SSE stream: snapshot first, then broadcast events."""
+
+    async def test_stream_sends_snapshot_then_events_and_unsubscribes(self):
+        redis = FakeAsyncRedis()
+        broadcaster = MonitorEventBroadcaster(client_factory=lambda: redis)
+        snapshot = {'type': 'snapshot', 'live': []}
+
+        with patch('apps.core.monitor_views.get_broadcaster', return_value=broadcaster), \
+                patch.object(PipelineMetricsService, 'build_snapshot_payload', return_value=snapshot):
+            stream = _monitor_event_stream_async(hours=24)
+            self.assertEqual(await stream.__anext__(), f"data: {json.dumps(snapshot)}\n\n")
+
+            next_frame = asyncio.ensure_future(stream.__anext__())
+            while not redis.pubsubs:
+                await asyncio.sleep(0)
+            await redis.pubsubs[0].messages.put({'type': 'message', 'data': b'{"type": "stage_change"}'})
+            self.assertEqual(await next_frame, 'data: {"type": "stage_change"}\n\n')
+
+            await stream.aclose()
+
+        self.assertEqual(broadcaster.subscriber_count, 0)
+        self.assertTrue(redis.pubsubs[0].closed)
+
@@ -0,0 +1,223 @@
+"""
+Tests for the buffered audit log writer.
+
+Covers:
+- Spooling events and bulk inserting them on flush
+- Inline flush when the buffer is full
+- AuditLog.log_event(buffered=True)
+- Replay of spool segments left by a crash or a failed flush
+- Flusher retries of failed flushes, and forked children
+- Hash chain verification and tamper detection
+"""
+
+import fcntl
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from apps.core import audit_buffer
+from apps.core.audit_buffer import AuditBuffer, verify_audit_chain
+from apps.core.models import AuditLog
+
+
+def _record(description='GET request to /patients/', **overrides):
+    record = {
+        'timestamp': timezone.now().isoformat(),
+        'event_type': 'phi_access',
+        'category': 'data_access',
+        'severity': 'info',
+        'description': description,
+        'details': {'status_code': 200, 'response_time': 0.125},
+        'phi_involved': True,
+    }
+    record.update(overrides)
+    return record
+
+
+@patch.object(AuditBuffer, '_ensure_flusher')
+class AuditBufferTests(TestCase):
+    """Events are spooled on append and written in batches."""
+
+    def setUp(self):
+        self.spool_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.spool_dir, ignore_errors=True)
+
+    def _buffer(self, **kwargs):
+        kwargs.setdefault('max_events', 100)
+        kwargs.setdefault('fsync', False)
+        buffer = AuditBuffer(spool_dir=self.spool_dir, **kwargs)
+        self.addCleanup(buffer._seal_segment)
+        return buffer
+
+    def _spool_lines(self):
+        return [
+            line for path in self.spool_dir.glob('*.jsonl')
+            for line in path.read_text().splitlines() if line
+        ]
+
+    def test_append_spools_and_flush_bulk_inserts(self, _flusher):
+        buffer = self._buffer()
+        buffer.append(_record('first'))
+        buffer.append(_record('second'))
+
+        self.assertEqual(AuditLog.objects.count(), 0)
+        self.assertEqual(len(self._spool_lines()), 2)
+
+        self.assertEqual(buffer.flush(), 2)
+
+        self.assertEqual(
+            set(AuditLog.objects.values_list('description', flat=True)), {'first', 'second'}
+        )
+        self.assertEqual(self._spool_lines(), [])
+        log = AuditLog.objects.get(description='first')
+        self.assertIsNotNone(log.event_id)
+        self.assertEqual(log.details['status_code'], 200)
+
+    def test_full_buffer_flushes_inline(self, _flusher):
+        buffer = self._buffer(max_events=2)
+        buffer.append(_record('first'))
+        self.assertEqual(AuditLog.objects.count(), 0)
+
+        buffer.append(_record('second'))
+
+        self.assertEqual(AuditLog.objects.count(), 2)
+
+    def test_crashed_segment_is_replayed_once(self, _flusher):
+        crashed = self._buffer()
+        crashed.append(_record('before crash'))
+        segment = Path(crashed._segment_file.name)
+        # Dying releases the flock without flushing; the last write was torn
+        crashed._seal_segment()
+        with open(segment, 'a') as handle:
+            handle.write('{"timestamp": "2026-')
+        copy = segment.with_name('audit-copy-000001.jsonl')
+        shutil.copy(segment, copy)
+
+        recovering = self._buffer()
+        self.assertEqual(recovering.replay_spool(), 2)
+
+        self.assertEqual(AuditLog.objects.filter(description='before crash').count(), 1)
+        self.assertFalse(segment.exists())
+        self.assertFalse(copy.exists())
+
+    def test_live_segment_is_not_replayed(self, _flusher):
+        live = self._buffer()
+        live.append(_record('still buffered'))
+
+        self.assertEqual(self._buffer().replay_spool(), 0)
+        self.assertEqual(AuditLog.objects.count(), 0)
+        self.assertEqual(len(self._spool_lines()), 1)
+
+    def test_failed_flush_keeps_segment_for_replay(self, _flusher):
+        buffer = self._buffer()
+        buffer.append(_record('database down'))
+
+        with patch('apps.core.audit_buffer.insert_records', side_effect=RuntimeError('db down')):
+            self.assertEqual(buffer.flush(), 0)
+
+        self.assertEqual(len(self._spool_lines()), 1)
+        self.assertEqual(buffer.replay_spool(), 1)
+        self.assertTrue(AuditLog.objects.filter(description='database down').exists())
+
+    def test_failed_flush_is_retried_on_next_cycle(self, _flusher):
+        buffer = self._buffer()
+        buffer.append(_record('database down'))
+
+        with patch('apps.core.audit_buffer.insert_records', side_effect=RuntimeError('db down')):
+            buffer._flush_cycle()
+        self.assertEqual(AuditLog.objects.count(), 0)
+
+        buffer._flush_cycle()
+
+        self.assertTrue(AuditLog.objects.filter(description='database down').exists())
+        self.assertEqual(self._spool_lines(), [])
+        self.assertIsNone(buffer._retry_at)
+
+    def test_retries_back_off_while_failures_repeat(self, _flusher):
+        buffer = self._buffer(flush_interval=2.0)
+        buffer.append(_record('database down'))
+
+        with patch('apps.core.audit_buffer.insert_records', side_effect=RuntimeError('db down')), \
+                patch('apps.core.audit_buffer.time.monotonic', return_value=100.0):
+            buffer._flush_cycle()
+            self.assertEqual(buffer._retry_at, 100.0)
+            buffer._flush_cycle()
+            self.assertEqual(buffer._retry_at, 102.0)
+            buffer._flush_cycle()
+
+        self.assertEqual(AuditLog.objects.count(), 0)
+        self.assertEqual(len(self._spool_lines()), 1)
+
+    def test_forked_child_leaves_the_parent_segment_locked(self, _flusher):
+        parent = self._buffer()
+        parent.append(_record('parent event'))
+        segment = parent._segment_file.name
+
+        with patch.object(audit_buffer, '_audit_buffer', parent):
+            pid = os.fork()
+            if pid == 0:
+                # Child: the inherited buffer is dropped without unlocking
+                ok = audit_buffer._audit_buffer is None and parent._segment_file is None
+                os._exit(0 if ok else 1)
+            _, status = os.waitpid(pid, 0)
+
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        with open(segment, 'r') as handle, self.assertRaises(BlockingIOError):
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self.assertEqual(parent.flush(), 1)
+
+    def test_hash_chain_detects_edits_and_deletions(self, _flusher):
+        buffer = self._buffer(hash_chain=True)
+        for index in range(4):
+            buffer.append(_record(f'event {index}'))
+        buffer.flush()
+
+        result = verify_audit_chain()
+        self.assertEqual((result['writers'], result['entries'], result['problems']), (1, 4, []))
+
+        AuditLog.objects.filter(chain_seq=2).update(description='edited')
+        AuditLog.objects.filter(chain_seq=3).delete()
+
+        problems = verify_audit_chain(writer=buffer.writer_id)['problems']
+        self.assertIn({'writer': buffer.writer_id, 'chain_seq': 2, 'problem': 'modified'}, problems)
+        self.assertIn({'writer': buffer.writer_id, 'chain_seq': 3, 'problem': 'missing'}, problems)
+
+    def test_log_event_buffered(self, _flusher):
+        user = User.objects.create_user(username='auditor', email='auditor@example.com', password='pass123')
+        request = RequestFactory().get('/patients/42/', HTTP_USER_AGENT='pytest')
+        buffer = self._buffer()
+
+        with override_settings(AUDIT_BUFFER_ENABLED=True), \
+                patch('apps.core.audit_buffer.get_audit_buffer', return_value=buffer):
+            result = AuditLog.log_event(
+                event_type='patient_view', user=user, request=request,
+                description='Viewed patient', content_object=user, buffered=True,
+            )
+
+        self.assertIsNone(result)
+        self.assertEqual(AuditLog.objects.count(), 0)
+        buffer.flush()
+
+        log = AuditLog.objects.get()
+        self.assertEqual(log.user, user)
+        self.assertEqual(log.category, 'data_access')
+        self.assertEqual(log.request_url, 'http://testserver/patients/42/')
+        self.assertEqual(log.user_agent, 'pytest')
+        self.assertEqual(log.content_object, user)
+
+    def test_log_event_writes_immediately_when_buffer_disabled(self, _flusher):
+        request = RequestFactory().get('/patients/42/')
+
+        with override_settings(AUDIT_BUFFER_ENABLED=False):
+            log = AuditLog.log_event(
+                event_type='patient_view', request=request, description='Viewed patient', buffered=True,
+            )
+
+        self.assertIsNotNone(log.pk)
+        self.assertEqual(self._spool_lines(), [])
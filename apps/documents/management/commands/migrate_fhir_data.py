@@ -111,7 +111,7 @@ class Command(BaseCommand):
             
             # Check current patient FHIR bundle
             try:
-                bundle_entries = len(doc.patient.encrypted_fhir_bundle.get('entry', []))
+                bundle_entries = len(doc.patient.fhir_bundle.get('entry', []))
                 self.stdout.write(f"  Patient FHIR Bundle: {bundle_entries} entries")
             except Exception as e:
                 self.stdout.write(f"  Patient FHIR Bundle: Error accessing ({e})")
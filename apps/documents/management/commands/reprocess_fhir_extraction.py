@@ -60,6 +60,12 @@ class Command(BaseCommand):
             default=10,
             help='Number of documents to process in each batch (default: 10)',
         )
+        parser.add_argument(
+            '--batch',
+            action='store_true',
+            help='Submit all chunks as provider batch jobs; results are ingested '
+                 'asynchronously by the poll_extraction_batches task',
+        )
 
     def handle(self, *args, **options):
         """Reprocess documents with FHIR-focused extraction"""
@@ -81,6 +87,10 @@ class Command(BaseCommand):
             self._show_dry_run_summary(queryset)
             return
         
+        if options['batch']:
+            self._submit_batch_extraction(queryset, options)
+            return
+        
         # Process documents in batches
         batch_size = options['batch_size']
         success_count = 0
@@ -143,6 +153,35 @@ class Command(BaseCommand):
         
         return queryset.order_by('-uploaded_at')
 
+    def _submit_batch_extraction(self, queryset, options):
+        """Queue the documents' chunks as provider batch jobs instead of extracting inline"""
+        from apps.documents.services.batch_extraction import BatchExtractionService
+        
+        def documents_to_submit():
+            for doc in queryset.iterator(chunk_size=options['batch_size']):
+                if not options['force']:
+                    try:
+                        parsed_data = doc.parsed_data
+                        if parsed_data.is_merged and parsed_data.get_fhir_resource_count() > 0:
+                            self.stdout.write(f"  Skipping Document {doc.id}: Already has FHIR data (use --force to override)")
+                            continue
+                    except ParsedData.DoesNotExist:
+                        pass
+                yield doc
+        
+        summary = BatchExtractionService().submit_documents(documents_to_submit())
+        
+        self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS("=== Batch Submission Summary ==="))
+        self.stdout.write(f"Batches submitted: {len(summary['batches'])} {summary['batches']}")
+        self.stdout.write(f"Chunk requests: {summary['requests']}")
+        self.stdout.write(f"Chunks already in ledger: {summary['ledger_hits']}")
+        self.stdout.write(f"Documents queued: {len(summary['queued_documents'])}")
+        self.stdout.write(f"Documents finished from ledger: {len(summary['finalized_documents'])}")
+        for doc_id, reason in summary['skipped_documents'].items():
+            self.stdout.write(self.style.WARNING(f"  Skipped Document {doc_id}: {reason}"))
+        self.stdout.write("Results are ingested by the poll_extraction_batches task as batches end.")
+
     def _show_dry_run_summary(self, queryset):
         """Show what would be reprocessed in dry run mode"""
         for doc in queryset[:20]:  # Show first 20 documents
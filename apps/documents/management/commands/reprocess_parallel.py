@@ -2,10 +2,13 @@
 One-off management command to reprocess a document with parallel chunk extraction.
 
 Fires all chunks to the AI simultaneously using ThreadPoolExecutor,
-with an explicit HTTP timeout to prevent hangs.
+with an explicit HTTP timeout to prevent hangs. With --batch the chunks are
+submitted as a provider batch job instead and the document is finished by
+the poll_extraction_batches task once the batch ends.
 
 Usage:
     docker-compose exec web python manage.py reprocess_parallel 109
+    docker-compose exec web python manage.py reprocess_parallel 109 --batch
 """
 import time
 import json
@@ -38,6 +41,10 @@ class Command(BaseCommand):
             '--dry-run', action='store_true',
             help='Chunk the document and report plan without calling the API',
         )
+        parser.add_argument(
+            '--batch', action='store_true',
+            help='Submit the chunks as a provider batch job instead of calling the API now',
+        )
 
     def handle(self, *args, **options):
         document_id = options['document_id']
@@ -86,6 +93,19 @@ class Command(BaseCommand):
             self.stdout.write('Dry run complete.')
             return
 
+        if options['batch']:
+            from apps.documents.services.batch_extraction import BatchExtractionService
+
+            summary = BatchExtractionService().submit_documents([document])
+            if document_id in summary['skipped_documents']:
+                raise CommandError(
+                    f'Document {document_id} skipped: {summary["skipped_documents"][document_id]}')
+            self.stdout.write(self.style.SUCCESS(
+                f'Submitted {summary["requests"]} chunk requests in batches '
+                f'{summary["batches"]} ({summary["ledger_hits"]} chunks already in the ledger). '
+                f'The document finishes when poll_extraction_batches ingests the results.'))
+            return
+
         # ── Build a timeout-aware AI client ─────────────────────────
         self.stdout.write(f'Initializing Anthropic client with {api_timeout}s timeout ...')
         raw_client = anthropic.Anthropic(
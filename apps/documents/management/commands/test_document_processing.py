@@ -209,7 +209,7 @@ class Command(BaseCommand):
         # Patient bundle info
         patient = doc.patient
         patient.refresh_from_db()
-        bundle = patient.encrypted_fhir_bundle
+        bundle = patient.fhir_bundle
         bundle_count = len(bundle.get('entry', []))
         
         self.stdout.write(f"\n👤 Patient FHIR Bundle:")
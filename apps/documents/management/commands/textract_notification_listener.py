@@ -0,0 +1,59 @@
+"""
+Management command to listen for Textract async job completion notifications.
+
+Long-polls the SQS queue subscribed to the Textract SNS topic and enqueues
+handle_textract_completion for each finished job. Run one instance alongside
+the Celery workers when TEXTRACT_SNS_TOPIC_ARN is configured.
+"""
+
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.documents.services.textract_notifications import (
+    SQSNotificationQueue,
+    TextractNotificationListener,
+)
+
+
+class Command(BaseCommand):
+    help = 'Listen for Textract job completion notifications (SNS -> SQS)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue-url',
+            default=None,
+            help='SQS queue URL (defaults to TEXTRACT_SQS_QUEUE_URL)',
+        )
+        parser.add_argument(
+            '--wait-seconds',
+            type=int,
+            default=20,
+            help='SQS long-poll wait time per receive (max 20)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Receive a single batch and exit',
+        )
+
+    def handle(self, *args, **options):
+        queue_url = options['queue_url'] or getattr(settings, 'TEXTRACT_SQS_QUEUE_URL', None)
+        if not queue_url:
+            raise CommandError('TEXTRACT_SQS_QUEUE_URL is not configured')
+
+        listener = TextractNotificationListener(SQSNotificationQueue(queue_url=queue_url))
+
+        if options['once']:
+            dispatched = listener.poll_once(wait_seconds=options['wait_seconds'])
+            self.stdout.write(f'Dispatched {dispatched} Textract completion(s)')
+            return
+
+        stopping = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stopping.append(True))
+
+        self.stdout.write(self.style.SUCCESS(f'Listening for Textract notifications on {queue_url}'))
+        listener.run(wait_seconds=options['wait_seconds'], should_stop=lambda: bool(stopping))
+        self.stdout.write('Textract notification listener stopped')
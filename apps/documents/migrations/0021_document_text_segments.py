@@ -0,0 +1,125 @@
+# Generated by Django 5.2.3 on 2026-10-16 21:40
+
+import re
+
+import django.db.models.deletion
+import django_cryptography.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Frozen copies of apps.documents.models helpers as of this migration
+TEXT_PREVIEW_LENGTH = 500
+TEXT_SEGMENT_MAX_CHARS = 50000
+PAGE_HEADER_RE = re.compile(r'^--- Page (\d+)(?: \(OCR\))? ---$', re.MULTILINE)
+
+
+def split_text_segments(text):
+    """Split text into page segments at the '--- Page N ---' headers."""
+    if not text:
+        return []
+    
+    starts = [match.start() for match in PAGE_HEADER_RE.finditer(text)]
+    page_numbers = [int(match.group(1)) for match in PAGE_HEADER_RE.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+        page_numbers.insert(0, None)
+    bounds = starts[1:] + [len(text)]
+    
+    segments = []
+    for start, end, page_number in zip(starts, bounds, page_numbers):
+        for offset in range(start, end, TEXT_SEGMENT_MAX_CHARS):
+            segments.append({
+                'segment_index': len(segments),
+                'page_number': page_number,
+                'char_offset': offset,
+                'text': text[offset:min(end, offset + TEXT_SEGMENT_MAX_CHARS)],
+            })
+    return segments
+
+
+def backfill_text_segments(apps, schema_editor):
+    """
+    Split each document's extracted text into DocumentTextSegment rows and
+    fill the preview and length columns.
+    """
+    Document = apps.get_model('documents', 'Document')
+    DocumentTextSegment = apps.get_model('documents', 'DocumentTextSegment')
+    
+    migrated_count = 0
+    for document in Document.objects.only('id', 'original_text').iterator(chunk_size=50):
+        text = document.original_text or ''
+        if not text:
+            continue
+        
+        segments = split_text_segments(text)
+        DocumentTextSegment.objects.filter(document=document).delete()
+        DocumentTextSegment.objects.bulk_create([
+            DocumentTextSegment(document=document, char_count=len(segment['text']), **segment)
+            for segment in segments
+        ], batch_size=200)
+        document.text_preview = text[:TEXT_PREVIEW_LENGTH]
+        document.text_length = len(text)
+        document.text_segment_count = len(segments)
+        document.save(update_fields=['text_preview', 'text_length', 'text_segment_count'])
+        migrated_count += 1
+        
+        if migrated_count % 100 == 0:
+            print(f"Segmented text for {migrated_count} documents...")
+    
+    print(f"Successfully segmented text for {migrated_count} documents.")
+
+
+def clear_text_segments(apps, schema_editor):
+    """Reverse migration - original_text is still complete, so just drop the rows."""
+    DocumentTextSegment = apps.get_model('documents', 'DocumentTextSegment')
+    DocumentTextSegment.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0020_documentchunkresult'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='text_preview',
+            field=django_cryptography.fields.encrypt(models.TextField(blank=True, help_text='First characters of original_text for previews - encrypted at rest')),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='text_length',
+            field=models.PositiveIntegerField(default=0, help_text='Length of original_text in characters'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='text_segment_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of DocumentTextSegment rows mirroring original_text (0 = not segmented)'),
+        ),
+        migrations.CreateModel(
+            name='DocumentTextSegment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('segment_index', models.PositiveIntegerField(help_text='Zero-based position of this segment within the text')),
+                ('page_number', models.PositiveIntegerField(blank=True, help_text="Page from the '--- Page N ---' header (blank for text before the first page)", null=True)),
+                ('char_offset', models.PositiveIntegerField(help_text='Offset of this segment within original_text')),
+                ('char_count', models.PositiveIntegerField(help_text='Length of this segment in characters')),
+                ('text', django_cryptography.fields.encrypt(models.TextField(blank=True, help_text='Segment of the extracted text - encrypted at rest'))),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('document', models.ForeignKey(help_text='Document this text belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='text_segments', to='documents.document')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_updated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'document_text_segments',
+                'ordering': ['document', 'segment_index'],
+                'indexes': [models.Index(fields=['document', 'page_number'], name='doc_text_seg_page_idx'), models.Index(fields=['document', 'char_offset'], name='doc_text_seg_offset_idx')],
+                'constraints': [models.UniqueConstraint(fields=('document', 'segment_index'), name='unique_document_text_segment')],
+            },
+        ),
+        migrations.RunPython(backfill_text_segments, clear_text_segments),
+    ]
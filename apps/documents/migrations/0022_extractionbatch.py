@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2026-10-16 22:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0021_document_text_segments'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExtractionBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('provider', models.CharField(help_text='Batch provider the job was submitted to (see AI_BATCH_PROVIDER)', max_length=20)),
+                ('provider_batch_id', models.CharField(blank=True, db_index=True, help_text='Batch job ID assigned by the provider', max_length=100)),
+                ('status', models.CharField(choices=[('submitted', 'Submitted'), ('ingesting', 'Ingesting Results'), ('ingested', 'Ingested'), ('failed', 'Failed')], db_index=True, default='submitted', help_text='Lifecycle state of the batch job', max_length=10)),
+                ('request_count', models.PositiveIntegerField(default=0, help_text='Number of chunk requests in the batch')),
+                ('succeeded_count', models.PositiveIntegerField(default=0, help_text='Chunk requests that produced a valid extraction')),
+                ('failed_count', models.PositiveIntegerField(default=0, help_text='Chunk requests that errored, expired or failed validation')),
+                ('submitted_at', models.DateTimeField(blank=True, help_text='When the batch was accepted by the provider', null=True)),
+                ('ingested_at', models.DateTimeField(blank=True, help_text='When the batch results were written to the chunk ledger', null=True)),
+                ('error_message', models.TextField(blank=True, help_text='Submission or ingestion error, if any (no PHI)')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_updated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'document_extraction_batches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='documentchunkresult',
+            name='batch',
+            field=models.ForeignKey(blank=True, help_text='Provider batch job this chunk was last submitted in, if any', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='chunk_results', to='documents.extractionbatch'),
+        ),
+    ]
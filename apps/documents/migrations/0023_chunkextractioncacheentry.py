@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-16 23:05
+
+import django.db.models.deletion
+import django.utils.timezone
+import django_cryptography.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0022_extractionbatch'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChunkExtractionCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('cache_key', models.CharField(help_text='HMAC-SHA256 of normalized chunk text + prompt/schema version + model + context', max_length=64, unique=True)),
+                ('model', models.CharField(help_text='AI model that produced the extraction', max_length=100)),
+                ('structured_json', django_cryptography.fields.encrypt(models.JSONField(blank=True, default=dict, help_text='StructuredMedicalExtraction dump for the chunk - encrypted at rest'))),
+                ('cost_usd', models.DecimalField(decimal_places=6, default=0, help_text='API cost of the original extraction (saved again on every hit)', max_digits=10)),
+                ('hit_count', models.PositiveIntegerField(default=0, help_text='Number of times this entry replaced an API call')),
+                ('last_used_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, help_text='Last store or hit; least recently used entries are evicted first')),
+                ('expires_at', models.DateTimeField(db_index=True, help_text='Entry is ignored and evicted after this time')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_updated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'chunk_extraction_cache',
+                'ordering': ['-last_used_at'],
+            },
+        ),
+    ]
@@ -4,8 +4,9 @@ Handles document upload, processing, and AI-extracted data storage.
 """
 
 import os
+import re
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils import timezone
 from django.core.validators import FileExtensionValidator
@@ -43,6 +44,49 @@ def validate_file_size(value):
         raise ValidationError(f'File too large. Size cannot exceed 50MB.')
 
 
+# Extracted text is stored whole in Document.original_text and again as
+# DocumentTextSegment rows, so readers can decrypt only the pages they need
+TEXT_PREVIEW_LENGTH = 500
+TEXT_SEGMENT_MAX_CHARS = 50000
+PAGE_HEADER_RE = re.compile(r'^--- Page (\d+)(?: \(OCR\))? ---$', re.MULTILINE)
+
+
+def split_text_segments(text):
+    """
+    Split extracted text into page segments.
+    
+    Segments start at the '--- Page N ---' / '--- Page N (OCR) ---' headers
+    written by PDFTextExtractor and Textract, and carry the text up to the
+    next header, separators included, so the segments concatenate back to
+    the original text. Text before the first header gets page_number None.
+    Segments longer than TEXT_SEGMENT_MAX_CHARS (or text without headers)
+    are cut into several segments with the same page number.
+    
+    Returns:
+        List of dicts with segment_index, page_number, char_offset and text
+    """
+    if not text:
+        return []
+    
+    starts = [match.start() for match in PAGE_HEADER_RE.finditer(text)]
+    page_numbers = [int(match.group(1)) for match in PAGE_HEADER_RE.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+        page_numbers.insert(0, None)
+    bounds = starts[1:] + [len(text)]
+    
+    segments = []
+    for start, end, page_number in zip(starts, bounds, page_numbers):
+        for offset in range(start, end, TEXT_SEGMENT_MAX_CHARS):
+            segments.append({
+                'segment_index': len(segments),
+                'page_number': page_number,
+                'char_offset': offset,
+                'text': text[offset:min(end, offset + TEXT_SEGMENT_MAX_CHARS)],
+            })
+    return segments
+
+
 class EncryptedFileField(models.FileField):
     """
     Custom FileField that encrypts file contents at rest.
@@ -174,6 +218,18 @@ class Document(BaseModel):
         blank=True,
         help_text="Extracted text from PDF - encrypted at rest"
     ))
+    text_preview = encrypt(models.TextField(
+        blank=True,
+        help_text="First characters of original_text for previews - encrypted at rest"
+    ))
+    text_length = models.PositiveIntegerField(
+        default=0,
+        help_text="Length of original_text in characters"
+    )
+    text_segment_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of DocumentTextSegment rows mirroring original_text (0 = not segmented)"
+    )
     
     # Structured extraction data (encrypted for HIPAA compliance)
     structured_data = encrypt(models.JSONField(
@@ -264,10 +320,23 @@ class Document(BaseModel):
         if self.file:
             self.file_size = self.file.size
         
+        # original_text written without save_extracted_text leaves the
+        # segment rows and preview behind
+        text_loaded = 'original_text' not in self.get_deferred_fields()
+        if (
+            text_loaded
+            and self.text_segment_count
+            and self.original_text is not getattr(self, '_segmented_text', None)
+        ):
+            self.text_segment_count = 0
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'original_text' in update_fields:
+                kwargs['update_fields'] = list(update_fields) + ['text_segment_count']
+        
         # Set processing timestamps based on status changes
         if self.pk:
-            # Get original status
-            original = Document.objects.get(pk=self.pk)
+            # Get original status (without decrypting the text fields)
+            original = Document.objects.only('status').get(pk=self.pk)
             
             # Set processing started timestamp
             if original.status != 'processing' and self.status == 'processing':
@@ -279,6 +348,157 @@ class Document(BaseModel):
         
         super().save(*args, **kwargs)
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Loaded text is the text the segment rows were built from
+        instance._segmented_text = instance.__dict__.get('original_text')
+        return instance
+    
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None or 'original_text' in fields:
+            self._segmented_text = self.__dict__.get('original_text')
+    
+    def save_extracted_text(self, text, update_fields=None):
+        """
+        Store extracted text with its preview and page segments.
+        
+        Writes original_text, text_preview, text_length and the
+        DocumentTextSegment rows in one transaction. The document must
+        already be saved.
+        
+        Args:
+            text (str): Full extracted text
+            update_fields (list, optional): Other fields to save with the text
+        """
+        text = text or ''
+        segments = split_text_segments(text)
+        
+        self.original_text = text
+        self.text_preview = text[:TEXT_PREVIEW_LENGTH]
+        self.text_length = len(text)
+        self.text_segment_count = len(segments)
+        self._segmented_text = text
+        
+        with transaction.atomic():
+            self.text_segments.all().delete()
+            DocumentTextSegment.objects.bulk_create([
+                DocumentTextSegment(
+                    document=self,
+                    char_count=len(segment['text']),
+                    **segment
+                )
+                for segment in segments
+            ], batch_size=200)
+            self.save(update_fields=[
+                'original_text', 'text_preview', 'text_length', 'text_segment_count',
+                *(update_fields or []),
+            ])
+    
+    def get_text_preview(self):
+        """
+        Get the start of the extracted text without decrypting all of it.
+        
+        Falls back to original_text for documents that were never segmented.
+        """
+        if self.text_segment_count:
+            return self.text_preview
+        return (self.original_text or '')[:TEXT_PREVIEW_LENGTH]
+    
+    def get_text_length(self):
+        """Length of the extracted text, without decrypting it when segmented."""
+        if self.text_segment_count:
+            return self.text_length
+        return len(self.original_text or '')
+    
+    def _get_text_segments(self, pages=None, span=None):
+        """
+        Segments within a page range or overlapping a character span.
+        
+        Decrypts only the matching rows. Unsegmented documents are split in
+        memory from original_text.
+        
+        Args:
+            pages (tuple, optional): (first_page, last_page), inclusive
+            span (tuple, optional): (start, end) character offsets
+            
+        Returns:
+            list: Segment dicts (see split_text_segments), in text order
+        """
+        if self.text_segment_count:
+            segments = self.text_segments.order_by('segment_index')
+            if pages:
+                segments = segments.filter(page_number__range=pages)
+            if span:
+                segments = segments.alias(
+                    char_end=models.F('char_offset') + models.F('char_count')
+                ).filter(char_offset__lt=span[1], char_end__gt=span[0])
+            return [
+                {
+                    'segment_index': segment.segment_index,
+                    'page_number': segment.page_number,
+                    'char_offset': segment.char_offset,
+                    'text': segment.text,
+                }
+                for segment in segments
+            ]
+        
+        segments = split_text_segments(self.original_text or '')
+        if pages:
+            segments = [
+                segment for segment in segments
+                if segment['page_number'] is not None
+                and pages[0] <= segment['page_number'] <= pages[1]
+            ]
+        if span:
+            segments = [
+                segment for segment in segments
+                if segment['char_offset'] < span[1]
+                and segment['char_offset'] + len(segment['text']) > span[0]
+            ]
+        return segments
+    
+    def get_text_pages(self, first_page, last_page=None):
+        """
+        Get the extracted text of a range of pages.
+        
+        Args:
+            first_page (int): First 1-indexed page number
+            last_page (int, optional): Last page number (default: first_page)
+            
+        Returns:
+            list: Dicts with page_number and text, in page order
+        """
+        last_page = last_page if last_page is not None else first_page
+        pages = {}
+        for segment in self._get_text_segments(pages=(first_page, last_page)):
+            pages[segment['page_number']] = pages.get(segment['page_number'], '') + segment['text']
+        return [
+            {'page_number': page_number, 'text': text}
+            for page_number, text in sorted(pages.items())
+        ]
+    
+    def get_text_span(self, start, end):
+        """
+        Get original_text[start:end], decrypting only the segments it covers.
+        
+        Args:
+            start (int): Start character offset
+            end (int): End character offset (exclusive)
+            
+        Returns:
+            str: The requested slice of the extracted text
+        """
+        if end <= start:
+            return ''
+        segments = self._get_text_segments(span=(start, end))
+        if not segments:
+            return ''
+        first_offset = segments[0]['char_offset']
+        text = ''.join(segment['text'] for segment in segments)
+        return text[max(start - first_offset, 0):end - first_offset]
+    
     def get_processing_duration(self):
         """
         Calculate processing duration in seconds.
@@ -1387,6 +1607,75 @@ class PatientDataAudit(BaseModel):
         )
 
 
+class ExtractionBatch(BaseModel):
+    """
+    One provider-side batch job of chunk extraction requests.
+
+    Bulk reprocessing submits chunks from many documents through the
+    provider's batch API instead of one synchronous call per chunk. Every
+    request is a pending DocumentChunkResult row pointing at its batch; the
+    rows are filled in when the batch ends and its results are ingested.
+    """
+
+    STATUS_CHOICES = [
+        ('submitted', 'Submitted'),
+        ('ingesting', 'Ingesting Results'),
+        ('ingested', 'Ingested'),
+        ('failed', 'Failed'),
+    ]
+
+    provider = models.CharField(
+        max_length=20,
+        help_text="Batch provider the job was submitted to (see AI_BATCH_PROVIDER)"
+    )
+    provider_batch_id = models.CharField(
+        max_length=100,
+        blank=True,
+        db_index=True,
+        help_text="Batch job ID assigned by the provider"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='submitted',
+        db_index=True,
+        help_text="Lifecycle state of the batch job"
+    )
+    request_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of chunk requests in the batch"
+    )
+    succeeded_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Chunk requests that produced a valid extraction"
+    )
+    failed_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Chunk requests that errored, expired or failed validation"
+    )
+    submitted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the batch was accepted by the provider"
+    )
+    ingested_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the batch results were written to the chunk ledger"
+    )
+    error_message = models.TextField(
+        blank=True,
+        help_text="Submission or ingestion error, if any (no PHI)"
+    )
+
+    class Meta:
+        db_table = 'document_extraction_batches'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Extraction batch {self.pk} ({self.provider}, {self.status})"
+
+
 class DocumentChunkResult(BaseModel):
     """
     Per-chunk extraction checkpoint ledger for large document processing.
@@ -1458,6 +1747,14 @@ class DocumentChunkResult(BaseModel):
         blank=True,
         help_text="Last error message if extraction failed (no PHI)"
     )
+    batch = models.ForeignKey(
+        ExtractionBatch,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='chunk_results',
+        help_text="Provider batch job this chunk was last submitted in, if any"
+    )
 
     class Meta:
         db_table = 'document_chunk_results'
@@ -1476,6 +1773,115 @@ class DocumentChunkResult(BaseModel):
         return f"Chunk {self.chunk_index} of doc {self.document_id} ({self.status})"
 
 
+class ChunkExtractionCacheEntry(BaseModel):
+    """
+    Content-addressed chunk extraction shared across documents.
+
+    Unlike the per-document DocumentChunkResult ledger, an entry is reused by
+    any document containing the same chunk text (faxed duplicates,
+    re-uploads, identical medication list pages). cache_key is a keyed HMAC
+    of the normalized text, prompt/schema fingerprint and model, so it cannot
+    be matched against guessed text without the server secret. See
+    apps.documents.services.extraction_cache.
+    """
+
+    cache_key = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="HMAC-SHA256 of normalized chunk text + prompt/schema version + model + context"
+    )
+    model = models.CharField(
+        max_length=100,
+        help_text="AI model that produced the extraction"
+    )
+    structured_json = encrypt(models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="StructuredMedicalExtraction dump for the chunk - encrypted at rest"
+    ))
+    cost_usd = models.DecimalField(
+        max_digits=10,
+        decimal_places=6,
+        default=0,
+        help_text="API cost of the original extraction (saved again on every hit)"
+    )
+    hit_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of times this entry replaced an API call"
+    )
+    last_used_at = models.DateTimeField(
+        default=timezone.now,
+        db_index=True,
+        help_text="Last store or hit; least recently used entries are evicted first"
+    )
+    expires_at = models.DateTimeField(
+        db_index=True,
+        help_text="Entry is ignored and evicted after this time"
+    )
+
+    class Meta:
+        db_table = 'chunk_extraction_cache'
+        ordering = ['-last_used_at']
+
+    def __str__(self):
+        return f"Cached chunk extraction {self.cache_key[:12]} ({self.hit_count} hits)"
+
+
+class DocumentTextSegment(BaseModel):
+    """
+    One page (or part of a page) of a document's extracted text.
+    
+    Mirrors Document.original_text so previews, page views, snippet lookups
+    and chunk re-runs decrypt only the text they show or process. Rows are
+    written by Document.save_extracted_text; see split_text_segments for how
+    the text is cut.
+    """
+    
+    document = models.ForeignKey(
+        Document,
+        on_delete=models.CASCADE,
+        related_name='text_segments',
+        help_text="Document this text belongs to"
+    )
+    segment_index = models.PositiveIntegerField(
+        help_text="Zero-based position of this segment within the text"
+    )
+    page_number = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Page from the '--- Page N ---' header (blank for text before the first page)"
+    )
+    char_offset = models.PositiveIntegerField(
+        help_text="Offset of this segment within original_text"
+    )
+    char_count = models.PositiveIntegerField(
+        help_text="Length of this segment in characters"
+    )
+    
+    # Page text (encrypted for HIPAA compliance)
+    text = encrypt(models.TextField(
+        blank=True,
+        help_text="Segment of the extracted text - encrypted at rest"
+    ))
+    
+    class Meta:
+        db_table = 'document_text_segments'
+        ordering = ['document', 'segment_index']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['document', 'segment_index'],
+                name='unique_document_text_segment'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['document', 'page_number'], name='doc_text_seg_page_idx'),
+            models.Index(fields=['document', 'char_offset'], name='doc_text_seg_offset_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Text segment {self.segment_index} of doc {self.document_id}"
+
+
 # ============================================================================
 # HIPAA Audit Logging Helpers (Task 41.28)
 # ============================================================================
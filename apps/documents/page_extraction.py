@@ -0,0 +1,210 @@
+"""
+Page-parallel PDF parsing for PDFTextExtractor.
+
+pdfplumber parsing is pure-Python and CPU-bound, so threads do not help;
+long PDFs are split into page batches parsed by a pool of spawned worker
+processes. Workers open the file themselves (nothing large is pickled),
+return raw page text plus the embedded-font flag, and are recycled after a
+few batches with an optional address-space cap so one pathological page
+cannot take the Celery worker down with it.
+
+Celery prefork workers are daemonic, and the standard library refuses to
+start child processes from a daemonic process, so there the pool comes from
+billiard (Celery's multiprocessing fork) instead of ProcessPoolExecutor.
+
+This module must stay free of Django imports: spawned workers import it
+without settings being configured.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import billiard
+import pdfplumber
+
+logger = logging.getLogger(__name__)
+
+
+class ParsedPage(NamedTuple):
+    """pdfplumber output for one page (text is raw, not yet cleaned)."""
+    page_number: int
+    text: Optional[str]
+    has_fonts: bool
+    error: Optional[str] = None
+
+
+def pdf_page_has_embedded_fonts(page) -> bool:
+    """
+    Return True if the page's resource dictionary includes /Font.
+
+    Native text PDFs embed fonts; typical scanned PDFs do not (text is in pixels).
+    Accepts a PyPDF2-style page dict on ``page.page`` or, for pdfplumber pages,
+    reads the pdfminer resources on ``page.page_obj``.
+    """
+    try:
+        page_dict = getattr(page, 'page', None)
+        if page_dict is None:
+            resources = getattr(getattr(page, 'page_obj', None), 'resources', None)
+            return bool(resources and resources.get('Font'))
+        resources = page_dict.get('/Resources')
+        if resources is None:
+            return False
+        return bool(resources.get('/Font'))
+    except Exception as exc:
+        logger.debug('Embedded font check failed, treating as scanned: %s', exc)
+        return False
+
+
+def _limit_worker_memory(memory_limit_mb: int) -> None:
+    """Pool initializer: cap the worker's address space (Unix only)."""
+    if not memory_limit_mb:
+        return
+    try:
+        import resource
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as exc:
+        logger.warning('Could not cap PDF worker memory at %sMB: %s', memory_limit_mb, exc)
+
+
+def parse_page_batch(file_path: str, page_numbers: List[int]) -> List[ParsedPage]:
+    """
+    Parse a batch of pages (1-indexed) from one PDF.
+
+    Runs in a pool worker. A failing page is reported, not raised, so the
+    caller can route it to OCR like the serial path does.
+    """
+    parsed = []
+    with pdfplumber.open(file_path) as pdf:
+        for page_number in page_numbers:
+            page = None
+            try:
+                page = pdf.pages[page_number - 1]
+                parsed.append(ParsedPage(
+                    page_number, page.extract_text(), pdf_page_has_embedded_fonts(page)
+                ))
+            except Exception as exc:
+                parsed.append(ParsedPage(page_number, None, False, str(exc)))
+            finally:
+                # Drop pdfplumber's per-page object caches as we go
+                if page is not None and hasattr(page, 'close'):
+                    page.close()
+    return parsed
+
+
+def parse_pages_parallel(
+    file_path: str,
+    page_count: int,
+    workers: int,
+    batch_size: int = 10,
+    memory_limit_mb: int = 0,
+    max_batches_per_worker: int = 5,
+) -> Dict[int, ParsedPage]:
+    """
+    Parse every page of a PDF across a process pool.
+
+    Args:
+        file_path: Path to the PDF
+        page_count: Number of pages in the PDF
+        workers: Worker processes
+        batch_size: Pages per task
+        memory_limit_mb: Address-space cap per worker (0 = no cap)
+        max_batches_per_worker: Batches before a worker is replaced
+
+    Returns:
+        Dict mapping page number to ParsedPage. Pages of batches whose worker
+        died (e.g. hit the memory cap) are returned with ``error`` set.
+    """
+    batches = [
+        list(range(start, min(start + batch_size, page_count + 1)))
+        for start in range(1, page_count + 1, batch_size)
+    ]
+    if multiprocessing.current_process().daemon:
+        return _parse_batches_billiard(
+            file_path, batches, workers, memory_limit_mb, max_batches_per_worker
+        )
+
+    results: Dict[int, ParsedPage] = {}
+    executor = ProcessPoolExecutor(
+        max_workers=min(workers, len(batches)) or 1,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_limit_worker_memory,
+        initargs=(memory_limit_mb,),
+        max_tasks_per_child=max_batches_per_worker or None,
+    )
+    with executor:
+        futures = [
+            (batch, executor.submit(parse_page_batch, file_path, batch))
+            for batch in batches
+        ]
+        for batch, future in futures:
+            try:
+                for parsed in future.result():
+                    results[parsed.page_number] = parsed
+            except (BrokenProcessPool, MemoryError, OSError) as exc:
+                logger.warning(
+                    'PDF worker failed on pages %s-%s: %s', batch[0], batch[-1], exc
+                )
+                for page_number in batch:
+                    results[page_number] = ParsedPage(page_number, None, False, str(exc))
+    return results
+
+
+def _parse_batches_billiard(
+    file_path: str,
+    batches: List[List[int]],
+    workers: int,
+    memory_limit_mb: int,
+    max_batches_per_worker: int,
+) -> Dict[int, ParsedPage]:
+    """parse_pages_parallel for daemonic processes (Celery prefork workers)."""
+    results: Dict[int, ParsedPage] = {}
+    pool = billiard.get_context('spawn').Pool(
+        processes=min(workers, len(batches)) or 1,
+        initializer=_limit_worker_memory,
+        initargs=(memory_limit_mb,),
+        maxtasksperchild=max_batches_per_worker or None,
+    )
+    try:
+        pending = [
+            (batch, pool.apply_async(parse_page_batch, (file_path, batch)))
+            for batch in batches
+        ]
+        for batch, async_result in pending:
+            try:
+                for parsed in async_result.get():
+                    results[parsed.page_number] = parsed
+            except Exception as exc:
+                # billiard reports a dead worker as WorkerLostError on its batch
+                logger.warning(
+                    'PDF worker failed on pages %s-%s: %s', batch[0], batch[-1], exc
+                )
+                for page_number in batch:
+                    results[page_number] = ParsedPage(page_number, None, False, str(exc))
+    finally:
+        pool.terminate()
+        pool.join()
+    return results
+
+
+def split_pdf_pages(file_path: str, page_numbers: Iterable[int]):
+    """
+    Yield (page_number, single-page PDF bytes) for the given 1-indexed pages.
+
+    Used to send scanned pages of a multi-page PDF to Textract's single-page
+    synchronous API. Pages are produced lazily so callers can bound how many
+    are held in memory at once.
+    """
+    import io
+    from PyPDF2 import PdfReader, PdfWriter
+
+    reader = PdfReader(file_path)
+    for page_number in page_numbers:
+        writer = PdfWriter()
+        writer.add_page(reader.pages[page_number - 1])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        yield page_number, buffer.getvalue()
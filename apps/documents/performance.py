@@ -5,6 +5,7 @@ This module provides parallel processing capabilities and performance monitoring
 for handling large medical documents efficiently while maintaining HIPAA compliance.
 """
 import os
+import math
 import time
 import logging
 import asyncio
@@ -134,6 +135,163 @@ class DocumentChunker:
         return sentences
 
 
+class NearDuplicateIndex:
+    """
+    Near-duplicate lookup for extracted item names.
+    
+    Answers "which is the first indexed name whose SequenceMatcher ratio with
+    this one exceeds the threshold?" - the question the chunk-aggregation
+    dedup loops ask - without running SequenceMatcher against every name.
+    
+    SequenceMatcher's ratio is 2M / (la + lb) for a common subsequence of
+    length M, and two strings with such a subsequence still share at least
+    max(la, lb) - 1 - 2 * (la + lb - 2M) character bigrams. That gives every
+    name a minimum bigram overlap any match needs, so names are indexed by
+    only the rarest bigrams that overlap could avoid (prefix filtering).
+    Candidates sharing an indexed bigram are checked against the length,
+    exact bigram-overlap and character-count bounds before SequenceMatcher
+    runs, in insertion order, so the answer is exactly the linear scan's.
+    """
+    
+    def __init__(self, threshold: float = 0.85, vocabulary: Optional[List[str]] = None):
+        """
+        Args:
+            threshold: Ratio a pair must exceed to count as duplicates
+            vocabulary: Names that will be looked up, used to index the
+                rarest bigrams first; optional, only affects speed
+        """
+        self.threshold = threshold
+        self._slack = 1 - 4 * (1 - threshold)
+        self._gram_frequency: Dict[str, int] = {}
+        for name in vocabulary or []:
+            if not isinstance(name, str):
+                continue
+            for gram in set(self._bigrams(name.lower())):
+                self._gram_frequency[gram] = self._gram_frequency.get(gram, 0) + 1
+        
+        self._names: List[str] = []
+        self._gram_tokens: List[frozenset] = []
+        self._char_tokens: List[frozenset] = []
+        self._prefixes: List[List[tuple]] = []
+        self._postings: Dict[tuple, Dict[int, None]] = {}
+        # Slots whose names can match while sharing no bigram at all
+        self._unindexed: Dict[int, None] = {}
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    @staticmethod
+    def _bigrams(name: str) -> List[str]:
+        return [name[i:i + 2] for i in range(len(name) - 1)]
+    
+    @staticmethod
+    def _tokens(values) -> frozenset:
+        """Multiset as a set: the n-th repeat of a value becomes (value, n)."""
+        seen: Dict[str, int] = {}
+        tokens = []
+        for value in values:
+            occurrence = seen.get(value, 0)
+            seen[value] = occurrence + 1
+            tokens.append((value, occurrence))
+        return frozenset(tokens)
+    
+    def _prefix(self, name: str, gram_tokens: frozenset) -> Optional[List[tuple]]:
+        """
+        Rarest bigram tokens of ``name`` that any match must share, or None
+        when a match may share no bigram at all.
+        """
+        if self._slack <= 0:
+            return None
+        # Fewest shared bigrams a match of any length needs, minus one
+        least = len(name) * self._slack - 1
+        if least < 0:
+            return None
+        min_overlap = math.floor(least - 1e-9) + 1
+        tokens = sorted(
+            gram_tokens, key=lambda token: (self._gram_frequency.get(token[0], 0), token)
+        )
+        return tokens[:max(0, len(tokens) - min_overlap + 1)]
+    
+    def find(self, name: str) -> Optional[int]:
+        """
+        Slot of the first indexed name similar to ``name``, or None.
+        
+        Args:
+            name: Item name (compared case-insensitively)
+        """
+        from difflib import SequenceMatcher
+        
+        if not self._names:
+            return None
+        query = name.lower()
+        gram_tokens = self._tokens(self._bigrams(query))
+        prefix = self._prefix(query, gram_tokens)
+        if prefix is None:
+            candidates = range(len(self._names))
+        else:
+            found = dict(self._unindexed)
+            for token in prefix:
+                postings = self._postings.get(token)
+                if postings:
+                    found.update(postings)
+            candidates = sorted(found)
+        
+        # Cheap upper bounds on the ratio first (inlined: this loop is hot).
+        # Small tolerance so float rounding never prunes a real match.
+        limit = self.threshold - 1e-9
+        gap = 2 * (1 - self.threshold)
+        query_length = len(query)
+        char_tokens = self._tokens(query)
+        for slot in candidates:
+            other = self._names[slot]
+            total = query_length + len(other)
+            if total:
+                shorter, longer = sorted((query_length, len(other)))
+                # Matched characters can never exceed the shorter name...
+                if 2.0 * shorter / total <= limit:
+                    continue
+                # ...or the bigrams a good enough subsequence leaves shared...
+                shared = len(gram_tokens & self._gram_tokens[slot])
+                if shared <= longer - 1 - gap * total - 1e-9:
+                    continue
+                # ...or the shared character counts
+                if 2.0 * len(char_tokens & self._char_tokens[slot]) / total <= limit:
+                    continue
+            if SequenceMatcher(None, query, other).ratio() > self.threshold:
+                return slot
+        return None
+    
+    def add(self, name: str) -> int:
+        """Index ``name`` in a new slot and return the slot."""
+        self._names.append('')
+        self._gram_tokens.append(frozenset())
+        self._char_tokens.append(frozenset())
+        self._prefixes.append([])
+        slot = len(self._names) - 1
+        self.replace(slot, name)
+        return slot
+    
+    def replace(self, slot: int, name: str) -> None:
+        """Re-index ``slot`` under a new name (the kept item was swapped)."""
+        for token in self._prefixes[slot]:
+            del self._postings[token][slot]
+        self._unindexed.pop(slot, None)
+        
+        lowered = name.lower()
+        gram_tokens = self._tokens(self._bigrams(lowered))
+        prefix = self._prefix(lowered, gram_tokens)
+        if prefix is None:
+            self._unindexed[slot] = None
+            prefix = []
+        for token in prefix:
+            self._postings.setdefault(token, {})[slot] = None
+        
+        self._names[slot] = lowered
+        self._gram_tokens[slot] = gram_tokens
+        self._char_tokens[slot] = self._tokens(lowered)
+        self._prefixes[slot] = prefix
+
+
 class ParallelDocumentProcessor:
     """
     Parallel processing manager for large document extraction operations.
@@ -271,30 +429,21 @@ class ParallelDocumentProcessor:
         Returns:
             Deduplicated extraction results
         """
-        from difflib import SequenceMatcher
-        
-        def is_similar(a: str, b: str, threshold: float = 0.85) -> bool:
-            """Check if two medical terms are similar enough to be duplicates."""
-            return SequenceMatcher(None, a.lower(), b.lower()).ratio() > threshold
-        
         for data_type in ['conditions', 'medications', 'procedures']:
             if data_type in aggregated_data:
                 items = aggregated_data[data_type]
                 deduplicated = []
+                names = [
+                    item.get('name', str(item)) if isinstance(item, dict) else str(item)
+                    for item in items
+                ]
+                # Only names sharing enough bigrams reach SequenceMatcher
+                index = NearDuplicateIndex(threshold=0.85, vocabulary=names)
                 
-                for item in items:
-                    # Extract name for comparison
-                    item_name = item.get('name', str(item)) if isinstance(item, dict) else str(item)
-                    
-                    # Check if similar item already exists
-                    is_duplicate = False
-                    for existing in deduplicated:
-                        existing_name = existing.get('name', str(existing)) if isinstance(existing, dict) else str(existing)
-                        if is_similar(item_name, existing_name):
-                            is_duplicate = True
-                            break
-                    
-                    if not is_duplicate:
+                for item, item_name in zip(items, names):
+                    # Keep the item unless a similar item already exists
+                    if index.find(item_name) is None:
+                        index.add(item_name)
                         deduplicated.append(item)
                 
                 logger.info(f"Deduplicated {data_type}: {len(items)} -> {len(deduplicated)} items")
@@ -27,26 +27,15 @@ from apps.documents.services.textract import (
     TextractConfigurationError,
 )
 
-logger = logging.getLogger(__name__)
-
-
-def _pdf_page_has_embedded_fonts(page) -> bool:
-    """
-    Return True if the page's resource dictionary includes /Font.
+# Page-parallel parsing lives in a Django-free module so spawned workers can import it
+from apps.documents.page_extraction import (
+    ParsedPage,
+    parse_pages_parallel,
+    pdf_page_has_embedded_fonts as _pdf_page_has_embedded_fonts,
+    split_pdf_pages,
+)
 
-    Native text PDFs embed fonts; typical scanned PDFs do not (text is in pixels).
-    """
-    try:
-        page_dict = getattr(page, 'page', None)
-        if page_dict is None:
-            return False
-        resources = page_dict.get('/Resources')
-        if resources is None:
-            return False
-        return bool(resources.get('/Font'))
-    except Exception as exc:
-        logger.debug('Embedded font check failed, treating as scanned: %s', exc)
-        return False
+logger = logging.getLogger(__name__)
 
 
 class DocumentProcessingError(Exception):
@@ -76,6 +65,14 @@ class PDFTextExtractor:
         # Documents >= this size use async workflow; smaller use sync API
         self.ocr_async_threshold_mb = getattr(settings, 'OCR_ASYNC_THRESHOLD_MB', 5)
 
+        # Page-parallel mode: pdfplumber parsing on a process pool for long PDFs,
+        # and per-page Textract sync calls on a thread pool for scanned pages
+        self.page_workers = getattr(settings, 'PDF_PAGE_WORKERS', 0)
+        self.parallel_min_pages = getattr(settings, 'PDF_PARALLEL_MIN_PAGES', 20)
+        self.page_batch_size = getattr(settings, 'PDF_PAGE_BATCH_SIZE', 10)
+        self.page_worker_memory_mb = getattr(settings, 'PDF_PAGE_WORKER_MEMORY_MB', 1024)
+        self.ocr_page_workers = getattr(settings, 'OCR_SYNC_PAGE_WORKERS', 0)
+
         # Textract service (lazy initialization)
         self._textract_service = None
     @property
@@ -174,6 +171,123 @@ class PDFTextExtractor:
             logger.error(f"Failed to read file for Textract OCR: {e}")
             return None, None
 
+    def _extract_pages_with_textract_sync(
+        self,
+        file_path: str,
+        image_pages: List[int]
+    ) -> Tuple[Optional[Dict[int, str]], Optional[Dict]]:
+        """
+        OCR the scanned pages of a multi-page PDF with the Textract sync API.
+        
+        Each page is split into its own single-page PDF and sent on a thread
+        pool of OCR_SYNC_PAGE_WORKERS; at most twice that many pages are held
+        in memory at once. All-or-nothing: if any page fails the caller falls
+        back to the async S3 workflow for the whole document.
+        
+        Args:
+            file_path: Path to the PDF file
+            image_pages: 1-indexed page numbers needing OCR
+            
+        Returns:
+            Tuple of ({page_number: text with '--- Page N (OCR) ---' separator},
+            combined textract_metadata) or (None, None) on failure
+            
+        HIPAA Note:
+            - Page bytes are processed in memory only
+            - No PHI is logged; only metadata (page count, confidence)
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+        
+        service = self.textract_service
+        if not service:
+            return None, None
+        
+        page_texts: Dict[int, str] = {}
+        results: List[TextractResult] = []
+        in_flight = {}
+        
+        def collect(done):
+            for future in done:
+                page_number = in_flight.pop(future)
+                result = future.result()
+                results.append(result)
+                page_texts[page_number] = service.extract_text_from_result(
+                    result, page_number_offset=page_number - 1
+                )
+        
+        logger.info(
+            f"Starting Textract sync OCR fan-out: pages={len(image_pages)}, "
+            f"workers={self.ocr_page_workers}"
+        )
+        executor = ThreadPoolExecutor(max_workers=self.ocr_page_workers)
+        try:
+            # Build the boto3 client once, before threads race to create it
+            service.textract_client
+            for page_number, page_bytes in split_pdf_pages(file_path, image_pages):
+                if len(in_flight) >= self.ocr_page_workers * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                in_flight[executor.submit(service.process_document_sync, page_bytes)] = page_number
+            collect(wait(in_flight).done)
+        except TextractAPIError as e:
+            logger.warning(
+                f"Textract sync OCR fan-out failed, falling back to async: {e} "
+                f"(error_code={e.error_code})"
+            )
+            return None, None
+        except Exception as e:
+            logger.warning(f"Textract sync OCR fan-out failed, falling back to async: {e}")
+            return None, None
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        textract_metadata = {
+            'page_count': sum(r.page_count for r in results),
+            'confidence': sum(r.confidence for r in results) / len(results) if results else 0.0,
+            'extraction_time_ms': sum(r.extraction_time_ms for r in results),
+            'job_id': None,
+            'block_count': sum(len(r.blocks) for r in results),
+            'table_count': sum(len(r.get_tables()) for r in results),
+            'form_field_count': sum(len(r.get_forms()) for r in results),
+            'sync_page_fanout': True,
+        }
+        logger.info(
+            f"Textract sync OCR fan-out complete: pages={len(results)}, "
+            f"confidence={textract_metadata['confidence']:.1f}%"
+        )
+        return page_texts, textract_metadata
+
+    def _parse_pages(self, file_path: str, pdf) -> List[ParsedPage]:
+        """
+        Run pdfplumber over every page, on a process pool for long PDFs.
+        
+        Falls back to parsing in-process if the pool cannot be used (e.g.
+        process creation is not allowed in this worker).
+        """
+        page_count = len(pdf.pages)
+        if self.page_workers > 1 and page_count >= self.parallel_min_pages:
+            try:
+                parsed = parse_pages_parallel(
+                    file_path,
+                    page_count,
+                    workers=self.page_workers,
+                    batch_size=self.page_batch_size,
+                    memory_limit_mb=self.page_worker_memory_mb,
+                )
+                return [parsed[page_num] for page_num in range(1, page_count + 1)]
+            except Exception as e:
+                logger.warning(f"Parallel page parsing unavailable, parsing serially: {e}")
+        
+        parsed_pages = []
+        for page_num, page in enumerate(pdf.pages, 1):
+            try:
+                parsed_pages.append(ParsedPage(
+                    page_num, page.extract_text(), _pdf_page_has_embedded_fonts(page)
+                ))
+            except Exception as page_error:
+                parsed_pages.append(ParsedPage(page_num, None, False, str(page_error)))
+        return parsed_pages
+
     def extract_text(self, file_path: str) -> Dict[str, any]:
         """
         Extract text from a PDF file with comprehensive error handling.
@@ -184,7 +298,12 @@ class PDFTextExtractor:
 
         For documents with image pages requiring OCR:
         - Single-page documents under OCR_ASYNC_THRESHOLD_MB: Textract synchronous API
-        - Multi-page or large documents: async Textract via S3 (ocr_pending)
+        - Multi-page documents with OCR_SYNC_PAGE_WORKERS > 0: Textract synchronous
+          API page by page on a thread pool, falling back to async on failure
+        - Otherwise: async Textract via S3 (ocr_pending)
+
+        PDFs of at least PDF_PARALLEL_MIN_PAGES pages are parsed on a process pool
+        when PDF_PAGE_WORKERS > 1. Page order and separators are the same either way.
 
         Args:
             file_path (str): Path to the PDF file
@@ -220,7 +339,7 @@ class PDFTextExtractor:
             
             # Extract text using pdfplumber with page-level classification
             with pdfplumber.open(file_path) as pdf:
-                extracted_text = []
+                page_sections = {}  # page number -> text with page separator
                 
                 # Page classification tracking
                 chars_per_page = {}
@@ -237,19 +356,22 @@ class PDFTextExtractor:
                 }
                 
                 # Process each page: native text if /Font in Resources, else Textract OCR route
-                for page_num, page in enumerate(pdf.pages, 1):
+                for parsed in self._parse_pages(file_path, pdf):
+                    page_num = parsed.page_number
                     try:
-                        page_text = page.extract_text()
+                        if parsed.error is not None:
+                            raise DocumentProcessingError(parsed.error)
+                        page_text = parsed.text
                         cleaned_text = self._clean_text(page_text) if page_text else ''
                         char_count = len(cleaned_text)
 
                         chars_per_page[page_num] = char_count
                         page_texts[page_num] = cleaned_text
 
-                        if _pdf_page_has_embedded_fonts(page):
+                        if parsed.has_fonts:
                             text_pages.append(page_num)
                             if cleaned_text.strip():
-                                extracted_text.append(f"--- Page {page_num} ---\n{cleaned_text}")
+                                page_sections[page_num] = f"--- Page {page_num} ---\n{cleaned_text}"
                             else:
                                 logger.debug(
                                     'Page %s has font resources but no extractable text', page_num
@@ -269,7 +391,7 @@ class PDFTextExtractor:
                         continue
                 
                 # Combine all text pages
-                full_text = '\n\n'.join(extracted_text)
+                full_text = '\n\n'.join(page_sections[n] for n in sorted(page_sections))
                 page_count = len(pdf.pages)
                 
                 # Get file size
@@ -299,6 +421,14 @@ class PDFTextExtractor:
                         and file_size < self.ocr_async_threshold_mb
                     )
                     
+                    # Opt-in: OCR each scanned page through the sync API in parallel
+                    # instead of handing the whole document to the async S3 workflow
+                    page_ocr_texts = None
+                    if not use_sync and self.ocr_page_workers > 0 and self.textract_service:
+                        page_ocr_texts, textract_metadata = self._extract_pages_with_textract_sync(
+                            file_path, image_pages
+                        )
+                    
                     if use_sync:
                         # Single-page document under 5MB: use Textract sync API
                         try:
@@ -345,6 +475,17 @@ class PDFTextExtractor:
                                 "Textract sync OCR returned no text for image pages, "
                                 "continuing with embedded text only"
                             )
+                    elif page_ocr_texts is not None:
+                        # Interleave OCR pages with text pages in page order
+                        for page_num, page_ocr_text in page_ocr_texts.items():
+                            if page_ocr_text:
+                                page_sections[page_num] = page_ocr_text
+                        full_text = '\n\n'.join(page_sections[n] for n in sorted(page_sections))
+                        if extraction_method == 'ocr':
+                            extraction_method = 'external_ocr'
+                        logger.info(
+                            f"Textract sync OCR fan-out recovered text for {len(page_ocr_texts)} pages"
+                        )
                     else:
                         # Multi-page or large document: requires async Textract via S3
                         # Return early with ocr_pending flag so the Celery task can
@@ -378,7 +519,7 @@ class PDFTextExtractor:
                             full_text = ocr_text
                         else:
                             full_text = full_text + '\n\n' + ocr_text if full_text else ocr_text
-                    else:
+                    elif page_ocr_texts is None:
                         logger.warning(
                             f"Textract OCR produced no text for {len(image_pages)} image pages in {file_path}"
                         )
@@ -0,0 +1,545 @@
+"""
+Batch-mode chunk extraction for bulk reprocessing.
+
+Backfills don't need interactive latency, so instead of one synchronous
+messages.create per chunk, BatchExtractionService collects chunks from many
+documents into provider batch jobs (Anthropic Message Batches: discounted
+pricing, and no Celery worker held on an open HTTP call). Every request is a
+pending DocumentChunkResult row linked to an ExtractionBatch:
+
+1. submit_documents() chunks each document exactly as
+   continue_document_processing does, skips chunks the ledger already has,
+   and submits the rest in jobs of up to AI_BATCH_MAX_REQUESTS requests.
+2. poll_batches() (the poll_extraction_batches beat task) writes the
+   results of ended jobs into the ledger.
+3. A document with no chunk left in an open job is resumed through
+   continue_document_processing, which reads every succeeded chunk from the
+   ledger and only calls the API for chunks whose batch request failed.
+
+LocalBatchProvider stands in for the Anthropic batch API in tests and local
+development.
+
+HIPAA Note:
+- Request custom IDs carry document and chunk numbers only - no PHI
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from pydantic import ValidationError
+
+from apps.documents.exceptions import AIExtractionError, ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+# Same context continue_document_processing passes for chunk extraction
+EXTRACTION_CONTEXT = "medical_document"
+
+OPEN_BATCH_STATUSES = ('submitted', 'ingesting')
+
+
+@dataclass
+class BatchRequest:
+    """One chunk extraction request inside a provider batch."""
+    custom_id: str
+    params: Dict[str, Any]
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one request once its batch has ended."""
+    custom_id: str
+    response_text: Optional[str] = None
+    usage: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def chunk_custom_id(document_id: int, chunk_index: int) -> str:
+    """Batch request ID for one document chunk (unique within a batch)."""
+    return f"doc-{document_id}-chunk-{chunk_index}"
+
+
+class AnthropicBatchProvider:
+    """Anthropic Message Batches API, using the cached extractor's client."""
+
+    name = 'anthropic'
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from apps.documents.services.cached_extraction import get_cached_extractor
+            self._client = get_cached_extractor().client
+        return self._client
+
+    def submit(self, requests: List[BatchRequest]) -> str:
+        """Create a batch job; returns the provider batch ID."""
+        batch = self.client.messages.batches.create(requests=[
+            {'custom_id': request.custom_id, 'params': request.params}
+            for request in requests
+        ])
+        return batch.id
+
+    def is_ended(self, batch_id: str) -> bool:
+        return self.client.messages.batches.retrieve(batch_id).processing_status == 'ended'
+
+    def results(self, batch_id: str) -> Iterator[BatchResult]:
+        """Stream results of an ended batch (errored, canceled and expired included)."""
+        from apps.documents.services.cached_extraction import usage_stats
+
+        for entry in self.client.messages.batches.results(batch_id):
+            result = entry.result
+            if result.type == 'succeeded':
+                message = result.message
+                yield BatchResult(
+                    custom_id=entry.custom_id,
+                    response_text=message.content[0].text if message.content else '',
+                    usage=usage_stats(message.model, message.usage),
+                )
+            else:
+                detail = getattr(result, 'error', None)
+                yield BatchResult(
+                    custom_id=entry.custom_id,
+                    error=f"{result.type}: {detail}" if detail else result.type,
+                )
+
+
+class LocalBatchProvider:
+    """
+    In-memory stand-in for AnthropicBatchProvider (tests, local development).
+
+    respond(params) returns the response text for one request; an exception
+    becomes an errored result. Batches end as soon as they are submitted
+    unless auto_end is False, in which case end() finishes them.
+    """
+
+    name = 'local'
+
+    def __init__(self, respond: Callable[[Dict[str, Any]], str] = None, auto_end: bool = True):
+        self.respond = respond or (lambda params: '{}')
+        self.auto_end = auto_end
+        self.batches: Dict[str, List[BatchRequest]] = {}
+        self._ended = set()
+
+    def submit(self, requests: List[BatchRequest]) -> str:
+        batch_id = f"local-batch-{len(self.batches) + 1}"
+        self.batches[batch_id] = list(requests)
+        if self.auto_end:
+            self._ended.add(batch_id)
+        return batch_id
+
+    def end(self, batch_id: str) -> None:
+        self._ended.add(batch_id)
+
+    def is_ended(self, batch_id: str) -> bool:
+        return batch_id in self._ended
+
+    def results(self, batch_id: str) -> Iterator[BatchResult]:
+        for request in self.batches.get(batch_id, []):
+            try:
+                response_text = self.respond(request.params)
+            except Exception as exc:
+                yield BatchResult(custom_id=request.custom_id, error=f"errored: {exc}")
+                continue
+            yield BatchResult(
+                custom_id=request.custom_id,
+                response_text=response_text,
+                usage={'model': request.params.get('model'), 'input_tokens': 0, 'output_tokens': 0},
+            )
+
+
+_local_provider: Optional[LocalBatchProvider] = None
+
+
+def get_batch_provider():
+    """
+    Provider selected by AI_BATCH_PROVIDER ('anthropic' or 'local').
+
+    The local provider keeps batches in process memory, so one instance is
+    shared per process and submission and polling must happen in the same
+    process (eager Celery, tests).
+    """
+    global _local_provider
+    name = getattr(settings, 'AI_BATCH_PROVIDER', 'anthropic')
+    if name == 'anthropic':
+        return AnthropicBatchProvider()
+    if name == 'local':
+        if _local_provider is None:
+            _local_provider = LocalBatchProvider()
+        return _local_provider
+    raise ConfigurationError(
+        f"Unknown AI_BATCH_PROVIDER '{name}' (expected 'anthropic' or 'local')",
+        config_key='AI_BATCH_PROVIDER',
+    )
+
+
+class BatchExtractionService:
+    """Submit document chunks as provider batch jobs and ingest the results."""
+
+    def __init__(self, provider=None, extractor=None):
+        self.provider = provider or get_batch_provider()
+        self._extractor = extractor
+
+    @property
+    def extractor(self):
+        if self._extractor is None:
+            from apps.documents.services.cached_extraction import get_cached_extractor
+            self._extractor = get_cached_extractor()
+        return self._extractor
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def submit_documents(self, documents: Iterable) -> Dict[str, Any]:
+        """
+        Queue every chunk of these documents the ledger does not already have.
+
+        Chunks already pending in an open batch are not submitted twice.
+        Documents whose chunks are all checkpointed are finished right away.
+        Documents over the text, chunk or per-document spend limits are
+        skipped and left untouched.
+
+        Returns:
+            Dict with 'batches' (ExtractionBatch ids), 'requests',
+            'ledger_hits', 'queued_documents', 'finalized_documents' and
+            'skipped_documents' ({document_id: reason}).
+        """
+        from apps.documents.tasks import _chunk_content_hash, _check_cost_circuit_breaker
+
+        max_requests = max(1, int(getattr(settings, 'AI_BATCH_MAX_REQUESTS', 1000)))
+        model = self.extractor.model
+        summary = {
+            'batches': [],
+            'requests': 0,
+            'ledger_hits': 0,
+            'queued_documents': [],
+            'finalized_documents': [],
+            'skipped_documents': {},
+        }
+        ready_documents = []
+        # (document, chunk_index, content_hash, BatchRequest) awaiting submission
+        entries = []
+
+        for document in documents:
+            chunks, skip_reason = self._document_chunks(document)
+            if skip_reason is None:
+                try:
+                    _check_cost_circuit_breaker(document, 'batch-submit')
+                except AIExtractionError as limit_error:
+                    skip_reason = str(limit_error)
+            if skip_reason is not None:
+                logger.warning("Batch extraction skipped document %s: %s", document.id, skip_reason)
+                summary['skipped_documents'][document.id] = skip_reason
+                continue
+
+            content_hashes = [_chunk_content_hash(chunk, model) for chunk in chunks]
+            ledger = self._ledger_states(document, content_hashes)
+            outstanding = 0
+            for chunk_index, (chunk, content_hash) in enumerate(zip(chunks, content_hashes)):
+                status, batch_status = ledger.get((chunk_index, content_hash), (None, None))
+                if status == 'succeeded':
+                    summary['ledger_hits'] += 1
+                    continue
+                outstanding += 1
+                if status == 'pending' and batch_status in OPEN_BATCH_STATUSES:
+                    continue
+                entries.append((document, chunk_index, content_hash, BatchRequest(
+                    custom_id=chunk_custom_id(document.id, chunk_index),
+                    params=self.extractor.build_request_params(chunk, EXTRACTION_CONTEXT),
+                )))
+                if len(entries) >= max_requests:
+                    summary['batches'].append(self._submit(entries).id)
+                    summary['requests'] += len(entries)
+                    entries = []
+            del chunks
+
+            if outstanding:
+                summary['queued_documents'].append(document.id)
+            else:
+                ready_documents.append(document.id)
+
+        if entries:
+            summary['batches'].append(self._submit(entries).id)
+            summary['requests'] += len(entries)
+
+        summary['finalized_documents'] = self._finalize_documents(ready_documents)
+        logger.info(
+            "Batch extraction submitted %s requests in %s batches for %s documents "
+            "(%s ledger hits, %s finalized, %s skipped)",
+            summary['requests'], len(summary['batches']), len(summary['queued_documents']),
+            summary['ledger_hits'], len(summary['finalized_documents']),
+            len(summary['skipped_documents']),
+        )
+        return summary
+
+    @staticmethod
+    def _document_chunks(document) -> tuple:
+        """
+        Chunk texts for one document, split exactly as
+        continue_document_processing splits them so its ledger lookups hit.
+
+        Returns:
+            (chunk_texts, skip_reason) - skip_reason is None when the
+            document can be submitted.
+        """
+        from apps.documents.performance import document_chunker
+
+        text = document.original_text or ''
+        if not text.strip():
+            return [], "no extracted text"
+
+        max_length = getattr(settings, 'MAX_DOCUMENT_TEXT_LENGTH', 500000)
+        if len(text) > max_length:
+            return [], f"text length {len(text):,} exceeds {max_length:,} characters"
+
+        if len(text) <= getattr(settings, 'AI_TOKEN_THRESHOLD_FOR_CHUNKING', 20000):
+            return [text], None
+
+        chunks = [chunk['text'] for chunk in document_chunker.chunk_text(text, preserve_context=True)]
+        max_chunks = getattr(settings, 'MAX_DOCUMENT_CHUNKS', 25)
+        if len(chunks) > max_chunks:
+            return [], f"{len(chunks)} chunks exceeds the {max_chunks} chunk limit"
+        return chunks, None
+
+    @staticmethod
+    def _ledger_states(document, content_hashes: List[str]) -> Dict[tuple, tuple]:
+        """(chunk_index, content_hash) -> (status, batch status), without decrypting payloads."""
+        from apps.documents.models import DocumentChunkResult
+
+        rows = DocumentChunkResult.objects.filter(
+            document=document,
+            chunk_index__lt=len(content_hashes),
+            content_hash__in=set(content_hashes),
+        ).values_list('chunk_index', 'content_hash', 'status', 'batch__status')
+        return {
+            (chunk_index, content_hash): (status, batch_status)
+            for chunk_index, content_hash, status, batch_status in rows
+        }
+
+    def _submit(self, entries: List[tuple]):
+        """Submit one provider batch and record its pending ledger rows."""
+        from apps.documents.models import Document, DocumentChunkResult, ExtractionBatch
+
+        provider_batch_id = self.provider.submit([entry[3] for entry in entries])
+        try:
+            with transaction.atomic():
+                batch = ExtractionBatch.objects.create(
+                    provider=self.provider.name,
+                    provider_batch_id=provider_batch_id,
+                    status='submitted',
+                    request_count=len(entries),
+                    submitted_at=timezone.now(),
+                )
+                DocumentChunkResult.objects.bulk_create(
+                    [
+                        DocumentChunkResult(
+                            document=document,
+                            chunk_index=chunk_index,
+                            content_hash=content_hash,
+                            status='pending',
+                            batch=batch,
+                        )
+                        for document, chunk_index, content_hash, _ in entries
+                    ],
+                    batch_size=500,
+                    update_conflicts=True,
+                    unique_fields=['document', 'chunk_index', 'content_hash'],
+                    update_fields=['status', 'batch', 'error_message', 'updated_at'],
+                )
+                Document.objects.filter(id__in={entry[0].id for entry in entries}).update(
+                    status='processing',
+                    processing_message='Queued for batch AI extraction',
+                    error_message='',
+                    # Not started until the batch ends; keeps the stuck-document
+                    # watchdog away while the provider works through the job
+                    processing_started_at=None,
+                )
+        except Exception:
+            logger.error(
+                "Failed to record %s batch %s after submission; its results will not be ingested",
+                self.provider.name, provider_batch_id,
+            )
+            raise
+
+        logger.info(
+            "Submitted extraction batch %s (%s %s) with %s requests",
+            batch.pk, self.provider.name, provider_batch_id, len(entries),
+        )
+        return batch
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def poll_batches(self) -> Dict[str, int]:
+        """Ingest every submitted batch the provider reports as ended."""
+        from apps.documents.models import ExtractionBatch
+
+        summary = {'open': 0, 'ingested': 0, 'finalized_documents': 0}
+        open_batches = ExtractionBatch.objects.filter(
+            provider=self.provider.name, status='submitted'
+        ).order_by('submitted_at')
+        for batch in open_batches:
+            summary['open'] += 1
+            try:
+                ended = self.provider.is_ended(batch.provider_batch_id)
+            except Exception as exc:
+                logger.warning("Could not check extraction batch %s: %s", batch.pk, exc)
+                continue
+            if not ended:
+                continue
+            finalized = self.ingest_batch(batch)
+            if finalized is not None:
+                summary['ingested'] += 1
+                summary['finalized_documents'] += len(finalized)
+        return summary
+
+    def ingest_batch(self, batch) -> Optional[List[int]]:
+        """
+        Write an ended batch's results into the chunk ledger.
+
+        Requests that errored, expired or failed validation are recorded as
+        failed chunks; the resume path retries those synchronously (with the
+        usual bounded validation retry). Only rows still pending in this
+        batch are touched, so an interrupted ingest can simply run again.
+
+        Returns:
+            Ids of the documents handed on for finishing, or None if another
+            worker is already ingesting the batch.
+        """
+        from apps.documents.models import DocumentChunkResult, ExtractionBatch
+        from apps.documents.tasks import (
+            _build_chunk_ledger_row,
+            _flush_chunk_ledger,
+            _log_chunk_api_usage,
+        )
+
+        claimed = ExtractionBatch.objects.filter(pk=batch.pk, status='submitted').update(
+            status='ingesting', updated_at=timezone.now()
+        )
+        if not claimed:
+            return None
+
+        task_id = f"batch-{batch.pk}"
+        start_time = batch.submitted_at.timestamp() if batch.submitted_at else time.time()
+        rows = {
+            chunk_custom_id(row.document_id, row.chunk_index): row
+            for row in DocumentChunkResult.objects.filter(batch=batch, status='pending')
+            .select_related('document__patient')
+            .defer('structured_json', 'document__original_text', 'document__text_preview')
+        }
+        document_ids = {row.document_id for row in rows.values()}
+        succeeded = failed = 0
+        pending_rows = []
+
+        def _record(row, chunk_data, usage, chunk_error):
+            ledger = {(row.chunk_index, row.content_hash): row}
+            pending_rows.append(_build_chunk_ledger_row(
+                row.document, ledger, row.chunk_index, row.content_hash,
+                chunk_data, usage, chunk_error,
+            ))
+            _log_chunk_api_usage(
+                row.document, usage, task_id, row.chunk_index + 1, None, start_time,
+                success=chunk_error is None,
+                error_message=None if chunk_error is None else str(chunk_error)[:500],
+            )
+            if len(pending_rows) >= 100:
+                _flush_chunk_ledger(pending_rows)
+
+        try:
+            for result in self.provider.results(batch.provider_batch_id):
+                row = rows.pop(result.custom_id, None)
+                if row is None:
+                    continue
+                chunk_data, usage, chunk_error = self._parse_result(result)
+                _record(row, chunk_data, usage, chunk_error)
+                if chunk_error is None:
+                    succeeded += 1
+                else:
+                    logger.warning(
+                        "[%s] Batch request %s failed: %s", task_id, result.custom_id, chunk_error
+                    )
+                    failed += 1
+
+            for row in rows.values():
+                _record(row, None, {}, AIExtractionError("No result returned for batch request"))
+                failed += 1
+            _flush_chunk_ledger(pending_rows)
+        except Exception as exc:
+            ExtractionBatch.objects.filter(pk=batch.pk).update(
+                status='submitted', error_message=str(exc)[:2000], updated_at=timezone.now()
+            )
+            raise
+
+        batch.status = 'ingested'
+        batch.succeeded_count = succeeded
+        batch.failed_count = failed
+        batch.ingested_at = timezone.now()
+        batch.error_message = ''
+        batch.save(update_fields=[
+            'status', 'succeeded_count', 'failed_count', 'ingested_at',
+            'error_message', 'updated_at',
+        ])
+        logger.info(
+            "Ingested extraction batch %s: %s succeeded, %s failed",
+            batch.pk, succeeded, failed,
+        )
+        return self._finalize_documents(document_ids)
+
+    def _parse_result(self, result: BatchResult) -> tuple:
+        """
+        Validate one batch result the way the synchronous extractor does.
+
+        Returns:
+            (chunk_data, usage, error) like tasks._extract_chunk; usage is
+            tagged as batch usage so it is costed at the batch rate.
+        """
+        usage = dict(result.usage, batch=True) if result.usage else {}
+        if result.error is not None:
+            return None, usage, AIExtractionError(f"Batch request failed: {result.error}")
+        try:
+            extraction = self.extractor._parse_and_validate(
+                result.response_text or '', EXTRACTION_CONTEXT, result.custom_id
+            )
+        except (AIExtractionError, ValidationError) as parse_error:
+            return None, usage, parse_error
+        return extraction.model_dump(), usage, None
+
+    @staticmethod
+    def _finalize_documents(document_ids) -> List[int]:
+        """
+        Resume documents that have no chunk left in an open batch.
+
+        continue_document_processing's resume path assembles the ledger
+        results and runs the FHIR pipeline as usual.
+        """
+        from apps.documents.models import Document, DocumentChunkResult
+        from apps.documents.tasks import continue_document_processing
+
+        waiting = set(
+            DocumentChunkResult.objects.filter(
+                document_id__in=document_ids,
+                status='pending',
+                batch__status__in=OPEN_BATCH_STATUSES,
+            ).values_list('document_id', flat=True)
+        )
+        ready = sorted(set(document_ids) - waiting)
+        if not ready:
+            return []
+
+        Document.objects.filter(id__in=ready).update(
+            status='processing',
+            processing_message='Batch extraction complete, finishing document...',
+            processing_started_at=timezone.now(),
+        )
+        for document_id in ready:
+            continue_document_processing.delay(document_id, '')
+        return ready
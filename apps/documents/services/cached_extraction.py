@@ -13,12 +13,18 @@ client.messages.create directly with:
   validation error back — no silent unbounded retry loops.
 
 Usage data (including cache_read_input_tokens) is captured per call in
-last_usage for cost tracking and cache-hit verification.
+last_usage for cost tracking and cache-hit verification. last_usage is
+thread-local so concurrent chunk workers each see their own call's usage.
+
+Calls go through the PromptCacheScheduler, which lets a single call warm a
+cold prefix before the others (from any worker) proceed, and records
+per-worker cache hit ratios for the monitor.
 """
 
 import json
 import logging
 import re
+import threading
 import time
 from typing import Any, Dict, Optional
 
@@ -40,10 +46,23 @@ from apps.documents.services.extraction_prompts import (
     get_canonical_system_prompt,
     get_context_instructions,
 )
+from apps.documents.services.prompt_cache_scheduler import get_prompt_cache_scheduler
 
 logger = logging.getLogger(__name__)
 
 
+def usage_stats(model: str, usage: Any, api_duration: float = 0.0) -> Dict[str, Any]:
+    """Flatten an SDK usage object into the last_usage dict shape."""
+    return {
+        'model': model,
+        'input_tokens': getattr(usage, 'input_tokens', 0) or 0,
+        'output_tokens': getattr(usage, 'output_tokens', 0) or 0,
+        'cache_read_input_tokens': getattr(usage, 'cache_read_input_tokens', 0) or 0,
+        'cache_creation_input_tokens': getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+        'api_duration_seconds': api_duration,
+    }
+
+
 class CachedAnthropicExtractor:
     """
     Structured medical extraction with Anthropic prompt caching.
@@ -80,8 +99,17 @@ class CachedAnthropicExtractor:
         )
         self.model = getattr(settings, 'AI_MODEL_PRIMARY', 'claude-sonnet-4-5-20250929')
         self.max_tokens = getattr(settings, 'AI_MAX_TOKENS_PER_REQUEST', 4096)
-        # Usage stats from the most recent API call (for cost tracking)
-        self.last_usage: Dict[str, Any] = {}
+        # Usage stats from the most recent API call on the current thread
+        self._local = threading.local()
+
+    @property
+    def last_usage(self) -> Dict[str, Any]:
+        """Usage stats from the most recent API call made by this thread."""
+        return getattr(self._local, 'last_usage', {})
+
+    @last_usage.setter
+    def last_usage(self, usage: Dict[str, Any]) -> None:
+        self._local.last_usage = usage
 
     def _build_system_blocks(self) -> list:
         """
@@ -113,21 +141,50 @@ class CachedAnthropicExtractor:
             f"Return structured data with complete source context for each item."
         )
 
-    def _call_api(self, system_blocks: list, messages: list, extraction_id: str) -> str:
+    def _request_params(self, system_blocks: list, messages: list,
+                        max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Keyword arguments for one messages.create call."""
+        return {
+            'model': self.model,
+            'max_tokens': max_tokens or self.max_tokens,
+            'temperature': 0.1,
+            'system': system_blocks,
+            'messages': messages,
+        }
+
+    def build_request_params(self, text: str, context: Optional[str] = None) -> Dict[str, Any]:
+        """
+        The exact request extract() would send for this text.
+
+        Used by batch extraction so batched chunks share the synchronous
+        path's cached prefix, prompt and model settings.
+        """
+        user_message = self._build_user_message(text, context)
+        return self._request_params(
+            self._build_system_blocks(), [{"role": "user", "content": user_message}]
+        )
+
+    def _call_api(self, system_blocks: list, messages: list, extraction_id: str,
+                  max_tokens: Optional[int] = None, keepalive: bool = False) -> str:
         """
         Make one API call and return the response text.
 
-        Maps SDK errors to domain exceptions and records usage stats.
+        Maps SDK errors to domain exceptions and records usage stats
+        (keepalive calls are tagged so they stay out of the hit ratios).
         """
+        scheduler = get_prompt_cache_scheduler()
         start_time = time.time()
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=0.1,
-                system=system_blocks,
-                messages=messages,
-            )
+            with scheduler.prefix_slot(self.model):
+                # Time the call itself, not the wait for a warm prefix
+                start_time = time.time()
+                response = self.client.messages.create(
+                    **self._request_params(system_blocks, messages, max_tokens)
+                )
+                self.last_usage = usage_stats(
+                    self.model, getattr(response, 'usage', None), time.time() - start_time
+                )
+                scheduler.record_call(self.last_usage, keepalive=keepalive)
         except anthropic.RateLimitError as e:
             raise AIServiceRateLimitError(
                 f"Claude rate limit exceeded: {str(e)}",
@@ -148,26 +205,14 @@ class CachedAnthropicExtractor:
                 details={'extraction_id': extraction_id, 'error_type': type(e).__name__},
             )
 
-        api_duration = time.time() - start_time
-        usage = getattr(response, 'usage', None)
-        cache_read = getattr(usage, 'cache_read_input_tokens', 0) or 0
-        cache_created = getattr(usage, 'cache_creation_input_tokens', 0) or 0
-        input_tokens = getattr(usage, 'input_tokens', 0) or 0
-        output_tokens = getattr(usage, 'output_tokens', 0) or 0
-
-        self.last_usage = {
-            'model': self.model,
-            'input_tokens': input_tokens,
-            'output_tokens': output_tokens,
-            'cache_read_input_tokens': cache_read,
-            'cache_creation_input_tokens': cache_created,
-            'api_duration_seconds': api_duration,
-        }
+        api_duration = self.last_usage['api_duration_seconds']
+        cache_read = self.last_usage['cache_read_input_tokens']
 
         logger.info(
             f"[{extraction_id}] Cached extraction API call: {api_duration:.2f}s, "
-            f"input={input_tokens}, output={output_tokens}, "
-            f"cache_read={cache_read}, cache_created={cache_created} "
+            f"input={self.last_usage['input_tokens']}, output={self.last_usage['output_tokens']}, "
+            f"cache_read={cache_read}, "
+            f"cache_created={self.last_usage['cache_creation_input_tokens']} "
             f"({'CACHE HIT' if cache_read > 0 else 'cache miss'})"
         )
 
@@ -175,6 +220,22 @@ class CachedAnthropicExtractor:
         del response
         return response_text
 
+    def refresh_prefix(self) -> Dict[str, Any]:
+        """
+        Read the cached system prefix with a one-token request.
+
+        A cache read restarts the prefix's TTL at a tenth of the input price,
+        far less than re-writing it for the next document's first chunk.
+        """
+        self._call_api(
+            self._build_system_blocks(),
+            [{"role": "user", "content": "Reply with OK."}],
+            "prompt-cache-keepalive",
+            max_tokens=1,
+            keepalive=True,
+        )
+        return self.last_usage
+
     def _parse_and_validate(self, response_text: str, context: Optional[str], extraction_id: str):
         """
         Extract JSON from response text and validate against the Pydantic model.
@@ -310,11 +371,14 @@ class CachedAnthropicExtractor:
 
 
 _extractor_instance: Optional[CachedAnthropicExtractor] = None
+_extractor_lock = threading.Lock()
 
 
 def get_cached_extractor() -> CachedAnthropicExtractor:
     """Module-level singleton so the client and prompt strings are built once."""
     global _extractor_instance
     if _extractor_instance is None:
-        _extractor_instance = CachedAnthropicExtractor()
+        with _extractor_lock:
+            if _extractor_instance is None:
+                _extractor_instance = CachedAnthropicExtractor()
     return _extractor_instance
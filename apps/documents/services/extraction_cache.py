@@ -0,0 +1,228 @@
+"""
+Content-addressed chunk extraction cache shared across documents.
+
+The DocumentChunkResult ledger only saves re-work within one document. This
+store is keyed by chunk content instead, so faxed duplicates, re-uploads and
+identical pages (medication lists, standard discharge instructions) are
+extracted once no matter which document or patient they arrive in.
+
+- Keys: HMAC-SHA256 (keyed with SECRET_KEY) over the normalized chunk text,
+  the extraction version, a fingerprint of the static system prompt and
+  schema, the model and the document context. Whitespace and page header
+  differences between copies don't matter; prompt, schema or model changes
+  miss automatically. Keys reveal nothing about short, guessable texts.
+- Payloads: encrypted at rest (ChunkExtractionCacheEntry.structured_json).
+- Eviction: entries expire AI_EXTRACTION_CACHE_TTL_DAYS after they were
+  stored; evict() (the evict_extraction_cache beat task) deletes expired
+  entries, then the least recently used ones beyond
+  AI_EXTRACTION_CACHE_MAX_ENTRIES.
+- Metrics: lookup hits and misses are counted in hourly buckets in the
+  default cache; stats() feeds the monitor dashboard.
+"""
+
+import hashlib
+import hmac
+import logging
+import re
+from datetime import timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+METRICS_KEY_PREFIX = 'extraction_cache'
+METRICS_TTL_SECONDS = 3600 * 24 * 8  # covers the monitor's 168h maximum window
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_chunk_text(text: str) -> str:
+    """Drop page headers and collapse whitespace so copies of a page hash alike."""
+    from apps.documents.models import PAGE_HEADER_RE
+
+    return _WHITESPACE_RE.sub(' ', PAGE_HEADER_RE.sub(' ', text)).strip()
+
+
+@lru_cache(maxsize=1)
+def _prompt_fingerprint() -> str:
+    """Short hash of the static system prompt and schema."""
+    from apps.documents.services.extraction_prompts import SCHEMA_PROMPT, get_canonical_system_prompt
+
+    payload = f"{get_canonical_system_prompt()}|{SCHEMA_PROMPT}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class ChunkExtractionCache:
+    """Global, encrypted store of chunk extractions keyed by chunk content."""
+
+    def __init__(self):
+        self.enabled = getattr(settings, 'AI_EXTRACTION_CACHE_ENABLED', True)
+        self.ttl = timedelta(days=getattr(settings, 'AI_EXTRACTION_CACHE_TTL_DAYS', 30))
+        self.max_entries = getattr(settings, 'AI_EXTRACTION_CACHE_MAX_ENTRIES', 50000)
+
+    def key_for(self, chunk_text: str, model: str, context: Optional[str]) -> str:
+        """Cache key for one chunk; no PHI can be recovered from it."""
+        from apps.documents.tasks import CHUNK_EXTRACTION_VERSION
+
+        message = "|".join([
+            normalize_chunk_text(chunk_text),
+            CHUNK_EXTRACTION_VERSION,
+            _prompt_fingerprint(),
+            model,
+            context or '',
+        ])
+        return hmac.new(
+            settings.SECRET_KEY.encode('utf-8'), message.encode('utf-8'), hashlib.sha256
+        ).hexdigest()
+
+    def lookup(self, chunk_texts: Dict[Any, str], model: str,
+               context: Optional[str]) -> Dict[Any, Dict[str, Any]]:
+        """
+        Look up several chunks in one query.
+
+        Args:
+            chunk_texts: Caller's chunk id (e.g. chunk index) -> chunk text.
+
+        Returns:
+            Chunk id -> cached structured_json, for hits only. Hits refresh
+            the entries' LRU position and hit counters.
+        """
+        from apps.documents.models import ChunkExtractionCacheEntry
+
+        if not self.enabled or not chunk_texts:
+            return {}
+
+        keys = {chunk_id: self.key_for(text, model, context) for chunk_id, text in chunk_texts.items()}
+        now = timezone.now()
+        try:
+            entries = {
+                entry.cache_key: entry
+                for entry in ChunkExtractionCacheEntry.objects.filter(
+                    cache_key__in=set(keys.values()), expires_at__gt=now,
+                )
+            }
+            if entries:
+                ChunkExtractionCacheEntry.objects.filter(cache_key__in=list(entries)).update(
+                    hit_count=F('hit_count') + 1, last_used_at=now,
+                )
+        except Exception as lookup_error:
+            logger.warning(f"Chunk extraction cache lookup failed: {lookup_error}")
+            return {}
+
+        hits = {
+            chunk_id: entries[key].structured_json
+            for chunk_id, key in keys.items()
+            if key in entries
+        }
+        self._record_lookups(hits=len(hits), misses=len(keys) - len(hits))
+        return hits
+
+    def store(self, chunk_text: str, model: str, context: Optional[str],
+              structured_json: Dict[str, Any], cost_usd=0) -> bool:
+        """Save one extraction; never fails the caller."""
+        from apps.documents.models import ChunkExtractionCacheEntry
+
+        if not self.enabled or not structured_json:
+            return False
+
+        now = timezone.now()
+        try:
+            ChunkExtractionCacheEntry.objects.bulk_create(
+                [ChunkExtractionCacheEntry(
+                    cache_key=self.key_for(chunk_text, model, context),
+                    model=model,
+                    structured_json=structured_json,
+                    cost_usd=cost_usd or Decimal('0'),
+                    last_used_at=now,
+                    expires_at=now + self.ttl,
+                )],
+                update_conflicts=True,
+                unique_fields=['cache_key'],
+                update_fields=['structured_json', 'cost_usd', 'last_used_at', 'expires_at', 'updated_at'],
+            )
+            return True
+        except Exception as store_error:
+            logger.warning(f"Failed to store chunk extraction in cache: {store_error}")
+            return False
+
+    def evict(self) -> Dict[str, int]:
+        """Delete expired entries, then the least recently used beyond max_entries."""
+        from apps.documents.models import ChunkExtractionCacheEntry
+
+        expired, _ = ChunkExtractionCacheEntry.objects.filter(expires_at__lte=timezone.now()).delete()
+
+        lru = 0
+        overflow = ChunkExtractionCacheEntry.objects.count() - self.max_entries
+        if overflow > 0:
+            stale_ids = list(
+                ChunkExtractionCacheEntry.objects.order_by('last_used_at')
+                .values_list('id', flat=True)[:overflow]
+            )
+            lru, _ = ChunkExtractionCacheEntry.objects.filter(id__in=stale_ids).delete()
+
+        if expired or lru:
+            logger.info(f"Chunk extraction cache eviction: {expired} expired, {lru} least recently used")
+        return {'expired': expired, 'lru': lru}
+
+    @staticmethod
+    def _metrics_key(kind: str, hour) -> str:
+        return f"{METRICS_KEY_PREFIX}:{kind}:{hour:%Y%m%d%H}"
+
+    def _record_lookups(self, hits: int, misses: int) -> None:
+        """Add to this hour's hit/miss counters; never fails the caller."""
+        hour = timezone.now()
+        for kind, count in (('hits', hits), ('misses', misses)):
+            if not count:
+                continue
+            key = self._metrics_key(kind, hour)
+            try:
+                cache.add(key, 0, METRICS_TTL_SECONDS)
+                cache.incr(key, count)
+            except Exception as metrics_error:
+                logger.debug(f"Could not record extraction cache {kind}: {metrics_error}")
+
+    def stats(self, hours: int = 24) -> Dict[str, Any]:
+        """Hit rate over the last `hours` plus current store size and savings."""
+        from apps.documents.models import ChunkExtractionCacheEntry
+
+        now = timezone.now()
+        keys = {
+            kind: [self._metrics_key(kind, now - timedelta(hours=offset)) for offset in range(hours)]
+            for kind in ('hits', 'misses')
+        }
+        counts = cache.get_many(keys['hits'] + keys['misses'])
+        hits = sum(counts.get(key, 0) for key in keys['hits'])
+        misses = sum(counts.get(key, 0) for key in keys['misses'])
+        lookups = hits + misses
+
+        store = ChunkExtractionCacheEntry.objects.filter(expires_at__gt=now).aggregate(
+            total_hits=Sum('hit_count'),
+            saved_usd=Sum(F('hit_count') * F('cost_usd')),
+        )
+        return {
+            'enabled': self.enabled,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round((hits / lookups) * 100, 1) if lookups else 0.0,
+            'entries': ChunkExtractionCacheEntry.objects.filter(expires_at__gt=now).count(),
+            'max_entries': self.max_entries,
+            'lifetime_hits': store['total_hits'] or 0,
+            'saved_usd': float(store['saved_usd'] or 0),
+        }
+
+
+_cache_instance: Optional[ChunkExtractionCache] = None
+
+
+def get_chunk_extraction_cache() -> ChunkExtractionCache:
+    """Module-level singleton."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = ChunkExtractionCache()
+    return _cache_instance
@@ -0,0 +1,271 @@
+"""
+Prompt-cache-aware scheduling of extraction calls across documents.
+
+CachedAnthropicExtractor marks the static system prefix as an ephemeral
+cache entry, but Anthropic only keeps it for ~5 minutes after its last use
+and only makes it readable once the first request that writes it has been
+answered. Two things therefore waste the cache:
+
+- Cold fan-out: when the prefix is cold, every chunk call already in flight
+  (other threads of the same document, other workers starting on
+  concurrently queued documents) pays the full cache write.
+- Sporadic uploads: with --concurrency=1 workers the prefix expires
+  between documents, so chunk 1 of nearly every document is a miss.
+
+PromptCacheScheduler coordinates every worker through the default cache
+(Redis in production):
+
+- prefix_slot(): while the prefix is cold, only one call at a time is let
+  through to warm it; the others wait (up to
+  AI_PROMPT_CACHE_WARMUP_WAIT_SECONDS) and then read the warm prefix.
+- keepalive_due(): the keep_prompt_cache_warm beat task refreshes a warm
+  prefix that would expire while documents are still queued or in OCR.
+- record_call(): hourly per-worker counters of calls, cache hits and
+  cache_read/cache_creation tokens; stats() feeds PipelineMetricsService.
+  Keepalive refreshes are counted separately (keepalive_calls) and left out
+  of the hit ratios, since every one of them is a cache read by design.
+"""
+
+import logging
+import socket
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'prompt_cache'
+METRICS_TTL_SECONDS = 3600 * 24 * 8  # covers the monitor's 168h maximum window
+COUNTERS = (
+    'calls', 'hits', 'input_tokens', 'cache_read_input_tokens', 'cache_creation_input_tokens',
+    'keepalive_calls',
+)
+WARMUP_POLL_SECONDS = 0.25
+REGISTRY_LOCK_SECONDS = 5
+# How long a worker trusts that it is already in the registry
+REGISTRY_RECHECK_SECONDS = 3600
+# Documents in these states will need the extraction prefix soon
+WAITING_STATUSES = ('pending', 'processing', 'ocr_pending')
+# Batch jobs still being worked through by the provider
+OPEN_BATCH_STATUSES = ('submitted', 'ingesting')
+
+
+def current_worker() -> str:
+    """Name of the worker host making the call."""
+    return socket.gethostname()
+
+
+class PromptCacheScheduler:
+    """Fleet-wide view of the cached extraction prefix, shared via the default cache."""
+
+    def __init__(self):
+        self.ttl_seconds = getattr(settings, 'AI_PROMPT_CACHE_TTL_SECONDS', 300)
+        self.warmup_wait_seconds = getattr(settings, 'AI_PROMPT_CACHE_WARMUP_WAIT_SECONDS', 15)
+        self.keepalive_enabled = getattr(settings, 'AI_PROMPT_CACHE_KEEPALIVE', True)
+
+    def _last_call_key(self, model: str) -> str:
+        return f"{KEY_PREFIX}:last_call:{model}"
+
+    def _warming_key(self, model: str) -> str:
+        return f"{KEY_PREFIX}:warming:{model}"
+
+    @staticmethod
+    def _counter_key(worker: str, counter: str, hour) -> str:
+        return f"{KEY_PREFIX}:{worker}:{counter}:{hour:%Y%m%d%H}"
+
+    def prefix_age(self, model: str) -> Optional[float]:
+        """Seconds since the prefix was last written or read, or None if unknown."""
+        last_call = cache.get(self._last_call_key(model))
+        return None if last_call is None else max(0.0, time.time() - last_call)
+
+    def is_warm(self, model: str) -> bool:
+        age = self.prefix_age(model)
+        return age is not None and age < self.ttl_seconds
+
+    @contextmanager
+    def prefix_slot(self, model: str) -> Iterator[None]:
+        """
+        Hold an extraction call until it can read a warm prefix.
+
+        Warm prefix: the call goes straight through. Cold prefix: the first
+        caller takes the warming lock and goes; later callers wait for it
+        to finish (or for warmup_wait_seconds) so they read its cache
+        entry instead of each writing their own. Never blocks on cache
+        errors.
+        """
+        warming_key = self._warming_key(model)
+        holds_lock = False
+        try:
+            if not self.is_warm(model):
+                holds_lock = cache.add(warming_key, current_worker(), self.warmup_wait_seconds)
+                if not holds_lock:
+                    deadline = time.monotonic() + self.warmup_wait_seconds
+                    while (
+                        time.monotonic() < deadline
+                        and not self.is_warm(model)
+                        and cache.get(warming_key) is not None
+                    ):
+                        time.sleep(WARMUP_POLL_SECONDS)
+        except Exception as cache_error:
+            logger.debug(f"Prompt cache scheduling unavailable: {cache_error}")
+
+        try:
+            yield
+        finally:
+            if holds_lock:
+                try:
+                    cache.delete(warming_key)
+                except Exception as cache_error:
+                    logger.debug(f"Could not release prompt cache warming lock: {cache_error}")
+
+    def record_call(self, usage: Dict[str, Any], worker: Optional[str] = None,
+                    keepalive: bool = False) -> None:
+        """
+        Count one API call's prompt cache usage; never fails the caller.
+
+        A keepalive call still marks the prefix warm but only bumps
+        keepalive_calls, so it doesn't inflate the hit ratios.
+        """
+        if not usage:
+            return
+        worker = worker or current_worker()
+        hour = timezone.now()
+        cache_read = usage.get('cache_read_input_tokens', 0) or 0
+        cache_creation = usage.get('cache_creation_input_tokens', 0) or 0
+        if keepalive:
+            values = {'keepalive_calls': 1}
+        else:
+            values = {
+                'calls': 1,
+                'hits': 1 if cache_read else 0,
+                'input_tokens': usage.get('input_tokens', 0) or 0,
+                'cache_read_input_tokens': cache_read,
+                'cache_creation_input_tokens': cache_creation,
+            }
+        try:
+            if cache_read or cache_creation:
+                cache.set(self._last_call_key(usage.get('model', '')), time.time(), self.ttl_seconds)
+            self._register_worker(worker)
+            for counter, count in values.items():
+                if not count:
+                    continue
+                key = self._counter_key(worker, counter, hour)
+                cache.add(key, 0, METRICS_TTL_SECONDS)
+                cache.incr(key, count)
+        except Exception as metrics_error:
+            logger.debug(f"Could not record prompt cache usage: {metrics_error}")
+
+    def _register_worker(self, worker: str) -> None:
+        """
+        Remember worker names so stats() can find their counters.
+
+        The registry list is read-modify-write, so updates take a cache.add
+        lock; otherwise two workers registering at once could each drop the
+        other. A short-lived per-worker marker keeps the lock off the hot path.
+        """
+        marker_key = f"{KEY_PREFIX}:registered:{worker}"
+        if cache.get(marker_key):
+            return
+        registry_key = f"{KEY_PREFIX}:workers"
+        lock_key = f"{registry_key}:lock"
+        deadline = time.monotonic() + REGISTRY_LOCK_SECONDS
+        while not cache.add(lock_key, worker, REGISTRY_LOCK_SECONDS):
+            if time.monotonic() >= deadline:
+                # Try again on the next call rather than racing the holder
+                return
+            time.sleep(WARMUP_POLL_SECONDS)
+        try:
+            workers = cache.get(registry_key) or []
+            cache.set(registry_key, sorted(set(workers) | {worker}), METRICS_TTL_SECONDS)
+        finally:
+            cache.delete(lock_key)
+        cache.set(marker_key, True, REGISTRY_RECHECK_SECONDS)
+
+    def keepalive_due(self, model: str) -> bool:
+        """
+        True when a warm prefix should be refreshed now.
+
+        Only while documents are waiting for extraction, and only once the
+        prefix is past half its TTL, so a refresh every AI_PROMPT_CACHE_TTL/2
+        or more often never lets it lapse. A cold prefix is left alone: the
+        next document's first call warms it anyway. Documents queued in an
+        open Message Batch sit in 'processing' for up to a day but never read
+        the prefix, so they don't count as waiting.
+        """
+        from apps.documents.models import Document, DocumentChunkResult
+
+        if not self.keepalive_enabled:
+            return False
+        age = self.prefix_age(model)
+        if age is None or age < self.ttl_seconds / 2 or age >= self.ttl_seconds:
+            return False
+        batched = DocumentChunkResult.objects.filter(
+            status='pending', batch__status__in=OPEN_BATCH_STATUSES
+        ).values('document_id')
+        return (
+            Document.objects.filter(status__in=WAITING_STATUSES)
+            .exclude(id__in=batched)
+            .exists()
+        )
+
+    def stats(self, hours: int = 24) -> Dict[str, Any]:
+        """Per-worker and overall prompt cache hit ratios over the last `hours`."""
+        workers: List[str] = cache.get(f"{KEY_PREFIX}:workers") or []
+        now = timezone.now()
+        hour_stamps = [now - timedelta(hours=offset) for offset in range(hours)]
+        keys = [
+            self._counter_key(worker, counter, hour)
+            for worker in workers for counter in COUNTERS for hour in hour_stamps
+        ]
+        counts = cache.get_many(keys) if keys else {}
+
+        rows = []
+        totals = dict.fromkeys(COUNTERS, 0)
+        for worker in workers:
+            row = {
+                counter: sum(counts.get(self._counter_key(worker, counter, hour), 0) for hour in hour_stamps)
+                for counter in COUNTERS
+            }
+            if not (row['calls'] or row['keepalive_calls']):
+                continue
+            for counter in COUNTERS:
+                totals[counter] += row[counter]
+            rows.append({'worker': worker, **row, **self._ratios(row)})
+
+        model = getattr(settings, 'AI_MODEL_PRIMARY', 'claude-sonnet-4-5-20250929')
+        age = self.prefix_age(model)
+        return {
+            'workers': sorted(rows, key=lambda row: row['worker']),
+            'totals': {**totals, **self._ratios(totals)},
+            'prefix_warm': age is not None and age < self.ttl_seconds,
+            'prefix_age_seconds': round(age, 1) if age is not None else None,
+        }
+
+    @staticmethod
+    def _ratios(row: Dict[str, int]) -> Dict[str, float]:
+        """Share of calls that hit the cache, and of prompt tokens read from it."""
+        prompt_tokens = (
+            row['input_tokens'] + row['cache_read_input_tokens'] + row['cache_creation_input_tokens']
+        )
+        return {
+            'call_hit_ratio': round((row['hits'] / row['calls']) * 100, 1) if row['calls'] else 0.0,
+            'token_hit_ratio': (
+                round((row['cache_read_input_tokens'] / prompt_tokens) * 100, 1) if prompt_tokens else 0.0
+            ),
+        }
+
+
+_scheduler_instance: Optional[PromptCacheScheduler] = None
+
+
+def get_prompt_cache_scheduler() -> PromptCacheScheduler:
+    """Module-level singleton."""
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        _scheduler_instance = PromptCacheScheduler()
+    return _scheduler_instance
@@ -8,8 +8,9 @@ HIPAA Compliance Note:
 - All PHI remains in memory during processing and is not persisted by this service
 """
 
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 import logging
 import time
 from statistics import mean
@@ -67,13 +68,16 @@ class S3StorageError(TextractError):
         super().__init__(message)
 
 
-@dataclass
+@dataclass(slots=True)
 class TextractBlock:
     """
     Represents a single block from Textract response.
     
     Textract returns blocks of type: PAGE, LINE, WORD, TABLE, CELL, etc.
     This dataclass normalizes the block structure for easier processing.
+    Results keep their blocks in a TextractBlockStore; TextractBlock objects
+    are built from it on access. Geometry is reduced to the BoundingBox and
+    relationships to one flat list of related block IDs.
     """
     block_type: str
     text: str = ""
@@ -108,6 +112,191 @@ class TextractBlock:
         )
 
 
+class TextractBlockStore:
+    """
+    Columnar storage for Textract blocks.
+    
+    Large OCR results hold hundreds of thousands of blocks. As one object
+    per block with its geometry and relationship dicts they dominated worker
+    memory. The store keeps type, page, confidence and bounding box in typed
+    arrays, related block IDs in one flat list addressed by per-block index
+    ranges, and indexes block positions by type and by (type, page).
+    
+    The store is a read-only sequence of TextractBlock; use the index-based
+    accessors to avoid building block objects in hot paths.
+    """
+    
+    _BBOX_FIELDS = ('Top', 'Left', 'Width', 'Height')
+    
+    def __init__(self):
+        self._type_names: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+        self._types = array('H')
+        self._pages = array('I')
+        self._confidence = array('d')
+        # Top, Left, Width, Height per block
+        self._bbox = array('d')
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._related_start = array('I')
+        self._related_ids: List[str] = []
+        self._by_type: Dict[int, array] = {}
+        self._by_type_page: Dict[tuple, array] = {}
+    
+    @classmethod
+    def from_raw_blocks(cls, raw_blocks: List[Dict[str, Any]]) -> 'TextractBlockStore':
+        """Build a store from raw Textract API blocks."""
+        store = cls()
+        for raw_block in raw_blocks:
+            store.append_raw(raw_block)
+        return store
+    
+    def append_raw(self, block: Dict[str, Any]) -> None:
+        """Append a raw Textract API block."""
+        bounding_box = block.get('Geometry', {}).get('BoundingBox', {})
+        related_ids: List[str] = []
+        for rel in block.get('Relationships', []):
+            related_ids.extend(rel.get('Ids', []))
+        
+        self._append(
+            block_type=block.get('BlockType', 'UNKNOWN'),
+            text=block.get('Text', ''),
+            confidence=block.get('Confidence', 0.0),
+            page=block.get('Page', 1),
+            bbox=[bounding_box.get(name, 0.0) for name in self._BBOX_FIELDS],
+            related_ids=related_ids,
+            block_id=block.get('Id', ''),
+        )
+    
+    def append(self, block: TextractBlock) -> None:
+        """Append a TextractBlock."""
+        bounding_box = block.geometry.get('BoundingBox', {}) if block.geometry else {}
+        related_ids: List[str] = []
+        for rel_ids in block.relationships:
+            if isinstance(rel_ids, list):
+                related_ids.extend(rel_ids)
+            elif rel_ids:
+                related_ids.append(rel_ids)
+        
+        self._append(
+            block_type=block.block_type,
+            text=block.text,
+            confidence=block.confidence,
+            page=block.page,
+            bbox=[bounding_box.get(name, 0.0) for name in self._BBOX_FIELDS],
+            related_ids=related_ids,
+            block_id=block.id,
+        )
+    
+    def _append(
+        self,
+        block_type: str,
+        text: str,
+        confidence: float,
+        page: int,
+        bbox: List[float],
+        related_ids: List[str],
+        block_id: str,
+    ) -> None:
+        type_code = self._type_codes.get(block_type)
+        if type_code is None:
+            type_code = len(self._type_names)
+            self._type_codes[block_type] = type_code
+            self._type_names.append(block_type)
+        
+        index = len(self._ids)
+        self._types.append(type_code)
+        self._pages.append(page)
+        self._confidence.append(confidence or 0.0)
+        self._bbox.extend(bbox)
+        self._ids.append(block_id or '')
+        self._texts.append(text or '')
+        self._related_start.append(len(self._related_ids))
+        self._related_ids.extend(related_ids)
+        
+        self._by_type.setdefault(type_code, array('I')).append(index)
+        self._by_type_page.setdefault((type_code, page), array('I')).append(index)
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def __bool__(self) -> bool:
+        return bool(self._ids)
+    
+    def __iter__(self):
+        for index in range(len(self._ids)):
+            yield self.block(index)
+    
+    def __getitem__(self, index: int) -> TextractBlock:
+        return self.block(range(len(self._ids))[index])
+    
+    def indices(self, block_type: str, page: Optional[int] = None) -> array:
+        """
+        Positions of blocks of one type, optionally on one page, in stream order.
+        """
+        type_code = self._type_codes.get(block_type)
+        if type_code is None:
+            return array('I')
+        if page is None:
+            return self._by_type.get(type_code, array('I'))
+        return self._by_type_page.get((type_code, page), array('I'))
+    
+    def count(self, block_type: str) -> int:
+        """Number of blocks of one type."""
+        return len(self.indices(block_type))
+    
+    def blocks_of_type(self, block_type: str, page: Optional[int] = None) -> List[TextractBlock]:
+        """TextractBlock objects of one type, optionally on one page."""
+        return [self.block(index) for index in self.indices(block_type, page)]
+    
+    def block_type(self, index: int) -> str:
+        return self._type_names[self._types[index]]
+    
+    def text(self, index: int) -> str:
+        return self._texts[index]
+    
+    def block_id(self, index: int) -> str:
+        return self._ids[index]
+    
+    def confidence(self, index: int) -> float:
+        return self._confidence[index]
+    
+    def related_ids(self, index: int) -> List[str]:
+        """IDs from all of the block's relationships, flattened."""
+        end = (
+            self._related_start[index + 1]
+            if index + 1 < len(self._related_start)
+            else len(self._related_ids)
+        )
+        return self._related_ids[self._related_start[index]:end]
+    
+    def sort_key(self, index: int) -> tuple:
+        """
+        Sort key based on Textract geometry (top-to-bottom, left-to-right).
+        
+        Returns:
+            Tuple suitable for sorting (top, left)
+        """
+        offset = index * 4
+        return (round(self._bbox[offset], 4), round(self._bbox[offset + 1], 4))
+    
+    def block(self, index: int) -> TextractBlock:
+        """Build the TextractBlock at a position."""
+        offset = index * 4
+        related_ids = self.related_ids(index)
+        return TextractBlock(
+            block_type=self.block_type(index),
+            text=self._texts[index],
+            confidence=self._confidence[index],
+            page=self._pages[index],
+            geometry={
+                'BoundingBox': dict(zip(self._BBOX_FIELDS, self._bbox[offset:offset + 4]))
+            },
+            relationships=[related_ids] if related_ids else [],
+            id=self._ids[index],
+        )
+
+
 @dataclass
 class TextractResult:
     """
@@ -118,20 +307,25 @@ class TextractResult:
     
     Attributes:
         pages: List of extracted text strings, one per page
-        blocks: List of TextractBlock objects for advanced processing
+        blocks: TextractBlockStore with the blocks for advanced processing
         confidence: Average confidence score across all text blocks (0-100)
         page_count: Total number of pages in the document
         extraction_time_ms: Time taken for Textract processing in milliseconds
         job_id: Async job ID (None for sync processing)
         document_metadata: Additional Textract document metadata
+        block_type_counts: Block counts by type, kept when blocks are discarded
+        blocks_discarded: True if the result was assembled page by page and
+                          ``pages`` already holds reading-order text
     """
     pages: List[str] = field(default_factory=list)
-    blocks: List[TextractBlock] = field(default_factory=list)
+    blocks: TextractBlockStore = field(default_factory=TextractBlockStore)
     confidence: float = 0.0
     page_count: int = 0
     extraction_time_ms: int = 0
     job_id: Optional[str] = None
     document_metadata: Dict[str, Any] = field(default_factory=dict)
+    block_type_counts: Dict[str, int] = field(default_factory=dict)
+    blocks_discarded: bool = False
     
     @classmethod
     def from_response(
@@ -156,28 +350,24 @@ class TextractResult:
         Returns:
             TextractResult with parsed pages, blocks, and metrics
         """
-        raw_blocks = response.get('Blocks', [])
-        
-        # Parse blocks into typed objects
-        blocks = [
-            TextractBlock.from_textract_block(block) 
-            for block in raw_blocks
-        ]
+        blocks = TextractBlockStore.from_raw_blocks(response.get('Blocks', []))
         
         # Determine page count from PAGE blocks
-        page_blocks = [b for b in blocks if b.block_type == 'PAGE']
-        page_count = len(page_blocks) if page_blocks else 1
+        page_count = blocks.count('PAGE') or 1
         
         # Extract text organized by page
         pages = cls._extract_pages_text(blocks, page_count)
         
         # Calculate average confidence from LINE and WORD blocks
-        text_blocks = [b for b in blocks if b.block_type in ('LINE', 'WORD')]
         confidence = 0.0
-        if text_blocks:
-            confidences = [b.confidence for b in text_blocks if b.confidence > 0]
-            if confidences:
-                confidence = round(mean(confidences), 2)
+        confidences = [
+            blocks.confidence(index)
+            for block_type in ('LINE', 'WORD')
+            for index in blocks.indices(block_type)
+            if blocks.confidence(index) > 0
+        ]
+        if confidences:
+            confidence = round(mean(confidences), 2)
         
         # Extract document metadata
         document_metadata = {
@@ -245,33 +435,27 @@ class TextractResult:
         )
     
     @staticmethod
-    def _extract_pages_text(blocks: List[TextractBlock], page_count: int) -> List[str]:
+    def _extract_pages_text(blocks: TextractBlockStore, page_count: int) -> List[str]:
         """
         Extract text from blocks organized by page number.
         
-        Groups LINE blocks by page and concatenates them with newlines.
+        Joins each page's LINE blocks with newlines, in response order.
         
         Args:
-            blocks: List of TextractBlock objects
+            blocks: TextractBlockStore with the parsed blocks
             page_count: Expected number of pages
             
         Returns:
             List of text strings, one per page
         """
-        # Initialize pages list
-        pages: List[str] = [''] * page_count
-        
-        # Group LINE blocks by page
-        for block in blocks:
-            if block.block_type == 'LINE' and block.text:
-                page_idx = block.page - 1  # Convert 1-indexed to 0-indexed
-                if 0 <= page_idx < page_count:
-                    if pages[page_idx]:
-                        pages[page_idx] += '\n' + block.text
-                    else:
-                        pages[page_idx] = block.text
-        
-        return pages
+        return [
+            '\n'.join(
+                blocks.text(index)
+                for index in blocks.indices('LINE', page_number)
+                if blocks.text(index)
+            )
+            for page_number in range(1, page_count + 1)
+        ]
     
     def get_full_text(self, include_page_separators: bool = True) -> str:
         """
@@ -296,6 +480,19 @@ class TextractResult:
         else:
             return '\n\n'.join(page for page in self.pages if page.strip())
     
+    @property
+    def block_count(self) -> int:
+        """Total number of blocks, including blocks already discarded."""
+        if self.blocks_discarded:
+            return sum(self.block_type_counts.values())
+        return len(self.blocks)
+    
+    def _count_blocks(self, block_type: str) -> int:
+        """Count blocks of one type, including blocks already discarded."""
+        if self.blocks_discarded:
+            return self.block_type_counts.get(block_type, 0)
+        return self.blocks.count(block_type)
+    
     def get_lines_by_page(self, page_number: int) -> List[TextractBlock]:
         """
         Get all LINE blocks for a specific page.
@@ -306,10 +503,7 @@ class TextractResult:
         Returns:
             List of LINE TextractBlock objects for the page
         """
-        return [
-            block for block in self.blocks 
-            if block.block_type == 'LINE' and block.page == page_number
-        ]
+        return self.blocks.blocks_of_type('LINE', page_number)
     
     def get_tables(self) -> List[TextractBlock]:
         """
@@ -318,7 +512,7 @@ class TextractResult:
         Returns:
             List of TABLE TextractBlock objects
         """
-        return [block for block in self.blocks if block.block_type == 'TABLE']
+        return self.blocks.blocks_of_type('TABLE')
     
     def get_forms(self) -> List[TextractBlock]:
         """
@@ -327,7 +521,7 @@ class TextractResult:
         Returns:
             List of KEY_VALUE_SET TextractBlock objects
         """
-        return [block for block in self.blocks if block.block_type == 'KEY_VALUE_SET']
+        return self.blocks.blocks_of_type('KEY_VALUE_SET')
     
     def to_audit_dict(self) -> Dict[str, Any]:
         """
@@ -343,20 +537,163 @@ class TextractResult:
             'confidence': self.confidence,
             'extraction_time_ms': self.extraction_time_ms,
             'job_id': self.job_id,
-            'block_count': len(self.blocks),
-            'table_count': len(self.get_tables()),
-            'form_field_count': len(self.get_forms()),
+            'block_count': self.block_count,
+            'table_count': self._count_blocks('TABLE'),
+            'form_field_count': self._count_blocks('KEY_VALUE_SET'),
         }
     
     def __repr__(self) -> str:
         return (
             f"TextractResult(pages={self.page_count}, "
             f"confidence={self.confidence}%, "
-            f"blocks={len(self.blocks)}, "
+            f"blocks={self.block_count}, "
             f"job_id={self.job_id})"
         )
 
 
+class TextractPageAssembler:
+    """
+    Build a TextractResult from async result pages as they arrive.
+    
+    GetDocumentTextDetection / GetDocumentAnalysis return blocks in document
+    page order, split into result pages of up to 1,000 blocks that do not line
+    up with document pages. Only blocks of pages that are not finished yet are
+    held. When the PAGE block of a later page arrives, earlier pages are
+    rendered to text and their blocks are dropped. Peak memory is about one
+    page of blocks instead of the whole document.
+    
+    The finished result holds reading-order page text and block counts, but
+    no blocks (``blocks_discarded`` is True), so get_tables()/get_forms() are
+    empty for it.
+    
+    Args:
+        build_page_text: Renders one page of a TextractBlockStore to text,
+                         e.g. TextractService._build_page_text
+    """
+    
+    def __init__(self, build_page_text: Callable[[TextractBlockStore, int], str]):
+        self._build_page_text = build_page_text
+        self._pending: Dict[int, TextractBlockStore] = {}
+        self._page_texts: Dict[int, str] = {}
+        self._page_block_count = 0
+        self._confidence_total = 0.0
+        self._confidence_count = 0
+        self._document_metadata: Optional[Dict[str, Any]] = None
+        self.block_type_counts: Dict[str, int] = {}
+        self.response_count = 0
+    
+    def add_response(self, response: Dict[str, Any]) -> None:
+        """
+        Consume one GetDocument* response.
+        
+        The response can be released by the caller once this returns.
+        """
+        self.response_count += 1
+        if self._document_metadata is None:
+            # Preserve metadata from first response
+            self._document_metadata = {
+                'document_type': response.get('DocumentMetadata', {}),
+                'analyze_document_model_version': response.get(
+                    'AnalyzeDocumentModelVersion', ''
+                ),
+                'detect_document_text_model_version': response.get(
+                    'DetectDocumentTextModelVersion', ''
+                ),
+                'status_message': response.get('StatusMessage', ''),
+            }
+        
+        for raw_block in response.get('Blocks', []):
+            page = raw_block.get('Page', 1)
+            self._track(
+                raw_block.get('BlockType', 'UNKNOWN'),
+                page,
+                raw_block.get('Confidence', 0.0),
+            )
+            self._page_store(page).append_raw(raw_block)
+    
+    def add_block(self, block: TextractBlock) -> None:
+        """Add one block, finishing earlier pages when a new page starts."""
+        self._track(block.block_type, block.page, block.confidence)
+        self._page_store(block.page).append(block)
+    
+    def _track(self, block_type: str, page: int, confidence: float) -> None:
+        self.block_type_counts[block_type] = self.block_type_counts.get(block_type, 0) + 1
+        
+        if block_type in ('LINE', 'WORD') and confidence > 0:
+            self._confidence_total += confidence
+            self._confidence_count += 1
+        
+        if block_type == 'PAGE':
+            self._page_block_count += 1
+            self._finalize_pages_before(page)
+    
+    def _page_store(self, page: int) -> TextractBlockStore:
+        store = self._pending.get(page)
+        if store is None:
+            store = self._pending[page] = TextractBlockStore()
+        return store
+    
+    def _finalize_pages_before(self, page_number: int) -> None:
+        for pending_page in sorted(self._pending):
+            if pending_page < page_number:
+                self._finalize_page(pending_page)
+    
+    def _finalize_page(self, page_number: int) -> None:
+        """
+        Render a page's pending blocks to text and drop them.
+        
+        Blocks arriving after their page was finished are rendered separately
+        and appended, so out-of-order output loses ordering, not text.
+        """
+        page_text = self._build_page_text(self._pending.pop(page_number), page_number)
+        if not page_text:
+            return
+        
+        existing = self._page_texts.get(page_number)
+        self._page_texts[page_number] = (
+            f"{existing}\n{page_text}" if existing else page_text
+        )
+    
+    def finish(
+        self,
+        extraction_time_ms: int = 0,
+        job_id: Optional[str] = None
+    ) -> TextractResult:
+        """
+        Finish remaining pages and return the assembled result.
+        
+        Args:
+            extraction_time_ms: Total processing time in milliseconds
+            job_id: Async job ID
+            
+        Returns:
+            TextractResult with page text and metrics, without blocks
+        """
+        for page_number in sorted(self._pending):
+            self._finalize_page(page_number)
+        
+        page_count = self._page_block_count or 1
+        pages = [
+            self._page_texts.get(page_number, '')
+            for page_number in range(1, page_count + 1)
+        ]
+        
+        confidence = 0.0
+        if self._confidence_count:
+            confidence = round(self._confidence_total / self._confidence_count, 2)
+        
+        return TextractResult(
+            pages=pages,
+            confidence=confidence,
+            page_count=page_count,
+            extraction_time_ms=extraction_time_ms,
+            job_id=job_id,
+            document_metadata=self._document_metadata or {},
+            block_type_counts=dict(self.block_type_counts),
+            blocks_discarded=True,
+        )
+
+
 # =============================================================================
 # S3 TEMPORARY STORAGE SERVICE
 # =============================================================================
@@ -778,6 +1115,13 @@ class TextractService:
             settings, 'TEXTRACT_FEATURE_TYPES', ['TABLES', 'FORMS']
         )
 
+        # SNS completion notifications for async jobs (both must be set)
+        topic_arn = getattr(settings, 'TEXTRACT_SNS_TOPIC_ARN', None)
+        role_arn = getattr(settings, 'TEXTRACT_SNS_ROLE_ARN', None)
+        self.notification_channel = (
+            {'SNSTopicArn': topic_arn, 'RoleArn': role_arn} if topic_arn and role_arn else None
+        )
+
         # Initialize boto3 client lazily
         self._textract_client = None
 
@@ -1027,50 +1371,61 @@ class TextractService:
             return self.detect_document_text_sync(document_bytes)
         return self.analyze_document_sync(document_bytes)
 
-    def extract_text_from_result(self, result: TextractResult) -> str:
+    def extract_text_from_result(self, result: TextractResult, page_number_offset: int = 0) -> str:
         """
         Convert a TextractResult into plain text with OCR page separators.
         
         This preserves reading order by sorting LINE blocks by geometry
         and falls back to WORD blocks when LINE blocks are unavailable.
+        Results assembled by TextractPageAssembler already hold reading-order
+        page text and are formatted directly.
         
         Args:
             result: Parsed TextractResult instance
+            page_number_offset: Added to page numbers in the separators, for
+                                results of pages split out of a larger PDF
             
         Returns:
             Combined text with page separators in the format:
             '--- Page N (OCR) ---'
         """
-        if not result or not result.blocks:
+        if not result:
             return ''
         
-        page_count = result.page_count or 1
-        formatted_pages: List[str] = []
+        if result.blocks_discarded:
+            page_texts = enumerate(result.pages, 1)
+        elif result.blocks:
+            page_texts = (
+                (page_number, self._build_page_text(result.blocks, page_number))
+                for page_number in range(1, (result.page_count or 1) + 1)
+            )
+        else:
+            return ''
         
-        for page_number in range(1, page_count + 1):
-            page_text = self._build_page_text(result, page_number)
+        formatted_pages: List[str] = []
+        for page_number, page_text in page_texts:
             if page_text:
                 formatted_pages.append(
-                    f"--- Page {page_number} (OCR) ---\n{page_text}"
+                    f"--- Page {page_number + page_number_offset} (OCR) ---\n{page_text}"
                 )
         
         return '\n\n'.join(formatted_pages)
 
-    def _build_page_text(self, result: TextractResult, page_number: int) -> str:
+    def _build_page_text(self, blocks: TextractBlockStore, page_number: int) -> str:
         """
         Build text for a single page from Textract blocks.
         
         Args:
-            result: TextractResult containing parsed blocks
+            blocks: TextractBlockStore containing the page's blocks
             page_number: 1-indexed page number to extract
             
         Returns:
             Page text string (empty if no content found)
         """
-        line_blocks = self._get_sorted_blocks(result, page_number, 'LINE')
-        word_blocks = self._get_unreferenced_word_blocks(result, page_number, line_blocks)
+        line_indices = self._get_sorted_blocks(blocks, page_number, 'LINE')
+        word_indices = self._get_unreferenced_word_blocks(blocks, page_number, line_indices)
         
-        fragments = self._build_text_fragments(line_blocks, word_blocks)
+        fragments = self._build_text_fragments(blocks, line_indices + word_indices)
         if not fragments:
             return ''
         
@@ -1078,55 +1433,39 @@ class TextractService:
 
     def _get_unreferenced_word_blocks(
         self,
-        result: TextractResult,
+        blocks: TextractBlockStore,
         page_number: int,
-        line_blocks: List[TextractBlock]
-    ) -> List[TextractBlock]:
+        line_indices: List[int]
+    ) -> List[int]:
         """
-        Return WORD blocks not already referenced by LINE blocks.
+        Return positions of WORD blocks not already referenced by LINE blocks.
         
         This captures table cells that Textract may not include in LINE blocks.
         """
-        line_word_ids = self._collect_word_ids_from_lines(line_blocks)
+        line_word_ids = set()
+        for index in line_indices:
+            line_word_ids.update(blocks.related_ids(index))
         
         return [
-            block for block in result.blocks
+            index for index in blocks.indices('WORD', page_number)
             if (
-                block.block_type == 'WORD'
-                and block.page == page_number
-                and block.text
-                and (not block.id or block.id not in line_word_ids)
+                blocks.text(index)
+                and (not blocks.block_id(index) or blocks.block_id(index) not in line_word_ids)
             )
         ]
 
     @staticmethod
-    def _collect_word_ids_from_lines(line_blocks: List[TextractBlock]) -> set:
-        """
-        Collect WORD block IDs referenced by LINE blocks.
-        """
-        word_ids = set()
-        for line in line_blocks:
-            for rel_ids in line.relationships:
-                if isinstance(rel_ids, list):
-                    word_ids.update(rel_ids)
-                elif rel_ids:
-                    word_ids.add(rel_ids)
-        return word_ids
-
-    def _build_text_fragments(
-        self,
-        line_blocks: List[TextractBlock],
-        word_blocks: List[TextractBlock]
-    ) -> List[tuple]:
+    def _build_text_fragments(blocks: TextractBlockStore, indices: List[int]) -> List[tuple]:
         """
-        Build (text, top, left) fragments from LINE and WORD blocks.
+        Build (text, top, left) fragments from the given block positions.
         """
         fragments: List[tuple] = []
         
-        for block in line_blocks + word_blocks:
-            if block.text:
-                top, left = self._geometry_sort_key(block)
-                fragments.append((block.text, top, left))
+        for index in indices:
+            text = blocks.text(index)
+            if text:
+                top, left = blocks.sort_key(index)
+                fragments.append((text, top, left))
         
         return sorted(fragments, key=lambda fragment: (fragment[1], fragment[2]))
 
@@ -1161,48 +1500,27 @@ class TextractService:
         
         return '\n'.join(line for line in lines if line)
 
+    @staticmethod
     def _get_sorted_blocks(
-        self,
-        result: TextractResult,
+        blocks: TextractBlockStore,
         page_number: int,
         block_type: str
-    ) -> List[TextractBlock]:
+    ) -> List[int]:
         """
-        Get blocks of a given type for a page, sorted by geometry.
+        Get positions of a page's blocks of one type, sorted by geometry.
         
         Args:
-            result: TextractResult containing parsed blocks
+            blocks: TextractBlockStore containing parsed blocks
             page_number: 1-indexed page number to extract
             block_type: Textract block type to filter (e.g., 'LINE', 'WORD')
             
         Returns:
-            Sorted list of TextractBlock objects
+            Sorted list of block positions in the store
         """
-        blocks = [
-            block for block in result.blocks
-            if block.block_type == block_type and block.page == page_number
-        ]
-        
         return sorted(
-            blocks,
-            key=self._geometry_sort_key
+            blocks.indices(block_type, page_number),
+            key=blocks.sort_key
         )
-
-    @staticmethod
-    def _geometry_sort_key(block: TextractBlock) -> tuple:
-        """
-        Sort key for blocks based on Textract geometry (top-to-bottom, left-to-right).
-        
-        Args:
-            block: TextractBlock with geometry data
-            
-        Returns:
-            Tuple suitable for sorting (top, left)
-        """
-        bounding_box = block.geometry.get('BoundingBox', {}) if block.geometry else {}
-        top = round(bounding_box.get('Top', 0.0), 4)
-        left = round(bounding_box.get('Left', 0.0), 4)
-        return (top, left)
     
     def is_sync_eligible(self, document_bytes: bytes) -> bool:
         """
@@ -1229,7 +1547,21 @@ class TextractService:
     # ASYNC TEXTRACT METHODS (for documents >= 5MB)
     # =========================================================================
 
-    def start_async_analysis(self, s3_bucket: str, s3_key: str) -> str:
+    @property
+    def notifications_enabled(self) -> bool:
+        """True if async jobs publish completion to SNS (TEXTRACT_SNS_*)."""
+        return self.notification_channel is not None
+
+    def _async_job_options(self, job_tag: Optional[str]) -> Dict[str, Any]:
+        """JobTag and NotificationChannel parameters shared by the Start* APIs."""
+        options: Dict[str, Any] = {}
+        if job_tag:
+            options['JobTag'] = job_tag
+        if self.notification_channel:
+            options['NotificationChannel'] = self.notification_channel
+        return options
+
+    def start_async_analysis(self, s3_bucket: str, s3_key: str, job_tag: str = None) -> str:
         """
         Start an asynchronous Textract document analysis job.
         
@@ -1239,6 +1571,8 @@ class TextractService:
         Args:
             s3_bucket: S3 bucket containing the document
             s3_key: S3 key (path) of the document
+            job_tag: Echoed back in the SNS completion notification
+                     (we use the Document ID)
             
         Returns:
             Job ID string to use with get_async_result()
@@ -1267,7 +1601,8 @@ class TextractService:
                         'Name': s3_key
                     }
                 },
-                FeatureTypes=self.feature_types
+                FeatureTypes=self.feature_types,
+                **self._async_job_options(job_tag)
             )
             
             job_id = response.get('JobId')
@@ -1328,7 +1663,7 @@ class TextractService:
             logger.error("Textract boto3 error starting async job: %s", str(e))
             raise TextractAPIError(f"AWS SDK error: {str(e)}") from e
 
-    def start_async_text_detection(self, s3_bucket: str, s3_key: str) -> str:
+    def start_async_text_detection(self, s3_bucket: str, s3_key: str, job_tag: str = None) -> str:
         """
         Start asynchronous DetectDocumentText (text-only) for an S3 object.
 
@@ -1348,6 +1683,7 @@ class TextractService:
                         'Name': s3_key,
                     }
                 },
+                **self._async_job_options(job_tag),
             )
             job_id = response.get('JobId')
             if not job_id:
@@ -1394,7 +1730,7 @@ class TextractService:
             logger.error("Textract boto3 error starting async text job: %s", str(e))
             raise TextractAPIError(f"AWS SDK error: {str(e)}") from e
 
-    def start_async_job(self, s3_bucket: str, s3_key: str) -> Dict[str, str]:
+    def start_async_job(self, s3_bucket: str, s3_key: str, job_tag: str = None) -> Dict[str, str]:
         """
         Start async Textract using mode from settings (detect vs analyze).
 
@@ -1402,9 +1738,9 @@ class TextractService:
             Dict with ``job_id`` and ``job_type`` (``detect`` or ``analyze``) for polling.
         """
         if self.mode == self.JOB_TYPE_DETECT:
-            job_id = self.start_async_text_detection(s3_bucket, s3_key)
+            job_id = self.start_async_text_detection(s3_bucket, s3_key, job_tag=job_tag)
             return {'job_id': job_id, 'job_type': self.JOB_TYPE_DETECT}
-        job_id = self.start_async_analysis(s3_bucket, s3_key)
+        job_id = self.start_async_analysis(s3_bucket, s3_key, job_tag=job_tag)
         return {'job_id': job_id, 'job_type': self.JOB_TYPE_ANALYZE}
 
     def _get_async_results_page(
@@ -1577,7 +1913,9 @@ class TextractService:
         """
         Fetch all paginated results from a completed async Textract job.
 
-        Handles NextToken pagination to retrieve all blocks from large documents.
+        Handles NextToken pagination. Each result page is handed to a
+        TextractPageAssembler and released, so large documents are never
+        held in memory as a whole.
 
         Args:
             job_id: The completed job ID
@@ -1586,32 +1924,29 @@ class TextractService:
                 GetDocumentAnalysis)
 
         Returns:
-            TextractResult with combined data from all result pages
+            TextractResult with page text and metrics from all result pages
 
         Raises:
             TextractAPIError: If retrieval fails
         """
-        responses = []
+        assembler = TextractPageAssembler(self._build_page_text)
         next_token = None
-        page_count = 0
 
         logger.info("Fetching paginated results for job: %s (job_type=%s)", job_id, job_type)
 
         try:
             while True:
-                page_count += 1
-
                 response = self._get_async_results_page(
                     job_id,
                     job_type,
                     next_token=next_token,
                 )
-                responses.append(response)
+                assembler.add_response(response)
 
                 block_count = len(response.get('Blocks', []))
                 logger.debug(
                     "Retrieved result page %d: job_id=%s, blocks=%d",
-                    page_count,
+                    assembler.response_count,
                     job_id,
                     block_count,
                 )
@@ -1624,9 +1959,7 @@ class TextractService:
             # Calculate total extraction time
             extraction_time_ms = int((time.time() - start_time) * 1000)
 
-            # Parse combined responses into TextractResult
-            result = TextractResult.from_paginated_responses(
-                responses,
+            result = assembler.finish(
                 extraction_time_ms=extraction_time_ms,
                 job_id=job_id,
             )
@@ -1637,8 +1970,8 @@ class TextractService:
                 job_id,
                 result.page_count,
                 result.confidence,
-                len(result.blocks),
-                page_count,
+                result.block_count,
+                assembler.response_count,
                 extraction_time_ms
             )
             
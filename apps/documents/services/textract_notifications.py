@@ -0,0 +1,186 @@
+"""
+Textract async job completion notifications (SNS -> SQS).
+
+When TEXTRACT_SNS_TOPIC_ARN / TEXTRACT_SNS_ROLE_ARN are set, Textract
+publishes a message to SNS as soon as an async job finishes. The topic fans
+into the SQS queue at TEXTRACT_SQS_QUEUE_URL, which the
+``textract_notification_listener`` management command long-polls. Each
+completion enqueues ``handle_textract_completion`` right away, so a scanned
+document moves on to AI extraction without waiting for the next poll.
+poll_textract_job keeps running as a slower fallback for missed messages.
+
+LocalNotificationQueue stands in for SQS in tests and local development.
+
+HIPAA Note:
+- Notifications carry job IDs, status and S3 object names only - no PHI
+"""
+
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TextractCompletion:
+    """One Textract job completion notification."""
+    job_id: str
+    status: str
+    document_id: Optional[int]
+    s3_key: Optional[str] = None
+    api: Optional[str] = None
+
+
+def parse_completion_message(body: str) -> Optional[TextractCompletion]:
+    """
+    Parse an SQS message body into a TextractCompletion.
+
+    Accepts both the SNS envelope (``{"Type": "Notification", "Message": ...}``)
+    and raw message delivery. Returns None for anything that is not a
+    Textract completion, so unrelated messages can be dropped.
+    """
+    try:
+        payload = json.loads(body)
+        if isinstance(payload, dict) and payload.get('Type') == 'Notification':
+            payload = json.loads(payload.get('Message') or '{}')
+    except (TypeError, ValueError):
+        return None
+
+    if not isinstance(payload, dict) or not payload.get('JobId') or not payload.get('Status'):
+        return None
+
+    try:
+        document_id = int(payload.get('JobTag'))
+    except (TypeError, ValueError):
+        document_id = None
+
+    return TextractCompletion(
+        job_id=payload['JobId'],
+        status=payload['Status'],
+        document_id=document_id,
+        s3_key=(payload.get('DocumentLocation') or {}).get('S3ObjectName'),
+        api=payload.get('API'),
+    )
+
+
+class SQSNotificationQueue:
+    """SQS queue subscribed to the Textract SNS topic."""
+
+    def __init__(self, queue_url: str = None, region: str = None):
+        self.queue_url = queue_url or getattr(settings, 'TEXTRACT_SQS_QUEUE_URL', None)
+        self.region = region or getattr(settings, 'AWS_DEFAULT_REGION', 'us-east-1')
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = boto3.client('sqs', region_name=self.region)
+        return self._client
+
+    def receive(self, max_messages: int = 10, wait_seconds: int = 20) -> List[Tuple[str, str]]:
+        """Long-poll for messages; returns (receipt_handle, body) pairs."""
+        response = self.client.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=max_messages,
+            WaitTimeSeconds=wait_seconds,
+        )
+        return [
+            (message['ReceiptHandle'], message['Body'])
+            for message in response.get('Messages', [])
+        ]
+
+    def delete(self, receipt_handle: str) -> None:
+        self.client.delete_message(QueueUrl=self.queue_url, ReceiptHandle=receipt_handle)
+
+
+class LocalNotificationQueue:
+    """In-memory stand-in for SQSNotificationQueue (tests, local development)."""
+
+    def __init__(self):
+        self._messages = deque()
+        self._in_flight = {}
+        self._next_receipt = 0
+
+    def publish(self, body: str) -> None:
+        self._messages.append(body)
+
+    def receive(self, max_messages: int = 10, wait_seconds: int = 0) -> List[Tuple[str, str]]:
+        received = []
+        while self._messages and len(received) < max_messages:
+            self._next_receipt += 1
+            receipt = str(self._next_receipt)
+            body = self._messages.popleft()
+            self._in_flight[receipt] = body
+            received.append((receipt, body))
+        return received
+
+    def delete(self, receipt_handle: str) -> None:
+        self._in_flight.pop(receipt_handle, None)
+
+    def release_unacknowledged(self) -> None:
+        """Make undeleted messages visible again, like an SQS visibility timeout."""
+        self._messages.extend(self._in_flight.values())
+        self._in_flight.clear()
+
+
+class TextractNotificationListener:
+    """
+    Drain a notification queue and hand each completion to a dispatcher.
+
+    A message is deleted once dispatched, or once it is known not to be a
+    Textract completion. If dispatching fails the message stays on the
+    queue and is redelivered.
+    """
+
+    def __init__(self, queue, dispatch: Callable[[TextractCompletion], None] = None):
+        self.queue = queue
+        self.dispatch = dispatch or self._enqueue_completion
+
+    @staticmethod
+    def _enqueue_completion(completion: TextractCompletion) -> None:
+        from apps.documents.tasks import handle_textract_completion
+        handle_textract_completion.delay(
+            completion.document_id, completion.job_id, completion.status, s3_key=completion.s3_key
+        )
+
+    def poll_once(self, wait_seconds: int = 20) -> int:
+        """Receive one batch; returns the number of completions dispatched."""
+        dispatched = 0
+        for receipt_handle, body in self.queue.receive(wait_seconds=wait_seconds):
+            completion = parse_completion_message(body)
+            if completion is None or completion.document_id is None:
+                logger.warning("Dropping unrecognized Textract notification")
+                self.queue.delete(receipt_handle)
+                continue
+            try:
+                self.dispatch(completion)
+            except Exception as exc:
+                logger.error(
+                    "Failed to dispatch Textract completion for job %s: %s",
+                    completion.job_id, exc
+                )
+                continue
+            self.queue.delete(receipt_handle)
+            dispatched += 1
+            logger.info(
+                "Textract completion dispatched: job_id=%s, status=%s, document_id=%s",
+                completion.job_id, completion.status, completion.document_id
+            )
+        return dispatched
+
+    def run(self, wait_seconds: int = 20, should_stop: Callable[[], bool] = lambda: False) -> None:
+        """Poll until should_stop() returns True."""
+        while not should_stop():
+            try:
+                self.poll_once(wait_seconds=wait_seconds)
+            except (ClientError, BotoCoreError) as exc:
+                logger.warning("Textract notification queue unavailable: %s", exc)
+                time.sleep(wait_seconds)
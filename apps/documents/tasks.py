@@ -172,7 +172,7 @@ from .exceptions import (
     categorize_exception,
     get_recovery_strategy
 )
-from .performance import performance_monitor, document_chunker
+from .performance import performance_monitor, document_chunker, NearDuplicateIndex
 
 logger = logging.getLogger(__name__)
 
@@ -774,8 +774,7 @@ def process_document_async(self, document_id: int):
             }
         
         # Store extracted text in document
-        document.original_text = extraction_result['text']
-        document.save()
+        document.save_extracted_text(extraction_result['text'])
         
         # PORTHOLE: Capture PDF text extraction
         capture_pdf_text(
@@ -1843,6 +1842,7 @@ def start_textract_async_job(self, document_id: int):
         async_job = textract_service.start_async_job(
             s3_bucket=s3_storage.bucket,
             s3_key=s3_key,
+            job_tag=str(document_id),
         )
         job_id = async_job['job_id']
         textract_job_type = async_job['job_type']
@@ -1907,6 +1907,7 @@ def start_textract_async_job(self, document_id: int):
             }
     
     # Step 4: Store job tracking info in Document.structured_data
+    started_at = timezone.now().isoformat()
     try:
         # Preserve existing structured_data if any
         existing_data = document.structured_data or {}
@@ -1915,7 +1916,7 @@ def start_textract_async_job(self, document_id: int):
             'job_type': textract_job_type,
             's3_key': s3_key,
             's3_bucket': s3_storage.bucket,
-            'started_at': timezone.now().isoformat(),
+            'started_at': started_at,
             'task_id': task_id,
             'file_size_bytes': file_size,
         }
@@ -1934,11 +1935,17 @@ def start_textract_async_job(self, document_id: int):
     
     # Step 5: Schedule poll task with initial delay
     poll_interval = getattr(settings, 'TEXTRACT_ASYNC_POLL_INTERVAL', 10)
+    if textract_service.notifications_enabled:
+        # Completion arrives through SNS/SQS (handle_textract_completion);
+        # polling only catches notifications that never arrive
+        poll_interval = max(
+            poll_interval, getattr(settings, 'TEXTRACT_NOTIFICATION_FALLBACK_POLL_DELAY', 120)
+        )
     
     try:
         poll_textract_job.apply_async(
             args=[document_id, job_id, s3_key],
-            kwargs={'attempt': 0},
+            kwargs={'attempt': 0, 'started_at': started_at, 'job_type': textract_job_type},
             countdown=poll_interval
         )
         
@@ -1985,184 +1992,100 @@ def start_textract_async_job(self, document_id: int):
         'task_id': task_id,
         'processing_time_seconds': round(processing_time, 2),
         'poll_task_scheduled': True,
-        'poll_delay_seconds': poll_interval
+        'poll_delay_seconds': poll_interval,
+        'completion_notifications': textract_service.notifications_enabled,
     }
 
 
-@shared_task(bind=True, name="apps.documents.tasks.poll_textract_job", acks_late=True,
-             max_retries=30, default_retry_delay=10)
-def poll_textract_job(self, document_id: int, job_id: str, s3_key: str, attempt: int = 0):
+def _textract_elapsed_seconds(started_at: Optional[str]) -> float:
+    """Seconds since an async Textract job's ISO start time (0 if unknown)."""
+    if not started_at:
+        return 0
+    try:
+        from django.utils.dateparse import parse_datetime
+        started = parse_datetime(started_at)
+        if started:
+            return (timezone.now() - started).total_seconds()
+    except Exception:
+        pass
+    return 0
+
+
+def _textract_completion_key(job_id: str) -> str:
+    return f"textract_job_finalized:{job_id}"
+
+
+def _claim_textract_completion(job_id: str) -> bool:
     """
-    Poll AWS Textract for async job completion with exponential backoff.
-    
-    This task checks the status of an async Textract job and:
-    - On IN_PROGRESS: Retries with exponential backoff (10s, 20s, 40s... up to 60s max)
-    - On SUCCEEDED: Retrieves results, cleans up S3, chains to continue_document_processing
-    - On FAILED/timeout: Marks Document as failed, creates review queue entry
-    
-    Args:
-        document_id: ID of the Document being processed
-        job_id: Textract async job ID
-        s3_key: S3 key of the temporary document file
-        attempt: Current polling attempt number (for backoff calculation)
-        
-    Returns:
-        Dict with job status and result info
-        
-    Raises:
-        TextractAPIError: If status check fails (will retry)
+    Atomically claim the right to finalize a Textract job.
+
+    The SNS notification and the fallback poll can both see the same
+    finished job; only the first one through here chains the pipeline.
     """
-    from .models import Document
-    from .services.textract import (
-        TextractService, 
-        OCRTempStorage,
-        TextractAPIError,
-        TextractConfigurationError
-    )
-    from apps.core.models import AuditLog
-    
-    task_id = self.request.id
-    max_wait_seconds = getattr(settings, 'TEXTRACT_ASYNC_MAX_WAIT', 300)
-    
-    logger.info(
-        f"[{task_id}] Polling Textract job: job_id={job_id}, "
-        f"document_id={document_id}, attempt={attempt}"
-    )
-    
-    # Load Document for status updates
-    try:
-        document = Document.objects.get(id=document_id)
-    except Document.DoesNotExist:
-        logger.error(f"[{task_id}] Document {document_id} not found during polling")
-        # Can't continue without document - cleanup S3 and exit
-        try:
-            OCRTempStorage().delete_document(s3_key)
-        except Exception:
-            pass
-        return {
-            'success': False,
-            'document_id': document_id,
-            'error': 'Document not found',
-            'job_id': job_id
-        }
-    
-    # Check elapsed time from job start
-    textract_data = (document.structured_data or {}).get('textract_async', {})
-    started_at_str = textract_data.get('started_at')
-    elapsed_seconds = 0
-    
-    if started_at_str:
-        try:
-            from django.utils.dateparse import parse_datetime
-            started_at = parse_datetime(started_at_str)
-            if started_at:
-                elapsed_seconds = (timezone.now() - started_at).total_seconds()
-        except Exception:
-            pass
-    
-    # Check for timeout
-    if elapsed_seconds >= max_wait_seconds:
-        logger.error(
-            f"[{task_id}] Textract job timed out: job_id={job_id}, "
-            f"elapsed={elapsed_seconds:.0f}s, max={max_wait_seconds}s"
-        )
-        
-        # Clean up S3
-        try:
-            OCRTempStorage().delete_document(s3_key)
-            logger.info(f"[{task_id}] Cleaned up S3 object after timeout: {s3_key}")
-        except Exception as cleanup_error:
-            logger.warning(f"[{task_id}] Failed to clean up S3: {cleanup_error}")
-        
-        # Mark document as failed
-        document.status = 'failed'
-        document.error_message = f"OCR processing timed out after {max_wait_seconds}s"
-        document.processed_at = timezone.now()
-        document.save(update_fields=['status', 'error_message', 'processed_at'])
-        
-        # Audit log: timeout
-        try:
-            AuditLog.log_event(
-                event_type='ocr_async_job_timeout',
-                description=f"Async Textract job timed out for document {document_id}",
-                details={
-                    'document_id': document_id,
-                    'job_id': job_id,
-                    'elapsed_seconds': elapsed_seconds,
-                    'max_wait_seconds': max_wait_seconds,
-                    'task_id': task_id
-                },
-                severity='error'
-            )
-        except Exception:
-            pass
-        
+    from django.core.cache import cache
+    return cache.add(_textract_completion_key(job_id), True, timeout=86400)
+
+
+def _release_textract_completion(job_id: str) -> None:
+    from django.core.cache import cache
+    cache.delete(_textract_completion_key(job_id))
+
+
+def _textract_completion_claimed(job_id: str) -> bool:
+    from django.core.cache import cache
+    return bool(cache.get(_textract_completion_key(job_id)))
+
+
+def _finalize_textract_job(
+    task_id: str,
+    document,
+    job_id: str,
+    s3_key: str,
+    status: str,
+    textract_service,
+    textract_job_type: str,
+    elapsed_seconds: float,
+) -> Dict[str, Any]:
+    """
+    Handle a finished async Textract job for poll_textract_job and
+    handle_textract_completion.
+
+    SUCCEEDED/PARTIAL_SUCCESS: retrieve results, clean up S3 and chain to
+    continue_document_processing. Anything else marks the Document failed.
+    Runs at most once per job; a later caller gets status 'already_finalized'.
+    """
+    document_id = document.id
+
+    if not _claim_textract_completion(job_id):
+        logger.info(f"[{task_id}] Textract job {job_id} already finalized, skipping")
         return {
-            'success': False,
+            'success': True,
             'document_id': document_id,
             'job_id': job_id,
-            'status': 'timeout',
-            'elapsed_seconds': elapsed_seconds
+            'status': 'already_finalized',
         }
-    
-    # Check job status
-    textract_job_type = textract_data.get(
-        'job_type', TextractService.JOB_TYPE_ANALYZE
-    )
+
     try:
-        textract_service = TextractService()
-        status = textract_service.get_async_job_status(
-            job_id, job_type=textract_job_type
-        )
-        
-        logger.info(
-            f"[{task_id}] Textract job status: {status} (attempt {attempt}, "
-            f"elapsed {elapsed_seconds:.0f}s)"
-        )
-        
-        # Audit log: polling attempt
-        try:
-            AuditLog.log_event(
-                event_type='ocr_async_job_polling',
-                description=f"Polling Textract job {job_id}",
-                details={
-                    'document_id': document_id,
-                    'job_id': job_id,
-                    'status': status,
-                    'attempt': attempt,
-                    'elapsed_seconds': elapsed_seconds,
-                    'task_id': task_id
-                },
-                severity='debug'
-            )
-        except Exception:
-            pass
-        
-    except TextractAPIError as api_error:
-        logger.warning(f"[{task_id}] Error checking job status: {api_error}")
-        # Retry with backoff
-        backoff_delay = min(10 * (2 ** attempt), 60)
-        raise self.retry(exc=api_error, countdown=backoff_delay)
-    
-    # Handle status outcomes
-    if status == 'IN_PROGRESS':
-        # Job still running - retry with exponential backoff
-        backoff_delay = min(10 * (2 ** attempt), 60)  # 10s, 20s, 40s, 60s max
-        
-        document.processing_message = f"OCR processing in progress ({elapsed_seconds:.0f}s elapsed)..."
-        document.save(update_fields=['processing_message'])
-        
-        logger.info(
-            f"[{task_id}] Job still in progress, retrying in {backoff_delay}s"
-        )
-        
-        raise self.retry(
-            args=[document_id, job_id, s3_key],
-            kwargs={'attempt': attempt + 1},
-            countdown=backoff_delay
+        return _finalize_claimed_textract_job(
+            task_id, document, job_id, s3_key, status,
+            textract_service, textract_job_type, elapsed_seconds,
         )
-    
-    elif status in ('SUCCEEDED', 'PARTIAL_SUCCESS'):
+    except Exception:
+        # Let the fallback poll or a redelivered notification try again
+        _release_textract_completion(job_id)
+        raise
+
+
+def _finalize_claimed_textract_job(
+    task_id, document, job_id, s3_key, status, textract_service,
+    textract_job_type, elapsed_seconds,
+):
+    from .services.textract import OCRTempStorage, TextractAPIError
+    from apps.core.models import AuditLog
+
+    document_id = document.id
+
+    if status in ('SUCCEEDED', 'PARTIAL_SUCCESS'):
         # Job completed - retrieve results
         logger.info(f"[{task_id}] Textract job succeeded, retrieving results...")
         
@@ -2231,9 +2154,10 @@ def poll_textract_job(self, document_id: int, job_id: str, s3_key: str, attempt:
             # Continue anyway - file will be auto-deleted by lifecycle policy
         
         # Update document with OCR metadata
+        textract_data = dict((document.structured_data or {}).get('textract_async', {}))
         textract_data['completed_at'] = timezone.now().isoformat()
         textract_data['result_metadata'] = result.to_audit_dict()
-        document.structured_data = {**document.structured_data, 'textract_async': textract_data}
+        document.structured_data = {**(document.structured_data or {}), 'textract_async': textract_data}
         document.save(update_fields=['structured_data'])
         
         # Audit log: job completed
@@ -2272,10 +2196,9 @@ def poll_textract_job(self, document_id: int, job_id: str, s3_key: str, attempt:
         except Exception as chain_error:
             logger.error(f"[{task_id}] Failed to chain processing task: {chain_error}")
             # Store OCR text in document for manual recovery
-            document.original_text = ocr_text
             document.status = 'failed'
             document.processing_message = 'OCR complete but processing chain failed'
-            document.save(update_fields=['original_text', 'status', 'processing_message'])
+            document.save_extracted_text(ocr_text, update_fields=['status', 'processing_message'])
         
         return {
             'success': True,
@@ -2331,67 +2254,346 @@ def poll_textract_job(self, document_id: int, job_id: str, s3_key: str, attempt:
         }
 
 
-@shared_task(bind=True, name="apps.documents.tasks.continue_document_processing", acks_late=True,
-             max_retries=3, default_retry_delay=60,
-             time_limit=getattr(settings, 'LARGE_DOCUMENT_TASK_TIME_LIMIT', 2100),
-             soft_time_limit=getattr(settings, 'LARGE_DOCUMENT_TASK_SOFT_TIME_LIMIT', 1800))
-def continue_document_processing(self, document_id: int, ocr_text: str, resume_attempt: int = 0):
+@shared_task(bind=True, name="apps.documents.tasks.poll_textract_job", acks_late=True,
+             max_retries=30, default_retry_delay=10)
+def poll_textract_job(self, document_id: int, job_id: str, s3_key: str, attempt: int = 0,
+                      started_at: str = None, job_type: str = None):
     """
-    Continue document processing pipeline after async OCR completion.
-    
-    This task receives the OCR text from the async Textract workflow and
-    continues the standard processing pipeline:
-    1. Stores OCR text in Document.original_text
-    2. Runs DocumentAnalyzer for AI extraction
-    3. Converts to FHIR resources via StructuredDataConverter
-    4. Creates ParsedData with optimistic merge
-    5. Sets Document.status to 'completed' when merge succeeds
+    Poll AWS Textract for async job completion with exponential backoff.
     
-    This mirrors the sync processing path after text extraction, reusing
-    as much code as possible from process_document_async.
+    This task checks the status of an async Textract job and:
+    - On IN_PROGRESS: Retries with exponential backoff (10s, 20s, 40s... up to 60s max)
+    - On SUCCEEDED: Retrieves results, cleans up S3, chains to continue_document_processing
+    - On FAILED/timeout: Marks Document as failed, creates review queue entry
     
-    Also serves as the RESUME path after a soft time limit: when called with
-    empty ocr_text, the text is reloaded from document.original_text and the
-    chunk ledger skips all previously completed chunks.
+    With SNS completion notifications enabled this is only the fallback:
+    it stops as soon as handle_textract_completion has finalized the job.
     
     Args:
-        document_id: ID of the Document to continue processing
-        ocr_text: Extracted text from async Textract OCR. Empty string means
-            "resume from document.original_text".
-        resume_attempt: How many soft-time-limit resumes have already happened.
+        document_id: ID of the Document being processed
+        job_id: Textract async job ID
+        s3_key: S3 key of the temporary document file
+        attempt: Current polling attempt number (for backoff calculation)
+        started_at: ISO job start time; saves decrypting structured_data per attempt
+        job_type: 'detect' or 'analyze' (read from structured_data if omitted)
         
     Returns:
-        Dict with processing results matching process_document_async format
+        Dict with job status and result info
+        
+    Raises:
+        TextractAPIError: If status check fails (will retry)
     """
     from .models import Document
+    from .services.textract import (
+        TextractService, 
+        OCRTempStorage,
+        TextractAPIError,
+        TextractConfigurationError
+    )
+    from apps.core.models import AuditLog
     
     task_id = self.request.id
-    start_time = time.time()
+    max_wait_seconds = getattr(settings, 'TEXTRACT_ASYNC_MAX_WAIT', 300)
     
     logger.info(
-        f"[{task_id}] Continuing document processing after async OCR: "
-        f"document_id={document_id}, text_length={len(ocr_text)}, "
-        f"resume_attempt={resume_attempt}"
+        f"[{task_id}] Polling Textract job: job_id={job_id}, "
+        f"document_id={document_id}, attempt={attempt}"
     )
     
-    # Load document
+    if _textract_completion_claimed(job_id):
+        logger.info(f"[{task_id}] Textract job {job_id} already finalized, stopping poll")
+        return {
+            'success': True,
+            'document_id': document_id,
+            'job_id': job_id,
+            'status': 'already_finalized',
+        }
+    
+    # Load Document for status updates (encrypted fields are loaded only if needed)
     try:
-        document = Document.objects.select_related('patient').get(id=document_id)
+        document = Document.objects.defer('original_text', 'structured_data').get(id=document_id)
     except Document.DoesNotExist:
-        logger.error(f"[{task_id}] Document {document_id} not found")
+        logger.error(f"[{task_id}] Document {document_id} not found during polling")
+        # Can't continue without document - cleanup S3 and exit
+        try:
+            OCRTempStorage().delete_document(s3_key)
+        except Exception:
+            pass
         return {
             'success': False,
             'document_id': document_id,
             'error': 'Document not found',
-            'task_id': task_id
+            'job_id': job_id
         }
     
-    if ocr_text:
-        # Normal path: store fresh OCR text in document
-        document.original_text = ocr_text
+    # Check elapsed time from job start (tasks queued before started_at/job_type
+    # were passed along still read them from structured_data)
+    if started_at is None or job_type is None:
+        textract_data = (document.structured_data or {}).get('textract_async', {})
+        started_at = started_at or textract_data.get('started_at')
+        job_type = job_type or textract_data.get('job_type')
+    elapsed_seconds = _textract_elapsed_seconds(started_at)
+    
+    # Check for timeout
+    if elapsed_seconds >= max_wait_seconds:
+        logger.error(
+            f"[{task_id}] Textract job timed out: job_id={job_id}, "
+            f"elapsed={elapsed_seconds:.0f}s, max={max_wait_seconds}s"
+        )
+        
+        # The completion notification may be finalizing this job right now;
+        # only one of them gets to write the document's outcome
+        if not _claim_textract_completion(job_id):
+            logger.info(f"[{task_id}] Textract job {job_id} already finalized, skipping timeout")
+            return {
+                'success': True,
+                'document_id': document_id,
+                'job_id': job_id,
+                'status': 'already_finalized',
+            }
+        
+        # Clean up S3
+        try:
+            OCRTempStorage().delete_document(s3_key)
+            logger.info(f"[{task_id}] Cleaned up S3 object after timeout: {s3_key}")
+        except Exception as cleanup_error:
+            logger.warning(f"[{task_id}] Failed to clean up S3: {cleanup_error}")
+        
+        # Mark document as failed
+        document.status = 'failed'
+        document.error_message = f"OCR processing timed out after {max_wait_seconds}s"
+        document.processed_at = timezone.now()
+        try:
+            document.save(update_fields=['status', 'error_message', 'processed_at'])
+        except Exception:
+            _release_textract_completion(job_id)
+            raise
+        
+        # Audit log: timeout
+        try:
+            AuditLog.log_event(
+                event_type='ocr_async_job_timeout',
+                description=f"Async Textract job timed out for document {document_id}",
+                details={
+                    'document_id': document_id,
+                    'job_id': job_id,
+                    'elapsed_seconds': elapsed_seconds,
+                    'max_wait_seconds': max_wait_seconds,
+                    'task_id': task_id
+                },
+                severity='error'
+            )
+        except Exception:
+            pass
+        
+        return {
+            'success': False,
+            'document_id': document_id,
+            'job_id': job_id,
+            'status': 'timeout',
+            'elapsed_seconds': elapsed_seconds
+        }
+    
+    # Check job status
+    textract_job_type = job_type or TextractService.JOB_TYPE_ANALYZE
+    try:
+        textract_service = TextractService()
+        status = textract_service.get_async_job_status(
+            job_id, job_type=textract_job_type
+        )
+        
+        logger.info(
+            f"[{task_id}] Textract job status: {status} (attempt {attempt}, "
+            f"elapsed {elapsed_seconds:.0f}s)"
+        )
+        
+        # Audit log: polling attempt
+        try:
+            AuditLog.log_event(
+                event_type='ocr_async_job_polling',
+                description=f"Polling Textract job {job_id}",
+                details={
+                    'document_id': document_id,
+                    'job_id': job_id,
+                    'status': status,
+                    'attempt': attempt,
+                    'elapsed_seconds': elapsed_seconds,
+                    'task_id': task_id
+                },
+                severity='debug'
+            )
+        except Exception:
+            pass
+        
+    except TextractAPIError as api_error:
+        logger.warning(f"[{task_id}] Error checking job status: {api_error}")
+        # Retry with backoff
+        backoff_delay = min(10 * (2 ** attempt), 60)
+        raise self.retry(exc=api_error, countdown=backoff_delay)
+    
+    # Handle status outcomes
+    if status == 'IN_PROGRESS':
+        # Job still running - retry with exponential backoff
+        backoff_delay = min(10 * (2 ** attempt), 60)  # 10s, 20s, 40s, 60s max
+        
+        document.processing_message = f"OCR processing in progress ({elapsed_seconds:.0f}s elapsed)..."
+        document.save(update_fields=['processing_message'])
+        
+        logger.info(
+            f"[{task_id}] Job still in progress, retrying in {backoff_delay}s"
+        )
+        
+        raise self.retry(
+            args=[document_id, job_id, s3_key],
+            kwargs={'attempt': attempt + 1, 'started_at': started_at, 'job_type': textract_job_type},
+            countdown=backoff_delay
+        )
+
+    return _finalize_textract_job(
+        task_id, document, job_id, s3_key, status,
+        textract_service, textract_job_type, elapsed_seconds,
+    )
+
+
+@shared_task(bind=True, name="apps.documents.tasks.handle_textract_completion", acks_late=True,
+             max_retries=3, default_retry_delay=30)
+def handle_textract_completion(self, document_id: int, job_id: str, status: str,
+                               s3_key: str = None):
+    """
+    Finalize an async Textract job as soon as its SNS notification arrives.
+    
+    Enqueued by the textract_notification_listener command for each
+    completion message. Results are retrieved and the document chained to
+    continue_document_processing exactly as poll_textract_job would; the
+    fallback poll then finds the job finalized and stops.
+    
+    Args:
+        document_id: Document ID (the JobTag passed to Textract)
+        job_id: Textract async job ID
+        status: Job status from the notification (SUCCEEDED, FAILED, ...)
+        s3_key: S3 object name from the notification, if present
+        
+    Returns:
+        Dict with job status and result info
+    """
+    from .models import Document
+    from .services.textract import TextractService, TextractConfigurationError
+    
+    task_id = self.request.id
+    logger.info(
+        f"[{task_id}] Textract completion notification: job_id={job_id}, "
+        f"document_id={document_id}, status={status}"
+    )
+    
+    if status not in ('SUCCEEDED', 'PARTIAL_SUCCESS', 'FAILED', 'ERROR'):
+        return {'success': False, 'document_id': document_id, 'job_id': job_id,
+                'status': 'ignored', 'error': f'Non-terminal status: {status}'}
+    
+    if _textract_completion_claimed(job_id):
+        return {'success': True, 'document_id': document_id, 'job_id': job_id,
+                'status': 'already_finalized'}
+    
+    try:
+        document = Document.objects.defer('original_text').get(id=document_id)
+    except Document.DoesNotExist:
+        logger.error(f"[{task_id}] Document {document_id} not found for Textract notification")
+        return {'success': False, 'document_id': document_id, 'job_id': job_id,
+                'error': 'Document not found'}
+    
+    textract_data = (document.structured_data or {}).get('textract_async', {})
+    if textract_data.get('job_id') != job_id:
+        # Stale notification, e.g. for a job replaced by a reprocess
+        logger.warning(
+            f"[{task_id}] Ignoring Textract notification for job {job_id}: "
+            f"document {document_id} is tracking job {textract_data.get('job_id')}"
+        )
+        return {'success': False, 'document_id': document_id, 'job_id': job_id,
+                'status': 'ignored', 'error': 'Job is not the document\'s current Textract job'}
+    
+    try:
+        textract_service = TextractService()
+    except TextractConfigurationError as config_error:
+        logger.error(f"[{task_id}] Textract configuration error: {config_error}")
+        return {'success': False, 'document_id': document_id, 'job_id': job_id,
+                'error_type': 'configuration_error', 'error_message': str(config_error)}
+    
+    try:
+        return _finalize_textract_job(
+            task_id, document, job_id,
+            textract_data.get('s3_key') or s3_key,
+            status,
+            textract_service,
+            textract_data.get('job_type', TextractService.JOB_TYPE_ANALYZE),
+            _textract_elapsed_seconds(textract_data.get('started_at')),
+        )
+    except Exception as exc:
+        logger.error(f"[{task_id}] Failed to finalize Textract job {job_id}: {exc}")
+        raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, name="apps.documents.tasks.continue_document_processing", acks_late=True,
+             max_retries=3, default_retry_delay=60,
+             time_limit=getattr(settings, 'LARGE_DOCUMENT_TASK_TIME_LIMIT', 2100),
+             soft_time_limit=getattr(settings, 'LARGE_DOCUMENT_TASK_SOFT_TIME_LIMIT', 1800))
+def continue_document_processing(self, document_id: int, ocr_text: str, resume_attempt: int = 0):
+    """
+    Continue document processing pipeline after async OCR completion.
+    
+    This task receives the OCR text from the async Textract workflow and
+    continues the standard processing pipeline:
+    1. Stores OCR text in Document.original_text
+    2. Runs DocumentAnalyzer for AI extraction
+    3. Converts to FHIR resources via StructuredDataConverter
+    4. Creates ParsedData with optimistic merge
+    5. Sets Document.status to 'completed' when merge succeeds
+    
+    This mirrors the sync processing path after text extraction, reusing
+    as much code as possible from process_document_async.
+    
+    Also serves as the RESUME path after a soft time limit: when called with
+    empty ocr_text, the text is reloaded from document.original_text and the
+    chunk ledger skips all previously completed chunks.
+    
+    Args:
+        document_id: ID of the Document to continue processing
+        ocr_text: Extracted text from async Textract OCR. Empty string means
+            "resume from document.original_text".
+        resume_attempt: How many soft-time-limit resumes have already happened.
+        
+    Returns:
+        Dict with processing results matching process_document_async format
+    """
+    from .models import Document
+    
+    task_id = self.request.id
+    start_time = time.time()
+    
+    logger.info(
+        f"[{task_id}] Continuing document processing after async OCR: "
+        f"document_id={document_id}, text_length={len(ocr_text)}, "
+        f"resume_attempt={resume_attempt}"
+    )
+    
+    # Load document
+    try:
+        # Only the resume path reads the stored text; fresh OCR text replaces it
+        document = Document.objects.select_related('patient').defer(
+            'original_text', 'text_preview'
+        ).get(id=document_id)
+    except Document.DoesNotExist:
+        logger.error(f"[{task_id}] Document {document_id} not found")
+        return {
+            'success': False,
+            'document_id': document_id,
+            'error': 'Document not found',
+            'task_id': task_id
+        }
+    
+    if ocr_text:
+        # Normal path: store fresh OCR text in document
         document.status = 'processing'
         document.processing_message = "OCR complete, analyzing document with AI..."
-        document.save(update_fields=['original_text', 'status', 'processing_message'])
+        document.save_extracted_text(ocr_text, update_fields=['status', 'processing_message'])
     else:
         # Resume path: reload previously saved text, never overwrite it
         ocr_text = document.original_text or ''
@@ -2490,15 +2692,23 @@ def continue_document_processing(self, document_id: int, ocr_text: str, resume_a
                     f"({chunk_stats['ledger_hits']} ledger hits)"
                 )
             else:
-                structured_extraction = ai_analyzer.analyze_document_structured(
-                    document_content=chunks[0]['text'], context=context
+                structured_extraction = _load_single_chunk_from_ledger(
+                    document, chunks[0]['text'], task_id
                 )
+                if structured_extraction is None:
+                    structured_extraction = ai_analyzer.analyze_document_structured(
+                        document_content=chunks[0]['text'], context=context
+                    )
                 del chunks
                 force_memory_cleanup("after single-chunk extraction in continue_processing")
         else:
-            structured_extraction = ai_analyzer.analyze_document_structured(
-                document_content=extracted_text, context=context
+            structured_extraction = _load_single_chunk_from_ledger(
+                document, extracted_text, task_id
             )
+            if structured_extraction is None:
+                structured_extraction = ai_analyzer.analyze_document_structured(
+                    document_content=extracted_text, context=context
+                )
             del extracted_text
             force_memory_cleanup("after AI extraction in continue_processing")
         
@@ -2739,6 +2949,51 @@ def continue_document_processing(self, document_id: int, ocr_text: str, resume_a
     }
 
 
+@shared_task(name="apps.documents.tasks.poll_extraction_batches")
+def poll_extraction_batches():
+    """
+    Ingest provider batch jobs that have ended (see CELERY_BEAT_SCHEDULE).
+
+    Results are written to the chunk ledger and every document whose chunks
+    are all settled is handed to continue_document_processing to finish.
+    """
+    from apps.documents.services.batch_extraction import BatchExtractionService
+
+    return BatchExtractionService().poll_batches()
+
+
+@shared_task(name="apps.documents.tasks.evict_extraction_cache")
+def evict_extraction_cache():
+    """
+    Drop expired and least recently used chunk extraction cache entries
+    (see CELERY_BEAT_SCHEDULE).
+    """
+    from apps.documents.services.extraction_cache import get_chunk_extraction_cache
+
+    return get_chunk_extraction_cache().evict()
+
+
+@shared_task(name="apps.documents.tasks.keep_prompt_cache_warm")
+def keep_prompt_cache_warm():
+    """
+    Refresh the cached extraction prefix while documents are waiting for it
+    (see CELERY_BEAT_SCHEDULE), so sporadic uploads and documents sitting in
+    async OCR don't pay a cold prefix on their first chunk.
+    """
+    from apps.documents.services.cached_extraction import get_cached_extractor
+    from apps.documents.services.prompt_cache_scheduler import get_prompt_cache_scheduler
+
+    model = getattr(settings, 'AI_MODEL_PRIMARY', 'claude-sonnet-4-5-20250929')
+    if not get_prompt_cache_scheduler().keepalive_due(model):
+        return {'refreshed': False}
+    try:
+        usage = get_cached_extractor().refresh_prefix()
+    except Exception as refresh_error:
+        logger.warning(f"Prompt cache keepalive failed: {refresh_error}")
+        return {'refreshed': False, 'error': str(refresh_error)}
+    return {'refreshed': True, 'cache_read_input_tokens': usage.get('cache_read_input_tokens', 0)}
+
+
 @shared_task
 def cleanup_old_documents():
     """
@@ -2996,35 +3251,30 @@ def _deduplicate_exact(aggregated: Dict[str, Any], data_type: str, key_fields: t
 
 def _deduplicate_aggregated(aggregated: Dict[str, Any]) -> None:
     """Deduplicate similar medical items in aggregated chunk results."""
-    from difflib import SequenceMatcher
-
-    def is_similar(a: str, b: str, threshold: float = 0.85) -> bool:
-        return SequenceMatcher(None, a.lower(), b.lower()).ratio() > threshold
-
     for data_type in ['conditions', 'medications', 'procedures']:
         if data_type not in aggregated:
             continue
         items = aggregated[data_type]
         deduplicated = []
-
-        for item in items:
-            item_name = item.get('name', str(item)) if isinstance(item, dict) else str(item)
-            is_duplicate = False
-            for existing in deduplicated:
-                existing_name = (
-                    existing.get('name', str(existing))
-                    if isinstance(existing, dict)
-                    else str(existing)
-                )
-                if is_similar(item_name, existing_name):
-                    if isinstance(item, dict) and isinstance(existing, dict):
-                        if item.get('confidence', 0) > existing.get('confidence', 0):
-                            idx = deduplicated.index(existing)
-                            deduplicated[idx] = item
-                    is_duplicate = True
-                    break
-            if not is_duplicate:
+        names = [
+            item.get('name', str(item)) if isinstance(item, dict) else str(item)
+            for item in items
+        ]
+        # Same first-match semantics as a pairwise SequenceMatcher scan, but
+        # only names sharing enough bigrams are actually compared.
+        index = NearDuplicateIndex(threshold=0.85, vocabulary=names)
+
+        for item, item_name in zip(items, names):
+            slot = index.find(item_name)
+            if slot is None:
+                index.add(item_name)
                 deduplicated.append(item)
+                continue
+            existing = deduplicated[slot]
+            if isinstance(item, dict) and isinstance(existing, dict):
+                if item.get('confidence', 0) > existing.get('confidence', 0):
+                    deduplicated[slot] = item
+                    index.replace(slot, item_name)
 
         logger.info(
             "Deduplicated %s: %s -> %s items",
@@ -3186,18 +3436,26 @@ def _get_chunk_usage() -> Dict[str, Any]:
 
 
 def _estimate_chunk_cost(usage: Dict[str, Any]):
-    """Estimate USD cost of one chunk call from its token usage."""
+    """
+    Estimate USD cost of one chunk call from its token usage.
+
+    Usage from a provider batch job (usage['batch']) is billed at
+    AI_BATCH_COST_FACTOR of the synchronous price.
+    """
     from decimal import Decimal
     from apps.core.services import CostCalculator
 
     if not usage:
         return Decimal('0')
     model = usage.get('model') or getattr(settings, 'AI_MODEL_PRIMARY', 'claude-sonnet-4-5-20250929')
-    return CostCalculator.calculate_cost(
+    cost = CostCalculator.calculate_cost(
         'anthropic', model,
         usage.get('input_tokens', 0) or 0,
         usage.get('output_tokens', 0) or 0,
     )
+    if usage.get('batch'):
+        cost *= Decimal(str(getattr(settings, 'AI_BATCH_COST_FACTOR', 0.5)))
+    return cost
 
 
 def _check_cost_circuit_breaker(document, task_id: str) -> None:
@@ -3264,11 +3522,159 @@ def _log_chunk_api_usage(document, usage: Dict[str, Any], task_id: str,
             error_message=error_message,
             chunk_number=chunk_number,
             total_chunks=total_chunks,
+            cost_usd=_estimate_chunk_cost(usage) if usage.get('batch') else None,
         )
     except Exception as log_error:
         logger.warning(f"[{task_id}] Failed to log chunk API usage: {log_error}")
 
 
+def _get_chunk_concurrency() -> int:
+    """Max in-flight chunk API calls per document (AI_CHUNK_CONCURRENCY, min 1)."""
+    try:
+        return max(1, int(getattr(settings, 'AI_CHUNK_CONCURRENCY', 1)))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _extract_chunk(chunk_text: str, context: Optional[str]) -> tuple:
+    """
+    Run the AI extraction for one chunk.
+
+    Safe to call from a worker thread: touches no ORM state, and usage is
+    read from the extractor's thread-local last_usage right after the call.
+
+    Returns:
+        (chunk_data, usage, error) — chunk_data is None when error is set.
+    """
+    from apps.documents.services.ai_extraction import extract_medical_data_structured
+
+    try:
+        chunk_result = extract_medical_data_structured(chunk_text, context=context)
+        chunk_data = chunk_result.model_dump()
+        del chunk_result
+        return chunk_data, _get_chunk_usage(), None
+    except SoftTimeLimitExceeded:
+        raise
+    except Exception as chunk_error:
+        return None, _get_chunk_usage(), chunk_error
+
+
+def _prefetch_chunk_ledger(document, content_hashes: List[str]) -> Dict[tuple, Any]:
+    """
+    Load the document's ledger rows for the current chunk hashes in one query.
+
+    Returns a dict keyed by (chunk_index, content_hash). Rows left by stale
+    hashes (old prompt version/model) are never loaded or decrypted.
+    """
+    from .models import DocumentChunkResult
+
+    rows = DocumentChunkResult.objects.filter(
+        document=document,
+        chunk_index__lt=len(content_hashes),
+        content_hash__in=set(content_hashes),
+    )
+    return {(row.chunk_index, row.content_hash): row for row in rows}
+
+
+def _load_single_chunk_from_ledger(document, chunk_text: str, task_id: str):
+    """
+    Return the ledger's extraction for a document analyzed in one call.
+
+    Single-chunk documents bypass _process_chunks_streaming, but batch
+    extraction still checkpoints them as chunk 0; finishing such a document
+    must not pay for the same extraction twice. Returns None on a miss.
+    """
+    from apps.documents.services.ai_extraction import StructuredMedicalExtraction
+    from .models import DocumentChunkResult
+
+    model = getattr(settings, 'AI_MODEL_PRIMARY', 'claude-sonnet-4-5-20250929')
+    row = DocumentChunkResult.objects.filter(
+        document=document,
+        chunk_index=0,
+        content_hash=_chunk_content_hash(chunk_text, model),
+        status='succeeded',
+    ).first()
+    if row is None:
+        return None
+    logger.info(f"[{task_id}] Ledger hit for single-chunk document {document.id}, skipping API call")
+    return StructuredMedicalExtraction.model_validate(row.structured_json)
+
+
+def _build_chunk_ledger_row(document, ledger: Dict[tuple, Any], chunk_idx: int,
+                            content_hash: str, chunk_data: Optional[Dict[str, Any]],
+                            usage: Dict[str, Any], chunk_error: Optional[Exception] = None):
+    """
+    Build the unsaved ledger row for one finished chunk.
+
+    attempts starts at 0: _flush_chunk_ledger counts the attempt in the
+    database, whether the row is inserted or already exists.
+    Failed rows keep any previously recorded token/cost figures, matching
+    the old update_or_create defaults.
+    """
+    from .models import DocumentChunkResult
+
+    existing = ledger.get((chunk_idx, content_hash))
+    row = DocumentChunkResult(
+        document=document,
+        chunk_index=chunk_idx,
+        content_hash=content_hash,
+        attempts=0,
+    )
+    if chunk_error is None:
+        row.status = 'succeeded'
+        row.structured_json = chunk_data
+        row.input_tokens = usage.get('input_tokens', 0) or 0
+        row.output_tokens = usage.get('output_tokens', 0) or 0
+        row.cost_usd = _estimate_chunk_cost(usage)
+        row.error_message = ''
+    else:
+        row.status = 'failed'
+        row.structured_json = {}
+        row.input_tokens = existing.input_tokens if existing else 0
+        row.output_tokens = existing.output_tokens if existing else 0
+        row.cost_usd = existing.cost_usd if existing else 0
+        row.error_message = str(chunk_error)[:2000]
+    ledger[(chunk_idx, content_hash)] = row
+    return row
+
+
+# attempts is left out: _flush_chunk_ledger counts it with F('attempts') + 1
+_CHUNK_LEDGER_UPSERT_FIELDS = [
+    'status', 'structured_json', 'input_tokens', 'output_tokens',
+    'cost_usd', 'error_message', 'updated_at',
+]
+
+
+def _flush_chunk_ledger(rows: List[Any]) -> None:
+    """
+    Upsert finished chunk rows in a single INSERT ... ON CONFLICT statement.
+
+    Rows are inserted with attempts = 0 and the upsert leaves attempts
+    alone; one UPDATE keyed on (document, chunk_index, content_hash) then
+    sets attempts = attempts + 1 for every row of the batch. New rows end
+    at 1, and a row that already existed, whether prefetched or inserted by
+    another worker after the prefetch, is counted in the database, so
+    concurrent retries are never lost.
+    """
+    from django.db.models import F, Q
+
+    from .models import DocumentChunkResult
+
+    if not rows:
+        return
+    DocumentChunkResult.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['document', 'chunk_index', 'content_hash'],
+        update_fields=_CHUNK_LEDGER_UPSERT_FIELDS,
+    )
+    flushed = Q()
+    for row in rows:
+        flushed |= Q(document_id=row.document_id, chunk_index=row.chunk_index, content_hash=row.content_hash)
+    DocumentChunkResult.objects.filter(flushed).update(attempts=F('attempts') + 1)
+    rows.clear()
+
+
 def _process_chunks_streaming(
     chunks: List[Dict[str, Any]],
     context: Optional[str],
@@ -3276,21 +3682,40 @@ def _process_chunks_streaming(
     document=None,
 ) -> tuple:
     """
-    Ledger-aware sequential chunk processing with incremental aggregation.
+    Ledger-aware chunk processing with incremental, in-order aggregation.
 
-    For each chunk (in order):
+    For each chunk:
     1. Skip the API entirely if the ledger has a 'succeeded' row with a
        matching content hash (retry/resume costs nothing for done chunks).
     2. Otherwise check the cost circuit breaker, call the AI, and persist the
-       result to the ledger immediately — a crash or kill never loses
-       completed work.
+       result to the ledger as soon as the call returns — a crash or kill
+       never loses completed work.
     3. On chunk failure, record it and continue — no longer all-or-nothing.
 
-    Peak memory is one chunk result plus the running aggregate.
+    Chunks the ledger doesn't have are then looked up, in one query, in the
+    global ChunkExtractionCache; a hit (the same page extracted for another
+    document) is checkpointed to the ledger at zero cost instead of calling
+    the API, and every successful API call is stored there for later hits.
+
+    Up to AI_CHUNK_CONCURRENCY API calls run at once on a thread pool (1 =
+    sequential, the default). Worker threads only make the API call; ledger
+    writes, usage logging and the circuit breaker all run on the task thread,
+    and results are aggregated strictly in chunk order, so the output is
+    identical to a sequential run. The breaker is checked before every
+    submission, so a limit breach can overshoot by at most the in-flight
+    window; in-flight calls are drained and checkpointed before it raises.
+
+    Ledger rows for the document are prefetched in one query, and each batch
+    of finished calls is written with one upsert plus one attempts UPDATE,
+    so ledger round trips no longer grow with chunk count.
+
+    Peak memory is the in-flight window of chunk results plus the running
+    aggregate.
 
     Returns:
         (StructuredMedicalExtraction, chunk_stats) where chunk_stats is
-        {'total': int, 'succeeded': int, 'failed_chunks': [int], 'ledger_hits': int}
+        {'total': int, 'succeeded': int, 'failed_chunks': [int],
+         'ledger_hits': int, 'cache_hits': int}
 
     Raises:
         AIExtractionError: If the cost circuit breaker trips, or fewer than
@@ -3298,129 +3723,205 @@ def _process_chunks_streaming(
         SoftTimeLimitExceeded: Propagated so the task can re-enqueue a resume;
             all completed chunks are already persisted in the ledger.
     """
-    from apps.documents.services.ai_extraction import (
-        extract_medical_data_structured,
-        StructuredMedicalExtraction,
-    )
-    from .models import DocumentChunkResult
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    from apps.documents.services.ai_extraction import StructuredMedicalExtraction
+    from apps.documents.services.extraction_cache import get_chunk_extraction_cache
 
     model = getattr(settings, 'AI_MODEL_PRIMARY', 'claude-sonnet-4-5-20250929')
     aggregated = _create_empty_aggregated_dict()
     total_chunks = len(chunks)
     failed_chunks: List[int] = []
     ledger_hits = 0
+    cache_hits = 0
+
+    content_hashes: List[Optional[str]] = [None] * total_chunks
+    ledger: Dict[tuple, Any] = {}
+    pending_rows: List[Any] = []
+    if document is not None:
+        content_hashes = [_chunk_content_hash(chunk['text'], model) for chunk in chunks]
+        ledger = _prefetch_chunk_ledger(document, content_hashes)
+
+    # Cross-document cache: one lookup for every chunk the ledger can't answer
+    extraction_cache = get_chunk_extraction_cache()
+    cached_chunks = extraction_cache.lookup(
+        {
+            chunk_idx: chunk['text']
+            for chunk_idx, chunk in enumerate(chunks)
+            if getattr(ledger.get((chunk_idx, content_hashes[chunk_idx])), 'status', None) != 'succeeded'
+        },
+        model,
+        context,
+    )
+
+    concurrency = min(_get_chunk_concurrency(), max(total_chunks, 1))
+    executor = None
+    if concurrency > 1:
+        executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix=f"chunk-{task_id[:8]}"
+        )
+        logger.info(
+            f"[{task_id}] Processing {total_chunks} chunks with up to "
+            f"{concurrency} concurrent API calls"
+        )
 
-    for chunk_idx, chunk in enumerate(chunks):
-        chunk_text = chunk['text']
-        content_hash = _chunk_content_hash(chunk_text, model) if document else None
+    # chunk_idx -> extracted dict, or None for a failed chunk; drained in order
+    completed: Dict[int, Optional[Dict[str, Any]]] = {}
+    in_flight: Dict[Any, tuple] = {}
+    next_submit = 0
+    next_aggregate = 0
+    breaker_error: Optional[AIExtractionError] = None
 
-        # 1. Ledger checkpoint: skip chunks already extracted with this exact
-        #    text/version/model combination
-        chunk_data = None
+    def _finish_chunk(chunk_idx, chunk_text, content_hash, chunk_start, chunk_data, usage, chunk_error):
+        if chunk_error is not None:
+            logger.error(
+                f"[{task_id}] Chunk {chunk_idx + 1}/{total_chunks} failed: {chunk_error}"
+            )
+            failed_chunks.append(chunk_idx)
+        else:
+            extraction_cache.store(
+                chunk_text, model, context, chunk_data, _estimate_chunk_cost(usage)
+            )
         if document is not None:
-            ledger_row = DocumentChunkResult.objects.filter(
-                document=document,
-                chunk_index=chunk_idx,
-                content_hash=content_hash,
-                status='succeeded',
-            ).first()
-            if ledger_row is not None:
-                chunk_data = ledger_row.structured_json
-                ledger_hits += 1
-                logger.info(
-                    f"[{task_id}] Chunk {chunk_idx + 1}/{total_chunks}: ledger hit, skipping API call"
+            pending_rows.append(_build_chunk_ledger_row(
+                document, ledger, chunk_idx, content_hash, chunk_data, usage, chunk_error,
+            ))
+            if chunk_error is None:
+                _log_chunk_api_usage(
+                    document, usage, task_id, chunk_idx + 1, total_chunks, chunk_start
                 )
+            else:
+                _log_chunk_api_usage(
+                    document, usage, task_id, chunk_idx + 1, total_chunks, chunk_start,
+                    success=False, error_message=str(chunk_error)[:500],
+                )
+        completed[chunk_idx] = chunk_data
 
-        # 2. Fresh extraction with immediate checkpoint persistence
-        if chunk_data is None:
-            if document is not None:
-                _check_cost_circuit_breaker(document, task_id)
-
-            logger.info(f"[{task_id}] Processing chunk {chunk_idx + 1}/{total_chunks}")
-            chunk_start = time.time()
-            try:
-                chunk_result = extract_medical_data_structured(chunk_text, context=context)
-                chunk_data = chunk_result.model_dump()
-                del chunk_result
-
-                usage = _get_chunk_usage()
+    try:
+        while next_aggregate < total_chunks:
+            # 1. Fill the in-flight window (ledger and cache hits don't occupy a slot)
+            while (
+                breaker_error is None
+                and next_submit < total_chunks
+                and len(in_flight) < concurrency
+            ):
+                chunk_idx = next_submit
+                chunk_text = chunks[chunk_idx]['text']
+                content_hash = content_hashes[chunk_idx]
+
+                # Ledger checkpoint: skip chunks already extracted with this
+                # exact text/version/model combination
                 if document is not None:
-                    ledger_row, _ = DocumentChunkResult.objects.update_or_create(
-                        document=document,
-                        chunk_index=chunk_idx,
-                        content_hash=content_hash,
-                        defaults={
-                            'status': 'succeeded',
-                            'structured_json': chunk_data,
-                            'input_tokens': usage.get('input_tokens', 0) or 0,
-                            'output_tokens': usage.get('output_tokens', 0) or 0,
-                            'cost_usd': _estimate_chunk_cost(usage),
-                            'error_message': '',
-                        },
-                    )
-                    DocumentChunkResult.objects.filter(pk=ledger_row.pk).update(
-                        attempts=models.F('attempts') + 1
-                    )
-                    _log_chunk_api_usage(
-                        document, usage, task_id, chunk_idx + 1, total_chunks, chunk_start
+                    ledger_row = ledger.get((chunk_idx, content_hash))
+                    if ledger_row is not None and ledger_row.status == 'succeeded':
+                        # Succeeded rows are never rewritten; drop the map's
+                        # reference so the payload is freed once aggregated
+                        del ledger[(chunk_idx, content_hash)]
+                        completed[chunk_idx] = ledger_row.structured_json
+                        ledger_hits += 1
+                        next_submit += 1
+                        logger.info(
+                            f"[{task_id}] Chunk {chunk_idx + 1}/{total_chunks}: "
+                            f"ledger hit, skipping API call"
+                        )
+                        continue
+
+                # Cache hit: the same content was extracted for another document
+                if chunk_idx in cached_chunks:
+                    chunk_data = cached_chunks.pop(chunk_idx)
+                    if document is not None:
+                        pending_rows.append(_build_chunk_ledger_row(
+                            document, ledger, chunk_idx, content_hash, chunk_data, {},
+                        ))
+                    completed[chunk_idx] = chunk_data
+                    cache_hits += 1
+                    next_submit += 1
+                    logger.info(
+                        f"[{task_id}] Chunk {chunk_idx + 1}/{total_chunks}: "
+                        f"extraction cache hit, skipping API call"
                     )
-            except SoftTimeLimitExceeded:
-                # Completed chunks are already in the ledger — propagate so the
-                # task layer can re-enqueue a resume run
-                raise
-            except Exception as chunk_error:
-                logger.error(
-                    f"[{task_id}] Chunk {chunk_idx + 1}/{total_chunks} failed: {chunk_error}"
-                )
-                failed_chunks.append(chunk_idx)
+                    continue
+
                 if document is not None:
-                    ledger_row, _ = DocumentChunkResult.objects.update_or_create(
-                        document=document,
-                        chunk_index=chunk_idx,
-                        content_hash=content_hash,
-                        defaults={
-                            'status': 'failed',
-                            'structured_json': {},
-                            'error_message': str(chunk_error)[:2000],
-                        },
-                    )
-                    DocumentChunkResult.objects.filter(pk=ledger_row.pk).update(
-                        attempts=models.F('attempts') + 1
-                    )
-                    _log_chunk_api_usage(
-                        document, _get_chunk_usage(), task_id, chunk_idx + 1,
-                        total_chunks, chunk_start, success=False,
-                        error_message=str(chunk_error)[:500],
+                    try:
+                        _check_cost_circuit_breaker(document, task_id)
+                    except AIExtractionError as limit_error:
+                        if not in_flight:
+                            raise
+                        # Drain and checkpoint in-flight calls before raising
+                        breaker_error = limit_error
+                        break
+
+                next_submit += 1
+                logger.info(f"[{task_id}] Processing chunk {chunk_idx + 1}/{total_chunks}")
+                chunk_start = time.time()
+                if executor is None:
+                    _finish_chunk(
+                        chunk_idx, chunk_text, content_hash, chunk_start,
+                        *_extract_chunk(chunk_text, context),
                     )
-                chunk['text'] = ''
-                continue
+                    _flush_chunk_ledger(pending_rows)
+                else:
+                    future = executor.submit(_extract_chunk, chunk_text, context)
+                    in_flight[future] = (chunk_idx, chunk_text, content_hash, chunk_start)
+
+            # 2. Aggregate every contiguous finished chunk, in chunk order
+            while next_aggregate in completed:
+                chunk_data = completed.pop(next_aggregate)
+                chunks[next_aggregate]['text'] = ''
+                next_aggregate += 1
+                if chunk_data is None:
+                    continue
+                _extend_aggregated_from_chunk(aggregated, chunk_data)
+                del chunk_data
 
-        # 3. Aggregate and update progress
-        _extend_aggregated_from_chunk(aggregated, chunk_data)
-        del chunk_data
-        chunk['text'] = ''
+                if document is not None:
+                    try:
+                        document.processing_message = (
+                            f"AI extraction: {next_aggregate}/{total_chunks} chunks"
+                        )
+                        document.save(update_fields=['processing_message'])
+                    except Exception as msg_error:
+                        logger.debug(f"[{task_id}] Could not update progress message: {msg_error}")
+
+                if next_aggregate < total_chunks:
+                    force_memory_cleanup(f"after chunk {next_aggregate}")
+
+            if next_aggregate >= total_chunks:
+                break
+            if not in_flight:
+                if breaker_error is not None:
+                    raise breaker_error
+                continue
 
-        if document is not None:
+            # 3. Wait for at least one in-flight call and checkpoint it
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: in_flight[f][0]):
+                chunk_idx, chunk_text, content_hash, chunk_start = in_flight.pop(future)
+                _finish_chunk(chunk_idx, chunk_text, content_hash, chunk_start, *future.result())
+            _flush_chunk_ledger(pending_rows)
+    finally:
+        if pending_rows:
             try:
-                document.processing_message = (
-                    f"AI extraction: {chunk_idx + 1}/{total_chunks} chunks"
-                )
-                document.save(update_fields=['processing_message'])
-            except Exception as msg_error:
-                logger.debug(f"[{task_id}] Could not update progress message: {msg_error}")
-
-        if chunk_idx < total_chunks - 1:
-            force_memory_cleanup(f"after chunk {chunk_idx + 1}")
+                _flush_chunk_ledger(pending_rows)
+            except Exception as flush_error:
+                logger.error(f"[{task_id}] Failed to checkpoint finished chunks: {flush_error}")
+        if executor is not None:
+            # On soft time limit / breaker, abandon queued work; calls already
+            # on the wire finish in the background and are simply discarded.
+            executor.shutdown(wait=False, cancel_futures=True)
 
     del chunks
     force_memory_cleanup("after all chunks processed")
 
+    failed_chunks.sort()
     succeeded = total_chunks - len(failed_chunks)
     chunk_stats = {
         'total': total_chunks,
         'succeeded': succeeded,
         'failed_chunks': failed_chunks,
         'ledger_hits': ledger_hits,
+        'cache_hits': cache_hits,
     }
 
     partial_threshold = float(getattr(settings, 'AI_CHUNK_PARTIAL_THRESHOLD', 0.85))
@@ -0,0 +1,180 @@
+"""
+Tests for batch-mode chunk extraction.
+
+Covers:
+- Submitting chunks from several documents as provider batch jobs
+- Ingesting ended batches into the DocumentChunkResult ledger
+- Skipping chunks the ledger already has or an open batch is working on
+- Single-chunk documents reading their batch result from the ledger
+- Batch usage costed at AI_BATCH_COST_FACTOR
+"""
+import json
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.documents.models import Document, DocumentChunkResult, ExtractionBatch
+from apps.documents.services.batch_extraction import (
+    BatchExtractionService,
+    LocalBatchProvider,
+    chunk_custom_id,
+)
+from apps.documents.tasks import _estimate_chunk_cost, _load_single_chunk_from_ledger
+from apps.patients.models import Patient
+
+
+def _respond(params):
+    return json.dumps({'conditions': [{
+        'name': 'Hypertension',
+        'confidence': 0.9,
+        'source': {'text': 'hypertension'},
+    }]})
+
+
+class BatchExtractionServiceTests(TestCase):
+    """Chunks go out as batch jobs and come back through the ledger."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='batch-extract', password='pass123')
+        patient = Patient.objects.create(
+            first_name='Batch', last_name='Backfill', mrn='BATCH-EXTRACT-1',
+            date_of_birth='1975-05-05', created_by=self.user,
+        )
+        self.documents = []
+        for index in range(2):
+            document = Document.objects.create(
+                filename=f'note-{index}.pdf',
+                file=SimpleUploadedFile(f'note-{index}.pdf', b'%PDF-1.4 note', content_type='application/pdf'),
+                patient=patient,
+                status='completed',
+                created_by=self.user,
+                uploaded_by=self.user,
+            )
+            document.save_extracted_text(f"--- Page 1 ---\nAssessment {index}: hypertension")
+            self.documents.append(document)
+
+    def _service(self, **provider_kwargs):
+        provider_kwargs.setdefault('respond', _respond)
+        return BatchExtractionService(provider=LocalBatchProvider(**provider_kwargs))
+
+    def test_submit_queues_pending_rows(self):
+        service = self._service(auto_end=False)
+
+        summary = service.submit_documents(self.documents)
+
+        self.assertEqual(summary['requests'], 2)
+        self.assertEqual(len(summary['batches']), 1)
+        batch = ExtractionBatch.objects.get(pk=summary['batches'][0])
+        self.assertEqual(batch.request_count, 2)
+        self.assertEqual(batch.status, 'submitted')
+        rows = DocumentChunkResult.objects.filter(batch=batch)
+        self.assertEqual({row.status for row in rows}, {'pending'})
+        self.assertEqual(
+            [request.custom_id for request in service.provider.batches[batch.provider_batch_id]],
+            [chunk_custom_id(document.id, 0) for document in self.documents],
+        )
+        document = Document.objects.get(pk=self.documents[0].pk)
+        self.assertEqual(document.status, 'processing')
+        self.assertEqual(document.processing_message, 'Queued for batch AI extraction')
+        self.assertIsNone(document.processing_started_at)
+
+    @patch('apps.documents.tasks.continue_document_processing.delay')
+    def test_poll_ingests_results_and_finishes_documents(self, mock_continue):
+        service = self._service()
+        service.submit_documents(self.documents)
+
+        summary = service.poll_batches()
+
+        self.assertEqual(summary, {'open': 1, 'ingested': 1, 'finalized_documents': 2})
+        batch = ExtractionBatch.objects.get()
+        self.assertEqual(batch.status, 'ingested')
+        self.assertEqual(batch.succeeded_count, 2)
+        row = DocumentChunkResult.objects.get(document=self.documents[0])
+        self.assertEqual(row.status, 'succeeded')
+        self.assertEqual(row.attempts, 1)
+        self.assertEqual(row.structured_json['conditions'][0]['name'], 'Hypertension')
+        mock_continue.assert_any_call(self.documents[0].id, '')
+        mock_continue.assert_any_call(self.documents[1].id, '')
+        self.assertIsNotNone(Document.objects.get(pk=self.documents[0].pk).processing_started_at)
+
+    @patch('apps.documents.tasks.continue_document_processing.delay')
+    def test_errored_request_is_recorded_as_failed_chunk(self, mock_continue):
+        def respond(params):
+            if 'Assessment 1' in params['messages'][0]['content']:
+                raise RuntimeError('overloaded')
+            return _respond(params)
+
+        service = self._service(respond=respond)
+        service.submit_documents(self.documents)
+        service.poll_batches()
+
+        row = DocumentChunkResult.objects.get(document=self.documents[1])
+        self.assertEqual(row.status, 'failed')
+        self.assertIn('overloaded', row.error_message)
+        self.assertEqual(ExtractionBatch.objects.get().failed_count, 1)
+        # The resume path retries the failed chunk synchronously
+        self.assertEqual(mock_continue.call_count, 2)
+
+    @patch('apps.documents.tasks.continue_document_processing.delay')
+    def test_resubmit_skips_checkpointed_chunks(self, mock_continue):
+        service = self._service()
+        service.submit_documents(self.documents)
+        service.poll_batches()
+        mock_continue.reset_mock()
+
+        summary = service.submit_documents(self.documents)
+
+        self.assertEqual(summary['requests'], 0)
+        self.assertEqual(summary['ledger_hits'], 2)
+        self.assertEqual(summary['finalized_documents'], [d.id for d in self.documents])
+        self.assertEqual(ExtractionBatch.objects.count(), 1)
+        self.assertEqual(mock_continue.call_count, 2)
+
+    def test_chunks_in_open_batch_are_not_resubmitted(self):
+        service = self._service(auto_end=False)
+        service.submit_documents(self.documents)
+
+        summary = service.submit_documents(self.documents)
+
+        self.assertEqual(summary['requests'], 0)
+        self.assertEqual(summary['queued_documents'], [d.id for d in self.documents])
+        self.assertEqual(ExtractionBatch.objects.count(), 1)
+
+    @override_settings(AI_BATCH_MAX_REQUESTS=1)
+    def test_splits_requests_across_batches(self):
+        summary = self._service(auto_end=False).submit_documents(self.documents)
+
+        self.assertEqual(len(summary['batches']), 2)
+        self.assertEqual(
+            list(ExtractionBatch.objects.values_list('request_count', flat=True)), [1, 1]
+        )
+
+    @patch('apps.documents.tasks.continue_document_processing.delay')
+    def test_single_chunk_document_reads_ledger(self, mock_continue):
+        service = self._service()
+        service.submit_documents(self.documents[:1])
+        service.poll_batches()
+        document = Document.objects.get(pk=self.documents[0].pk)
+
+        extraction = _load_single_chunk_from_ledger(document, document.original_text, 'test-task')
+
+        self.assertEqual(extraction.conditions[0].name, 'Hypertension')
+        self.assertIsNone(
+            _load_single_chunk_from_ledger(document, 'different text', 'test-task')
+        )
+
+
+class BatchCostTests(SimpleTestCase):
+    """Batch usage is billed at the discounted batch rate."""
+
+    @override_settings(AI_BATCH_COST_FACTOR=0.5)
+    def test_batch_usage_is_discounted(self):
+        usage = {'model': 'claude-sonnet-4-5-20250929', 'input_tokens': 10000, 'output_tokens': 2000}
+
+        full = _estimate_chunk_cost(usage)
+        discounted = _estimate_chunk_cost(dict(usage, batch=True))
+
+        self.assertGreater(full, 0)
+        self.assertEqual(discounted, full / 2)
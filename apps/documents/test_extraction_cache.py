@@ -0,0 +1,163 @@
+"""
+Tests for the cross-document chunk extraction cache.
+
+Covers:
+- Keys ignore whitespace/page-header differences but not model or context
+- Encrypted store/lookup round trip and hit counting
+- TTL expiry and least-recently-used eviction
+- Hourly hit-rate metrics for the monitor dashboard
+- _process_chunks_streaming skipping the API on a cache hit
+"""
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from apps.documents.models import ChunkExtractionCacheEntry, Document, DocumentChunkResult
+from apps.documents.services.extraction_cache import ChunkExtractionCache, normalize_chunk_text
+from apps.documents.tasks import _create_empty_aggregated_dict, _process_chunks_streaming
+from apps.patients.models import Patient
+
+MODEL = 'claude-sonnet-4-5-20250929'
+CONTEXT = 'medical_document'
+
+
+def _chunk_dump(name):
+    dump = _create_empty_aggregated_dict()
+    dump['conditions'] = [{'name': name, 'confidence': 0.9, 'source': {'text': name}}]
+    return dump
+
+
+class ChunkCacheKeyTests(SimpleTestCase):
+    """Copies of a page share a key; anything that changes the output doesn't."""
+
+    def test_normalization_drops_page_headers_and_whitespace(self):
+        self.assertEqual(
+            normalize_chunk_text("--- Page 4 (OCR) ---\nMetformin  500mg\n\n BID"),
+            'Metformin 500mg BID',
+        )
+
+    def test_key_ignores_layout_but_not_model_or_context(self):
+        extraction_cache = ChunkExtractionCache()
+        key = extraction_cache.key_for("--- Page 1 ---\nMetformin 500mg BID", MODEL, CONTEXT)
+
+        self.assertEqual(key, extraction_cache.key_for("Metformin   500mg\nBID", MODEL, CONTEXT))
+        self.assertNotEqual(key, extraction_cache.key_for("Metformin 500mg BID", 'other-model', CONTEXT))
+        self.assertNotEqual(key, extraction_cache.key_for("Metformin 500mg BID", MODEL, 'lab_report'))
+        self.assertNotIn('Metformin', key)
+
+
+class ChunkExtractionCacheTests(TestCase):
+    """Store, lookup, eviction and metrics against the database."""
+
+    def setUp(self):
+        cache.clear()
+        self.extraction_cache = ChunkExtractionCache()
+
+    def test_store_then_lookup_hits_across_copies(self):
+        self.extraction_cache.store('BP 120/80', MODEL, CONTEXT, _chunk_dump('Hypertension'), Decimal('0.02'))
+
+        hits = self.extraction_cache.lookup(
+            {0: '--- Page 2 ---\nBP  120/80', 1: 'never seen'}, MODEL, CONTEXT,
+        )
+
+        self.assertEqual(list(hits), [0])
+        self.assertEqual(hits[0]['conditions'][0]['name'], 'Hypertension')
+        entry = ChunkExtractionCacheEntry.objects.get()
+        self.assertEqual(entry.hit_count, 1)
+        self.assertEqual(self.extraction_cache.lookup({0: 'BP 120/80'}, 'other-model', CONTEXT), {})
+
+    def test_expired_entries_miss_and_are_evicted(self):
+        self.extraction_cache.store('old page', MODEL, CONTEXT, _chunk_dump('Asthma'))
+        ChunkExtractionCacheEntry.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(self.extraction_cache.lookup({0: 'old page'}, MODEL, CONTEXT), {})
+        self.assertEqual(self.extraction_cache.evict(), {'expired': 1, 'lru': 0})
+        self.assertFalse(ChunkExtractionCacheEntry.objects.exists())
+
+    @override_settings(AI_EXTRACTION_CACHE_MAX_ENTRIES=2)
+    def test_evicts_least_recently_used_beyond_limit(self):
+        extraction_cache = ChunkExtractionCache()
+        for index, text in enumerate(['page a', 'page b', 'page c']):
+            extraction_cache.store(text, MODEL, CONTEXT, _chunk_dump(text))
+            ChunkExtractionCacheEntry.objects.filter(
+                cache_key=extraction_cache.key_for(text, MODEL, CONTEXT),
+            ).update(last_used_at=timezone.now() - timedelta(hours=3 - index))
+        # A hit on the oldest entry makes 'page b' the least recently used
+        extraction_cache.lookup({0: 'page a'}, MODEL, CONTEXT)
+
+        self.assertEqual(extraction_cache.evict(), {'expired': 0, 'lru': 1})
+        remaining = extraction_cache.lookup({'a': 'page a', 'b': 'page b', 'c': 'page c'}, MODEL, CONTEXT)
+        self.assertEqual(set(remaining), {'a', 'c'})
+
+    def test_stats_report_hit_rate_and_savings(self):
+        self.extraction_cache.store('shared page', MODEL, CONTEXT, _chunk_dump('Gout'), Decimal('0.05'))
+        self.extraction_cache.lookup({0: 'shared page', 1: 'new page', 2: 'other page'}, MODEL, CONTEXT)
+        self.extraction_cache.lookup({0: 'shared page'}, MODEL, CONTEXT)
+
+        stats = self.extraction_cache.stats(hours=24)
+
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['hit_rate'], 50.0)
+        self.assertEqual(stats['entries'], 1)
+        self.assertAlmostEqual(stats['saved_usd'], 0.10)
+
+    @override_settings(AI_EXTRACTION_CACHE_ENABLED=False)
+    def test_disabled_cache_is_a_no_op(self):
+        extraction_cache = ChunkExtractionCache()
+
+        self.assertFalse(extraction_cache.store('page', MODEL, CONTEXT, _chunk_dump('Asthma')))
+        self.assertEqual(extraction_cache.lookup({0: 'page'}, MODEL, CONTEXT), {})
+
+
+@override_settings(MEDIA_ROOT='/tmp/test_pipeline_media', AI_MODEL_PRIMARY=MODEL)
+class StreamingCacheIntegrationTests(TestCase):
+    """_process_chunks_streaming consults the cache before paying for a chunk."""
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='chunk-cache', password='pass123')
+        patient = Patient.objects.create(
+            first_name='Cache', last_name='Hit', mrn='CHUNK-CACHE-1',
+            date_of_birth='1970-01-01', created_by=user,
+        )
+        self.document = Document.objects.create(
+            filename='dup.pdf',
+            file=SimpleUploadedFile('dup.pdf', b'%PDF-1.4 dup', content_type='application/pdf'),
+            patient=patient,
+            created_by=user,
+            uploaded_by=user,
+        )
+
+    @patch('apps.documents.services.ai_extraction.extract_medical_data_structured')
+    def test_cached_chunk_skips_api_and_is_checkpointed(self, mock_extract):
+        ChunkExtractionCache().store(
+            'Discharge instructions: follow up in 2 weeks', MODEL, CONTEXT, _chunk_dump('Cached'),
+        )
+        fresh_result = MagicMock()
+        fresh_result.model_dump.return_value = _chunk_dump('Fresh')
+        mock_extract.return_value = fresh_result
+
+        chunks = [
+            {'text': '--- Page 7 ---\nDischarge instructions:\nfollow up in 2 weeks', 'chunk_id': 0},
+            {'text': 'New assessment for this visit', 'chunk_id': 1},
+        ]
+        result, chunk_stats = _process_chunks_streaming(
+            chunks, CONTEXT, 'task-chunk-cache', document=self.document
+        )
+
+        self.assertEqual(mock_extract.call_count, 1)
+        self.assertEqual(chunk_stats['cache_hits'], 1)
+        self.assertEqual(chunk_stats['succeeded'], 2)
+        self.assertEqual([c.name for c in result.conditions], ['Cached', 'Fresh'])
+        cached_row = DocumentChunkResult.objects.get(document=self.document, chunk_index=0)
+        self.assertEqual(cached_row.status, 'succeeded')
+        self.assertEqual(cached_row.cost_usd, 0)
+        # The freshly extracted chunk is now available to other documents
+        self.assertEqual(ChunkExtractionCacheEntry.objects.count(), 2)
@@ -9,12 +9,16 @@ Covers the plan's verification checklist:
 - Partial completion threshold + failed-chunk continuation (Phase 3.3)
 - Soft time limit resume re-enqueue (Phase 3.3)
 - Per-document and daily cost circuit breakers (Phase 3.4)
+- Bounded-concurrency chunk extraction with in-order aggregation
 """
+import threading
+import time
 from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import F
 from django.test import TestCase, override_settings
 from django.utils import timezone
 
@@ -310,6 +314,239 @@ class LedgerSkipOnRetryTests(TestCase):
             self.assertEqual(row.status, 'succeeded')
             self.assertEqual(row.attempts, 1)
 
+    @patch('apps.documents.services.ai_extraction.extract_medical_data_structured')
+    def test_ledger_prefetched_once_and_upserted_per_chunk(self, mock_extract):
+        """Ledger reads are one query per document; each finished chunk is
+        one upsert plus one attempts UPDATE."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        fresh_result = MagicMock()
+        fresh_result.model_dump.return_value = _empty_chunk_dump()
+        mock_extract.return_value = fresh_result
+
+        chunks = [{'text': f'chunk {i}', 'chunk_id': i} for i in range(4)]
+        with CaptureQueriesContext(connection) as ctx:
+            _process_chunks_streaming(
+                chunks, 'medical_document', 'task-bulk', document=self.document
+            )
+
+        ledger_sql = [
+            q['sql'] for q in ctx.captured_queries
+            if 'document_chunk_results' in q['sql'] and 'SUM(' not in q['sql']
+        ]
+        selects = [sql for sql in ledger_sql if sql.startswith('SELECT')]
+        inserts = [sql for sql in ledger_sql if sql.startswith('INSERT')]
+        updates = [sql for sql in ledger_sql if sql.startswith('UPDATE')]
+        self.assertEqual(len(selects), 1)
+        self.assertEqual(len(inserts), 4)
+        self.assertEqual(len(updates), 4)
+        self.assertTrue(all('"attempts" = ("document_chunk_results"."attempts" + ' in sql for sql in updates))
+
+    @patch('apps.documents.services.ai_extraction.extract_medical_data_structured')
+    def test_retry_of_failed_chunk_increments_attempts(self, mock_extract):
+        from django.conf import settings
+        model = getattr(settings, 'AI_MODEL_PRIMARY', 'claude-sonnet-4-5-20250929')
+        DocumentChunkResult.objects.create(
+            document=self.document,
+            chunk_index=0,
+            content_hash=_chunk_content_hash('flaky chunk', model),
+            status='failed',
+            structured_json={},
+            error_message='timeout',
+            attempts=1,
+        )
+        fresh_result = MagicMock()
+        fresh_result.model_dump.return_value = _empty_chunk_dump()
+        mock_extract.return_value = fresh_result
+
+        _process_chunks_streaming(
+            [{'text': 'flaky chunk', 'chunk_id': 0}],
+            'medical_document', 'task-retry', document=self.document,
+        )
+
+        row = DocumentChunkResult.objects.get(document=self.document, chunk_index=0)
+        self.assertEqual(row.status, 'succeeded')
+        self.assertEqual(row.attempts, 2)
+        self.assertEqual(row.error_message, '')
+
+    @patch('apps.documents.services.ai_extraction.extract_medical_data_structured')
+    def test_concurrent_retry_attempts_are_not_lost(self, mock_extract):
+        """Another worker's retry landing after the prefetch still counts."""
+        from django.conf import settings
+        model = getattr(settings, 'AI_MODEL_PRIMARY', 'claude-sonnet-4-5-20250929')
+        row = DocumentChunkResult.objects.create(
+            document=self.document,
+            chunk_index=0,
+            content_hash=_chunk_content_hash('flaky chunk', model),
+            status='failed',
+            structured_json={},
+            error_message='timeout',
+            attempts=1,
+        )
+
+        def extract_while_other_worker_retries(*args, **kwargs):
+            DocumentChunkResult.objects.filter(pk=row.pk).update(attempts=F('attempts') + 1)
+            result = MagicMock()
+            result.model_dump.return_value = _empty_chunk_dump()
+            return result
+
+        mock_extract.side_effect = extract_while_other_worker_retries
+
+        _process_chunks_streaming(
+            [{'text': 'flaky chunk', 'chunk_id': 0}],
+            'medical_document', 'task-retry-race', document=self.document,
+        )
+
+        row.refresh_from_db()
+        self.assertEqual(row.attempts, 3)
+
+    @patch('apps.documents.services.ai_extraction.extract_medical_data_structured')
+    def test_row_inserted_after_prefetch_is_counted(self, mock_extract):
+        """A row another worker created after the prefetch still gets this attempt."""
+        from django.conf import settings
+        model = getattr(settings, 'AI_MODEL_PRIMARY', 'claude-sonnet-4-5-20250929')
+
+        def extract_while_other_worker_inserts(*args, **kwargs):
+            DocumentChunkResult.objects.create(
+                document=self.document,
+                chunk_index=0,
+                content_hash=_chunk_content_hash('racing chunk', model),
+                status='failed',
+                structured_json={},
+                error_message='timeout',
+                attempts=1,
+            )
+            result = MagicMock()
+            result.model_dump.return_value = _empty_chunk_dump()
+            return result
+
+        mock_extract.side_effect = extract_while_other_worker_inserts
+
+        _process_chunks_streaming(
+            [{'text': 'racing chunk', 'chunk_id': 0}],
+            'medical_document', 'task-insert-race', document=self.document,
+        )
+
+        row = DocumentChunkResult.objects.get(document=self.document, chunk_index=0)
+        self.assertEqual(row.status, 'succeeded')
+        self.assertEqual(row.attempts, 2)
+
+
+@override_settings(MEDIA_ROOT='/tmp/test_pipeline_media', AI_CHUNK_CONCURRENCY=4)
+class ConcurrentChunkProcessingTests(TestCase):
+    """AI_CHUNK_CONCURRENCY > 1 overlaps API calls without changing results."""
+
+    def setUp(self):
+        self.user = _create_user('concurrenttest')
+        self.patient = _create_patient(self.user, mrn='CONC-001')
+        self.document = _create_document(self.user, self.patient)
+
+    def _fake_extract(self, delays=None, failures=()):
+        """Build an extract side effect keyed on chunk text that tracks overlap."""
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def side_effect(text, context=None):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            try:
+                time.sleep((delays or {}).get(text, 0.05))
+                if text in failures:
+                    raise RuntimeError(f'{text} exploded')
+                result = MagicMock()
+                result.model_dump.return_value = _empty_chunk_dump(conditions=[{
+                    'name': f'Condition {text}', 'confidence': 0.9,
+                    'source': {'text': text},
+                }])
+                return result
+            finally:
+                with lock:
+                    state['active'] -= 1
+
+        return side_effect, state
+
+    @patch('apps.documents.services.ai_extraction.extract_medical_data_structured')
+    def test_calls_overlap_and_aggregate_in_chunk_order(self, mock_extract):
+        """Later chunks finishing first must not reorder the aggregate."""
+        texts = ['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot']
+        side_effect, state = self._fake_extract(delays={'alpha': 0.2, 'bravo': 0.15})
+        mock_extract.side_effect = side_effect
+
+        chunks = [{'text': text, 'chunk_id': i} for i, text in enumerate(texts)]
+        result, chunk_stats = _process_chunks_streaming(
+            chunks, 'medical_document', 'task-concurrent', document=self.document
+        )
+
+        self.assertGreater(state['peak'], 1)
+        self.assertLessEqual(state['peak'], 4)
+        self.assertEqual(chunk_stats['succeeded'], len(texts))
+        self.assertEqual(
+            [c.name for c in result.conditions],
+            [f'Condition {text}' for text in texts],
+        )
+        rows = DocumentChunkResult.objects.filter(document=self.document)
+        self.assertEqual(rows.count(), len(texts))
+        for row in rows:
+            self.assertEqual(row.status, 'succeeded')
+            self.assertEqual(row.attempts, 1)
+
+    @override_settings(AI_CHUNK_PARTIAL_THRESHOLD=0.5)
+    @patch('apps.documents.services.ai_extraction.extract_medical_data_structured')
+    def test_failed_chunk_recorded_with_concurrency(self, mock_extract):
+        side_effect, _ = self._fake_extract(failures={'bravo'})
+        mock_extract.side_effect = side_effect
+
+        chunks = [
+            {'text': text, 'chunk_id': i}
+            for i, text in enumerate(['alpha', 'bravo', 'charlie'])
+        ]
+        result, chunk_stats = _process_chunks_streaming(
+            chunks, 'medical_document', 'task-concurrent-fail', document=self.document
+        )
+
+        self.assertEqual(chunk_stats['failed_chunks'], [1])
+        self.assertEqual(
+            [c.name for c in result.conditions],
+            ['Condition alpha', 'Condition charlie'],
+        )
+        failed_row = DocumentChunkResult.objects.get(document=self.document, chunk_index=1)
+        self.assertEqual(failed_row.status, 'failed')
+        self.assertIn('bravo exploded', failed_row.error_message)
+
+    @patch('apps.documents.services.ai_extraction.extract_medical_data_structured')
+    def test_ledger_hits_skip_api_with_concurrency(self, mock_extract):
+        from django.conf import settings
+        model = getattr(settings, 'AI_MODEL_PRIMARY', 'claude-sonnet-4-5-20250929')
+        DocumentChunkResult.objects.create(
+            document=self.document,
+            chunk_index=1,
+            content_hash=_chunk_content_hash('bravo', model),
+            status='succeeded',
+            structured_json=_empty_chunk_dump(conditions=[{
+                'name': 'From ledger', 'confidence': 0.9, 'source': {'text': 'ledger'},
+            }]),
+            attempts=1,
+        )
+        side_effect, _ = self._fake_extract()
+        mock_extract.side_effect = side_effect
+
+        chunks = [
+            {'text': text, 'chunk_id': i}
+            for i, text in enumerate(['alpha', 'bravo', 'charlie'])
+        ]
+        result, chunk_stats = _process_chunks_streaming(
+            chunks, 'medical_document', 'task-concurrent-ledger', document=self.document
+        )
+
+        self.assertEqual(mock_extract.call_count, 2)
+        self.assertEqual(chunk_stats['ledger_hits'], 1)
+        self.assertEqual(
+            [c.name for c in result.conditions],
+            ['Condition alpha', 'From ledger', 'Condition charlie'],
+        )
+
 
 @override_settings(MEDIA_ROOT='/tmp/test_pipeline_media')
 class PartialCompletionTests(TestCase):
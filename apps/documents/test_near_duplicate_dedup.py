@@ -0,0 +1,228 @@
+"""
+Tests for near-duplicate detection in chunk aggregation (NearDuplicateIndex).
+
+Covers:
+- NearDuplicateIndex answering exactly like a pairwise SequenceMatcher scan
+- _deduplicate_aggregated and ParallelDocumentProcessor._deduplicate_extracted_data
+  keeping the same items as the original nested loops on mixed fixtures
+- Benchmark: deduplicating 3,000 look-alike medication names
+
+Run the benchmark with: pytest apps/documents/test_near_duplicate_dedup.py --benchmark-only
+"""
+import copy
+import random
+from difflib import SequenceMatcher
+
+from django.test import SimpleTestCase
+
+from apps.documents.performance import NearDuplicateIndex, ParallelDocumentProcessor
+from apps.documents.tasks import _create_empty_aggregated_dict, _deduplicate_aggregated
+
+
+BASE_NAMES = [
+    'Metformin 500 mg', 'Metformin 1000 mg', 'Lisinopril 10 mg', 'Lisinopril 20 mg',
+    'Atorvastatin 40 mg', 'Amlodipine 5 mg', 'Insulin glargine', 'Aspirin 81 mg',
+    'Type 2 diabetes mellitus', 'Essential hypertension', 'Hyperlipidemia',
+    'Chronic kidney disease stage 3', 'Coronary artery bypass graft',
+    'Total knee arthroplasty', 'Colonoscopy', 'CHF', 'AF', 'O2', '', 'x',
+]
+
+
+def _is_similar(a, b, threshold=0.85):
+    return SequenceMatcher(None, a.lower(), b.lower()).ratio() > threshold
+
+
+def _item_name(item):
+    return item.get('name', str(item)) if isinstance(item, dict) else str(item)
+
+
+def _reference_aggregated(items):
+    """The pairwise loop _deduplicate_aggregated used before indexing."""
+    deduplicated = []
+    for item in items:
+        is_duplicate = False
+        for existing in deduplicated:
+            if _is_similar(_item_name(item), _item_name(existing)):
+                if isinstance(item, dict) and isinstance(existing, dict):
+                    if item.get('confidence', 0) > existing.get('confidence', 0):
+                        deduplicated[deduplicated.index(existing)] = item
+                is_duplicate = True
+                break
+        if not is_duplicate:
+            deduplicated.append(item)
+    return deduplicated
+
+
+def _reference_extracted(items):
+    """The pairwise loop _deduplicate_extracted_data used before indexing."""
+    deduplicated = []
+    for item in items:
+        if not any(_is_similar(_item_name(item), _item_name(e)) for e in deduplicated):
+            deduplicated.append(item)
+    return deduplicated
+
+
+def _variant(rng, name):
+    """A chunk-overlap style re-extraction: case changes, typos, suffixes."""
+    choice = rng.randrange(6)
+    if choice == 0 and name:
+        i = rng.randrange(len(name))
+        return name[:i] + name[i + 1:]
+    if choice == 1 and name:
+        i = rng.randrange(len(name))
+        return name[:i] + rng.choice('aeiou ') + name[i:]
+    if choice == 2:
+        return name.upper()
+    if choice == 3:
+        return f'{name} tablet'
+    if choice == 4:
+        return name.title()
+    return name
+
+
+def _extracted_items(rng, count):
+    items = []
+    for _ in range(count):
+        name = _variant(rng, rng.choice(BASE_NAMES))
+        kind = rng.randrange(10)
+        if kind == 0:
+            items.append(name)
+        elif kind == 1:
+            items.append({'code': name, 'confidence': 0.5})
+        else:
+            items.append({'name': name, 'confidence': round(rng.random(), 2)})
+    return items
+
+
+class NearDuplicateIndexTests(SimpleTestCase):
+    """The index returns the first slot a linear SequenceMatcher scan would."""
+
+    def _linear_find(self, names, query):
+        for slot, name in enumerate(names):
+            if _is_similar(query, name):
+                return slot
+        return None
+
+    def test_find_matches_linear_scan(self):
+        rng = random.Random(7)
+        index = NearDuplicateIndex(threshold=0.85)
+        names = []
+        for _ in range(400):
+            query = _variant(rng, rng.choice(BASE_NAMES))
+            self.assertEqual(index.find(query), self._linear_find(names, query), query)
+            if rng.random() < 0.5:
+                names.append(query)
+                index.add(query)
+
+    def test_short_names_match_without_shared_bigrams(self):
+        index = NearDuplicateIndex(threshold=0.85)
+        index.add('Metformin')
+        index.add('a')
+        index.add('')
+
+        self.assertEqual(index.find('A'), 1)
+        self.assertEqual(index.find(''), 2)
+        self.assertIsNone(index.find('ab'))
+
+    def test_replace_reindexes_slot(self):
+        index = NearDuplicateIndex(threshold=0.85)
+        index.add('Lisinopril 10 mg')
+        index.replace(0, 'Atorvastatin 40 mg')
+
+        self.assertIsNone(index.find('Lisinopril 10 mg'))
+        self.assertEqual(index.find('atorvastatin 40mg'), 0)
+
+    def test_low_threshold_falls_back_to_full_scan(self):
+        index = NearDuplicateIndex(threshold=0.4)
+        index.add('ab')
+        index.add('ba')
+
+        # 'ab' / 'ba' share no bigram yet their ratio of 0.5 passes
+        self.assertEqual(index.find('ba'), 0)
+
+
+class AggregatedDedupParityTests(SimpleTestCase):
+    """Both dedup paths keep exactly what the pairwise loops kept."""
+
+    def test_deduplicate_aggregated_matches_pairwise_loop(self):
+        rng = random.Random(11)
+        for _ in range(5):
+            aggregated = _create_empty_aggregated_dict()
+            for data_type in ('conditions', 'medications', 'procedures'):
+                aggregated[data_type] = _extracted_items(rng, 150)
+            expected = {
+                data_type: _reference_aggregated(copy.deepcopy(aggregated[data_type]))
+                for data_type in ('conditions', 'medications', 'procedures')
+            }
+
+            _deduplicate_aggregated(aggregated)
+
+            for data_type, items in expected.items():
+                self.assertEqual(aggregated[data_type], items)
+
+    def test_higher_confidence_duplicate_replaces_kept_item(self):
+        aggregated = _create_empty_aggregated_dict()
+        aggregated['medications'] = [
+            {'name': 'Metformin 500 mg', 'confidence': 0.6},
+            {'name': 'Lisinopril 10 mg', 'confidence': 0.9},
+            {'name': 'metformin 500mg', 'confidence': 0.95},
+            {'name': 'Metformin 500 mg', 'confidence': 0.7},
+        ]
+
+        _deduplicate_aggregated(aggregated)
+
+        self.assertEqual(aggregated['medications'], [
+            {'name': 'metformin 500mg', 'confidence': 0.95},
+            {'name': 'Lisinopril 10 mg', 'confidence': 0.9},
+        ])
+
+    def test_parallel_processor_matches_pairwise_loop(self):
+        rng = random.Random(13)
+        aggregated = {
+            data_type: _extracted_items(rng, 200)
+            for data_type in ('conditions', 'medications', 'procedures')
+        }
+        expected = {
+            data_type: _reference_extracted(list(items))
+            for data_type, items in aggregated.items()
+        }
+
+        result = ParallelDocumentProcessor(max_workers=1)._deduplicate_extracted_data(aggregated)
+
+        self.assertEqual(result, expected)
+
+
+class TestNearDuplicateDedupBenchmark:
+    """pytest-benchmark guard for large aggregated extractions."""
+
+    SYLLABLES = ['al', 'bu', 'car', 'de', 'dro', 'em', 'fen', 'fo', 'gab', 'hex', 'i', 'ka', 'lo',
+                 'mi', 'nap', 'ox', 'pre', 'quin', 'ro', 'sul', 'ta', 'tri', 'um', 'val', 'xy', 'zo']
+    SUFFIXES = ['pril', 'sartan', 'statin', 'olol', 'azole', 'cillin', 'mab', 'tide', 'pine', 'done']
+
+    def _drug_name(self, rng):
+        stem = ''.join(rng.choice(self.SYLLABLES) for _ in range(rng.randint(1, 3)))
+        dose = rng.choice([5, 10, 20, 25, 40, 50, 100, 250, 500])
+        return f'{stem}{rng.choice(self.SUFFIXES)} {dose} mg'
+
+    def test_deduplicate_3000_medications(self, benchmark):
+        """
+        Benchmark deduplicating 3,000 medications re-extracted from 1,500
+        look-alike drug names.
+        Expected: under 5s; the pairwise loop takes about a minute here.
+        """
+        rng = random.Random(17)
+        distinct = [self._drug_name(rng) for _ in range(1500)]
+        medications = [
+            {'name': _variant(rng, rng.choice(distinct)), 'confidence': round(rng.random(), 2)}
+            for _ in range(3000)
+        ]
+
+        def setup():
+            aggregated = _create_empty_aggregated_dict()
+            aggregated['medications'] = list(medications)
+            return (aggregated,), {}
+
+        benchmark.pedantic(_deduplicate_aggregated, setup=setup, rounds=2)
+
+        max_ms = benchmark.stats.stats.max * 1000
+        assert max_ms < 5000, f"Max dedup time {max_ms:.2f}ms exceeds 5000ms target"
@@ -0,0 +1,247 @@
+"""
+Tests for page-parallel PDF extraction (apps.documents.page_extraction).
+
+Covers:
+- Process-pool parsing producing the same text, page order and separators
+  as the serial path
+- Falling back to serial parsing, and to OCR routing, when workers fail
+- Parallel parsing from a daemonic process, as in a Celery prefork worker
+- Textract sync fan-out for scanned pages of multi-page PDFs, with the async
+  S3 workflow as fallback
+"""
+import io
+import multiprocessing
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+from PyPDF2 import PdfReader, PdfWriter
+from reportlab.pdfgen import canvas
+
+from apps.documents.page_extraction import (
+    ParsedPage,
+    parse_page_batch,
+    parse_pages_parallel,
+    split_pdf_pages,
+)
+from apps.documents.services import PDFTextExtractor
+from apps.documents.services.textract import TextractAPIError
+
+
+def _write_pdf(pages):
+    """
+    Write a PDF with one page per entry: text strings become native text
+    pages, None becomes a scanned-style page with no fonts.
+    """
+    text_buffer = io.BytesIO()
+    pdf = canvas.Canvas(text_buffer)
+    for text in pages:
+        if text is not None:
+            pdf.drawString(72, 720, text)
+            pdf.showPage()
+    pdf.save()
+
+    # reportlab shares one font resource across pages, so scanned pages are
+    # added as blank pages without /Resources
+    text_pages = iter(PdfReader(io.BytesIO(text_buffer.getvalue())).pages)
+    writer = PdfWriter()
+    for text in pages:
+        if text is None:
+            writer.add_blank_page(width=612, height=792)
+        else:
+            writer.add_page(next(text_pages))
+    temp_file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
+    writer.write(temp_file)
+    temp_file.close()
+    return temp_file.name
+
+
+def _parse_in_daemon(pdf_path, page_count, queue):
+    """Daemonic process target: report what parse_pages_parallel returned."""
+    try:
+        parsed = parse_pages_parallel(pdf_path, page_count, workers=2, batch_size=5)
+        queue.put({n: (p.text, p.error) for n, p in parsed.items()})
+    except Exception as exc:
+        queue.put(repr(exc))
+
+
+def _fake_textract_service():
+    """Textract double whose OCR text names the page it was given."""
+    service = MagicMock()
+
+    def process_document_sync(document_bytes):
+        # Every call must carry exactly one page
+        assert len(PdfReader(io.BytesIO(document_bytes)).pages) == 1
+        result = MagicMock(page_count=1, confidence=90.0, extraction_time_ms=50, blocks=[object()])
+        result.get_tables.return_value = []
+        result.get_forms.return_value = []
+        return result
+
+    def extract_text_from_result(result, page_number_offset=0):
+        page_number = page_number_offset + 1
+        return f"--- Page {page_number} (OCR) ---\nScanned text {page_number}"
+
+    service.process_document_sync.side_effect = process_document_sync
+    service.extract_text_from_result.side_effect = extract_text_from_result
+    return service
+
+
+class PageBatchParsingTests(SimpleTestCase):
+    """The worker functions themselves, run in-process."""
+
+    def setUp(self):
+        self.pdf_path = _write_pdf(['Visit note one', None, 'Visit note three'])
+
+    def tearDown(self):
+        os.unlink(self.pdf_path)
+
+    def test_parse_page_batch_reports_text_and_fonts(self):
+        parsed = parse_page_batch(self.pdf_path, [1, 2, 3])
+
+        self.assertEqual([p.page_number for p in parsed], [1, 2, 3])
+        self.assertIn('Visit note one', parsed[0].text)
+        self.assertEqual([p.has_fonts for p in parsed], [True, False, True])
+        self.assertTrue(all(p.error is None for p in parsed))
+
+    def test_parse_page_batch_reports_bad_page_without_raising(self):
+        parsed = parse_page_batch(self.pdf_path, [3, 9])
+
+        self.assertIsNone(parsed[0].error)
+        self.assertEqual(parsed[1].page_number, 9)
+        self.assertIsNotNone(parsed[1].error)
+
+    def test_split_pdf_pages_yields_single_page_pdfs(self):
+        pages = list(split_pdf_pages(self.pdf_path, [2, 3]))
+
+        self.assertEqual([page_number for page_number, _ in pages], [2, 3])
+        for _, page_bytes in pages:
+            self.assertEqual(len(PdfReader(io.BytesIO(page_bytes)).pages), 1)
+
+
+class ParallelExtractionTests(SimpleTestCase):
+    """PDFTextExtractor output does not depend on how pages were parsed."""
+
+    def setUp(self):
+        self.pages = [f'Progress note page {n}' for n in range(1, 13)]
+        self.pdf_path = _write_pdf(self.pages)
+
+    def tearDown(self):
+        os.unlink(self.pdf_path)
+
+    def test_process_pool_matches_serial_output(self):
+        serial = PDFTextExtractor().extract_text(self.pdf_path)
+
+        with override_settings(PDF_PAGE_WORKERS=2, PDF_PARALLEL_MIN_PAGES=4, PDF_PAGE_BATCH_SIZE=5):
+            parallel = PDFTextExtractor().extract_text(self.pdf_path)
+
+        self.assertTrue(parallel['success'])
+        self.assertEqual(parallel['text'], serial['text'])
+        self.assertEqual(parallel['metadata']['text_pages'], list(range(1, 13)))
+        positions = [parallel['text'].index(f'--- Page {n} ---') for n in range(1, 13)]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_parse_pages_parallel_returns_every_page(self):
+        parsed = parse_pages_parallel(self.pdf_path, 12, workers=2, batch_size=5)
+
+        self.assertEqual(sorted(parsed), list(range(1, 13)))
+        self.assertIn('Progress note page 7', parsed[7].text)
+
+    def test_parse_pages_parallel_inside_daemonic_process(self):
+        """Celery prefork workers are daemonic; the pool must still start there."""
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        worker = context.Process(target=_parse_in_daemon, args=(self.pdf_path, 12, queue), daemon=True)
+        worker.start()
+        try:
+            parsed = queue.get(timeout=60)
+        finally:
+            worker.join(10)
+
+        self.assertIsInstance(parsed, dict, parsed)
+        self.assertEqual(sorted(parsed), list(range(1, 13)))
+        self.assertIn('Progress note page 7', parsed[7][0])
+        self.assertTrue(all(error is None for _text, error in parsed.values()))
+
+    @override_settings(PDF_PAGE_WORKERS=2, PDF_PARALLEL_MIN_PAGES=4)
+    def test_pool_failure_falls_back_to_serial(self):
+        with patch('services_module.parse_pages_parallel', side_effect=OSError('no processes')):
+            result = PDFTextExtractor().extract_text(self.pdf_path)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['metadata']['extraction_method'], 'embedded_text')
+        self.assertIn('Progress note page 12', result['text'])
+
+    @override_settings(PDF_PAGE_WORKERS=2, PDF_PARALLEL_MIN_PAGES=4)
+    def test_dead_worker_pages_are_routed_to_ocr(self):
+        def parsed_with_dead_batch(file_path, page_count, **kwargs):
+            parsed = parse_page_batch(file_path, list(range(1, page_count + 1)))
+            results = {p.page_number: p for p in parsed}
+            for page_number in (11, 12):
+                results[page_number] = ParsedPage(page_number, None, False, 'worker died')
+            return results
+
+        with patch('services_module.parse_pages_parallel', side_effect=parsed_with_dead_batch):
+            result = PDFTextExtractor().extract_text(self.pdf_path)
+
+        self.assertEqual(result['metadata']['image_pages'], [11, 12])
+        self.assertEqual(result['metadata']['chars_per_page'][11], 0)
+        self.assertTrue(result['ocr_pending'])
+
+
+class TextractPageFanOutTests(SimpleTestCase):
+    """Scanned pages of multi-page PDFs OCR'd through the sync API in parallel."""
+
+    def setUp(self):
+        self.pdf_path = _write_pdf(['Intake form', None, 'Discharge summary', None, None])
+
+    def tearDown(self):
+        os.unlink(self.pdf_path)
+
+    def _extractor(self, service):
+        extractor = PDFTextExtractor()
+        extractor._textract_service = service
+        return extractor
+
+    @override_settings(OCR_SYNC_PAGE_WORKERS=2)
+    def test_scanned_pages_are_interleaved_in_page_order(self):
+        service = _fake_textract_service()
+
+        result = self._extractor(service).extract_text(self.pdf_path)
+
+        self.assertTrue(result['success'])
+        self.assertNotIn('ocr_pending', result)
+        self.assertEqual(service.process_document_sync.call_count, 3)
+        separators = [
+            '--- Page 1 ---', '--- Page 2 (OCR) ---', '--- Page 3 ---',
+            '--- Page 4 (OCR) ---', '--- Page 5 (OCR) ---',
+        ]
+        positions = [result['text'].index(separator) for separator in separators]
+        self.assertEqual(positions, sorted(positions))
+        self.assertIn('Scanned text 4', result['text'])
+
+        textract_metadata = result['metadata']['textract_metadata']
+        self.assertEqual(textract_metadata['page_count'], 3)
+        self.assertEqual(textract_metadata['extraction_time_ms'], 150)
+        self.assertEqual(result['metadata']['extraction_method'], 'hybrid')
+
+    @override_settings(OCR_SYNC_PAGE_WORKERS=2)
+    def test_page_failure_falls_back_to_async_workflow(self):
+        service = _fake_textract_service()
+        service.process_document_sync.side_effect = TextractAPIError(
+            'Throttled', error_code='ProvisionedThroughputExceededException'
+        )
+
+        result = self._extractor(service).extract_text(self.pdf_path)
+
+        self.assertTrue(result['ocr_pending'])
+        self.assertIn('Intake form', result['text'])
+        self.assertNotIn('(OCR)', result['text'])
+
+    def test_fan_out_is_off_by_default(self):
+        service = _fake_textract_service()
+
+        result = self._extractor(service).extract_text(self.pdf_path)
+
+        self.assertTrue(result['ocr_pending'])
+        service.process_document_sync.assert_not_called()
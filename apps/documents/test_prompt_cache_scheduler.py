@@ -0,0 +1,210 @@
+"""
+Tests for prompt-cache-aware scheduling of extraction calls.
+
+Covers:
+- Per-worker cache_read/cache_creation hit ratios
+- Keepalive refreshes kept out of the hit ratios
+- One call warming a cold prefix while the others wait
+- Keepalive only while documents are waiting (not in a Message Batch) and
+  the prefix is aging
+- CachedAnthropicExtractor recording usage through the scheduler
+"""
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.documents.models import Document, DocumentChunkResult, ExtractionBatch
+from apps.documents.services.cached_extraction import CachedAnthropicExtractor
+from apps.documents.services.prompt_cache_scheduler import PromptCacheScheduler
+from apps.patients.models import Patient
+
+MODEL = 'claude-sonnet-4-5-20250929'
+
+
+def _usage(cache_read=0, cache_creation=0, input_tokens=200):
+    return {
+        'model': MODEL,
+        'input_tokens': input_tokens,
+        'output_tokens': 50,
+        'cache_read_input_tokens': cache_read,
+        'cache_creation_input_tokens': cache_creation,
+    }
+
+
+@override_settings(AI_MODEL_PRIMARY=MODEL)
+class PromptCacheMetricsTests(SimpleTestCase):
+    """record_call() feeds per-worker and overall hit ratios."""
+
+    def setUp(self):
+        cache.clear()
+        self.scheduler = PromptCacheScheduler()
+
+    def test_hit_ratios_per_worker(self):
+        self.scheduler.record_call(_usage(cache_creation=4000), worker='worker-a')
+        self.scheduler.record_call(_usage(cache_read=4000), worker='worker-a')
+        self.scheduler.record_call(_usage(cache_creation=4000), worker='worker-b')
+
+        stats = self.scheduler.stats(hours=1)
+
+        by_worker = {row['worker']: row for row in stats['workers']}
+        self.assertEqual(by_worker['worker-a']['calls'], 2)
+        self.assertEqual(by_worker['worker-a']['call_hit_ratio'], 50.0)
+        self.assertEqual(by_worker['worker-a']['token_hit_ratio'], round(4000 / 8400 * 100, 1))
+        self.assertEqual(by_worker['worker-b']['call_hit_ratio'], 0.0)
+        self.assertEqual(stats['totals']['calls'], 3)
+        self.assertEqual(stats['totals']['cache_read_input_tokens'], 4000)
+        self.assertTrue(stats['prefix_warm'])
+
+    def test_keepalive_calls_are_not_hits(self):
+        self.scheduler.record_call(_usage(cache_creation=4000), worker='worker-a')
+        self.scheduler.record_call(_usage(cache_read=4000), worker='worker-a', keepalive=True)
+        self.scheduler.record_call(_usage(cache_read=4000), worker='worker-b', keepalive=True)
+
+        stats = self.scheduler.stats(hours=1)
+
+        self.assertEqual(stats['totals']['calls'], 1)
+        self.assertEqual(stats['totals']['keepalive_calls'], 2)
+        self.assertEqual(stats['totals']['call_hit_ratio'], 0.0)
+        self.assertEqual(stats['totals']['cache_read_input_tokens'], 0)
+        self.assertEqual([row['worker'] for row in stats['workers']], ['worker-a', 'worker-b'])
+
+    def test_worker_registry_waits_for_lock(self):
+        """A registration never overwrites one made under the lock."""
+        self.scheduler.record_call(_usage(), worker='worker-a')
+        cache.add('prompt_cache:workers:lock', 'worker-c', 60)
+        released = threading.Timer(0.3, cache.delete, args=['prompt_cache:workers:lock'])
+        released.start()
+
+        self.scheduler.record_call(_usage(), worker='worker-b')
+
+        released.join()
+        self.assertEqual(cache.get('prompt_cache:workers'), ['worker-a', 'worker-b'])
+
+    def test_prefix_cold_until_a_cacheable_call(self):
+        self.assertFalse(self.scheduler.is_warm(MODEL))
+        self.scheduler.record_call(_usage())
+        self.assertFalse(self.scheduler.is_warm(MODEL))
+        self.scheduler.record_call(_usage(cache_creation=4000))
+        self.assertTrue(self.scheduler.is_warm(MODEL))
+
+    @override_settings(AI_PROMPT_CACHE_WARMUP_WAIT_SECONDS=5)
+    def test_cold_prefix_is_warmed_by_one_call(self):
+        scheduler = PromptCacheScheduler()
+        waiter_started = threading.Event()
+        waiter_through = threading.Event()
+
+        def waiter():
+            waiter_started.set()
+            with scheduler.prefix_slot(MODEL):
+                waiter_through.set()
+
+        with scheduler.prefix_slot(MODEL):
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            waiter_started.wait(1)
+            # The second caller holds back while the first warms the prefix
+            self.assertFalse(waiter_through.wait(0.5))
+            scheduler.record_call(_usage(cache_creation=4000))
+
+        thread.join(5)
+        self.assertTrue(waiter_through.is_set())
+
+    def test_warm_prefix_does_not_wait(self):
+        self.scheduler.record_call(_usage(cache_read=4000))
+        cache.add(self.scheduler._warming_key(MODEL), 'other-worker', 60)
+
+        started = time.monotonic()
+        with self.scheduler.prefix_slot(MODEL):
+            pass
+
+        self.assertLess(time.monotonic() - started, 0.2)
+
+
+class PromptCacheKeepaliveTests(TestCase):
+    """keepalive_due() only spends on a prefix that documents will use."""
+
+    def setUp(self):
+        cache.clear()
+        self.scheduler = PromptCacheScheduler()
+        self.user = User.objects.create_user(username='prompt-cache', password='pass123')
+        self.patient = Patient.objects.create(
+            first_name='Prompt', last_name='Cache', mrn='PROMPT-CACHE-1',
+            date_of_birth='1970-01-01', created_by=self.user,
+        )
+
+    def _age_prefix(self, seconds):
+        cache.set(self.scheduler._last_call_key(MODEL), time.time() - seconds, 300)
+
+    def _queue_document(self, status='ocr_pending'):
+        return Document.objects.create(
+            filename='queued.pdf',
+            file=SimpleUploadedFile('queued.pdf', b'%PDF-1.4 q', content_type='application/pdf'),
+            patient=self.patient,
+            status=status,
+            created_by=self.user,
+            uploaded_by=self.user,
+        )
+
+    def test_due_when_prefix_aging_and_documents_waiting(self):
+        self._queue_document()
+        self._age_prefix(200)
+        self.assertTrue(self.scheduler.keepalive_due(MODEL))
+
+    def test_not_due_without_waiting_documents(self):
+        self._queue_document(status='completed')
+        self._age_prefix(200)
+        self.assertFalse(self.scheduler.keepalive_due(MODEL))
+
+    def test_not_due_for_documents_queued_in_a_message_batch(self):
+        document = self._queue_document(status='processing')
+        batch = ExtractionBatch.objects.create(provider='local', status='submitted')
+        DocumentChunkResult.objects.create(
+            document=document, chunk_index=0, content_hash='a' * 64, status='pending', batch=batch,
+        )
+        self._age_prefix(200)
+
+        self.assertFalse(self.scheduler.keepalive_due(MODEL))
+
+        batch.status = 'ingested'
+        batch.save()
+        self.assertTrue(self.scheduler.keepalive_due(MODEL))
+
+    def test_not_due_for_fresh_or_unknown_prefix(self):
+        self._queue_document()
+        self.assertFalse(self.scheduler.keepalive_due(MODEL))
+        self._age_prefix(30)
+        self.assertFalse(self.scheduler.keepalive_due(MODEL))
+
+
+@override_settings(AI_MODEL_PRIMARY=MODEL)
+class CachedExtractorSchedulingTests(SimpleTestCase):
+    """Every extractor call is recorded against the worker that made it."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_refresh_prefix_reads_cache_and_records_usage(self):
+        extractor = CachedAnthropicExtractor(api_key='test-key-not-real')
+        extractor.client = MagicMock()
+        extractor.client.messages.create.return_value = SimpleNamespace(
+            usage=SimpleNamespace(
+                input_tokens=5, output_tokens=1,
+                cache_read_input_tokens=4000, cache_creation_input_tokens=0,
+            ),
+            content=[SimpleNamespace(text='OK')],
+        )
+
+        usage = extractor.refresh_prefix()
+
+        self.assertEqual(usage['cache_read_input_tokens'], 4000)
+        self.assertEqual(extractor.client.messages.create.call_args.kwargs['max_tokens'], 1)
+        stats = PromptCacheScheduler().stats(hours=1)
+        self.assertEqual(stats['totals']['calls'], 0)
+        self.assertEqual(stats['totals']['keepalive_calls'], 1)
+        self.assertTrue(stats['prefix_warm'])
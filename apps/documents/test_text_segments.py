@@ -0,0 +1,127 @@
+"""
+Tests for paged storage of extracted document text.
+
+Covers:
+- split_text_segments cutting text at page headers and by size
+- Document.save_extracted_text writing the preview and segment rows
+- Page range and character span reads, with the fallback for documents
+  that were never segmented
+- The preview and text pages API views
+"""
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from apps.documents.models import Document, DocumentTextSegment, split_text_segments
+from apps.patients.models import Patient
+
+
+PAGED_TEXT = (
+    "--- Page 1 ---\nChief complaint: chest pain\n\n"
+    "--- Page 2 (OCR) ---\nMetoprolol 25mg daily\n\n"
+    "--- Page 3 ---\nFollow up in 2 weeks"
+)
+
+
+class SplitTextSegmentsTests(SimpleTestCase):
+    """Segments follow the PDF and Textract page headers."""
+
+    def test_splits_on_page_headers(self):
+        segments = split_text_segments(PAGED_TEXT)
+
+        self.assertEqual([s['page_number'] for s in segments], [1, 2, 3])
+        self.assertEqual(''.join(s['text'] for s in segments), PAGED_TEXT)
+        self.assertTrue(segments[1]['text'].startswith('--- Page 2 (OCR) ---'))
+        self.assertEqual(
+            segments[2]['char_offset'],
+            PAGED_TEXT.index('--- Page 3 ---'),
+        )
+
+    def test_text_before_first_header_has_no_page(self):
+        segments = split_text_segments("Cover sheet\n" + PAGED_TEXT)
+
+        self.assertIsNone(segments[0]['page_number'])
+        self.assertEqual(segments[0]['text'], "Cover sheet\n")
+
+    @patch('apps.documents.models.TEXT_SEGMENT_MAX_CHARS', 10)
+    def test_cuts_long_segments(self):
+        segments = split_text_segments('x' * 25)
+
+        self.assertEqual([len(s['text']) for s in segments], [10, 10, 5])
+        self.assertEqual([s['segment_index'] for s in segments], [0, 1, 2])
+
+
+class DocumentTextSegmentTests(TestCase):
+    """Reads decrypt only the segments they need."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='text-pages', password='pass123')
+        patient = Patient.objects.create(
+            first_name='Page', last_name='Reader', mrn='TEXT-PAGES-1',
+            date_of_birth='1980-01-01', created_by=self.user,
+        )
+        self.document = Document.objects.create(
+            filename='chart.pdf',
+            file=SimpleUploadedFile('chart.pdf', b'%PDF-1.4 chart', content_type='application/pdf'),
+            patient=patient,
+            created_by=self.user,
+            uploaded_by=self.user,
+        )
+        self.document.save_extracted_text(PAGED_TEXT)
+
+    def test_save_extracted_text(self):
+        document = Document.objects.get(pk=self.document.pk)
+
+        self.assertEqual(document.original_text, PAGED_TEXT)
+        self.assertEqual(document.text_length, len(PAGED_TEXT))
+        self.assertEqual(document.text_segment_count, 3)
+        self.assertEqual(DocumentTextSegment.objects.filter(document=document).count(), 3)
+        self.assertEqual(document.get_text_preview(), PAGED_TEXT[:500])
+
+    def test_page_range_and_span(self):
+        document = Document.objects.defer('original_text').get(pk=self.document.pk)
+
+        pages = document.get_text_pages(2, 3)
+        span_start = PAGED_TEXT.index('Metoprolol')
+        span = document.get_text_span(span_start, span_start + 10)
+
+        self.assertEqual([p['page_number'] for p in pages], [2, 3])
+        self.assertIn('Metoprolol', pages[0]['text'])
+        self.assertEqual(span, 'Metoprolol')
+        self.assertIn('original_text', document.get_deferred_fields())
+
+    def test_direct_text_assignment_marks_segments_stale(self):
+        document = Document.objects.get(pk=self.document.pk)
+        document.original_text = "--- Page 1 ---\nReplaced"
+        document.save(update_fields=['original_text'])
+
+        document = Document.objects.get(pk=self.document.pk)
+        self.assertEqual(document.text_segment_count, 0)
+        self.assertEqual(document.get_text_pages(1)[0]['text'], "--- Page 1 ---\nReplaced")
+        self.assertEqual(document.get_text_preview(), "--- Page 1 ---\nReplaced")
+
+    def test_text_pages_api(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(
+            reverse('documents:api-document-text', args=[self.document.pk]),
+            {'start': 1, 'end': 2},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([p['page_number'] for p in data['pages']], [1, 2])
+        self.assertEqual(data['text_length'], len(PAGED_TEXT))
+
+    def test_text_pages_api_rejects_bad_range(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(
+            reverse('documents:api-document-text', args=[self.document.pk]),
+            {'start': 3, 'end': 1},
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,275 @@
+"""
+Tests for event-driven Textract completion (SNS/SQS notifications).
+
+Covers:
+- Parsing SNS-enveloped and raw Textract completion messages
+- The notification listener against the in-memory queue stand-in
+- handle_textract_completion chaining the pipeline, with the fallback poll
+  and duplicate notifications finalizing a job at most once
+- The poll timeout taking the same finalize claim
+- Start* calls carrying JobTag and NotificationChannel when configured
+"""
+import json
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from apps.documents.models import Document
+from apps.documents.services.textract import TextractService
+from apps.documents.services.textract_notifications import (
+    LocalNotificationQueue,
+    TextractNotificationListener,
+    parse_completion_message,
+)
+from apps.documents.tasks import handle_textract_completion, poll_textract_job
+from apps.patients.models import Patient
+
+
+def _notification(job_id='job-1', status='SUCCEEDED', job_tag='42', envelope=True):
+    message = json.dumps({
+        'JobId': job_id,
+        'Status': status,
+        'API': 'StartDocumentTextDetection',
+        'JobTag': job_tag,
+        'Timestamp': 1760000000000,
+        'DocumentLocation': {'S3ObjectName': 'ocr-temp/42.pdf', 'S3Bucket': 'bucket'},
+    })
+    if not envelope:
+        return message
+    return json.dumps({'Type': 'Notification', 'MessageId': 'm-1', 'Message': message})
+
+
+class CompletionMessageTests(SimpleTestCase):
+    """SQS bodies from an SNS subscription, with or without raw delivery."""
+
+    def test_parses_sns_envelope(self):
+        completion = parse_completion_message(_notification())
+
+        self.assertEqual(completion.job_id, 'job-1')
+        self.assertEqual(completion.status, 'SUCCEEDED')
+        self.assertEqual(completion.document_id, 42)
+        self.assertEqual(completion.s3_key, 'ocr-temp/42.pdf')
+
+    def test_parses_raw_delivery(self):
+        completion = parse_completion_message(_notification(status='FAILED', envelope=False))
+
+        self.assertEqual(completion.status, 'FAILED')
+        self.assertEqual(completion.document_id, 42)
+
+    def test_rejects_unrelated_messages(self):
+        self.assertIsNone(parse_completion_message('not json'))
+        self.assertIsNone(parse_completion_message(json.dumps({'Type': 'SubscriptionConfirmation'})))
+        self.assertIsNone(parse_completion_message(json.dumps({'Type': 'Notification', 'Message': '{}'})))
+
+
+class NotificationListenerTests(SimpleTestCase):
+    """Listener behaviour against the in-memory stand-in for SQS."""
+
+    def test_dispatches_and_deletes_completions(self):
+        queue = LocalNotificationQueue()
+        queue.publish(_notification(job_id='job-1'))
+        queue.publish(_notification(job_id='job-2', job_tag='43'))
+        dispatched = []
+
+        listener = TextractNotificationListener(queue, dispatch=dispatched.append)
+
+        self.assertEqual(listener.poll_once(wait_seconds=0), 2)
+        self.assertEqual([c.document_id for c in dispatched], [42, 43])
+        queue.release_unacknowledged()
+        self.assertEqual(queue.receive(), [])
+
+    def test_failed_dispatch_is_redelivered(self):
+        queue = LocalNotificationQueue()
+        queue.publish(_notification())
+        dispatch = MagicMock(side_effect=[ConnectionError('broker down'), None])
+        listener = TextractNotificationListener(queue, dispatch=dispatch)
+
+        self.assertEqual(listener.poll_once(wait_seconds=0), 0)
+        queue.release_unacknowledged()
+        self.assertEqual(listener.poll_once(wait_seconds=0), 1)
+        self.assertEqual(dispatch.call_count, 2)
+
+    def test_unrecognized_messages_are_dropped(self):
+        queue = LocalNotificationQueue()
+        queue.publish('garbage')
+        queue.publish(_notification(job_tag='not-a-document'))
+        dispatch = MagicMock()
+
+        self.assertEqual(TextractNotificationListener(queue, dispatch=dispatch).poll_once(0), 0)
+        dispatch.assert_not_called()
+        queue.release_unacknowledged()
+        self.assertEqual(queue.receive(), [])
+
+    @patch('apps.documents.tasks.handle_textract_completion.delay')
+    def test_default_dispatch_enqueues_completion_task(self, mock_delay):
+        queue = LocalNotificationQueue()
+        queue.publish(_notification())
+
+        TextractNotificationListener(queue).poll_once(wait_seconds=0)
+
+        mock_delay.assert_called_once_with(42, 'job-1', 'SUCCEEDED', s3_key='ocr-temp/42.pdf')
+
+
+class TextractCompletionTaskTests(TestCase):
+    """Completion notifications finalize the job once; polling is only a fallback."""
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='ocr-notify', password='pass123')
+        patient = Patient.objects.create(
+            first_name='Scan', last_name='Ned', mrn='OCR-NOTIFY-1',
+            date_of_birth='1975-03-03', created_by=user,
+        )
+        self.document = Document.objects.create(
+            filename='scanned.pdf',
+            file=SimpleUploadedFile('scanned.pdf', b'%PDF-1.4 scan', content_type='application/pdf'),
+            status='processing',
+            patient=patient,
+            created_by=user,
+            uploaded_by=user,
+            structured_data={'textract_async': {
+                'job_id': 'job-1',
+                'job_type': 'detect',
+                's3_key': 'ocr-temp/scanned.pdf',
+                's3_bucket': 'bucket',
+                'started_at': (timezone.now() - timedelta(seconds=40)).isoformat(),
+            }},
+        )
+
+        result = MagicMock(page_count=2, confidence=97.5, extraction_time_ms=900)
+        result.to_audit_dict.return_value = {'page_count': 2, 'confidence': 97.5}
+        self.textract = MagicMock()
+        self.textract.get_async_result.return_value = result
+        self.textract.extract_text_from_result.return_value = '--- Page 1 (OCR) ---\nScanned note'
+        self.textract.get_async_job_status.return_value = 'SUCCEEDED'
+
+        patches = [
+            patch('apps.documents.services.textract.TextractService', return_value=self.textract),
+            patch('apps.documents.services.textract.OCRTempStorage'),
+            patch('apps.documents.tasks._log_textract_usage'),
+            patch('apps.documents.tasks.continue_document_processing'),
+        ]
+        mocks = [p.start() for p in patches]
+        for p in patches:
+            self.addCleanup(p.stop)
+        self.storage = mocks[1]
+        self.continue_processing = mocks[3]
+
+    def test_notification_chains_processing_and_stops_fallback_poll(self):
+        result = handle_textract_completion.delay(self.document.id, 'job-1', 'SUCCEEDED').get()
+
+        self.assertTrue(result['success'])
+        self.continue_processing.delay.assert_called_once_with(
+            self.document.id, '--- Page 1 (OCR) ---\nScanned note'
+        )
+        self.storage.return_value.delete_document.assert_called_once_with('ocr-temp/scanned.pdf')
+        self.document.refresh_from_db()
+        self.assertIn('completed_at', self.document.structured_data['textract_async'])
+
+        poll_result = poll_textract_job.delay(
+            self.document.id, 'job-1', 'ocr-temp/scanned.pdf'
+        ).get()
+        self.assertEqual(poll_result['status'], 'already_finalized')
+        self.textract.get_async_job_status.assert_not_called()
+        self.continue_processing.delay.assert_called_once()
+
+    def test_duplicate_notification_is_ignored(self):
+        handle_textract_completion.delay(self.document.id, 'job-1', 'SUCCEEDED').get()
+        again = handle_textract_completion.delay(self.document.id, 'job-1', 'SUCCEEDED').get()
+
+        self.assertEqual(again['status'], 'already_finalized')
+        self.continue_processing.delay.assert_called_once()
+
+    def test_fallback_poll_finalizes_when_notification_never_arrives(self):
+        poll_result = poll_textract_job.delay(
+            self.document.id, 'job-1', 'ocr-temp/scanned.pdf',
+            started_at=timezone.now().isoformat(), job_type='detect',
+        ).get()
+
+        self.assertTrue(poll_result['success'])
+        self.textract.get_async_job_status.assert_called_once_with('job-1', job_type='detect')
+        late = handle_textract_completion.delay(self.document.id, 'job-1', 'SUCCEEDED').get()
+        self.assertEqual(late['status'], 'already_finalized')
+        self.continue_processing.delay.assert_called_once()
+
+    def test_failed_job_marks_document_failed(self):
+        result = handle_textract_completion.delay(self.document.id, 'job-1', 'FAILED').get()
+
+        self.assertFalse(result['success'])
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.status, 'failed')
+        self.continue_processing.delay.assert_not_called()
+
+    @override_settings(TEXTRACT_ASYNC_MAX_WAIT=30)
+    def test_timeout_claims_the_job_before_failing_it(self):
+        poll_result = poll_textract_job.delay(self.document.id, 'job-1', 'ocr-temp/scanned.pdf').get()
+
+        self.assertEqual(poll_result['status'], 'timeout')
+        late = handle_textract_completion.delay(self.document.id, 'job-1', 'SUCCEEDED').get()
+        self.assertEqual(late['status'], 'already_finalized')
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.status, 'failed')
+        self.continue_processing.delay.assert_not_called()
+
+    @override_settings(TEXTRACT_ASYNC_MAX_WAIT=30)
+    def test_timeout_leaves_a_finalizing_job_alone(self):
+        # The notification claims the job after the poll's early check
+        with patch('apps.documents.tasks._textract_completion_claimed', return_value=False):
+            cache.add('textract_job_finalized:job-1', True)
+            poll_result = poll_textract_job.delay(self.document.id, 'job-1', 'ocr-temp/scanned.pdf').get()
+
+        self.assertEqual(poll_result['status'], 'already_finalized')
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.status, 'processing')
+
+    def test_stale_job_notification_is_ignored(self):
+        result = handle_textract_completion.delay(self.document.id, 'old-job', 'SUCCEEDED').get()
+
+        self.assertEqual(result['status'], 'ignored')
+        self.textract.get_async_result.assert_not_called()
+
+
+@override_settings(
+    OCR_ENABLED=True,
+    AWS_ACCESS_KEY_ID='ak',
+    AWS_SECRET_ACCESS_KEY='sk',
+    TEXTRACT_SNS_TOPIC_ARN='arn:aws:sns:us-east-1:123456789012:textract-done',
+    TEXTRACT_SNS_ROLE_ARN='arn:aws:iam::123456789012:role/textract-sns',
+)
+class AsyncJobNotificationChannelTests(SimpleTestCase):
+    """Start* requests ask Textract to publish completion to SNS."""
+
+    @patch('apps.documents.services.textract.boto3.client')
+    def test_start_async_job_sends_job_tag_and_notification_channel(self, mock_boto):
+        mock_textract = MagicMock()
+        mock_boto.return_value = mock_textract
+        mock_textract.start_document_text_detection.return_value = {'JobId': 'job-1'}
+        service = TextractService(mode='detect')
+
+        service.start_async_job('bucket', 'ocr-temp/42.pdf', job_tag='42')
+
+        kwargs = mock_textract.start_document_text_detection.call_args.kwargs
+        self.assertTrue(service.notifications_enabled)
+        self.assertEqual(kwargs['JobTag'], '42')
+        self.assertEqual(kwargs['NotificationChannel'], {
+            'SNSTopicArn': 'arn:aws:sns:us-east-1:123456789012:textract-done',
+            'RoleArn': 'arn:aws:iam::123456789012:role/textract-sns',
+        })
+
+    @override_settings(TEXTRACT_SNS_TOPIC_ARN=None)
+    @patch('apps.documents.services.textract.boto3.client')
+    def test_no_notification_channel_without_topic(self, mock_boto):
+        mock_textract = MagicMock()
+        mock_boto.return_value = mock_textract
+        mock_textract.start_document_analysis.return_value = {'JobId': 'job-2'}
+        service = TextractService(mode='analyze')
+
+        service.start_async_job('bucket', 'key.pdf')
+
+        self.assertFalse(service.notifications_enabled)
+        self.assertNotIn('NotificationChannel', mock_textract.start_document_analysis.call_args.kwargs)
@@ -0,0 +1,174 @@
+"""
+Tests for Textract block storage and page-wise assembly of async results.
+
+Covers:
+- TextractBlockStore page/type indexes and block round-tripping
+- TextractPageAssembler producing the same text and metrics as the
+  all-at-once from_paginated_responses path
+- Blocks of finished pages being released as later pages arrive
+- _fetch_paginated_results streaming NextToken pages through the assembler
+"""
+from unittest.mock import MagicMock
+
+from django.test import SimpleTestCase
+
+from apps.documents.services.textract import (
+    TextractBlock,
+    TextractBlockStore,
+    TextractPageAssembler,
+    TextractResult,
+    TextractService,
+)
+
+
+def _page_blocks(page, line_count=3):
+    blocks = [{'BlockType': 'PAGE', 'Page': page, 'Id': f'page-{page}'}]
+    for index in range(line_count):
+        top = 0.9 - index * 0.1
+        blocks.append({
+            'BlockType': 'LINE',
+            'Page': page,
+            'Id': f'line-{page}-{index}',
+            'Text': f'page {page} line {index}',
+            'Confidence': 90.0 + index,
+            'Geometry': {'BoundingBox': {'Top': top, 'Left': 0.1}},
+            'Relationships': [{'Type': 'CHILD', 'Ids': [f'word-{page}-{index}']}],
+        })
+        blocks.append({
+            'BlockType': 'WORD',
+            'Page': page,
+            'Id': f'word-{page}-{index}',
+            'Text': f'line {index}',
+            'Confidence': 80.0,
+            'Geometry': {'BoundingBox': {'Top': top, 'Left': 0.1}},
+        })
+    # Table cell word not referenced by any LINE
+    blocks.append({
+        'BlockType': 'WORD',
+        'Page': page,
+        'Id': f'cell-{page}',
+        'Text': f'cell {page}',
+        'Confidence': 70.0,
+        'Geometry': {'BoundingBox': {'Top': 0.95, 'Left': 0.5}},
+    })
+    blocks.append({'BlockType': 'TABLE', 'Page': page, 'Id': f'table-{page}'})
+    return blocks
+
+
+def _responses(blocks, per_response):
+    return [
+        {'Blocks': blocks[start:start + per_response]}
+        for start in range(0, len(blocks), per_response)
+    ]
+
+
+def _service():
+    return TextractService.__new__(TextractService)
+
+
+class TextractBlockStoreTests(SimpleTestCase):
+    """Columnar block storage with page-indexed lookups."""
+
+    def setUp(self):
+        self.result = TextractResult.from_response(
+            {'Blocks': _page_blocks(1) + _page_blocks(2, line_count=2)}
+        )
+
+    def test_page_indexed_lookups(self):
+        self.assertEqual(
+            [block.text for block in self.result.get_lines_by_page(2)],
+            ['page 2 line 0', 'page 2 line 1'],
+        )
+        self.assertEqual(len(self.result.get_tables()), 2)
+        self.assertEqual(self.result.get_forms(), [])
+        self.assertEqual(self.result.pages[1], 'page 2 line 0\npage 2 line 1')
+
+    def test_blocks_round_trip(self):
+        line = self.result.get_lines_by_page(1)[0]
+
+        self.assertEqual(line.block_type, 'LINE')
+        self.assertEqual(line.id, 'line-1-0')
+        self.assertEqual(line.confidence, 90.0)
+        self.assertEqual(line.relationships, [['word-1-0']])
+        self.assertAlmostEqual(line.geometry['BoundingBox']['Top'], 0.9)
+        self.assertEqual(len(self.result.blocks), 16)
+        self.assertEqual(self.result.blocks[-1].block_type, 'TABLE')
+
+    def test_sorted_by_geometry(self):
+        store = TextractBlockStore()
+        for top in (0.5, 0.1, 0.3):
+            store.append(TextractBlock(
+                block_type='LINE',
+                text=f'top {top}',
+                geometry={'BoundingBox': {'Top': top, 'Left': 0.0}},
+            ))
+
+        text = _service()._build_page_text(store, 1)
+
+        self.assertEqual(text, 'top 0.1\ntop 0.3\ntop 0.5')
+
+
+class TextractPageAssemblerTests(SimpleTestCase):
+    """Streaming assembly matches the materialized result."""
+
+    def setUp(self):
+        self.service = _service()
+        self.blocks = [block for page in (1, 2, 3) for block in _page_blocks(page)]
+
+    def test_matches_materialized_result(self):
+        # Result pages deliberately split document pages mid-way
+        responses = _responses(self.blocks, 5)
+        materialized = TextractResult.from_paginated_responses(responses)
+
+        assembler = TextractPageAssembler(self.service._build_page_text)
+        for response in responses:
+            assembler.add_response(response)
+        streamed = assembler.finish(extraction_time_ms=12, job_id='job-1')
+
+        self.assertTrue(streamed.blocks_discarded)
+        self.assertEqual(len(streamed.blocks), 0)
+        self.assertEqual(
+            self.service.extract_text_from_result(streamed),
+            self.service.extract_text_from_result(materialized),
+        )
+        self.assertEqual(streamed.page_count, 3)
+        self.assertEqual(streamed.confidence, materialized.confidence)
+        self.assertEqual(streamed.to_audit_dict()['block_count'], len(self.blocks))
+        self.assertEqual(streamed.to_audit_dict()['table_count'], 3)
+        self.assertEqual(streamed.job_id, 'job-1')
+
+    def test_releases_finished_pages(self):
+        assembler = TextractPageAssembler(self.service._build_page_text)
+
+        assembler.add_response({'Blocks': _page_blocks(1) + _page_blocks(2)[:1]})
+
+        self.assertEqual(list(assembler._pending), [2])
+        self.assertIn('page 1 line 0', assembler._page_texts[1])
+
+    def test_late_blocks_are_appended(self):
+        assembler = TextractPageAssembler(self.service._build_page_text)
+        assembler.add_response({'Blocks': _page_blocks(1, line_count=1) + _page_blocks(2, line_count=1)})
+        assembler.add_block(TextractBlock(block_type='LINE', text='late line', page=1))
+
+        result = assembler.finish()
+
+        self.assertTrue(result.pages[0].endswith('\nlate line'))
+
+
+class FetchPaginatedResultsTests(SimpleTestCase):
+    """_fetch_paginated_results follows NextToken through the assembler."""
+
+    def test_streams_all_result_pages(self):
+        service = _service()
+        blocks = _page_blocks(1) + _page_blocks(2)
+        responses = _responses(blocks, 4)
+        for index, response in enumerate(responses[:-1]):
+            response['NextToken'] = f'token-{index}'
+        service._get_async_results_page = MagicMock(side_effect=responses)
+
+        result = service._fetch_paginated_results('job-1', 0.0, 'detect')
+
+        self.assertEqual(service._get_async_results_page.call_count, len(responses))
+        self.assertEqual(result.page_count, 2)
+        self.assertEqual(result.block_count, len(blocks))
+        self.assertIn('--- Page 2 (OCR) ---', service.extract_text_from_result(result))
@@ -364,7 +364,9 @@ class DocumentDetailView(OwnedDocumentMixin, LoginRequiredMixin, DetailView):
         Returns:
             QuerySet: Document queryset with related data
         """
-        return Document.objects.select_related('patient', 'created_by').prefetch_related('providers')
+        return Document.objects.select_related(
+            'patient', 'created_by'
+        ).prefetch_related('providers').defer('original_text')
     
     def get_context_data(self, **kwargs):
         """
@@ -381,6 +383,8 @@ class DocumentDetailView(OwnedDocumentMixin, LoginRequiredMixin, DetailView):
                 'processing_duration': self.object.get_processing_duration(),
                 'can_retry': self.object.can_retry_processing(),
                 'file_size_mb': round(self.object.file_size / (1024 * 1024), 1) if self.object.file_size else 0,
+                'text_preview': self.object.get_text_preview(),
+                'text_length': self.object.get_text_length(),
             })
             
             # Add parsed data if available
@@ -679,9 +683,10 @@ class DocumentPreviewAPIView(LoginRequiredMixin, View):
         """
         try:
             document = get_object_or_404(
-                Document.objects.filter(created_by=request.user),
+                Document.objects.filter(created_by=request.user).defer('original_text'),
                 pk=pk
             )
+            text_preview = document.get_text_preview()
             
             preview_data = {
                 'id': document.id,
@@ -700,7 +705,7 @@ class DocumentPreviewAPIView(LoginRequiredMixin, View):
                     for p in document.providers.all()
                 ],
                 'notes': document.notes,
-                'original_text_preview': document.original_text[:500] + '...' if document.original_text and len(document.original_text) > 500 else document.original_text,
+                'original_text_preview': text_preview + '...' if document.get_text_length() > len(text_preview) else text_preview,
                 'error_message': document.error_message,
                 'processing_attempts': getattr(document, 'processing_attempts', 0),
                 'can_retry': document.can_retry_processing() if hasattr(document, 'can_retry_processing') else False,
@@ -719,6 +724,69 @@ class DocumentPreviewAPIView(LoginRequiredMixin, View):
             }, status=500)
 
 
+@method_decorator([login_required], name='dispatch')
+class DocumentTextPagesAPIView(LoginRequiredMixin, View):
+    """
+    API endpoint for reading a document's extracted text a page range at a time.
+    """
+    max_pages = 20
+    
+    def get(self, request, pk):
+        """
+        Get the extracted text of a range of pages.
+        
+        Query parameters:
+            start: First 1-indexed page (default 1)
+            end: Last page, inclusive (default start; at most max_pages pages)
+        
+        Args:
+            request: HTTP request
+            pk: Document primary key
+            
+        Returns:
+            JsonResponse: Page texts for the requested range
+        """
+        try:
+            start_page = int(request.GET.get('start', 1))
+            end_page = int(request.GET.get('end', start_page))
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'error': 'start and end must be page numbers'
+            }, status=400)
+        
+        if start_page < 1 or end_page < start_page:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid page range'
+            }, status=400)
+        end_page = min(end_page, start_page + self.max_pages - 1)
+        
+        try:
+            document = get_object_or_404(
+                Document.objects.filter(created_by=request.user).defer('original_text'),
+                pk=pk
+            )
+            
+            return JsonResponse({
+                'success': True,
+                'document_id': document.id,
+                'start': start_page,
+                'end': end_page,
+                'text_length': document.get_text_length(),
+                'pages': document.get_text_pages(start_page, end_page),
+            })
+            
+        except Http404:
+            raise
+        except Exception as pages_error:
+            logger.error(f"Error getting document text pages: {pages_error}")
+            return JsonResponse({
+                'success': False,
+                'error': 'Unable to load document text'
+            }, status=500)
+
+
 # ============================================================================
 # Development-Only Deletion Views  
 # ============================================================================
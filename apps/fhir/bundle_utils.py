@@ -525,42 +525,47 @@ def _compare_observations(
     return value1 == value2
 
 
-def _compare_conditions(cond1: ConditionResource, cond2: ConditionResource) -> bool:
+def _get_condition_match_code(cond: ConditionResource) -> Optional[str]:
     """
-    Compare two condition resources for clinical equivalence.
+    Extract the code used to match conditions, checking multiple representations.
     
     Args:
-        cond1: First condition resource
-        cond2: Second condition resource
+        cond: Condition resource
         
     Returns:
-        True if conditions are clinically equivalent
+        Condition code, code text, or None
     """
-    # Compare condition codes - check multiple code representations
     # Try wrapper helper method first
-    code1 = getattr(cond1, 'get_condition_code', lambda: None)()
-    code2 = getattr(cond2, 'get_condition_code', lambda: None)()
+    code = getattr(cond, 'get_condition_code', lambda: None)()
     
     # Fallback to code.coding[0].code if available
-    if code1 is None and getattr(cond1, 'code', None) and getattr(cond1.code, 'coding', None):
-        code1 = cond1.code.coding[0].code
-    if code2 is None and getattr(cond2, 'code', None) and getattr(cond2.code, 'coding', None):
-        code2 = cond2.code.coding[0].code
+    if code is None and getattr(cond, 'code', None) and getattr(cond.code, 'coding', None):
+        code = cond.code.coding[0].code
     
     # Fallback to code.text if coding not available
-    if code1 is None and getattr(cond1, 'code', None):
-        code1 = getattr(cond1.code, 'text', None)
-    if code2 is None and getattr(cond2, 'code', None):
-        code2 = getattr(cond2.code, 'text', None)
+    if code is None and getattr(cond, 'code', None):
+        code = getattr(cond.code, 'text', None)
+    
+    # If we still don't have a code, try dict access for code.text
+    if code is None and hasattr(cond, 'code') and isinstance(cond.code, dict):
+        code = cond.code.get('text')
     
-    # If we still don't have codes, try dict access for code.text
-    if code1 is None and hasattr(cond1, 'code') and isinstance(cond1.code, dict):
-        code1 = cond1.code.get('text')
-    if code2 is None and hasattr(cond2, 'code') and isinstance(cond2.code, dict):
-        code2 = cond2.code.get('text')
+    return code
+
+
+def _compare_conditions(cond1: ConditionResource, cond2: ConditionResource) -> bool:
+    """
+    Compare two condition resources for clinical equivalence.
     
+    Args:
+        cond1: First condition resource
+        cond2: Second condition resource
+        
+    Returns:
+        True if conditions are clinically equivalent
+    """
     # Compare the extracted codes
-    if code1 != code2:
+    if _get_condition_match_code(cond1) != _get_condition_match_code(cond2):
         return False
     
     # Compare patient references
@@ -665,6 +670,79 @@ def _compare_practitioners(prac1: PractitionerResource, prac2: PractitionerResou
     return name1 == name2
 
 
+def _get_block_keys(resource: Resource) -> List[Tuple]:
+    """
+    Get the block keys for a resource.
+    
+    Two resources can only be clinically equivalent if they share at least
+    one key, so comparing within blocks finds exactly the same duplicates as
+    comparing every pair. Comparators with alternative match rules (e.g.
+    NPI or name) contribute one key per rule.
+    
+    Args:
+        resource: FHIR resource
+        
+    Returns:
+        List of hashable block keys
+    """
+    resource_type = resource.resource_type
+    
+    if resource_type == "Patient":
+        keys = [("name_birth", resource.get_display_name(), str(resource.birthDate))]
+        mrn = resource.get_mrn()
+        if mrn:
+            keys.append(("mrn", mrn))
+        return keys
+    elif resource_type == "Observation":
+        code = resource.code.coding[0].code if resource.code and resource.code.coding else None
+        return [("code", code, get_reference_value(getattr(resource, 'subject', None)))]
+    elif resource_type == "Condition":
+        return [("code", _get_condition_match_code(resource))]
+    elif resource_type == "MedicationStatement":
+        return [("name", resource.get_medication_name())]
+    elif resource_type == "DocumentReference":
+        doc_type = resource.type.coding[0].code if resource.type and resource.type.coding else None
+        keys = [("type", doc_type)]
+        url = resource.get_document_url()
+        if url:
+            keys.append(("url", url))
+        return keys
+    elif resource_type == "Practitioner":
+        keys = [("name", resource.get_display_name())]
+        npi = resource.get_npi()
+        if npi:
+            keys.append(("npi", npi))
+        return keys
+    else:
+        return [("hash", get_resource_hash(resource))]
+
+
+def _build_candidate_index(resources: List[Resource]) -> List[List[int]]:
+    """
+    Map each resource position to the later positions it must be compared with.
+    
+    Args:
+        resources: Resources of a single type
+        
+    Returns:
+        For each position i, a sorted list of positions j > i sharing a block key
+    """
+    try:
+        blocks: Dict[Tuple, List[int]] = {}
+        for position, resource in enumerate(resources):
+            for key in _get_block_keys(resource):
+                blocks.setdefault(key, []).append(position)
+    except Exception:
+        # Keys could not be derived for this group; compare every pair
+        return [list(range(i + 1, len(resources))) for i in range(len(resources))]
+    
+    candidates = [set() for _ in resources]
+    for members in blocks.values():
+        for a, i in enumerate(members):
+            candidates[i].update(members[a + 1:])
+    return [sorted(later) for later in candidates]
+
+
 def find_duplicate_resources(bundle: Bundle) -> List[Dict[str, Any]]:
     """
     Find duplicate resources in a bundle based on clinical equivalence.
@@ -699,12 +777,14 @@ def find_duplicate_resources(bundle: Bundle) -> List[Dict[str, Any]]:
     for resource_type, resources in resource_groups.items():
         if len(resources) < 2:
             continue
-            
-        # Compare each resource with every other resource
+        
+        # Only compare resources that share a block key (see _get_block_keys)
+        candidates = _build_candidate_index(resources)
+        
         for i in range(len(resources)):
             duplicate_group = [resources[i]]
             
-            for j in range(i + 1, len(resources)):
+            for j in candidates[i]:
                 try:
                     if are_resources_clinically_equivalent(resources[i], resources[j]):
                         duplicate_group.append(resources[j])
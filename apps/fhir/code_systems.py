@@ -19,6 +19,8 @@ import hashlib
 from django.conf import settings
 from django.core.cache import cache
 
+from .terminology import TerminologyConcept, TerminologyIndex, canonical_code, get_terminology_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -123,8 +125,14 @@ class CodeSystemRegistry:
     
     @classmethod
     def get_system_info(cls, system_name: str) -> Optional[CodeSystemInfo]:
-        """Get information about a code system."""
-        return cls.SYSTEMS.get(system_name.upper())
+        """Get information about a code system (case-insensitive)."""
+        system_info = cls.SYSTEMS.get(system_name.upper())
+        if system_info is None:
+            system_info = next(
+                (info for name, info in cls.SYSTEMS.items() if name.upper() == system_name.upper()),
+                None
+            )
+        return system_info
     
     @classmethod
     def get_all_systems(cls) -> List[str]:
@@ -284,15 +292,23 @@ class FuzzyCodeMatcher:
 class CodeSystemMapper:
     """Main class for code system mapping and normalization."""
     
-    def __init__(self, enable_caching: bool = True):
+    def __init__(self, enable_caching: bool = True, terminology_index: Optional[TerminologyIndex] = None):
         self.enable_caching = enable_caching
         self.detector = CodeSystemDetector()
         self.fuzzy_matcher = FuzzyCodeMatcher()
         self.mappings_cache = {}
+        self._terminology_index = terminology_index
         
         # Load predefined mappings if available
         self._load_predefined_mappings()
     
+    @property
+    def terminology(self) -> Optional[TerminologyIndex]:
+        """Local terminology index (FHIR_TERMINOLOGY_INDEX_PATH), if one has been built."""
+        if self._terminology_index is not None:
+            return self._terminology_index
+        return get_terminology_index()
+    
     def normalize_code(
         self, 
         code: str, 
@@ -332,6 +348,20 @@ class CodeSystemMapper:
         else:
             confidence = 1.0
         
+        # Resolve the display, and a system shape detection got wrong, from the terminology index
+        concept = self._lookup_concept(cleaned_code, system, search_other_systems=not original_system)
+        if concept:
+            if concept.system.upper() != system.upper():
+                notes.append(f"Terminology index places code in {concept.system}")
+                system = concept.system
+                confidence = max(confidence, 0.9)
+            if concept.code != cleaned_code:
+                notes.append(f"Code written as '{concept.code}' in {concept.system}")
+                cleaned_code = concept.code
+            if not display and concept.display:
+                display = concept.display
+                notes.append("Display resolved from terminology index")
+        
         # Validate system
         system_info = CodeSystemRegistry.get_system_info(system)
         if not system_info:
@@ -427,21 +457,83 @@ class CodeSystemMapper:
             ]
         }
     
+    def search_concepts(
+        self,
+        text: str,
+        system: Optional[str] = None,
+        limit: int = 10
+    ) -> List[TerminologyConcept]:
+        """
+        Search the terminology index by display text.
+        
+        Returns an empty list when no index has been built.
+        """
+        terminology = self.terminology
+        if terminology is None:
+            return []
+        return terminology.search(text, system=system, limit=limit)
+    
+    def _lookup_concept(
+        self,
+        code: str,
+        system: str,
+        search_other_systems: bool = False
+    ) -> Optional[TerminologyConcept]:
+        """
+        Look a code up in the terminology index.
+        
+        With search_other_systems, a code missing from `system` is also
+        looked up in the other systems whose format it matches.
+        """
+        terminology = self.terminology
+        if terminology is None:
+            return None
+        
+        concept = terminology.lookup(system, code) if system != 'UNKNOWN' else None
+        if concept is None and search_other_systems:
+            for candidate in CodeSystemRegistry.get_all_systems():
+                if candidate.upper() == system.upper():
+                    continue
+                if CodeSystemRegistry.validate_code_format(canonical_code(candidate, code), candidate):
+                    concept = terminology.lookup(candidate, code)
+                    if concept:
+                        break
+        return concept
+    
     def _find_exact_mappings(
         self, 
         source_code: str, 
         source_system: str,
         target_systems: List[str]
     ) -> List[CodeMapping]:
-        """Find exact mappings in predefined mappings."""
+        """Find exact mappings in predefined mappings and the terminology index."""
         mappings = []
         key = (source_code, source_system.upper())
+        targets = {s.upper() for s in target_systems}
         
         if key in self.predefined_mappings:
             for mapping in self.predefined_mappings[key]:
-                if mapping.target_system.upper() in [s.upper() for s in target_systems]:
+                if mapping.target_system.upper() in targets:
                     mappings.append(mapping)
         
+        terminology = self.terminology
+        if terminology is not None:
+            seen = {(m.target_system.upper(), m.target_code) for m in mappings}
+            for mapped in terminology.mappings(source_system, source_code):
+                target = mapped.target
+                if target.system.upper() not in targets or (target.system.upper(), target.code) in seen:
+                    continue
+                mappings.append(CodeMapping(
+                    source_code=source_code,
+                    source_system=source_system,
+                    target_code=target.code,
+                    target_system=target.system,
+                    confidence=mapped.confidence,
+                    mapping_type=mapped.mapping_type,
+                    description=target.display or None,
+                    metadata={'source': 'terminology_index'}
+                ))
+        
         return mappings
     
     def _find_fuzzy_mappings(
@@ -499,11 +591,13 @@ class CodeSystemMapper:
     
     def get_mapping_statistics(self) -> Dict[str, Any]:
         """Get statistics about code mappings."""
+        terminology = self.terminology
         return {
             'total_cached_mappings': len(self.mappings_cache),
             'supported_systems': len(CodeSystemRegistry.SYSTEMS),
             'predefined_mappings': len(self.predefined_mappings),
-            'cache_enabled': self.enable_caching
+            'cache_enabled': self.enable_caching,
+            'terminology_index': terminology.stats() if terminology is not None else None
         }
 
 
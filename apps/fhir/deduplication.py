@@ -13,9 +13,10 @@ some are close enough, and some just look similar but are actually different.
 
 import json
 import hashlib
+import itertools
 import logging
-from datetime import datetime, date
-from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, date, timezone as dt_timezone
+from typing import Optional, List, Dict, Any, Set, Tuple
 
 from django.utils import timezone
 from django.contrib.auth.models import User
@@ -459,6 +460,197 @@ class FuzzyMatcher:
         return False
 
 
+class CandidatePairBlocker:
+    """
+    Generates candidate pairs for fuzzy duplicate detection so a group of n
+    resources is not compared all-against-all.
+    
+    Resources are bucketed by normalized code token (each coding's
+    system|code plus the lowercased code text). Inside a bucket, dated
+    resources are swept in date order and only pairs inside the tolerance
+    window are emitted; undated resources pair with the whole bucket. Pairs
+    whose numeric values (same unit) fall outside the relative value band
+    are skipped. Exact duplicates share every key, so they are always
+    emitted.
+    """
+    
+    # Field paths holding each resource type's code, tried in order (default
+    # 'code'). Medications carry medicationCodeableConcept in R4 JSON and
+    # medication.concept (a CodeableReference) in the R5 models.
+    CODE_FIELDS = {
+        'MedicationStatement': ('medicationCodeableConcept', 'medication.concept'),
+        'MedicationRequest': ('medicationCodeableConcept', 'medication.concept'),
+        'Immunization': ('vaccineCode',),
+    }
+    
+    def __init__(self, tolerance_hours: int = 24, value_tolerance: float = 0.1):
+        """
+        Initialize the blocker.
+        
+        Args:
+            tolerance_hours: Date window; dated resources further apart are never paired
+            value_tolerance: Relative value band for numeric quantities with the same unit
+        """
+        self.tolerance_seconds = tolerance_hours * 3600
+        self.value_tolerance = value_tolerance
+    
+    def candidate_pairs(self, resources: List[Resource]) -> List[Tuple[int, int]]:
+        """Return sorted (i, j) index pairs, i < j, worth a full comparison."""
+        return self._pairs_from_profiles([self._profile(resource) for resource in resources])
+    
+    def candidate_pairs_for_dicts(self, resource_dicts: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+        """
+        Same as ``candidate_pairs`` but reads FHIR JSON dicts directly, so
+        callers can find the few resources worth parsing into models.
+        """
+        return self._pairs_from_profiles([self._profile_dict(rd) for rd in resource_dicts])
+    
+    def _pairs_from_profiles(self, profiles: List[tuple]) -> List[Tuple[int, int]]:
+        buckets: Dict[Any, List[int]] = {}
+        for pos, profile in enumerate(profiles):
+            for token in profile[0]:
+                buckets.setdefault(token, []).append(pos)
+        
+        pairs = set()
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            dated = sorted(
+                (profiles[pos][1], pos) for pos in members if profiles[pos][1] is not None
+            )
+            undated = [pos for pos in members if profiles[pos][1] is None]
+            
+            for a in range(len(dated)):
+                ts_a, pos_a = dated[a]
+                for b in range(a + 1, len(dated)):
+                    ts_b, pos_b = dated[b]
+                    if ts_b - ts_a > self.tolerance_seconds:
+                        break
+                    self._add_pair(pairs, profiles, pos_a, pos_b)
+            for pos_u in undated:
+                for pos in members:
+                    if pos != pos_u:
+                        self._add_pair(pairs, profiles, pos_u, pos)
+        
+        return sorted(pairs)
+    
+    def _add_pair(self, pairs: set, profiles: List[tuple], pos1: int, pos2: int) -> None:
+        value1, value2 = profiles[pos1][2], profiles[pos2][2]
+        if value1 is not None and value2 is not None and value1[1] == value2[1]:
+            num1, num2 = value1[0], value2[0]
+            scale = max(abs(num1), abs(num2))
+            if scale and abs(num1 - num2) / scale > self.value_tolerance:
+                return
+        pairs.add((pos1, pos2) if pos1 < pos2 else (pos2, pos1))
+    
+    def _profile(self, resource: Resource) -> Tuple[set, Optional[float], Optional[Tuple[float, Any]]]:
+        """(code tokens, timestamp, (value, unit)) for one resource model."""
+        resource_type = resource.resource_type
+        if resource_type == 'Patient':
+            return self._build_profile(resource_type, birth_date=getattr(resource, 'birthDate', None))
+        
+        concept = None
+        for path in self.CODE_FIELDS.get(resource_type, ('code',)):
+            concept = resource
+            for name in path.split('.'):
+                concept = getattr(concept, name, None)
+            if concept is not None:
+                break
+        try:
+            codings = [
+                (getattr(coding, 'system', None), getattr(coding, 'code', None))
+                for coding in getattr(concept, 'coding', None) or []
+            ]
+            text = getattr(concept, 'text', None)
+        except Exception:
+            codings, text = [], None
+        
+        effective = quantity = None
+        if resource_type == 'Observation':
+            effective = getattr(resource, 'effectiveDateTime', None)
+            value_quantity = getattr(resource, 'valueQuantity', None)
+            if value_quantity is not None:
+                quantity = (getattr(value_quantity, 'value', None), getattr(value_quantity, 'unit', None))
+        return self._build_profile(resource_type, codings, text, effective, quantity)
+    
+    def _profile_dict(self, rd: Dict[str, Any]) -> Tuple[set, Optional[float], Optional[Tuple[float, Any]]]:
+        """(code tokens, timestamp, (value, unit)) for one FHIR JSON dict."""
+        resource_type = rd.get('resourceType')
+        if resource_type == 'Patient':
+            return self._build_profile(resource_type, birth_date=rd.get('birthDate'))
+        
+        concept = None
+        for path in self.CODE_FIELDS.get(resource_type, ('code',)):
+            concept = rd
+            for name in path.split('.'):
+                concept = concept.get(name) if isinstance(concept, dict) else None
+            if concept is not None:
+                break
+        codings, text = [], None
+        if isinstance(concept, dict):
+            codings = [
+                (coding.get('system'), coding.get('code'))
+                for coding in concept.get('coding') or []
+                if isinstance(coding, dict)
+            ]
+            text = concept.get('text')
+        
+        effective = quantity = None
+        if resource_type == 'Observation':
+            effective = rd.get('effectiveDateTime')
+            value_quantity = rd.get('valueQuantity')
+            if isinstance(value_quantity, dict):
+                quantity = (value_quantity.get('value'), value_quantity.get('unit'))
+        return self._build_profile(resource_type, codings, text, effective, quantity)
+    
+    def _build_profile(
+        self,
+        resource_type: str,
+        codings: Optional[List[Tuple[Any, Any]]] = None,
+        text: Any = None,
+        effective: Any = None,
+        quantity: Optional[Tuple[Any, Any]] = None,
+        birth_date: Any = None
+    ) -> Tuple[set, Optional[float], Optional[Tuple[float, Any]]]:
+        if resource_type == 'Patient':
+            # Patient similarity cannot reach the fuzzy threshold without a
+            # matching birthDate, so it is the block key.
+            return {('birthDate', str(birth_date))}, None, None
+        
+        tokens = set()
+        for system, code in codings or []:
+            if code:
+                tokens.add(('code', (system or '').strip().lower(), str(code).strip().lower()))
+        if text:
+            tokens.add(('text', ' '.join(str(text).lower().split())))
+        if not tokens:
+            tokens.add(('uncoded', resource_type))
+        
+        value = None
+        if quantity is not None and quantity[0] is not None:
+            try:
+                value = (float(quantity[0]), quantity[1])
+            except (TypeError, ValueError):
+                value = None
+        return tokens, self._timestamp(effective), value
+    
+    @staticmethod
+    def _timestamp(value: Any) -> Optional[float]:
+        """POSIX seconds for a date/datetime/ISO string; naive values read as UTC."""
+        try:
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if isinstance(value, datetime):
+                if value.tzinfo is None:
+                    value = value.replace(tzinfo=dt_timezone.utc)
+                return value.timestamp()
+            if isinstance(value, date):
+                return datetime(value.year, value.month, value.day, tzinfo=dt_timezone.utc).timestamp()
+        except (ValueError, TypeError, OverflowError):
+            pass
+        return None
+
+
 class ResourceDeduplicator:
     """
     Main class for identifying and merging duplicate FHIR resources.
@@ -477,6 +669,12 @@ class ResourceDeduplicator:
         self.fuzzy_matcher = FuzzyMatcher(
             tolerance_hours=self.config.get('deduplication_tolerance_hours', 24)
         )
+        # Blocking stage: only resources sharing a code bucket, date window and
+        # value band are compared. Disable for an exhaustive all-pairs audit.
+        self.use_blocking = self.config.get('use_blocking', True)
+        self.blocker = CandidatePairBlocker(
+            tolerance_hours=self.config.get('deduplication_tolerance_hours', 24)
+        )
         
         # Similarity thresholds for different duplicate types
         self.exact_threshold = 1.0  # Perfect match
@@ -486,7 +684,8 @@ class ResourceDeduplicator:
     def deduplicate_resources(
         self,
         resources: List[Resource],
-        preserve_provenance: bool = True
+        preserve_provenance: bool = True,
+        settled_ids: Optional[Set[int]] = None
     ) -> DeduplicationResult:
         """
         Identify and merge duplicate resources in a list.
@@ -494,6 +693,9 @@ class ResourceDeduplicator:
         Args:
             resources: List of FHIR resources to deduplicate
             preserve_provenance: Whether to preserve source information in metadata
+            settled_ids: Optional set of ``id()`` values for resources already
+                deduplicated against each other; pairs where both resources are
+                settled are never compared (incremental merges)
             
         Returns:
             DeduplicationResult with details of the operation
@@ -515,7 +717,9 @@ class ResourceDeduplicator:
                 self.logger.debug(f"Checking {len(type_resources)} {resource_type} resources for duplicates")
                 
                 # Find duplicates within this resource type
-                duplicates = self._find_duplicates_in_group(type_resources, resource_type)
+                duplicates = self._find_duplicates_in_group(
+                    type_resources, resource_type, settled_ids=settled_ids
+                )
                 
                 # Add to overall results
                 for duplicate in duplicates:
@@ -560,84 +764,102 @@ class ResourceDeduplicator:
     def _find_duplicates_in_group(
         self,
         resources: List[Resource],
-        resource_type: str
+        resource_type: str,
+        settled_ids: Optional[Set[int]] = None
     ) -> List[DuplicateResourceDetail]:
         """Find duplicate resources within a group of the same type."""
         duplicates = []
         processed_pairs = set()
+        settled_ids = settled_ids or set()
         
-        for i in range(len(resources)):
-            for j in range(i + 1, len(resources)):
-                resource1 = resources[i]
-                resource2 = resources[j]
-                
-                # Avoid duplicate comparisons
-                pair_key = tuple(sorted([id(resource1), id(resource2)]))
-                if pair_key in processed_pairs:
-                    continue
-                processed_pairs.add(pair_key)
-                
-                # Check for exact duplicates first (hash-based)
-                hash1 = self.hash_generator.generate_resource_hash(resource1)
-                hash2 = self.hash_generator.generate_resource_hash(resource2)
-                
-                if hash1 == hash2:
-                    # Exact duplicate found
-                    duplicate = DuplicateResourceDetail(
-                        resource_type=resource_type,
-                        resource_id=getattr(resource1, 'id', str(id(resource1))),
-                        duplicate_id=getattr(resource2, 'id', str(id(resource2))),
-                        similarity_score=1.0,
-                        duplicate_type='exact',
-                        matching_fields=['*'],  # All fields match for exact duplicates
-                        source_metadata={
-                            'hash': hash1,
-                            'comparison_method': 'hash'
-                        }
-                    )
-                    duplicates.append(duplicate)
-                    continue
+        if self.use_blocking:
+            candidate_pairs = self.blocker.candidate_pairs(resources)
+        else:
+            candidate_pairs = itertools.combinations(range(len(resources)), 2)
+        
+        # Hash each resource at most once, and only if it is in a candidate pair
+        hashes: Dict[int, str] = {}
+        
+        def resource_hash(pos: int) -> str:
+            if pos not in hashes:
+                hashes[pos] = self.hash_generator.generate_resource_hash(resources[pos])
+            return hashes[pos]
+        
+        for i, j in candidate_pairs:
+            resource1 = resources[i]
+            resource2 = resources[j]
+            
+            # Already-deduplicated pairs cannot have become duplicates
+            if id(resource1) in settled_ids and id(resource2) in settled_ids:
+                continue
+            
+            # Avoid duplicate comparisons
+            pair_key = tuple(sorted([id(resource1), id(resource2)]))
+            if pair_key in processed_pairs:
+                continue
+            processed_pairs.add(pair_key)
+            
+            # Check for exact duplicates first (hash-based)
+            hash1 = resource_hash(i)
+            hash2 = resource_hash(j)
+            
+            if hash1 == hash2:
+                # Exact duplicate found
+                duplicate = DuplicateResourceDetail(
+                    resource_type=resource_type,
+                    resource_id=getattr(resource1, 'id', str(id(resource1))),
+                    duplicate_id=getattr(resource2, 'id', str(id(resource2))),
+                    similarity_score=1.0,
+                    duplicate_type='exact',
+                    matching_fields=['*'],  # All fields match for exact duplicates
+                    source_metadata={
+                        'hash': hash1,
+                        'comparison_method': 'hash'
+                    }
+                )
+                duplicates.append(duplicate)
+                continue
+            
+            # Check for fuzzy duplicates using similarity scoring
+            similarity_score = self.fuzzy_matcher.calculate_similarity(resource1, resource2)
+            
+            if similarity_score >= self.near_threshold:
+                duplicate_type = 'near' if similarity_score >= self.near_threshold else 'fuzzy'
                 
-                # Check for fuzzy duplicates using similarity scoring
-                similarity_score = self.fuzzy_matcher.calculate_similarity(resource1, resource2)
+                # Identify matching fields for near/fuzzy duplicates
+                matching_fields = self._identify_matching_fields(resource1, resource2)
                 
-                if similarity_score >= self.near_threshold:
-                    duplicate_type = 'near' if similarity_score >= self.near_threshold else 'fuzzy'
-                    
-                    # Identify matching fields for near/fuzzy duplicates
-                    matching_fields = self._identify_matching_fields(resource1, resource2)
-                    
-                    duplicate = DuplicateResourceDetail(
-                        resource_type=resource_type,
-                        resource_id=getattr(resource1, 'id', str(id(resource1))),
-                        duplicate_id=getattr(resource2, 'id', str(id(resource2))),
-                        similarity_score=similarity_score,
-                        duplicate_type=duplicate_type,
-                        matching_fields=matching_fields,
-                        source_metadata={
-                            'comparison_method': 'fuzzy_matching',
-                            'threshold_used': self.near_threshold if duplicate_type == 'near' else self.fuzzy_threshold
-                        }
-                    )
-                    duplicates.append(duplicate)
+                duplicate = DuplicateResourceDetail(
+                    resource_type=resource_type,
+                    resource_id=getattr(resource1, 'id', str(id(resource1))),
+                    duplicate_id=getattr(resource2, 'id', str(id(resource2))),
+                    similarity_score=similarity_score,
+                    duplicate_type=duplicate_type,
+                    matching_fields=matching_fields,
+                    source_metadata={
+                        'comparison_method': 'fuzzy_matching',
+                        'threshold_used': self.near_threshold if duplicate_type == 'near' else self.fuzzy_threshold
+                    }
+                )
+                duplicates.append(duplicate)
+            
+            elif similarity_score >= self.fuzzy_threshold:
+                # Fuzzy duplicate
+                matching_fields = self._identify_matching_fields(resource1, resource2)
                 
-                elif similarity_score >= self.fuzzy_threshold:
-                    # Fuzzy duplicate
-                    matching_fields = self._identify_matching_fields(resource1, resource2)
-                    
-                    duplicate = DuplicateResourceDetail(
-                        resource_type=resource_type,
-                        resource_id=getattr(resource1, 'id', str(id(resource1))),
-                        duplicate_id=getattr(resource2, 'id', str(id(resource2))),
-                        similarity_score=similarity_score,
-                        duplicate_type='fuzzy',
-                        matching_fields=matching_fields,
-                        source_metadata={
-                            'comparison_method': 'fuzzy_matching',
-                            'threshold_used': self.fuzzy_threshold
-                        }
-                    )
-                    duplicates.append(duplicate)
+                duplicate = DuplicateResourceDetail(
+                    resource_type=resource_type,
+                    resource_id=getattr(resource1, 'id', str(id(resource1))),
+                    duplicate_id=getattr(resource2, 'id', str(id(resource2))),
+                    similarity_score=similarity_score,
+                    duplicate_type='fuzzy',
+                    matching_fields=matching_fields,
+                    source_metadata={
+                        'comparison_method': 'fuzzy_matching',
+                        'threshold_used': self.fuzzy_threshold
+                    }
+                )
+                duplicates.append(duplicate)
         
         return duplicates
     
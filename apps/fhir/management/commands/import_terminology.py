@@ -0,0 +1,101 @@
+"""
+Django management command to build the local terminology index.
+
+Usage:
+    python manage.py import_terminology --loinc Loinc.csv --icd10cm icd10cm_codes_2026.txt
+    python manage.py import_terminology --snomed sct2_Description_Snapshot-en_US.txt \
+        --snomed-icd10-map der2_iisssccRefset_ExtendedMapSnapshot_US.txt
+    python manage.py import_terminology --concepts local_subset.csv --mappings local_maps.csv
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.fhir.terminology import (
+    TerminologyIndexBuilder,
+    read_concepts_csv,
+    read_icd10cm,
+    read_loinc,
+    read_mappings_csv,
+    read_rxnorm,
+    read_snomed_descriptions,
+    read_snomed_icd10_map,
+    reset_terminology_index,
+)
+
+
+class Command(BaseCommand):
+    help = 'Build the memory-mapped terminology index from LOINC, ICD-10-CM, SNOMED CT and RxNorm files'
+
+    CONCEPT_SOURCES = (
+        ('loinc', read_loinc),
+        ('icd10cm', read_icd10cm),
+        ('snomed', read_snomed_descriptions),
+        ('rxnorm', read_rxnorm),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loinc', help='Loinc.csv or LoincTableCore.csv')
+        parser.add_argument('--icd10cm', help='icd10cm_codes_<year>.txt')
+        parser.add_argument('--snomed', help='SNOMED CT RF2 description snapshot')
+        parser.add_argument('--rxnorm', help='RxNorm RXNCONSO.RRF')
+        parser.add_argument(
+            '--snomed-icd10-map',
+            help='SNOMED CT to ICD-10-CM extended map snapshot',
+        )
+        parser.add_argument(
+            '--concepts',
+            action='append',
+            default=[],
+            help='CSV subset with system, code and display columns (repeatable)',
+        )
+        parser.add_argument(
+            '--mappings',
+            action='append',
+            default=[],
+            help='CSV cross-maps with source_system, source_code, target_system, target_code, '
+                 'mapping_type and confidence columns (repeatable)',
+        )
+        parser.add_argument(
+            '--output',
+            default=None,
+            help='Index file to write (default: FHIR_TERMINOLOGY_INDEX_PATH)',
+        )
+
+    def handle(self, *args, **options):
+        output = options['output'] or getattr(settings, 'FHIR_TERMINOLOGY_INDEX_PATH', '')
+        if not output:
+            raise CommandError('No --output given and FHIR_TERMINOLOGY_INDEX_PATH is not set')
+
+        concept_files = [(options[name], reader) for name, reader in self.CONCEPT_SOURCES if options[name]]
+        concept_files += [(path, read_concepts_csv) for path in options['concepts']]
+        mapping_files = [(path, read_mappings_csv) for path in options['mappings']]
+        if options['snomed_icd10_map']:
+            mapping_files.append((options['snomed_icd10_map'], read_snomed_icd10_map))
+        if not concept_files:
+            raise CommandError('Give at least one terminology file to import')
+
+        builder = TerminologyIndexBuilder()
+        try:
+            for path, reader in concept_files:
+                count = builder.add_concepts(reader(path))
+                self.stdout.write(f"Read {count} concepts from {path}")
+            for path, reader in mapping_files:
+                count = builder.add_mappings(reader(path))
+                self.stdout.write(f"Read {count} mappings from {path}")
+        except (OSError, KeyError, ValueError) as e:
+            raise CommandError(f"Failed to read terminology files: {e}")
+
+        metadata = builder.write(output, sources=[path for path, _reader in concept_files + mapping_files])
+        reset_terminology_index()
+
+        for system, count in sorted(metadata['concepts_by_system'].items()):
+            self.stdout.write(f"  {system}: {count} concepts")
+        if builder.skipped_mappings:
+            self.stdout.write(self.style.WARNING(
+                f"Skipped {builder.skipped_mappings} mappings whose source or target was not imported"
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {metadata['concepts']} concepts and {metadata['mappings']} mappings to {output}"
+        ))
+        self.stdout.write('Restart web and Celery workers to pick up the new index')
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from fhir.resources.resource import Resource
 
@@ -78,64 +78,159 @@ class DeduplicationService:
         if len(entries) < 2:
             return entries
 
-        parseable_rows: List[Tuple[int, Dict[str, Any], Dict[str, Any], Resource]] = []
+        if any(not isinstance(shell, dict) for shell in entries):
+            # Unexpected payload – avoid mutating unknown structure.
+            return entries
 
-        for idx, shell in enumerate(entries):
-            if not isinstance(shell, dict):
-                # Unexpected payload – avoid mutating unknown structure.
-                return entries
+        return self._deduplicate_scoped(
+            entries,
+            candidate_idxs=range(len(entries)),
+            settled_idxs=set(),
+            preserve_provenance=preserve_provenance,
+        )
 
-            rd = shell.get("resource")
-            if not isinstance(rd, dict):
-                continue
+    def deduplicate_new_entries(
+        self,
+        entries: List[Dict[str, Any]],
+        new_start: int,
+        *,
+        preserve_provenance: bool = True,
+        type_index: Optional[Dict[str, List[int]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Deduplicate ``entries[new_start:]`` against each other and against the
+        existing entries of the same resource types.
+
+        Existing entries (``entries[:new_start]``) are assumed to already be
+        deduplicated against each other — the invariant every merge keeps — so
+        existing/existing pairs are never compared, and existing entries of
+        resource types absent from the incoming batch are passed through
+        untouched. Merge cost therefore follows the incoming resources rather
+        than the whole patient history.
+
+        Args:
+            entries: Existing entries followed by the incoming entries.
+            new_start: Position of the first incoming entry.
+            preserve_provenance: Record merge provenance on surviving resources.
+            type_index: Optional ``{resourceType: [positions]}`` for the existing
+                entries; built with one scan when omitted.
+        """
+        if len(entries) < 2 or new_start >= len(entries):
+            return entries
 
-            parsed = _parse_resource_dict(rd)
-            if parsed is None:
-                continue
+        if any(not isinstance(shell, dict) for shell in entries):
+            return entries
+
+        new_types = {
+            (shell.get("resource") or {}).get("resourceType")
+            for shell in entries[new_start:]
+            if isinstance(shell.get("resource"), dict)
+        }
+        if type_index is None:
+            type_index = build_resource_type_index(entries[:new_start])
+
+        existing_idxs = sorted(
+            idx
+            for resource_type in new_types
+            for idx in type_index.get(resource_type, [])
+            if idx < new_start
+        )
+        return self._deduplicate_scoped(
+            entries,
+            candidate_idxs=existing_idxs + list(range(new_start, len(entries))),
+            settled_idxs=set(existing_idxs),
+            preserve_provenance=preserve_provenance,
+        )
+
+    def _deduplicate_scoped(
+        self,
+        entries: List[Dict[str, Any]],
+        *,
+        candidate_idxs,
+        settled_idxs: Set[int],
+        preserve_provenance: bool,
+    ) -> List[Dict[str, Any]]:
+        """
+        Dedupe the entries at ``candidate_idxs``; all others pass through.
+
+        Candidate pairs are found from the JSON itself, and only entries in a
+        pair that still needs comparing are parsed into models. Entries that
+        are neither removed nor merged into are returned by reference.
+        """
+        deduper = ResourceDeduplicator()
+
+        rows_by_type: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        for idx in candidate_idxs:
+            rd = entries[idx].get("resource")
+            if isinstance(rd, dict) and rd.get("resourceType"):
+                rows_by_type.setdefault(str(rd["resourceType"]), []).append((idx, rd))
 
-            parseable_rows.append((idx, shell, rd, parsed))
+        needs_parse: Set[int] = set()
+        for rows in rows_by_type.values():
+            if len(rows) < 2:
+                continue
+            pairs = deduper.blocker.candidate_pairs_for_dicts([rd for _, rd in rows])
+            for i, j in pairs:
+                idx_i, idx_j = rows[i][0], rows[j][0]
+                if idx_i in settled_idxs and idx_j in settled_idxs:
+                    continue
+                needs_parse.update((idx_i, idx_j))
+
+        parseable_rows: List[Tuple[int, Dict[str, Any], Resource]] = []
+        for idx in sorted(needs_parse):
+            rd = entries[idx]["resource"]
+            parsed = _parse_resource_dict(rd)
+            if parsed is not None:
+                parseable_rows.append((idx, rd, parsed))
 
         if len(parseable_rows) < 2:
             return entries
 
         ranked = sorted(
             parseable_rows,
-            key=lambda row: (-_confidence_from_resource_dict(row[2]), row[3].resource_type),
+            key=lambda row: (-_confidence_from_resource_dict(row[1]), row[2].resource_type),
         )
+        settled_ids = {id(row[2]) for row in parseable_rows if row[0] in settled_idxs}
 
-        deduper = ResourceDeduplicator()
         dedupe_result = deduper.deduplicate_resources(
-            [row[-1] for row in ranked], preserve_provenance=preserve_provenance
+            [row[-1] for row in ranked],
+            preserve_provenance=preserve_provenance,
+            settled_ids=settled_ids,
         )
+        if not dedupe_result.duplicates_found:
+            return entries
 
-        survivor_models = dedupe_result.merged_resources or []
-        survivor_set = {id(res) for res in survivor_models}
+        survivor_set = {id(res) for res in dedupe_result.merged_resources or []}
+        # Primaries of a merge carry new provenance and must be re-serialized
+        merged_primary_ids = {dup.resource_id for dup in dedupe_result.duplicates_found}
 
+        removed_idxs: Set[int] = set()
         refreshed_by_index: Dict[int, Dict[str, Any]] = {}
-        for idx, shell, _, model_inst in parseable_rows:
+        for idx, _, model_inst in parseable_rows:
             if id(model_inst) not in survivor_set:
-                continue
-            new_shell = dict(shell)
-            new_shell["resource"] = _dump_resource(model_inst)
-            refreshed_by_index[idx] = new_shell
+                removed_idxs.add(idx)
+            elif preserve_provenance and getattr(model_inst, "id", str(id(model_inst))) in merged_primary_ids:
+                new_shell = dict(entries[idx])
+                new_shell["resource"] = _dump_resource(model_inst)
+                refreshed_by_index[idx] = new_shell
 
         output: List[Dict[str, Any]] = []
-
-        parseable_idxs = {row[0] for row in parseable_rows}
         for idx, shell in enumerate(entries):
-            if not isinstance(shell, dict):
-                output.append(shell)
-                continue
-
-            refreshed = refreshed_by_index.get(idx)
-            if refreshed is not None:
-                output.append(refreshed)
-                continue
-
-            if idx in parseable_idxs:
+            if idx in removed_idxs:
                 # Duplicate removed during merge — drop entry outright
                 continue
-
-            output.append(shell)
+            output.append(refreshed_by_index.get(idx, shell))
 
         return output
+
+
+def build_resource_type_index(entries: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """Map resourceType -> positions of bundle entries carrying that type."""
+    index: Dict[str, List[int]] = {}
+    for idx, shell in enumerate(entries):
+        if not isinstance(shell, dict):
+            continue
+        rd = shell.get("resource")
+        if isinstance(rd, dict) and rd.get("resourceType"):
+            index.setdefault(rd["resourceType"], []).append(idx)
+    return index
@@ -17,7 +17,7 @@ from datetime import datetime
 
 from apps.core.date_parser import ClinicalDateParser
 from apps.fhir.services.extensions import append_extraction_extensions, source_snippet_from_field
-from apps.fhir.services.keyword_matching import is_vaccine_name, word_match
+from apps.fhir.services.keyword_matching import get_keyword_matcher, is_vaccine_name, word_match
 
 logger = logging.getLogger(__name__)
 
@@ -159,14 +159,16 @@ class ImmunizationService:
             return {"system": "http://hl7.org/fhir/sid/cvx", "code": "03", "display": "MMR"}
 
         # Word-boundary matching so "td" no longer matches "tdap"/"std" and
-        # "flu" no longer matches unrelated names.
-        for keyword, (code, display) in self.CVX_LOOKUP.items():
-            if word_match(name_lower, keyword):
-                return {
-                    "system": "http://hl7.org/fhir/sid/cvx",
-                    "code": code,
-                    "display": display,
-                }
+        # "flu" no longer matches unrelated names. The first CVX_LOOKUP entry
+        # found wins, from a single pass over the name.
+        cvx = get_keyword_matcher(tuple(self.CVX_LOOKUP.items())).classify(name_lower)
+        if cvx:
+            code, display = cvx
+            return {
+                "system": "http://hl7.org/fhir/sid/cvx",
+                "code": code,
+                "display": display,
+            }
         return None
 
     def _parse_date(self, raw_date: Any, clinical_date: Any) -> Optional[str]:
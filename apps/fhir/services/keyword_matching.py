@@ -13,10 +13,16 @@ Centralizes two things that were previously duplicated and fragile:
    real defects: ``"reflux"`` contains ``"flu"``, ``"fasting"`` contains
    ``"ast"``, ``"cobalt"`` contains ``"alt"``, ``"tdap"`` contains ``"td"``.
    Matching on word boundaries eliminates that whole class of bug.
+
+3. ``KeywordMatcher`` — a whole vocabulary compiled into one regex, so a text
+   field is scanned once instead of once per keyword. Matchers are memoized
+   by ``get_keyword_matcher``; the helpers above and the patient, encounter
+   and medication classifiers all go through it.
 """
 
 import re
-from typing import Iterable, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 # Single source of truth for vaccine recognition. Imported by both
 # ImmunizationService and ProcedureService.
@@ -47,30 +53,82 @@ def word_match(text: str, keyword: str) -> bool:
     """
     if not text or not keyword:
         return False
-    return re.search(_boundary_pattern(keyword), text.lower()) is not None
+    return get_keyword_matcher((keyword,)).search(text)
 
 
-def _boundary_pattern(keyword: str) -> str:
-    """Build a word-boundary regex for ``keyword`` allowing a plural ``s``.
+class KeywordMatcher:
+    """
+    A keyword vocabulary compiled into a single regex.
+
+    ``keywords`` is an ordered iterable of keywords, or of ``(keyword, label)``
+    pairs; earlier entries take priority. The pattern is a lookahead at every
+    candidate start position, so one ``finditer`` pass over the text reports,
+    for each position, the highest-priority keyword starting there, including
+    keywords that overlap each other.
+
+    With ``word_boundary`` (the default) keywords match on word boundaries,
+    which stops ``"ast"`` matching inside ``"fasting"``, and an optional
+    trailing ``s`` lets singular keywords match plurals (``"platelet"`` ->
+    ``"Platelets"``). Without it they match as plain substrings.
+    """
+
+    def __init__(self, keywords: Iterable[Any], word_boundary: bool = True):
+        self._entries: Dict[str, Tuple[int, Any]] = {}
+        for priority, entry in enumerate(keywords):
+            keyword, label = entry if isinstance(entry, tuple) else (entry, entry)
+            keyword = (keyword or '').lower()
+            if keyword and keyword not in self._entries:
+                self._entries[keyword] = (priority, label)
+
+        self._pattern = None
+        if self._entries:
+            alternation = '|'.join(re.escape(keyword) for keyword in self._entries)
+            if word_boundary:
+                self._pattern = re.compile(r"\b(?=(" + alternation + r")s?\b)")
+            else:
+                self._pattern = re.compile("(?=(" + alternation + "))")
+
+    def search(self, text: Optional[str]) -> bool:
+        """Return True when any keyword occurs in ``text``."""
+        if not text or self._pattern is None:
+            return False
+        return self._pattern.search(text.lower()) is not None
+
+    def best_match(self, text: Optional[str]) -> Optional[str]:
+        """Return the highest-priority keyword occurring in ``text``, or None."""
+        if not text or self._pattern is None:
+            return None
+        best = None
+        for match in self._pattern.finditer(text.lower()):
+            priority = self._entries[match.group(1)][0]
+            if best is None or priority < best[0]:
+                best = (priority, match.group(1))
+                if priority == 0:
+                    break
+        return best[1] if best else None
+
+    def classify(self, text: Optional[str], default: Any = None) -> Any:
+        """Return the label of the highest-priority keyword in ``text``, else ``default``."""
+        keyword = self.best_match(text)
+        return self._entries[keyword][1] if keyword is not None else default
+
+
+@lru_cache(maxsize=256)
+def get_keyword_matcher(keywords: Tuple[Any, ...], word_boundary: bool = True) -> KeywordMatcher:
+    """
+    Return the compiled ``KeywordMatcher`` for a vocabulary.
 
-    The leading ``\\b`` is what prevents the false matches (``"ast"`` inside
-    ``"fasting"``, ``"alt"`` inside ``"cobalt"``). The optional trailing ``s``
-    lets singular keywords still match pluralized lab/analyte names
-    (``"triglyceride"`` -> ``"Triglycerides"``, ``"platelet"`` -> ``"Platelets"``).
+    Memoized on the (hashable) keyword tuple, so classifiers called once per
+    resource compile their vocabulary once per process.
     """
-    return r"\b" + re.escape(keyword.lower()) + r"s?\b"
+    return KeywordMatcher(keywords, word_boundary=word_boundary)
 
 
 def contains_any_keyword(text: str, keywords: Iterable[str]) -> bool:
     """Return True when any keyword matches ``text`` on word boundaries."""
     if not text:
         return False
-    lowered = text.lower()
-    return any(
-        re.search(_boundary_pattern(kw), lowered)
-        for kw in keywords
-        if kw
-    )
+    return get_keyword_matcher(tuple(keywords)).search(text)
 
 
 def is_vaccine_name(name: Optional[str],
@@ -96,9 +154,11 @@ def is_vaccine_name(name: Optional[str],
     lowered = str(name).strip().lower()
 
     if claimed_names:
-        for claimed in claimed_names:
-            claimed_norm = (claimed or "").strip().lower()
-            if len(claimed_norm) >= 3 and word_match(lowered, claimed_norm):
-                return True
+        claimed = tuple(
+            claimed_norm for claimed_norm in ((c or "").strip().lower() for c in claimed_names)
+            if len(claimed_norm) >= 3
+        )
+        if contains_any_keyword(lowered, claimed):
+            return True
 
     return contains_any_keyword(lowered, VACCINE_KEYWORDS)
@@ -0,0 +1,655 @@
+"""
+Local Terminology Index
+
+CodeSystemMapper only knows code shapes; this module gives it terminology
+data. An importer (`manage.py import_terminology`) builds a single
+read-only index file from LOINC, ICD-10-CM, SNOMED CT and RxNorm release
+files (or subsets of them), plus optional cross-maps. At runtime the file
+is memory-mapped, never parsed into Python objects:
+
+- Code lookup is O(1): an open-addressing hash table of (system, code)
+  slots points into a fixed-width concept table.
+- Display search uses a trigram index (sorted trigram keys with posting
+  lists) for queries of three characters or more, and a display-ordered
+  concept list for shorter prefix queries.
+- Cross-maps are stored per concept as (target concept, type, confidence).
+
+The mapping is opened with ACCESS_READ, so every process - each Celery
+prefork child included - reads the same page-cache pages instead of
+holding its own copy. The importer writes to a temporary file and renames
+it into place; running processes keep the index they opened until they
+restart.
+
+File layout (little-endian): a fixed header of section offsets, a JSON
+metadata block, the hash slots, the concept table, the mapping table, the
+trigram table, the trigram postings, the display order, and the UTF-8
+string pool.
+"""
+
+import csv
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import zlib
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from heapq import nsmallest
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'MDPTERM1'
+FORMAT_VERSION = 1
+
+# magic, version, then (offset, length/count) pairs for each section
+_HEADER = struct.Struct('<8sI14I')
+# system id, code length, code offset, display offset, display length, mapping count, first mapping
+_CONCEPT = struct.Struct('<BxHIIHHI')
+# target concept, mapping type id, confidence percent
+_MAPPING = struct.Struct('<IBB2x')
+# trigram key, first posting, posting count
+_TRIGRAM = struct.Struct('<III')
+_U32 = struct.Struct('<I')
+
+MAPPING_TYPES = ('exact', 'equivalent', 'broader', 'narrower', 'related')
+INVERSE_MAPPING_TYPES = {'broader': 'narrower', 'narrower': 'broader'}
+
+MAX_DISPLAY_BYTES = 0xFFFF
+MAX_MAPPINGS_PER_CONCEPT = 0xFFFF
+
+# SNOMED CT RF2 identifiers used by the release-file readers
+SNOMED_FSN_TYPE_ID = '900000000000003001'
+SNOMED_PROPERLY_CLASSIFIED_CATEGORY = '447637006'
+# RxNorm term types that are synonyms of another atom on the same RXCUI
+RXNORM_SYNONYM_TTYS = {'SY', 'TMSY', 'PSN'}
+
+
+class TerminologyIndexError(Exception):
+    """Raised for missing, truncated or incompatible index files."""
+
+
+@dataclass(frozen=True)
+class TerminologyConcept:
+    """A code and its display from the terminology index."""
+    system: str
+    code: str
+    display: str
+
+
+@dataclass(frozen=True)
+class TerminologyMapping:
+    """A cross-map from one concept to another."""
+    target: TerminologyConcept
+    mapping_type: str
+    confidence: float
+
+
+def canonical_code(system: str, code: str) -> str:
+    """Normalize a code the way the index stores it (ICD-10 codes dotted)."""
+    code = str(code).strip()
+    system = system.upper()
+    if system == 'UCUM':
+        return code
+    code = code.upper()
+    if system.startswith('ICD-10') and '.' not in code and len(code) > 3:
+        code = f"{code[:3]}.{code[3:]}"
+    return code
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse punctuation to single spaces for display search."""
+    return re.sub(r'[\W_]+', ' ', str(text).lower()).strip()
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _trigram_key(trigram: str) -> int:
+    # Collisions only add candidates; search verifies every hit against the display
+    return zlib.crc32(trigram.encode('utf-8'))
+
+
+def _slot_hash(system_id: int, code: str) -> int:
+    return zlib.crc32(f"{system_id}|{code}".encode('utf-8'))
+
+
+def _u32_array(data: bytes) -> array:
+    values = array('I')
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+class TerminologyIndex:
+    """Read-only, memory-mapped terminology index."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as handle:
+            try:
+                self._buf = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:
+                raise TerminologyIndexError(f"Empty terminology index {self.path}") from exc
+
+        if len(self._buf) < _HEADER.size:
+            raise TerminologyIndexError(f"Truncated terminology index {self.path}")
+        (magic, version,
+         meta_off, meta_len,
+         self._slots_off, self._slot_count,
+         self._concepts_off, self._concept_count,
+         self._mappings_off, self._mapping_count,
+         self._trigrams_off, self._trigram_count,
+         self._postings_off, self._sorted_off,
+         self._strings_off, strings_len) = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise TerminologyIndexError(f"{self.path} is not a terminology index")
+        if version != FORMAT_VERSION:
+            raise TerminologyIndexError(
+                f"{self.path} has index format {version}, expected {FORMAT_VERSION}; re-run import_terminology"
+            )
+        if self._strings_off + strings_len > len(self._buf):
+            raise TerminologyIndexError(f"Truncated terminology index {self.path}")
+
+        self.metadata = json.loads(self._buf[meta_off:meta_off + meta_len].decode('utf-8'))
+        self.systems: List[str] = self.metadata['systems']
+        self._system_ids = {name.upper(): index for index, name in enumerate(self.systems)}
+
+    def __len__(self) -> int:
+        return self._concept_count
+
+    def close(self):
+        self._buf.close()
+
+    def lookup(self, system: str, code: str) -> Optional[TerminologyConcept]:
+        """Return the concept for a code, or None if the index doesn't have it."""
+        index = self._find(system, code)
+        return self._concept(index) if index is not None else None
+
+    def display(self, system: str, code: str) -> Optional[str]:
+        """Return the display for a code, or None."""
+        concept = self.lookup(system, code)
+        return concept.display if concept else None
+
+    def mappings(self, system: str, code: str) -> List[TerminologyMapping]:
+        """Return the cross-maps recorded for a code."""
+        index = self._find(system, code)
+        if index is None:
+            return []
+        _system_id, _code_len, _code_off, _display_off, _display_len, count, start = self._record(index)
+        results = []
+        for position in range(start, start + count):
+            target, type_id, confidence = _MAPPING.unpack_from(
+                self._buf, self._mappings_off + position * _MAPPING.size
+            )
+            results.append(TerminologyMapping(
+                target=self._concept(target),
+                mapping_type=MAPPING_TYPES[type_id],
+                confidence=confidence / 100,
+            ))
+        return results
+
+    def search(self, query: str, system: Optional[str] = None, limit: int = 10) -> List[TerminologyConcept]:
+        """
+        Find concepts whose display contains every word of the query.
+
+        Words shorter than three characters have to start a word. Exact
+        matches rank first, then displays starting with the query, then
+        displays with a word starting with it, then shorter displays.
+        """
+        normalized = normalize_text(query)
+        if not normalized or limit <= 0:
+            return []
+        system_id = None
+        if system:
+            system_id = self._system_ids.get(system.upper())
+            if system_id is None:
+                return []
+
+        words = normalized.split()
+        if all(len(word) < 3 for word in words):
+            return self._prefix_search(normalized, system_id, limit)
+
+        # Words of three or more characters match anywhere; shorter ones must start a word
+        needles = [word if len(word) >= 3 else f" {word}" for word in words]
+        candidates = self._trigram_candidates(needles)
+
+        def ranked():
+            for index in candidates:
+                record = self._record(index)
+                if system_id is not None and record[0] != system_id:
+                    continue
+                text = f" {normalize_text(self._string(record[3], record[4]))}"
+                if not all(needle in text for needle in needles):
+                    continue
+                if text[1:] == normalized:
+                    rank = 0
+                elif text.startswith(f" {normalized}"):
+                    rank = 1
+                elif f" {normalized}" in text:
+                    rank = 2
+                else:
+                    rank = 3
+                yield (rank, len(text), index)
+
+        return [self._concept(index) for _rank, _length, index in nsmallest(limit, ranked())]
+
+    def stats(self) -> Dict[str, Any]:
+        """Index metadata plus its size."""
+        return {
+            **self.metadata,
+            'path': str(self.path),
+            'size_bytes': len(self._buf),
+        }
+
+    def _find(self, system: str, code: str) -> Optional[int]:
+        if not system or not code or not self._slot_count:
+            return None
+        system_id = self._system_ids.get(system.upper())
+        if system_id is None:
+            return None
+        code = canonical_code(system, code)
+        encoded = code.encode('utf-8')
+        mask = self._slot_count - 1
+        slot = _slot_hash(system_id, code) & mask
+        while True:
+            (entry,) = _U32.unpack_from(self._buf, self._slots_off + slot * 4)
+            if entry == 0:
+                return None
+            index = entry - 1
+            record = self._record(index)
+            if record[0] == system_id and self._buf[record[2]:record[2] + record[1]] == encoded:
+                return index
+            slot = (slot + 1) & mask
+
+    def _record(self, index: int) -> Tuple[int, ...]:
+        """(system id, code length, code offset, display offset, display length, mapping count, first mapping)."""
+        return _CONCEPT.unpack_from(self._buf, self._concepts_off + index * _CONCEPT.size)
+
+    def _string(self, offset: int, length: int) -> str:
+        return self._buf[offset:offset + length].decode('utf-8')
+
+    def _concept(self, index: int) -> TerminologyConcept:
+        system_id, code_len, code_off, display_off, display_len, _count, _start = self._record(index)
+        return TerminologyConcept(
+            system=self.systems[system_id],
+            code=self._string(code_off, code_len),
+            display=self._string(display_off, display_len),
+        )
+
+    def _postings(self, key: int) -> Optional[array]:
+        lo, hi = 0, self._trigram_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key, start, count = _TRIGRAM.unpack_from(self._buf, self._trigrams_off + mid * _TRIGRAM.size)
+            if mid_key < key:
+                lo = mid + 1
+            elif mid_key > key:
+                hi = mid
+            else:
+                offset = self._postings_off + start * 4
+                return _u32_array(self._buf[offset:offset + count * 4])
+        return None
+
+    def _trigram_candidates(self, needles: List[str]) -> List[int]:
+        keys = {_trigram_key(trigram) for needle in needles for trigram in _trigrams(needle)}
+        postings = []
+        for key in keys:
+            found = self._postings(key)
+            if found is None:
+                return []
+            postings.append(found)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            candidates.intersection_update(other)
+            if not candidates:
+                break
+        return sorted(candidates)
+
+    def _sorted_text(self, position: int) -> Tuple[int, str]:
+        (index,) = _U32.unpack_from(self._buf, self._sorted_off + position * 4)
+        record = self._record(index)
+        return index, normalize_text(self._string(record[3], record[4]))
+
+    def _prefix_search(self, prefix: str, system_id: Optional[int], limit: int) -> List[TerminologyConcept]:
+        lo, hi = 0, self._concept_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._sorted_text(mid)[1] < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        results = []
+        for position in range(lo, self._concept_count):
+            index, text = self._sorted_text(position)
+            if not text.startswith(prefix):
+                break
+            if system_id is not None and self._record(index)[0] != system_id:
+                continue
+            results.append(self._concept(index))
+            if len(results) >= limit:
+                break
+        return results
+
+
+class TerminologyIndexBuilder:
+    """Collects concepts and cross-maps and writes an index file."""
+
+    def __init__(self):
+        self.systems: List[str] = []
+        self._system_ids: Dict[str, int] = {}
+        self._concepts: Dict[Tuple[int, str], str] = {}
+        self._mappings: Dict[Tuple[int, str], Dict[Tuple[int, str], Tuple[str, float]]] = {}
+        self.skipped_mappings = 0
+
+    def add_concept(self, system: str, code: str, display: str):
+        """Add or replace a concept."""
+        if not code:
+            return
+        system_id = self._system_id(system)
+        display = (display or '').strip()
+        encoded = display.encode('utf-8')
+        if len(encoded) > MAX_DISPLAY_BYTES:
+            display = encoded[:MAX_DISPLAY_BYTES].decode('utf-8', 'ignore')
+        self._concepts[(system_id, canonical_code(system, code))] = display
+
+    def add_concepts(self, rows: Iterable[Tuple[str, str, str]]) -> int:
+        """Add (system, code, display) rows; returns how many were read."""
+        count = 0
+        for system, code, display in rows:
+            self.add_concept(system, code, display)
+            count += 1
+        return count
+
+    def add_mapping(
+        self,
+        source_system: str,
+        source_code: str,
+        target_system: str,
+        target_code: str,
+        mapping_type: str = 'equivalent',
+        confidence: float = 1.0,
+        reverse: bool = True,
+    ):
+        """
+        Record a cross-map, and by default its inverse.
+
+        Mappings are resolved against the concepts when the index is
+        written; ones whose source or target wasn't imported are skipped.
+        """
+        if mapping_type not in MAPPING_TYPES:
+            raise ValueError(f"Unknown mapping type: {mapping_type}")
+        confidence = min(max(float(confidence), 0.0), 1.0)
+        source = (self._system_id(source_system), canonical_code(source_system, source_code))
+        target = (self._system_id(target_system), canonical_code(target_system, target_code))
+        self._mappings.setdefault(source, {})[target] = (mapping_type, confidence)
+        if reverse:
+            self._mappings.setdefault(target, {}).setdefault(
+                source, (INVERSE_MAPPING_TYPES.get(mapping_type, mapping_type), confidence)
+            )
+
+    def add_mappings(self, rows: Iterable[Tuple[str, str, str, str, str, float]]) -> int:
+        """Add (source system, source code, target system, target code, type, confidence) rows."""
+        count = 0
+        for row in rows:
+            self.add_mapping(*row)
+            count += 1
+        return count
+
+    def write(self, path, sources: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Write the index atomically and return its metadata."""
+        keys = sorted(self._concepts)
+        positions = {key: index for index, key in enumerate(keys)}
+
+        strings = bytearray()
+        string_offsets: Dict[str, Tuple[int, int]] = {}
+
+        def intern(value: str) -> Tuple[int, int]:
+            if value not in string_offsets:
+                encoded = value.encode('utf-8')
+                string_offsets[value] = (len(strings), len(encoded))
+                strings.extend(encoded)
+            return string_offsets[value]
+
+        mapping_rows = []
+        concept_rows = []
+        per_system: Dict[str, int] = {}
+        self.skipped_mappings = 0
+        for key in keys:
+            system_id, code = key
+            display = self._concepts[key]
+            per_system[self.systems[system_id]] = per_system.get(self.systems[system_id], 0) + 1
+            first_mapping = len(mapping_rows)
+            for target, (mapping_type, confidence) in sorted(self._mappings.get(key, {}).items()):
+                if target not in positions or len(mapping_rows) - first_mapping >= MAX_MAPPINGS_PER_CONCEPT:
+                    self.skipped_mappings += 1
+                    continue
+                mapping_rows.append((positions[target], MAPPING_TYPES.index(mapping_type), round(confidence * 100)))
+            concept_rows.append((system_id, intern(code), intern(display), len(mapping_rows) - first_mapping, first_mapping))
+        self.skipped_mappings += sum(
+            len(targets) for source, targets in self._mappings.items() if source not in positions
+        )
+
+        slot_count = 1
+        while slot_count < len(keys) * 2:
+            slot_count *= 2
+        slots = array('I', [0]) * slot_count
+        for index, (system_id, code) in enumerate(keys):
+            slot = _slot_hash(system_id, code) & (slot_count - 1)
+            while slots[slot]:
+                slot = (slot + 1) & (slot_count - 1)
+            slots[slot] = index + 1
+
+        postings_by_key: Dict[int, List[int]] = {}
+        normalized = []
+        for index, key in enumerate(keys):
+            text = normalize_text(self._concepts[key])
+            normalized.append(text)
+            for trigram in _trigrams(f" {text}"):
+                postings_by_key.setdefault(_trigram_key(trigram), []).append(index)
+        trigram_rows = []
+        postings = array('I')
+        for trigram_key in sorted(postings_by_key):
+            indexes = postings_by_key[trigram_key]
+            trigram_rows.append((trigram_key, len(postings), len(indexes)))
+            postings.extend(indexes)
+        display_order = array('I', sorted(range(len(keys)), key=lambda index: (normalized[index], index)))
+
+        metadata = {
+            'systems': self.systems,
+            'concepts': len(keys),
+            'concepts_by_system': per_system,
+            'mappings': len(mapping_rows),
+            'trigrams': len(trigram_rows),
+            'sources': sources or [],
+            'built_at': datetime.now(timezone.utc).isoformat(),
+        }
+        meta_bytes = json.dumps(metadata, sort_keys=True).encode('utf-8')
+
+        meta_off = _HEADER.size
+        slots_off = meta_off + len(meta_bytes)
+        concepts_off = slots_off + slot_count * 4
+        mappings_off = concepts_off + len(concept_rows) * _CONCEPT.size
+        trigrams_off = mappings_off + len(mapping_rows) * _MAPPING.size
+        postings_off = trigrams_off + len(trigram_rows) * _TRIGRAM.size
+        sorted_off = postings_off + len(postings) * 4
+        strings_off = sorted_off + len(display_order) * 4
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                out.write(_HEADER.pack(
+                    MAGIC, FORMAT_VERSION,
+                    meta_off, len(meta_bytes),
+                    slots_off, slot_count,
+                    concepts_off, len(concept_rows),
+                    mappings_off, len(mapping_rows),
+                    trigrams_off, len(trigram_rows),
+                    postings_off, sorted_off,
+                    strings_off, len(strings),
+                ))
+                out.write(meta_bytes)
+                for values in (slots, postings, display_order):
+                    if sys.byteorder != 'little':
+                        values.byteswap()
+                out.write(slots.tobytes())
+                for system_id, (code_off, code_len), (display_off, display_len), count, first in concept_rows:
+                    out.write(_CONCEPT.pack(
+                        system_id, code_len, strings_off + code_off,
+                        strings_off + display_off, display_len, count, first,
+                    ))
+                for row in mapping_rows:
+                    out.write(_MAPPING.pack(*row))
+                for row in trigram_rows:
+                    out.write(_TRIGRAM.pack(*row))
+                out.write(postings.tobytes())
+                out.write(display_order.tobytes())
+                out.write(strings)
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return metadata
+
+    def _system_id(self, system: str) -> int:
+        key = system.upper()
+        if key not in self._system_ids:
+            if len(self.systems) > 0xFF:
+                raise ValueError("A terminology index holds at most 256 code systems")
+            self._system_ids[key] = len(self.systems)
+            self.systems.append(system)
+        return self._system_ids[key]
+
+
+# Release file readers. Each yields rows for TerminologyIndexBuilder.
+
+def read_loinc(path) -> Iterator[Tuple[str, str, str]]:
+    """Loinc.csv (or LoincTableCore.csv): LOINC_NUM with LONG_COMMON_NAME; deprecated codes skipped."""
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        for row in csv.DictReader(handle):
+            if (row.get('STATUS') or '').upper() == 'DEPRECATED':
+                continue
+            display = row.get('LONG_COMMON_NAME') or row.get('COMPONENT') or ''
+            yield 'LOINC', row['LOINC_NUM'], display
+
+
+def read_icd10cm(path) -> Iterator[Tuple[str, str, str]]:
+    """icd10cm_codes_<year>.txt: an undotted code, whitespace, then the description."""
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            parts = line.strip().split(None, 1)
+            if len(parts) == 2:
+                yield 'ICD-10-CM', parts[0], parts[1]
+
+
+def read_snomed_descriptions(path) -> Iterator[Tuple[str, str, str]]:
+    """sct2_Description_Snapshot: active fully specified names, semantic tag removed."""
+    with open(path, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle, delimiter='\t', quoting=csv.QUOTE_NONE):
+            if row['active'] != '1' or row['typeId'] != SNOMED_FSN_TYPE_ID:
+                continue
+            yield 'SNOMED', row['conceptId'], re.sub(r'\s*\([^()]*\)$', '', row['term'])
+
+
+def read_rxnorm(path) -> Iterator[Tuple[str, str, str]]:
+    """RXNCONSO.RRF: unsuppressed RXNORM-source atoms, one name per RXCUI."""
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            fields = line.rstrip('\n').split('|')
+            if len(fields) < 17:
+                continue
+            rxcui, sab, tty, name, suppress = fields[0], fields[11], fields[12], fields[14], fields[16]
+            if sab == 'RXNORM' and suppress == 'N' and tty not in RXNORM_SYNONYM_TTYS:
+                yield 'RxNorm', rxcui, name
+
+
+def read_snomed_icd10_map(path) -> Iterator[Tuple[str, str, str, str, str, float]]:
+    """der2_iisssccRefset_ExtendedMapSnapshot: first-priority SNOMED to ICD-10-CM targets."""
+    with open(path, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle, delimiter='\t', quoting=csv.QUOTE_NONE):
+            target = row['mapTarget'].strip()
+            if (row['active'] != '1' or not target or row['mapGroup'] != '1'
+                    or row['mapPriority'] != '1' or 'TRUE' not in row['mapRule']):
+                continue
+            if row['mapCategoryId'] == SNOMED_PROPERLY_CLASSIFIED_CATEGORY:
+                yield 'SNOMED', row['referencedComponentId'], 'ICD-10-CM', target, 'equivalent', 0.9
+            else:
+                yield 'SNOMED', row['referencedComponentId'], 'ICD-10-CM', target, 'related', 0.6
+
+
+def read_concepts_csv(path) -> Iterator[Tuple[str, str, str]]:
+    """A local subset as CSV with system, code and display columns."""
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        for row in csv.DictReader(handle):
+            yield row['system'], row['code'], row.get('display') or ''
+
+
+def read_mappings_csv(path) -> Iterator[Tuple[str, str, str, str, str, float]]:
+    """
+    Cross-maps as CSV with source_system, source_code, target_system,
+    target_code and optional mapping_type (default equivalent) and
+    confidence (default 1.0) columns.
+    """
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        for row in csv.DictReader(handle):
+            yield (
+                row['source_system'], row['source_code'],
+                row['target_system'], row['target_code'],
+                row.get('mapping_type') or 'equivalent',
+                float(row.get('confidence') or 1.0),
+            )
+
+
+_terminology_index: Optional[TerminologyIndex] = None
+_terminology_path: Optional[str] = None
+_terminology_lock = threading.Lock()
+
+
+def get_terminology_index() -> Optional[TerminologyIndex]:
+    """
+    Process-wide index for FHIR_TERMINOLOGY_INDEX_PATH, or None.
+
+    None means no path is configured, no index has been built there, or
+    the file is unreadable (logged once). The result is remembered per
+    path; call reset_terminology_index() after rebuilding in-process.
+    """
+    global _terminology_index, _terminology_path
+    path = getattr(settings, 'FHIR_TERMINOLOGY_INDEX_PATH', '') or ''
+    if path == _terminology_path:
+        return _terminology_index
+    with _terminology_lock:
+        if path != _terminology_path:
+            index = None
+            if path and os.path.exists(path):
+                try:
+                    index = TerminologyIndex(path)
+                except (OSError, TerminologyIndexError) as exc:
+                    logger.error(f"Terminology index {path} unavailable: {exc}")
+                else:
+                    logger.info(f"Opened terminology index {path} ({len(index)} concepts)")
+            _terminology_index = index
+            _terminology_path = path
+    return _terminology_index
+
+
+def reset_terminology_index():
+    """Forget the opened index so the next lookup reopens the file."""
+    global _terminology_index, _terminology_path
+    with _terminology_lock:
+        _terminology_index = None
+        _terminology_path = None
@@ -0,0 +1,230 @@
+"""
+Tests for the local terminology index
+
+Covers building and memory-mapping the index, code lookup, display search,
+cross-maps, CodeSystemMapper integration and the import_terminology command.
+"""
+
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+
+from .code_systems import CodeSystemMapper
+from .terminology import (
+    TerminologyIndex,
+    TerminologyIndexBuilder,
+    TerminologyIndexError,
+    get_terminology_index,
+    reset_terminology_index,
+)
+
+CONCEPTS = [
+    ('LOINC', '8480-6', 'Systolic blood pressure'),
+    ('LOINC', '2093-3', 'Cholesterol [Mass/volume] in Serum or Plasma'),
+    ('ICD-10-CM', 'E119', 'Type 2 diabetes mellitus without complications'),
+    ('ICD-10-CM', 'I10', 'Essential (primary) hypertension'),
+    ('SNOMED', '44054006', 'Diabetes mellitus type 2'),
+    ('SNOMED', '38341003', 'Hypertensive disorder'),
+    ('RxNorm', '161', 'Acetaminophen'),
+    ('RxNorm', '197361', 'Amlodipine 5 MG Oral Tablet'),
+]
+
+
+class TerminologyTestCase(SimpleTestCase):
+    """Builds a small index in a temporary directory."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        self.path = os.path.join(self.tmp_dir, 'terminology.idx')
+
+        builder = TerminologyIndexBuilder()
+        builder.add_concepts(CONCEPTS)
+        builder.add_mapping('SNOMED', '44054006', 'ICD-10-CM', 'E11.9', 'equivalent', 0.9)
+        builder.add_mapping('SNOMED', '38341003', 'ICD-10-CM', 'I10', 'narrower', 0.8)
+        builder.add_mapping('SNOMED', '999999999', 'ICD-10-CM', 'I10')
+        builder.write(self.path)
+        self.skipped_mappings = builder.skipped_mappings
+
+        self.index = TerminologyIndex(self.path)
+        self.addCleanup(self.index.close)
+
+
+class TerminologyIndexTest(TerminologyTestCase):
+    """Lookup, search and cross-maps against the memory-mapped file."""
+
+    def test_lookup(self):
+        concept = self.index.lookup('LOINC', '8480-6')
+        self.assertEqual(concept.display, 'Systolic blood pressure')
+        self.assertEqual(self.index.display('RxNorm', '197361'), 'Amlodipine 5 MG Oral Tablet')
+        self.assertIsNone(self.index.lookup('LOINC', '0000-0'))
+        self.assertIsNone(self.index.lookup('CPT', '99213'))
+        self.assertEqual(len(self.index), len(CONCEPTS))
+
+    def test_lookup_normalizes_system_and_icd_codes(self):
+        """ICD-10 codes are stored dotted and looked up either way."""
+        self.assertEqual(self.index.lookup('icd-10-cm', 'e11.9').code, 'E11.9')
+        self.assertEqual(self.index.lookup('ICD-10-CM', 'E119').code, 'E11.9')
+        self.assertEqual(self.index.lookup('rxnorm', '161').system, 'RxNorm')
+
+    def test_mappings_are_stored_both_ways(self):
+        forward = self.index.mappings('SNOMED', '38341003')
+        self.assertEqual(len(forward), 1)
+        self.assertEqual(forward[0].target.code, 'I10')
+        self.assertEqual(forward[0].mapping_type, 'narrower')
+        self.assertEqual(forward[0].confidence, 0.8)
+
+        reverse = self.index.mappings('ICD-10-CM', 'I10')
+        self.assertEqual([(m.target.code, m.mapping_type) for m in reverse], [('38341003', 'broader')])
+        self.assertEqual(self.skipped_mappings, 2)
+
+    def test_search_ranks_prefix_matches_first(self):
+        results = self.index.search('diabetes')
+        self.assertEqual(
+            [c.code for c in results],
+            ['44054006', 'E11.9'],
+        )
+        self.assertEqual([c.code for c in self.index.search('type 2 diab', system='ICD-10-CM')], ['E11.9'])
+        self.assertEqual([c.code for c in self.index.search('mass volume serum')], ['2093-3'])
+        self.assertEqual(self.index.search('diabetes', system='LOINC'), [])
+        self.assertEqual(self.index.search('nonexistent'), [])
+
+    def test_short_queries_use_prefix_search(self):
+        self.assertEqual([c.code for c in self.index.search('sy')], ['8480-6'])
+        self.assertEqual([c.code for c in self.index.search('A')], ['161', '197361'])
+        self.assertEqual(self.index.search('a', limit=1)[0].code, '161')
+
+    def test_rejects_other_files(self):
+        bogus = os.path.join(self.tmp_dir, 'bogus.idx')
+        with open(bogus, 'wb') as handle:
+            handle.write(b'not an index' * 10)
+        with self.assertRaises(TerminologyIndexError):
+            TerminologyIndex(bogus)
+
+    def test_rebuild_replaces_file_atomically(self):
+        """Readers keep the mapping they opened while the file is replaced."""
+        builder = TerminologyIndexBuilder()
+        builder.add_concept('LOINC', '8480-6', 'Renamed')
+        builder.write(self.path)
+
+        rebuilt = TerminologyIndex(self.path)
+        self.addCleanup(rebuilt.close)
+
+        self.assertEqual(self.index.display('LOINC', '8480-6'), 'Systolic blood pressure')
+        self.assertEqual(rebuilt.display('LOINC', '8480-6'), 'Renamed')
+        self.assertEqual(os.listdir(self.tmp_dir), ['terminology.idx'])
+
+
+class CodeSystemMapperTerminologyTest(TerminologyTestCase):
+    """CodeSystemMapper resolves displays and cross-maps from the index."""
+
+    def setUp(self):
+        super().setUp()
+        self.mapper = CodeSystemMapper(enable_caching=False, terminology_index=self.index)
+
+    def test_normalize_code_resolves_display(self):
+        normalized = self.mapper.normalize_code('e119', context='diagnosis')
+
+        self.assertEqual(normalized.system, 'ICD-10-CM')
+        self.assertEqual(normalized.code, 'E11.9')
+        self.assertEqual(normalized.display, 'Type 2 diabetes mellitus without complications')
+        self.assertIn('Display resolved from terminology index', normalized.normalization_notes)
+
+    def test_given_display_is_kept(self):
+        normalized = self.mapper.normalize_code('8480-6', system='LOINC', display='SBP')
+        self.assertEqual(normalized.display, 'SBP')
+
+    def test_index_corrects_shape_detection(self):
+        """Six digits look like a SNOMED id; the index knows it is an RxNorm code."""
+        normalized = self.mapper.normalize_code('197361')
+
+        self.assertEqual(normalized.system, 'RxNorm')
+        self.assertEqual(normalized.system_uri, 'http://www.nlm.nih.gov/research/umls/rxnorm')
+        self.assertEqual(normalized.display, 'Amlodipine 5 MG Oral Tablet')
+
+    def test_find_equivalent_codes_uses_index(self):
+        mappings = self.mapper.find_equivalent_codes('44054006', 'SNOMED', ['ICD-10-CM'])
+
+        self.assertEqual(len(mappings), 1)
+        self.assertEqual(mappings[0].target_code, 'E11.9')
+        self.assertEqual(mappings[0].description, 'Type 2 diabetes mellitus without complications')
+        self.assertEqual(mappings[0].metadata, {'source': 'terminology_index'})
+
+    def test_predefined_mappings_are_not_duplicated(self):
+        mappings = self.mapper.find_equivalent_codes('E11.9', 'ICD-10-CM', ['SNOMED'])
+        self.assertEqual([m.target_code for m in mappings], ['44054006'])
+
+    def test_search_concepts_and_statistics(self):
+        self.assertEqual(self.mapper.search_concepts('hypertens', system='SNOMED')[0].code, '38341003')
+        stats = self.mapper.get_mapping_statistics()
+        self.assertEqual(stats['terminology_index']['concepts'], len(CONCEPTS))
+
+    def test_mapper_without_index(self):
+        mapper = CodeSystemMapper(enable_caching=False)
+
+        self.assertIsNone(mapper.terminology)
+        self.assertIsNone(mapper.normalize_code('8480-6').display)
+        self.assertEqual(mapper.search_concepts('diabetes'), [])
+
+
+class ImportTerminologyCommandTest(SimpleTestCase):
+    """import_terminology builds the configured index from release files."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        self.addCleanup(reset_terminology_index)
+        self.output = os.path.join(self.tmp_dir, 'index', 'terminology.idx')
+
+    def _file(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(content)
+        return path
+
+    def test_imports_release_files(self):
+        loinc = self._file('Loinc.csv', (
+            '"LOINC_NUM","COMPONENT","STATUS","LONG_COMMON_NAME"\n'
+            '"8480-6","Systolic blood pressure","ACTIVE","Systolic blood pressure"\n'
+            '"1234-5","Old test","DEPRECATED","Old test"\n'
+        ))
+        icd = self._file('icd10cm_codes.txt', 'E119    Type 2 diabetes mellitus without complications\n')
+        rxnorm = self._file('RXNCONSO.RRF', (
+            '161|ENG||||||||||RXNORM|IN|161|acetaminophen||N|4096|\n'
+            '161|ENG||||||||||RXNORM|SY|161|APAP||N|4096|\n'
+            '161|ENG||||||||||MTHSPL|SU|161|ACETAMINOPHEN||N|4096|\n'
+        ))
+        snomed = self._file('sct2_Description.txt', (
+            'id\teffectiveTime\tactive\tmoduleId\tconceptId\tlanguageCode\ttypeId\tterm\tcaseSignificanceId\n'
+            '1\t20250101\t1\t0\t44054006\ten\t900000000000003001\tDiabetes mellitus type 2 (disorder)\t0\n'
+            '2\t20250101\t1\t0\t44054006\ten\t900000000000013009\tType II diabetes\t0\n'
+        ))
+        extended_map = self._file('der2_ExtendedMap.txt', (
+            'id\teffectiveTime\tactive\tmoduleId\trefsetId\treferencedComponentId\tmapGroup\tmapPriority'
+            '\tmapRule\tmapAdvice\tmapTarget\tcorrelationId\tmapCategoryId\n'
+            '1\t20250101\t1\t0\t0\t44054006\t1\t1\tTRUE\t\tE11.9\t0\t447637006\n'
+        ))
+        out = StringIO()
+
+        with override_settings(FHIR_TERMINOLOGY_INDEX_PATH=self.output):
+            call_command(
+                'import_terminology', loinc=loinc, icd10cm=icd, rxnorm=rxnorm,
+                snomed=snomed, snomed_icd10_map=extended_map, stdout=out,
+            )
+            index = get_terminology_index()
+
+            self.assertEqual(len(index), 4)
+            self.assertIsNone(index.lookup('LOINC', '1234-5'))
+            self.assertEqual(index.display('RxNorm', '161'), 'acetaminophen')
+            self.assertEqual(index.display('SNOMED', '44054006'), 'Diabetes mellitus type 2')
+            self.assertEqual(index.mappings('ICD-10-CM', 'E11.9')[0].target.code, '44054006')
+        self.assertIn('Wrote 4 concepts and 2 mappings', out.getvalue())
+
+    def test_requires_input(self):
+        with self.assertRaises(CommandError):
+            call_command('import_terminology', output=self.output, stdout=StringIO())
@@ -0,0 +1,247 @@
+"""
+Tests for candidate-pair blocking in FHIR duplicate detection.
+
+Covers:
+- CandidatePairBlocker bucketing by code, date window and value band
+- ResourceDeduplicator keeping every same-test duplicate the all-pairs scan finds
+- find_duplicate_resources returning the same groups as an all-pairs scan
+- Benchmark: deduplicating 5,000 Observations stays well under one second
+
+Run the benchmark with: pytest apps/fhir/tests/test_deduplication_blocking.py --benchmark-only
+"""
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from fhir.resources.medicationrequest import MedicationRequest
+from fhir.resources.medicationstatement import MedicationStatement
+from fhir.resources.observation import Observation
+
+from apps.fhir import bundle_utils
+from apps.fhir.bundle_utils import (
+    add_resource_to_bundle,
+    create_initial_patient_bundle,
+    find_duplicate_resources,
+)
+from apps.fhir.deduplication import CandidatePairBlocker, ResourceDeduplicator
+from apps.fhir.fhir_models import ConditionResource, ObservationResource, PatientResource
+
+
+BASE_TIME = datetime(2024, 1, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def _observation(obs_id, code, value, when, unit='mg/dL'):
+    """Build a lab Observation the way the FHIR services emit them."""
+    return Observation.parse_obj({
+        'resourceType': 'Observation',
+        'id': obs_id,
+        'status': 'final',
+        'code': {
+            'coding': [{'system': 'http://loinc.org', 'code': code}],
+            'text': f'Lab {code}',
+        },
+        'subject': {'reference': 'Patient/patient-123'},
+        'effectiveDateTime': when.isoformat(),
+        'valueQuantity': {'value': value, 'unit': unit},
+    })
+
+
+def _rxnorm(code, name):
+    return {'coding': [{'system': 'http://www.nlm.nih.gov/research/umls/rxnorm', 'code': code}], 'text': name}
+
+
+def _lab_history(codes, readings_per_code, duplicate_every):
+    """
+    Monthly readings per LOINC code; every Nth reading is also re-extracted
+    from a second document (same content, new id), as happens in practice.
+    """
+    observations = []
+    for c in range(codes):
+        code = f'{1000 + c}-{c % 10}'
+        for r in range(readings_per_code):
+            when = BASE_TIME + timedelta(days=30 * r, hours=c % 12)
+            value = 50 + (c * 7 + r * 13) % 100
+            observations.append(_observation(f'obs-{c}-{r}', code, value, when))
+            if r % duplicate_every == 0:
+                observations.append(_observation(f'obs-{c}-{r}-dup', code, value, when))
+    return observations
+
+
+def _duplicate_pairs(result):
+    return sorted(
+        (d.resource_id, d.duplicate_id, d.duplicate_type)
+        for d in result.duplicates_found
+    )
+
+
+class CandidatePairBlockerTests(SimpleTestCase):
+    """Unit tests for the blocking stage."""
+
+    def setUp(self):
+        self.blocker = CandidatePairBlocker(tolerance_hours=24)
+
+    def test_pairs_only_within_code_and_date_window(self):
+        resources = [
+            _observation('a', '2345-7', 100, BASE_TIME),
+            _observation('b', '2345-7', 101, BASE_TIME + timedelta(hours=3)),
+            _observation('c', '2345-7', 100, BASE_TIME + timedelta(days=30)),
+            _observation('d', '718-7', 100, BASE_TIME),
+        ]
+
+        self.assertEqual(self.blocker.candidate_pairs(resources), [(0, 1)])
+
+    def test_values_outside_band_are_not_paired(self):
+        resources = [
+            _observation('a', '2345-7', 100, BASE_TIME),
+            _observation('b', '2345-7', 180, BASE_TIME + timedelta(hours=1)),
+            _observation('c', '2345-7', 180, BASE_TIME + timedelta(hours=1), unit='mmol/L'),
+        ]
+
+        # Different units are left for the full comparison to judge
+        self.assertEqual(self.blocker.candidate_pairs(resources), [(0, 2), (1, 2)])
+
+    def test_undated_resources_pair_with_whole_bucket(self):
+        undated = Observation.parse_obj({
+            'resourceType': 'Observation',
+            'id': 'undated',
+            'status': 'final',
+            'code': {'coding': [{'system': 'http://loinc.org', 'code': '2345-7'}]},
+        })
+        resources = [
+            _observation('a', '2345-7', 100, BASE_TIME),
+            _observation('b', '2345-7', 100, BASE_TIME + timedelta(days=60)),
+            undated,
+        ]
+
+        self.assertEqual(self.blocker.candidate_pairs(resources), [(0, 2), (1, 2)])
+
+    def test_medication_models_block_on_medication_code(self):
+        # The R5 models carry the code in medication.concept
+        resources = [
+            MedicationStatement.parse_obj({
+                'resourceType': 'MedicationStatement', 'id': 'ms-1', 'status': 'recorded',
+                'subject': {'reference': 'Patient/patient-123'},
+                'medication': {'concept': _rxnorm('860975', 'Metformin 500 MG')},
+            }),
+            MedicationRequest.parse_obj({
+                'resourceType': 'MedicationRequest', 'id': 'mr-1', 'status': 'active', 'intent': 'order',
+                'subject': {'reference': 'Patient/patient-123'},
+                'medication': {'concept': _rxnorm('860975', 'metformin 500mg tablet')},
+            }),
+            MedicationStatement.parse_obj({
+                'resourceType': 'MedicationStatement', 'id': 'ms-2', 'status': 'recorded',
+                'subject': {'reference': 'Patient/patient-123'},
+                'medication': {'concept': _rxnorm('197361', 'Amlodipine 5 MG')},
+            }),
+        ]
+
+        self.assertEqual(self.blocker.candidate_pairs(resources), [(0, 1)])
+
+    def test_medication_dicts_block_on_medication_codeable_concept(self):
+        # The medication service emits R4-style medicationCodeableConcept
+        resource_dicts = [
+            {'resourceType': 'MedicationStatement', 'id': 'ms-1',
+             'medicationCodeableConcept': _rxnorm('860975', 'Metformin 500 MG')},
+            {'resourceType': 'MedicationStatement', 'id': 'ms-2',
+             'medicationCodeableConcept': _rxnorm('197361', 'Amlodipine 5 MG')},
+            {'resourceType': 'MedicationRequest', 'id': 'mr-1',
+             'medication': {'concept': _rxnorm('860975', 'metformin 500mg tablet')}},
+        ]
+
+        self.assertEqual(self.blocker.candidate_pairs_for_dicts(resource_dicts), [(0, 2)])
+
+
+class BlockingParityTests(SimpleTestCase):
+    """Blocking must not lose duplicates the exhaustive scan finds on lab data."""
+
+    def test_resource_deduplicator_keeps_same_test_duplicates(self):
+        resources = _lab_history(codes=12, readings_per_code=8, duplicate_every=3)
+        # Same-day repeat draws: close in time, slightly different values
+        resources.append(_observation('repeat-1', '1000-0', 51, BASE_TIME + timedelta(hours=2)))
+        resources.append(_observation('repeat-2', '1003-3', 73, BASE_TIME + timedelta(hours=5)))
+        by_id = {r.id: r for r in resources}
+
+        def same_test_same_day(pair):
+            first, second = by_id[pair[0]], by_id[pair[1]]
+            return (
+                first.code.coding[0].code == second.code.coding[0].code
+                and abs(first.effectiveDateTime - second.effectiveDateTime) <= timedelta(hours=24)
+            )
+
+        blocked = ResourceDeduplicator().deduplicate_resources(list(resources))
+        exhaustive = ResourceDeduplicator({'use_blocking': False}).deduplicate_resources(list(resources))
+
+        self.assertTrue(blocked.success)
+        blocked_pairs = _duplicate_pairs(blocked)
+        # Every same-test, same-day duplicate of the all-pairs scan is still found...
+        expected = [p for p in _duplicate_pairs(exhaustive) if same_test_same_day(p)]
+        self.assertEqual(blocked_pairs, expected)
+        self.assertEqual(blocked.exact_duplicates, 12 * 3)
+        self.assertIn(('obs-0-0', 'repeat-1', 'near'), blocked_pairs)
+        # ...while different tests sharing a coding system are no longer merged
+        self.assertGreater(len(exhaustive.duplicates_found), len(blocked_pairs))
+
+    def test_find_duplicate_resources_matches_all_pairs(self):
+        patient = PatientResource.create_from_demographics(
+            mrn="TEST123", first_name="John", last_name="Doe",
+            birth_date=date(1990, 1, 15), patient_id="patient-123"
+        )
+        bundle = create_initial_patient_bundle(patient)
+        bundle = add_resource_to_bundle(bundle, PatientResource.create_from_demographics(
+            mrn="OTHER-9", first_name="John", last_name="Doe",
+            birth_date=date(1990, 1, 15), patient_id="patient-dup"
+        ))
+        for i, (code, display) in enumerate([
+            ("E11.9", "Type 2 diabetes mellitus"),
+            ("I10", "Essential hypertension"),
+            ("E11.9", "Type 2 diabetes mellitus"),
+            ("E11.9", "Type 2 diabetes mellitus"),
+        ]):
+            bundle = add_resource_to_bundle(bundle, ConditionResource.create_from_diagnosis(
+                patient_id="patient-123", condition_code=code,
+                condition_display=display, condition_id=f"condition-{i}"
+            ))
+        for i, (code, value) in enumerate([("33747-0", 7.2), ("2345-7", 99), ("33747-0", 7.2)]):
+            bundle = add_resource_to_bundle(bundle, ObservationResource.create_from_lab_result(
+                patient_id="patient-123", test_code=code, test_name=f"Lab {code}",
+                value=value, unit="%", observation_id=f"observation-{i}"
+            ))
+
+        def all_pairs(resources):
+            return [list(range(i + 1, len(resources))) for i in range(len(resources))]
+
+        def summarize(groups):
+            return [(g["resource_type"], [r.id for r in g["resources"]]) for g in groups]
+
+        blocked = find_duplicate_resources(bundle)
+        with patch.object(bundle_utils, '_build_candidate_index', side_effect=all_pairs):
+            exhaustive = find_duplicate_resources(bundle)
+
+        self.assertEqual(summarize(blocked), summarize(exhaustive))
+        self.assertIn(("Condition", ["condition-0", "condition-2", "condition-3"]), summarize(blocked))
+        self.assertIn(("Condition", ["condition-2", "condition-3"]), summarize(blocked))
+
+
+class TestDeduplicationBlockingBenchmark:
+    """pytest-benchmark guard for large lab histories."""
+
+    def test_deduplicate_5000_observations(self, benchmark):
+        """
+        Benchmark deduplicating 5,000 Observations (250 codes x 18 monthly
+        readings plus 500 re-extracted copies).
+        Expected: well under 1s; the all-pairs scan needed ~12.5M comparisons.
+        """
+        def setup():
+            return (_lab_history(codes=250, readings_per_code=18, duplicate_every=9),), {}
+
+        deduplicator = ResourceDeduplicator()
+        result = benchmark.pedantic(
+            deduplicator.deduplicate_resources, setup=setup, rounds=3
+        )
+
+        assert result.success
+        assert result.exact_duplicates == 500
+        assert result.resources_removed == 500
+
+        max_ms = benchmark.stats.stats.max * 1000
+        assert max_ms < 1000, f"Max dedup time {max_ms:.2f}ms exceeds 1000ms target"
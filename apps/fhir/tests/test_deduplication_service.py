@@ -0,0 +1,83 @@
+"""Tests for the dict-native fast path in DeduplicationService."""
+
+import unittest
+from unittest.mock import patch
+
+from apps.fhir.services import deduplication_service
+from apps.fhir.services.deduplication_service import DeduplicationService
+
+
+def _lab_entry(obs_id: str, code: str, value: float, month: int) -> dict:
+    return {
+        "fullUrl": f"urn:uuid:{obs_id}",
+        "resource": {
+            "resourceType": "Observation",
+            "id": obs_id,
+            "status": "final",
+            "code": {"coding": [{"system": "http://loinc.org", "code": code}]},
+            "subject": {"reference": "Patient/patient-123"},
+            "effectiveDateTime": f"2024-{month:02d}-01T08:00:00+00:00",
+            "valueQuantity": {"value": value, "unit": "mg/dL"},
+        },
+    }
+
+
+class DeduplicationServicePassThroughTests(unittest.TestCase):
+    """Entries without a candidate duplicate are neither parsed nor copied."""
+
+    def setUp(self) -> None:
+        self.service = DeduplicationService()
+        self.entries = [
+            _lab_entry(f"obs-{month}", "2345-7", 90 + month, month) for month in range(1, 11)
+        ]
+
+    def _parse_spy(self):
+        return patch.object(
+            deduplication_service,
+            "_parse_resource_dict",
+            wraps=deduplication_service._parse_resource_dict,
+        )
+
+    def test_no_candidates_returns_entries_unparsed(self) -> None:
+        with self._parse_spy() as parse_spy:
+            result = self.service.deduplicate_bundle_entries(self.entries)
+
+        self.assertIs(result, self.entries)
+        self.assertEqual(parse_spy.call_count, 0)
+
+    def test_only_duplicate_pair_is_parsed_and_rest_passed_by_reference(self) -> None:
+        duplicate = _lab_entry("obs-5-copy", "2345-7", 95, 5)
+        entries = self.entries + [duplicate]
+
+        with self._parse_spy() as parse_spy:
+            result = self.service.deduplicate_bundle_entries(entries)
+
+        parsed_ids = sorted(call.args[0]["id"] for call in parse_spy.call_args_list)
+        self.assertEqual(parsed_ids, ["obs-5", "obs-5-copy"])
+        self.assertEqual(len(result), 10)
+
+        by_id = {entry["resource"]["id"]: entry for entry in result}
+        for original in self.entries:
+            resource_id = original["resource"]["id"]
+            if resource_id != "obs-5":
+                self.assertIs(by_id[resource_id], original)
+
+        # The surviving primary is re-serialized with merge provenance
+        survivor = by_id["obs-5"]
+        self.assertIsNot(survivor, self.entries[4])
+        extension_urls = [ext["url"] for ext in survivor["resource"]["meta"]["extension"]]
+        self.assertIn("http://medicaldocparser.com/fhir/extension/deduplication", extension_urls)
+
+    def test_survivor_passed_by_reference_without_provenance(self) -> None:
+        duplicate = _lab_entry("obs-5-copy", "2345-7", 95, 5)
+        entries = self.entries + [duplicate]
+
+        result = self.service.deduplicate_bundle_entries(entries, preserve_provenance=False)
+
+        self.assertEqual(result, self.entries)
+        for kept, original in zip(result, self.entries):
+            self.assertIs(kept, original)
+
+
+if __name__ == "__main__":
+    unittest.main()
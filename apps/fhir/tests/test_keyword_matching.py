@@ -0,0 +1,112 @@
+"""
+Tests for the compiled keyword matcher.
+
+Covers:
+- KeywordMatcher agreeing with one word-boundary regex per keyword
+- Priority between overlapping keywords and labels
+- Substring mode used for therapeutic classes
+- The observation, encounter, medication and CVX classifiers built on it
+"""
+import re
+
+from django.test import SimpleTestCase
+
+from apps.fhir.services.immunization_service import ImmunizationService
+from apps.fhir.services.keyword_matching import (
+    VACCINE_KEYWORDS,
+    KeywordMatcher,
+    contains_any_keyword,
+    get_keyword_matcher,
+    is_vaccine_name,
+    word_match,
+)
+from apps.patients.utils import categorize_observation, classify_encounter_type
+from apps.reports.utils.medication_utils import get_therapeutic_class
+
+
+def _per_keyword_match(text, keywords):
+    """The previous implementation: one boundary regex per keyword."""
+    lowered = text.lower()
+    return any(re.search(r"\b" + re.escape(kw.lower()) + r"s?\b", lowered) for kw in keywords if kw)
+
+
+class KeywordMatcherTests(SimpleTestCase):
+
+    def test_matches_like_one_regex_per_keyword(self):
+        keywords = VACCINE_KEYWORDS + ('ast', 'alt', 'td', 'pack-year')
+        texts = [
+            'Reflux esophagitis', 'Fasting glucose', 'Cobalt level', 'Tdap booster',
+            'Flu shots', 'SARS-CoV-2 mRNA', 'Pack-years: 20', 'ALT/AST ratio', '', 'td.',
+        ]
+        for text in texts:
+            self.assertEqual(
+                contains_any_keyword(text, keywords), _per_keyword_match(text, keywords), text
+            )
+
+    def test_word_boundaries_and_plurals(self):
+        self.assertFalse(word_match('Reflux', 'flu'))
+        self.assertFalse(contains_any_keyword('fasting', ['ast']))
+        self.assertTrue(contains_any_keyword('Platelets', ['platelet']))
+        self.assertTrue(word_match('COVID-19 vaccine', 'covid-19'))
+
+    def test_priority_wins_over_position(self):
+        matcher = KeywordMatcher([('office', 'ambulatory'), ('emergency', 'emergency')])
+
+        self.assertEqual(matcher.classify('Emergency follow-up at the office'), 'ambulatory')
+        self.assertEqual(matcher.best_match('emergency room'), 'emergency')
+        self.assertEqual(matcher.classify('telehealth', default='unknown'), 'unknown')
+
+    def test_overlapping_keywords_are_all_seen(self):
+        """A lower-priority match does not hide a higher-priority one inside it."""
+        matcher = KeywordMatcher([('rate', 'high'), ('heart rate', 'low')])
+        self.assertEqual(matcher.classify('Resting heart rate'), 'high')
+
+    def test_substring_mode(self):
+        matcher = KeywordMatcher([('albuterol', 'A'), ('levalbuterol', 'B')], word_boundary=False)
+        self.assertEqual(matcher.classify('levalbuterol'), 'A')
+        self.assertEqual(matcher.classify('humalog75/25'), None)
+
+    def test_empty_vocabulary_never_matches(self):
+        matcher = KeywordMatcher(['', None])
+        self.assertFalse(matcher.search('anything'))
+        self.assertIsNone(matcher.best_match('anything'))
+
+    def test_matchers_are_memoized(self):
+        self.assertIs(get_keyword_matcher(('flu', 'rsv')), get_keyword_matcher(('flu', 'rsv')))
+
+    def test_claimed_vaccine_names(self):
+        self.assertTrue(is_vaccine_name('Shingrix dose 2'))
+        self.assertTrue(is_vaccine_name('Fluzone High-Dose', claimed_names={'fluzone'}))
+        self.assertFalse(is_vaccine_name('Knee arthroscopy', claimed_names={'kn', 'hip'}))
+
+
+class KeywordClassifierTests(SimpleTestCase):
+    """The classifiers keep their priority order with a single pass."""
+
+    def test_categorize_observation(self):
+        self.assertEqual(
+            categorize_observation({'display_name': 'Blood pressure after smoking'}), 'social-history'
+        )
+        self.assertEqual(categorize_observation({'display_name': 'BMI and body weight'}), 'vital-signs')
+        self.assertEqual(categorize_observation({'display_name': 'Heart murmur'}), 'exam')
+        self.assertEqual(categorize_observation({'display_name': 'Hemoglobin A1c'}), 'laboratory')
+
+    def test_classify_encounter_type(self):
+        self.assertEqual(
+            classify_encounter_type({'class': 'Office visit', 'reason': [{'display': 'Emergency admission'}]}),
+            {'code': 'emergency', 'label': 'Emergency Visit'},
+        )
+        self.assertEqual(classify_encounter_type({'class': 'Hospital stay'})['code'], 'inpatient')
+        self.assertEqual(classify_encounter_type({'class': 'Telehealth'})['code'], 'ambulatory')
+
+    def test_get_therapeutic_class(self):
+        self.assertEqual(get_therapeutic_class('Humalog75/25 KwikPen'), 'Insulin')
+        self.assertEqual(get_therapeutic_class('Lisinopril-hydrochlorothiazide 20mg'), 'ACE Inhibitors')
+        self.assertEqual(get_therapeutic_class('Vitamin D3'), 'Other')
+
+    def test_resolve_cvx(self):
+        service = ImmunizationService()
+
+        self.assertEqual(service._resolve_cvx('Tdap booster', None)['code'], '115')
+        self.assertEqual(service._resolve_cvx('Influenza (flu) vaccine', None)['code'], '88')
+        self.assertIsNone(service._resolve_cvx('Unknown shot', None))
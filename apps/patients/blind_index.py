@@ -0,0 +1,158 @@
+"""
+Keyed blind indexes for duplicate patient detection.
+
+Names and dates of birth are encrypted, so comparing every patient with every
+other one meant decrypting PHI O(n²) times. Patient.save() instead stores
+two keyed HMAC digests next to the encrypted fields:
+
+- dob_blind_index: the normalized date of birth. It is the blocking key (DOB
+  bucket) for duplicate detection, since duplicates must share a birth date.
+- name_phonetic_index: the Soundex codes of first and last name, so spelling
+  variants ("Jon Smyth" / "John Smith") collide.
+
+Digests are keyed with PATIENT_BLIND_INDEX_KEY (falling back to SECRET_KEY),
+so a database dump alone can't be dictionary-attacked for birth dates or
+names. Changing the key requires re-saving patients (or re-running the
+patients 0015 backfill). The same goes for names or dates of birth written
+with QuerySet.update() or bulk_create(), which skip save(): those patients
+have stale or empty indexes until they are saved again.
+
+find_duplicate_patient_groups() gets candidate pairs from indexed equality on
+dob_blind_index and runs the fine-grained name similarity only inside those
+small buckets.
+"""
+
+import hashlib
+import hmac
+import unicodedata
+from difflib import SequenceMatcher
+from typing import List, Optional
+
+from django.conf import settings
+from django.db.models import Count
+
+NAME_SIMILARITY_THRESHOLD = 0.8
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys('BFPV', '1'),
+    **dict.fromkeys('CGJKQSXZ', '2'),
+    **dict.fromkeys('DT', '3'),
+    'L': '4',
+    **dict.fromkeys('MN', '5'),
+    'R': '6',
+}
+
+
+def _index_key() -> bytes:
+    return (getattr(settings, 'PATIENT_BLIND_INDEX_KEY', '') or settings.SECRET_KEY).encode('utf-8')
+
+
+def blind_index(purpose: str, value: str) -> str:
+    """HMAC-SHA256 of a normalized value, namespaced by purpose; '' for no value."""
+    if not value:
+        return ''
+    message = f"{purpose}:{value}".encode('utf-8')
+    return hmac.new(_index_key(), message, hashlib.sha256).hexdigest()
+
+
+def soundex(name: Optional[str]) -> str:
+    """American Soundex code ('Robert' -> 'R163'); '' when there are no letters."""
+    letters = [
+        char for char in unicodedata.normalize('NFKD', name or '').upper()
+        if 'A' <= char <= 'Z'
+    ]
+    if not letters:
+        return ''
+    code = letters[0]
+    previous = _SOUNDEX_CODES.get(letters[0], '')
+    for char in letters[1:]:
+        digit = _SOUNDEX_CODES.get(char, '')
+        if digit and digit != previous:
+            code += digit
+        # H and W don't separate letters with the same code; vowels do
+        if char not in 'HW':
+            previous = digit
+    return (code + '000')[:4]
+
+
+def dob_blind_index(date_of_birth) -> str:
+    """Blind index of a YYYY-MM-DD date of birth (string or date)."""
+    value = str(date_of_birth or '').strip()[:10]
+    return blind_index('dob', value)
+
+
+def name_phonetic_index(first_name: Optional[str], last_name: Optional[str]) -> str:
+    """Blind index of the first/last name Soundex pair."""
+    first, last = soundex(first_name), soundex(last_name)
+    if not first and not last:
+        return ''
+    return blind_index('name-soundex', f"{first}|{last}")
+
+
+def name_similarity(patient1, patient2) -> float:
+    """SequenceMatcher ratio of the two patients' lowercase full names."""
+    name1 = f"{patient1.first_name_search} {patient1.last_name_search}"
+    name2 = f"{patient2.first_name_search} {patient2.last_name_search}"
+    return SequenceMatcher(None, name1, name2).ratio()
+
+
+def is_probable_duplicate(patient1, patient2, threshold: float = NAME_SIMILARITY_THRESHOLD) -> bool:
+    """Same DOB bucket and either a phonetic name match or similar spelling."""
+    if not patient1.dob_blind_index or patient1.dob_blind_index != patient2.dob_blind_index:
+        return False
+    if patient1.name_phonetic_index and patient1.name_phonetic_index == patient2.name_phonetic_index:
+        return True
+    return name_similarity(patient1, patient2) > threshold
+
+
+def find_duplicate_patient_groups(threshold: float = NAME_SIMILARITY_THRESHOLD) -> List[list]:
+    """
+    Groups of probable duplicate patients.
+
+    Only patients sharing a DOB bucket with someone else are loaded (one
+    GROUP BY on the indexed column plus one IN query), ordered so each bucket
+    is contiguous; pairs are compared within a bucket only. Each group is a
+    seed patient plus every unclaimed bucket member that matches it.
+    """
+    from apps.patients.models import Patient
+
+    shared_buckets = (
+        Patient.objects.exclude(dob_blind_index='')
+        .values('dob_blind_index')
+        .annotate(patient_count=Count('id'))
+        .filter(patient_count__gt=1)
+        .values('dob_blind_index')
+    )
+    candidates = (
+        Patient.objects.filter(dob_blind_index__in=shared_buckets)
+        .defer('encrypted_fhir_bundle', 'cumulative_fhir_json')
+        .order_by('dob_blind_index', 'last_name_search', 'first_name_search', 'mrn')
+    )
+
+    groups = []
+    bucket: list = []
+    for patient in candidates.iterator(chunk_size=500):
+        if bucket and patient.dob_blind_index != bucket[0].dob_blind_index:
+            groups.extend(_group_bucket(bucket, threshold))
+            bucket = []
+        bucket.append(patient)
+    if bucket:
+        groups.extend(_group_bucket(bucket, threshold))
+    return groups
+
+
+def _group_bucket(bucket: list, threshold: float) -> List[list]:
+    """Greedy grouping within one DOB bucket, as the old full scan did."""
+    groups = []
+    claimed = set()
+    for index, seed in enumerate(bucket):
+        if seed.id in claimed:
+            continue
+        group = [seed]
+        for other in bucket[index + 1:]:
+            if other.id not in claimed and is_probable_duplicate(seed, other, threshold):
+                group.append(other)
+        if len(group) > 1:
+            groups.append(group)
+            claimed.update(patient.id for patient in group)
+    return groups
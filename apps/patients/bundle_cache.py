@@ -0,0 +1,168 @@
+"""
+Decrypted FHIR bundle cache.
+
+Decrypting the patient's FHIR resources (the PatientFHIRResource rows, or a
+legacy Patient.encrypted_fhir_bundle) dominates most patient pages, and
+several consumers in one request (detail view, report, export, JSON API)
+each need the whole bundle. Decrypted bundles are cached under
+(patient id, bundle meta.versionId) at two levels:
+
+- request scope: a dict opened by FHIRBundleCacheMiddleware and dropped when
+  the response is returned, so every consumer in a request shares one
+  decryption;
+- an optional process-local LRU with a short TTL, enabled by
+  FHIR_BUNDLE_CACHE_SIZE > 0, for back-to-back requests (page + side panel).
+
+The version is read from the unencrypted Patient.fhir_bundle_index, so a
+lookup never decrypts anything. add_fhir_resources and
+rollback_document_merge stamp a new versionId and Patient.save() invalidates
+the patient's entries, so a write is never followed by a stale read.
+Patients without an indexed version bypass the cache.
+
+Cached bundles are shared between consumers: treat them as read-only.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from django.conf import settings
+
+_request_cache: ContextVar[Optional[Dict[Tuple[str, str], Dict[str, Any]]]] = ContextVar(
+    'fhir_bundle_request_cache', default=None
+)
+
+
+class BundleLRUCache:
+    """Thread-safe LRU of decrypted bundles with a per-entry TTL."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, bundle = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return bundle
+
+    def put(self, key: Hashable, bundle: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, bundle)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_patient(self, patient_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == patient_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_lru: Optional[BundleLRUCache] = None
+_lru_lock = threading.Lock()
+
+
+def _get_lru() -> Optional[BundleLRUCache]:
+    """Process-local LRU, or None when FHIR_BUNDLE_CACHE_SIZE is 0."""
+    global _lru
+    max_size = getattr(settings, 'FHIR_BUNDLE_CACHE_SIZE', 0)
+    if max_size <= 0:
+        return None
+    if _lru is None or _lru.max_size != max_size:
+        with _lru_lock:
+            if _lru is None or _lru.max_size != max_size:
+                _lru = BundleLRUCache(max_size, getattr(settings, 'FHIR_BUNDLE_CACHE_TTL', 30))
+    return _lru
+
+
+def open_request_scope():
+    """Start a request-scoped cache; returns a token for close_request_scope."""
+    return _request_cache.set({})
+
+
+def close_request_scope(token) -> None:
+    """Drop the request-scoped cache opened with open_request_scope."""
+    _request_cache.reset(token)
+
+
+def bundle_version(patient) -> Optional[str]:
+    """The patient's bundle versionId from the unencrypted bundle index."""
+    return (patient.fhir_bundle_index or {}).get('versionId')
+
+
+def _load_bundle(patient) -> Dict[str, Any]:
+    if patient.fhir_resources_in_sync():
+        return patient.get_fhir_bundle()
+    if 'encrypted_fhir_bundle' not in patient.get_deferred_fields():
+        return patient.encrypted_fhir_bundle or {}
+    bundle = (
+        type(patient)._base_manager.filter(pk=patient.pk)
+        .values_list('encrypted_fhir_bundle', flat=True)
+        .first()
+    )
+    return bundle or {}
+
+
+def get_patient_bundle(patient) -> Dict[str, Any]:
+    """
+    Return the patient's decrypted FHIR bundle, decrypting at most once per
+    (patient, bundle version) per request.
+
+    Args:
+        patient: Patient instance; encrypted_fhir_bundle may be deferred
+
+    Returns:
+        dict: The FHIR bundle (shared - do not mutate)
+    """
+    version = bundle_version(patient)
+    if not version or patient.pk is None:
+        return _load_bundle(patient)
+
+    key = (str(patient.pk), version)
+    scope = _request_cache.get()
+    if scope is not None and key in scope:
+        return scope[key]
+
+    lru = _get_lru()
+    bundle = lru.get(key) if lru else None
+    if bundle is None:
+        bundle = _load_bundle(patient)
+        if lru:
+            lru.put(key, bundle)
+
+    if scope is not None:
+        scope[key] = bundle
+    return bundle
+
+
+def invalidate(patient_id) -> None:
+    """Forget every cached bundle version of one patient."""
+    patient_id = str(patient_id)
+    scope = _request_cache.get()
+    if scope is not None:
+        for key in [k for k in scope if k[0] == patient_id]:
+            del scope[key]
+    lru = _get_lru()
+    if lru:
+        lru.invalidate_patient(patient_id)
+
+
+def clear() -> None:
+    """Empty the process-local LRU (tests, key rotation)."""
+    if _lru is not None:
+        _lru.clear()
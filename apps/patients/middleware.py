@@ -0,0 +1,25 @@
+"""
+Patient app middleware.
+"""
+
+from apps.patients import bundle_cache
+
+
+class FHIRBundleCacheMiddleware:
+    """
+    Give each request its own decrypted FHIR bundle cache.
+
+    Every consumer that reads Patient.fhir_bundle during the request shares a
+    single decryption per patient and bundle version; the cache is discarded
+    when the response is returned.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = bundle_cache.open_request_scope()
+        try:
+            return self.get_response(request)
+        finally:
+            bundle_cache.close_request_scope(token)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-16 20:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0010_remove_patient_idx_medical_codes_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patient',
+            name='fhir_bundle_index',
+            field=models.JSONField(blank=True, default=dict, help_text='Non-PHI index of bundle entries: resource counts by source document and resourceType'),
+        ),
+    ]
@@ -0,0 +1,167 @@
+# Generated by Django 5.2.3 on 2026-10-16 20:24
+
+import json
+import uuid
+from datetime import date
+
+import django.db.models.deletion
+import django_cryptography.fields
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+CLINICAL_DATE_FIELDS = (
+    'effectiveDateTime', 'effectivePeriod', 'onsetDateTime', 'onsetPeriod',
+    'performedDateTime', 'performedPeriod', 'occurrenceDateTime', 'authoredOn',
+    'recordedDate', 'period', 'date', 'issued',
+)
+
+
+def fhir_resource_row_fields(entry):
+    """Column values for the row holding a bundle entry (frozen copy of the model helper)."""
+    resource = entry.get('resource') or {}
+    meta = resource.get('meta') or {}
+    
+    clinical_date = None
+    for field in CLINICAL_DATE_FIELDS:
+        value = resource.get(field)
+        if isinstance(value, dict):
+            value = value.get('start')
+        if not value:
+            continue
+        try:
+            clinical_date = date.fromisoformat(str(value)[:10])
+            break
+        except ValueError:
+            continue
+    
+    return {
+        'full_url': entry.get('fullUrl') or '',
+        'resource_type': resource.get('resourceType', 'Unknown'),
+        'resource_id': str(resource.get('id') or ''),
+        'source': meta.get('source') or '',
+        'clinical_date': clinical_date,
+        'last_updated': str(meta.get('lastUpdated') or ''),
+        'resource': json.loads(json.dumps(resource, default=str)),
+    }
+
+
+def backfill_fhir_resource_rows(apps, schema_editor):
+    """
+    Split each patient's encrypted FHIR bundle into PatientFHIRResource rows.
+    
+    Entries without a fullUrl get one so later merges can address their row.
+    The rows then hold the data and the bundle is emptied. The non-PHI
+    fhir_bundle_index (versionId, lastUpdated, resource counts by source) is
+    written too, so the bundle cache, report snapshot and report cache key
+    work before the patient's next merge. Bundles without a versionId get one.
+    """
+    Patient = apps.get_model('patients', 'Patient')
+    PatientFHIRResource = apps.get_model('patients', 'PatientFHIRResource')
+    
+    migrated_count = 0
+    for patient in Patient.objects.all().iterator(chunk_size=100):
+        bundle = patient.encrypted_fhir_bundle or {}
+        meta = bundle.get('meta') or {}
+        entries = [e for e in bundle.get('entry') or [] if isinstance(e, dict)]
+        if not entries:
+            continue
+        version = meta.get('versionId') or str(uuid.uuid4())
+        
+        for entry in entries:
+            if not entry.get('fullUrl'):
+                entry['fullUrl'] = f"urn:uuid:{uuid.uuid4()}"
+        
+        rows = [
+            PatientFHIRResource(patient=patient, position=position, **fhir_resource_row_fields(entry))
+            for position, entry in enumerate(entries)
+        ]
+        sources = {}
+        for row in rows:
+            type_counts = sources.setdefault(row.source, {})
+            type_counts[row.resource_type] = type_counts.get(row.resource_type, 0) + 1
+        
+        PatientFHIRResource.objects.filter(patient=patient).delete()
+        PatientFHIRResource.objects.bulk_create(rows, batch_size=500)
+        patient.encrypted_fhir_bundle = {}
+        patient.fhir_resources_version = version
+        patient.fhir_bundle_index = {
+            'versionId': version,
+            'lastUpdated': str(meta.get('lastUpdated') or timezone.now().isoformat()),
+            'sources': sources,
+        }
+        patient.save(update_fields=['encrypted_fhir_bundle', 'fhir_resources_version', 'fhir_bundle_index'])
+        migrated_count += 1
+        
+        if migrated_count % 100 == 0:
+            print(f"Split FHIR bundles for {migrated_count} patients...")
+    
+    print(f"Successfully split FHIR bundles for {migrated_count} patients.")
+
+
+def clear_fhir_resource_rows(apps, schema_editor):
+    """
+    Reverse migration - merges after the split only write rows, so put the
+    rows back into each patient's bundle before dropping them.
+    """
+    Patient = apps.get_model('patients', 'Patient')
+    PatientFHIRResource = apps.get_model('patients', 'PatientFHIRResource')
+    
+    synced = Patient.objects.exclude(fhir_resources_version='')
+    for patient in synced.iterator(chunk_size=100):
+        rows = PatientFHIRResource.objects.filter(patient=patient).order_by('position')
+        index = patient.fhir_bundle_index or {}
+        patient.encrypted_fhir_bundle = {
+            'resourceType': 'Bundle',
+            'meta': {
+                'versionId': index.get('versionId') or patient.fhir_resources_version,
+                'lastUpdated': index.get('lastUpdated', ''),
+            },
+            'entry': [{'resource': row.resource, 'fullUrl': row.full_url} for row in rows],
+        }
+        patient.save(update_fields=['encrypted_fhir_bundle'])
+    PatientFHIRResource.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0011_patient_fhir_bundle_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patient',
+            name='fhir_resources_version',
+            field=models.CharField(blank=True, default='', help_text='Bundle meta.versionId mirrored by the PatientFHIRResource rows (blank = rows out of date)', max_length=64),
+        ),
+        migrations.CreateModel(
+            name='PatientFHIRResource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('full_url', models.CharField(blank=True, help_text='Bundle entry fullUrl', max_length=255)),
+                ('resource_type', models.CharField(max_length=64)),
+                ('resource_id', models.CharField(blank=True, max_length=255)),
+                ('source', models.CharField(blank=True, help_text='meta.source of the resource, e.g. document_12', max_length=100)),
+                ('clinical_date', models.DateField(blank=True, null=True)),
+                ('last_updated', models.CharField(blank=True, help_text='meta.lastUpdated', max_length=40)),
+                ('position', models.PositiveIntegerField(help_text='Order of the entry within the bundle')),
+                ('resource', django_cryptography.fields.encrypt(models.JSONField(default=dict, help_text='FHIR resource with PHI (encrypted)'))),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fhir_resources', to='patients.patient')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_updated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Patient FHIR Resource',
+                'verbose_name_plural': 'Patient FHIR Resources',
+                'db_table': 'patient_fhir_resources',
+                'ordering': ['position'],
+                'indexes': [models.Index(fields=['patient', 'resource_type'], name='patient_fhi_patient_74c310_idx'), models.Index(fields=['patient', 'source'], name='patient_fhi_patient_152454_idx'), models.Index(fields=['patient', 'clinical_date'], name='patient_fhi_patient_a6077d_idx'), models.Index(fields=['patient', 'full_url'], name='patient_fhi_patient_08f0ab_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_fhir_resource_rows, clear_fhir_resource_rows),
+    ]
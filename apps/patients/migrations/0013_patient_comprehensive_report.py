@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-16 20:33
+
+import django.db.models.deletion
+import django_cryptography.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0012_patient_fhir_resources'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PatientComprehensiveReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('bundle_version', models.CharField(help_text='Bundle meta.versionId the report was built from', max_length=64)),
+                ('report', django_cryptography.fields.encrypt(models.JSONField(default=dict, help_text='Comprehensive report with PHI (encrypted)'))),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('patient', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='report_snapshot', to='patients.patient')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_updated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Patient Comprehensive Report',
+                'verbose_name_plural': 'Patient Comprehensive Reports',
+                'db_table': 'patient_comprehensive_reports',
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.3 on 2026-10-16 23:40
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+MEDICAL_SEARCH_CATEGORIES = ("conditions", "procedures", "medications", "observations")
+
+
+def build_medical_search_text(searchable_codes):
+    """Frozen copy of apps.patients.models.build_medical_search_text as of this migration."""
+    terms = set()
+    for category in MEDICAL_SEARCH_CATEGORIES:
+        for entry in (searchable_codes or {}).get(category) or []:
+            if not isinstance(entry, dict):
+                continue
+            for key in ("display", "code"):
+                value = entry.get(key)
+                if value:
+                    terms.add(str(value).strip().lower())
+    return "\n".join(sorted(term for term in terms if term))
+
+
+def backfill_medical_search_text(apps, schema_editor):
+    """
+    Fill medical_search_text from each patient's searchable_medical_codes.
+    """
+    Patient = apps.get_model('patients', 'Patient')
+
+    batch_size = 500
+    batch = []
+    updated_count = 0
+    for patient in Patient.objects.only('id', 'searchable_medical_codes').iterator(chunk_size=batch_size):
+        patient.medical_search_text = build_medical_search_text(patient.searchable_medical_codes)
+        batch.append(patient)
+        if len(batch) >= batch_size:
+            Patient.objects.bulk_update(batch, ['medical_search_text'])
+            updated_count += len(batch)
+            batch = []
+            print(f"Indexed medical search text for {updated_count} patients...")
+    if batch:
+        Patient.objects.bulk_update(batch, ['medical_search_text'])
+        updated_count += len(batch)
+
+    print(f"Successfully indexed medical search text for {updated_count} patients.")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0013_patient_comprehensive_report'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='patient',
+            name='medical_search_text',
+            field=models.TextField(blank=True, default='', help_text='Lowercase codes and displays from searchable_medical_codes (trigram-indexed for text search)'),
+        ),
+        migrations.RunPython(backfill_medical_search_text, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='patient',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['medical_search_text'], name='idx_medical_search_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:10
+
+import hashlib
+import hmac
+import unicodedata
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copies of the apps.patients.blind_index helpers as of this migration,
+# so later changes to that module don't alter what the backfill computes.
+_SOUNDEX_CODES = {
+    **dict.fromkeys('BFPV', '1'),
+    **dict.fromkeys('CGJKQSXZ', '2'),
+    **dict.fromkeys('DT', '3'),
+    'L': '4',
+    **dict.fromkeys('MN', '5'),
+    'R': '6',
+}
+
+
+def blind_index(purpose, value):
+    if not value:
+        return ''
+    key = (getattr(settings, 'PATIENT_BLIND_INDEX_KEY', '') or settings.SECRET_KEY).encode('utf-8')
+    return hmac.new(key, f"{purpose}:{value}".encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+def soundex(name):
+    letters = [
+        char for char in unicodedata.normalize('NFKD', name or '').upper()
+        if 'A' <= char <= 'Z'
+    ]
+    if not letters:
+        return ''
+    code = letters[0]
+    previous = _SOUNDEX_CODES.get(letters[0], '')
+    for char in letters[1:]:
+        digit = _SOUNDEX_CODES.get(char, '')
+        if digit and digit != previous:
+            code += digit
+        if char not in 'HW':
+            previous = digit
+    return (code + '000')[:4]
+
+
+def dob_blind_index(date_of_birth):
+    return blind_index('dob', str(date_of_birth or '').strip()[:10])
+
+
+def name_phonetic_index(first_name, last_name):
+    first, last = soundex(first_name), soundex(last_name)
+    if not first and not last:
+        return ''
+    return blind_index('name-soundex', f"{first}|{last}")
+
+
+def backfill_blind_indexes(apps, schema_editor):
+    """
+    Compute the duplicate-detection blind indexes for existing patients.
+
+    Decrypts each patient's name and date of birth once.
+    """
+    Patient = apps.get_model('patients', 'Patient')
+
+    batch_size = 500
+    batch = []
+    updated_count = 0
+    patients = Patient.objects.only('id', 'first_name', 'last_name', 'date_of_birth')
+    for patient in patients.iterator(chunk_size=batch_size):
+        patient.dob_blind_index = dob_blind_index(patient.date_of_birth)
+        patient.name_phonetic_index = name_phonetic_index(patient.first_name, patient.last_name)
+        batch.append(patient)
+        if len(batch) >= batch_size:
+            Patient.objects.bulk_update(batch, ['dob_blind_index', 'name_phonetic_index'])
+            updated_count += len(batch)
+            batch = []
+            print(f"Indexed {updated_count} patients for duplicate detection...")
+    if batch:
+        Patient.objects.bulk_update(batch, ['dob_blind_index', 'name_phonetic_index'])
+        updated_count += len(batch)
+
+    print(f"Successfully indexed {updated_count} patients for duplicate detection.")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0014_patient_medical_search_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patient',
+            name='dob_blind_index',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Keyed HMAC of date_of_birth (duplicate detection bucket)', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='patient',
+            name='name_phonetic_index',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Keyed HMAC of the first/last name Soundex codes', max_length=64),
+        ),
+        migrations.RunPython(backfill_blind_indexes, migrations.RunPython.noop),
+    ]
@@ -29,7 +29,7 @@ SECURITY NOTES:
 
 import json
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from django.db import models, transaction
 from django.contrib.postgres.indexes import GinIndex
 from django.utils import timezone
@@ -38,6 +38,28 @@ from django_cryptography.fields import encrypt
 
 from apps.core.models import BaseModel, MedicalRecord
 
+MEDICAL_SEARCH_CATEGORIES = ("conditions", "procedures", "medications", "observations")
+
+
+def build_medical_search_text(searchable_codes):
+    """
+    Flatten searchable_medical_codes into the medical_search_text column.
+    
+    One lowercase line per distinct code or display (condition, procedure,
+    medication and observation names), so text searches hit a trigram-indexed
+    column instead of casting every patient's JSON to text.
+    """
+    terms = set()
+    for category in MEDICAL_SEARCH_CATEGORIES:
+        for entry in (searchable_codes or {}).get(category) or []:
+            if not isinstance(entry, dict):
+                continue
+            for key in ("display", "code"):
+                value = entry.get(key)
+                if value:
+                    terms.add(str(value).strip().lower())
+    return "\n".join(sorted(term for term in terms if term))
+
 
 class Patient(MedicalRecord):
     """
@@ -80,6 +102,26 @@ class Patient(MedicalRecord):
         help_text="Lowercase version of last_name for efficient searching"
     )
     
+    # Keyed blind indexes for duplicate detection (apps.patients.blind_index).
+    # Only save() computes them: queryset .update() and bulk_create() of
+    # names or DOB leave them stale or empty, so re-save those patients.
+    dob_blind_index = models.CharField(
+        max_length=64,
+        db_index=True,
+        editable=False,
+        blank=True,
+        default='',
+        help_text="Keyed HMAC of date_of_birth (duplicate detection bucket)"
+    )
+    name_phonetic_index = models.CharField(
+        max_length=64,
+        db_index=True,
+        editable=False,
+        blank=True,
+        default='',
+        help_text="Keyed HMAC of the first/last name Soundex codes"
+    )
+    
     # Additional PHI fields - All encrypted
     ssn = encrypt(models.CharField(max_length=11, blank=True, null=True))
     address = encrypt(models.TextField(blank=True, null=True))
@@ -113,6 +155,8 @@ class Patient(MedicalRecord):
     cumulative_fhir_json = models.JSONField(default=dict, blank=True)  # Legacy field - will be migrated
     
     # Dual storage approach for hybrid encryption
+    # Legacy whole-bundle storage: emptied once the PatientFHIRResource rows
+    # take over on the patient's first merge or rollback.
     encrypted_fhir_bundle = encrypt(models.JSONField(
         default=dict, 
         blank=True,
@@ -123,6 +167,11 @@ class Patient(MedicalRecord):
         blank=True,
         help_text="Extracted medical codes without PHI (unencrypted for fast searching)"
     )
+    medical_search_text = models.TextField(
+        blank=True,
+        default='',
+        help_text="Lowercase codes and displays from searchable_medical_codes (trigram-indexed for text search)"
+    )
     
     # Additional searchable fields (non-PHI)
     encounter_dates = models.JSONField(
@@ -135,6 +184,17 @@ class Patient(MedicalRecord):
         blank=True,
         help_text="List of provider references for quick searching"
     )
+    fhir_bundle_index = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Non-PHI index of bundle entries: resource counts by source document and resourceType"
+    )
+    fhir_resources_version = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text="Bundle meta.versionId mirrored by the PatientFHIRResource rows (blank = rows out of date)"
+    )
     
     class Meta:
         db_table = 'patients'
@@ -147,6 +207,11 @@ class Patient(MedicalRecord):
             GinIndex(fields=['searchable_medical_codes'], name='idx_medical_codes_gin'),
             GinIndex(fields=['encounter_dates'], name='idx_encounter_dates_gin'),
             GinIndex(fields=['provider_references'], name='idx_provider_refs_gin'),
+            GinIndex(
+                fields=['medical_search_text'],
+                name='idx_medical_search_trgm',
+                opclasses=['gin_trgm_ops'],
+            ),
         ]
         verbose_name = "Patient"
         verbose_name_plural = "Patients"
@@ -159,7 +224,9 @@ class Patient(MedicalRecord):
         Override save to populate search-optimized fields.
         
         Populates first_name_search and last_name_search with lowercase
-        versions of the encrypted fields for efficient database searching.
+        versions of the encrypted fields for efficient database searching,
+        and medical_search_text from searchable_medical_codes. Refreshes the
+        duplicate-detection blind indexes from the decrypted name and DOB.
         """
         # Populate search fields with lowercase versions
         if self.first_name:
@@ -167,12 +234,55 @@ class Patient(MedicalRecord):
         if self.last_name:
             self.last_name_search = self.last_name.lower()
         
+        deferred = self.get_deferred_fields()
+        if not deferred & {'first_name', 'last_name', 'date_of_birth'}:
+            from apps.patients.blind_index import dob_blind_index, name_phonetic_index
+            self.dob_blind_index = dob_blind_index(self.date_of_birth)
+            self.name_phonetic_index = name_phonetic_index(self.first_name, self.last_name)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and {'first_name', 'last_name', 'date_of_birth'} & set(update_fields):
+                kwargs['update_fields'] = list(update_fields) + ['dob_blind_index', 'name_phonetic_index']
+        
+        if 'searchable_medical_codes' not in self.get_deferred_fields():
+            self.medical_search_text = build_medical_search_text(self.searchable_medical_codes)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'searchable_medical_codes' in update_fields:
+                kwargs['update_fields'] = list(update_fields) + ['medical_search_text']
+        
+        # Once the rows hold the data the bundle is kept empty, so a non-empty
+        # bundle is either a legacy one or was written without going through
+        # add_fhir_resources / rollback_document_merge: read it instead of the
+        # rows until the next merge splits it again.
+        bundle_loaded = 'encrypted_fhir_bundle' not in self.get_deferred_fields()
+        if bundle_loaded and self.encrypted_fhir_bundle and self.fhir_resources_version:
+            self.fhir_resources_version = ''
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'encrypted_fhir_bundle' in update_fields:
+                kwargs['update_fields'] = list(update_fields) + ['fhir_resources_version']
+        
         super().save(*args, **kwargs)
+        
+        if bundle_loaded and self.pk is not None:
+            from apps.patients import bundle_cache
+            bundle_cache.invalidate(self.pk)
     
     def get_absolute_url(self):
         from django.urls import reverse
         return reverse('patients:detail', kwargs={'pk': self.pk})
     
+    @property
+    def fhir_bundle(self):
+        """
+        Decrypted FHIR bundle, shared through the request/LRU bundle cache.
+        
+        Assembled from the PatientFHIRResource rows once they hold the data.
+        Load the patient with ``.defer('encrypted_fhir_bundle')`` so a legacy
+        bundle is only decrypted on a cache miss. Read-only: write through
+        add_fhir_resources / rollback_document_merge.
+        """
+        from apps.patients import bundle_cache
+        return bundle_cache.get_patient_bundle(self)
+    
     # Helper methods for date_of_birth (since it's stored as encrypted string)
     def get_date_of_birth(self):
         """Get date_of_birth as a datetime.date object."""
@@ -205,14 +315,15 @@ class Patient(MedicalRecord):
     
     def add_fhir_resources(self, fhir_resources, document_id=None):
         """
-        Idempotently merge FHIR resources into the encrypted bundle using composite key matching.
+        Idempotently merge FHIR resources into the patient's encrypted resource rows.
         
         This method ensures that processing the same document twice updates existing
         resources rather than creating duplicates. Uses (meta.source, resourceType)
         as composite key for matching.
         
         This is the core method for the hybrid encryption approach. It:
-        1. Merges FHIR resources to encrypted_fhir_bundle (with PHI) using composite key matching
+        1. Merges FHIR resources into the PatientFHIRResource rows (with PHI),
+           decrypting only the rows of the incoming resource types
         2. Extracts searchable metadata without PHI
         3. Updates encounter dates and provider references
         4. Creates audit trail
@@ -228,7 +339,6 @@ class Patient(MedicalRecord):
             ValueError: If fhir_resources is invalid
             TypeError: If fhir_resources is not dict or list
         """
-        import uuid
         from django.utils import timezone
         from django.db import transaction
         from apps.fhir.services.deduplication_service import DeduplicationService
@@ -253,13 +363,9 @@ class Patient(MedicalRecord):
         try:
             # Use atomic transaction for data integrity (Task 41.6)
             with transaction.atomic():
-                # Get current encrypted bundle or initialize empty one
-                current_bundle = self.encrypted_fhir_bundle or {"resourceType": "Bundle", "entry": []}
-                
-                # Ensure bundle has proper structure
-                if "entry" not in current_bundle:
-                    current_bundle["entry"] = []
-                
+                self._lock_for_fhir_write()
+                self._split_bundle_into_rows()
+                rows = self.fhir_resources
                 source_tag = f"document_{document_id}" if document_id else "direct_entry"
                 
                 # Rollback-then-append: remove existing resources from this document
@@ -267,15 +373,19 @@ class Patient(MedicalRecord):
                 # regardless of how many resources of each type the document produces.
                 replaced_count = 0
                 if document_id:
-                    original_len = len(current_bundle["entry"])
-                    current_bundle["entry"] = [
-                        entry for entry in current_bundle["entry"]
-                        if entry.get("resource", {}).get("meta", {}).get("source", "") != source_tag
-                    ]
-                    replaced_count = original_len - len(current_bundle["entry"])
+                    replaced_count = rows.filter(source=source_tag).delete()[0]
+                
+                # Only rows of the incoming resourceTypes can be duplicates, so
+                # only those are decrypted; the rest of the history is untouched.
+                incoming_types = {resource['resourceType'] for resource in resources}
+                existing_rows = list(rows.filter(resource_type__in=incoming_types).order_by('position'))
+                existing_entries = [
+                    {"resource": row.resource, "fullUrl": row.full_url or f"urn:uuid:{uuid.uuid4()}"}
+                    for row in existing_rows
+                ]
                 
                 # Append all incoming resources as new entries
-                added_count = 0
+                new_entries = []
                 for resource in resources:
                     if "meta" not in resource:
                         resource["meta"] = {}
@@ -291,21 +401,26 @@ class Patient(MedicalRecord):
                         }]
                     })
                     
-                    current_bundle["entry"].append({
+                    new_entries.append({
                         "resource": resource,
                         "fullUrl": f"urn:uuid:{uuid.uuid4()}"
                     })
-                    added_count += 1
+                added_count = len(new_entries)
                 
+                # Existing entries were deduplicated by earlier merges, so only
+                # the incoming resources need comparing (against each other and
+                # against existing entries of the same resourceType).
                 dedup_svc = DeduplicationService()
-                current_bundle["entry"] = dedup_svc.deduplicate_bundle_entries(
-                    current_bundle["entry"],
+                merged_entries = dedup_svc.deduplicate_new_entries(
+                    existing_entries + new_entries,
+                    len(existing_entries),
                     preserve_provenance=True,
                 )
+                self._write_fhir_resource_rows(existing_rows, existing_entries, new_entries, merged_entries)
 
                 metadata_batch = [
                     bucket.get("resource")
-                    for bucket in current_bundle["entry"]
+                    for bucket in merged_entries
                     if isinstance(bucket, dict)
                     and isinstance(bucket.get("resource"), dict)
                     and bucket.get("resource", {}).get("meta", {}).get("source") == source_tag
@@ -313,14 +428,7 @@ class Patient(MedicalRecord):
                 if not metadata_batch:
                     metadata_batch = list(resources)
 
-                # Update bundle metadata
-                current_bundle["meta"] = {
-                    "lastUpdated": timezone.now().isoformat(),
-                    "versionId": str(uuid.uuid4())
-                }
-                
-                # Store the updated encrypted bundle
-                self.encrypted_fhir_bundle = current_bundle
+                self._stamp_fhir_resources_version()
                 
                 # Extract searchable metadata
                 self.extract_searchable_metadata(metadata_batch)
@@ -335,6 +443,7 @@ class Patient(MedicalRecord):
                 
                 # Save the patient record
                 self.save()
+                self._schedule_report_rebuild()
             
             # Audit trail MUST be outside transaction.atomic() — a failed INSERT
             # (e.g. from non-serializable datetime objects in FHIR data) poisons
@@ -349,6 +458,186 @@ class Patient(MedicalRecord):
             logger.error(f"Error adding FHIR resources to patient {self.mrn}: {str(e)}")
             raise
     
+    def _lock_for_fhir_write(self):
+        """
+        Lock the patient row for the rest of the caller's transaction.
+        
+        Merges and rollbacks read the rows (and Max('position')) before
+        writing them, so concurrent writers for one patient are serialized
+        here. The FHIR state is then re-read from the locked row, so an
+        instance loaded before another writer committed doesn't re-split a
+        stale bundle over that writer's rows. The bundle is only decrypted
+        when the rows are out of date.
+        """
+        locked_version = (
+            Patient.objects.select_for_update()
+            .filter(pk=self.pk)
+            .values_list('fhir_resources_version', flat=True)
+            .first()
+        )
+        if locked_version is None:
+            return
+        self.fhir_resources_version = locked_version
+        if locked_version:
+            self.encrypted_fhir_bundle = {}
+        else:
+            self.encrypted_fhir_bundle = (
+                Patient.objects.filter(pk=self.pk).values_list('encrypted_fhir_bundle', flat=True).first()
+            )
+    
+    def _split_bundle_into_rows(self):
+        """
+        Rebuild the PatientFHIRResource rows from encrypted_fhir_bundle.
+        
+        A no-op once the rows are in sync. Otherwise the bundle is a legacy
+        one or was written directly, and it becomes the new row set; the
+        bundle itself is emptied by the next _stamp_fhir_resources_version().
+        
+        Must run inside the caller's transaction, before ``save()``.
+        """
+        if self.fhir_resources_in_sync():
+            return
+        bundle = self.encrypted_fhir_bundle or {}
+        entries = [e for e in bundle.get("entry") or [] if isinstance(e, dict)]
+        for entry in entries:
+            if not entry.get("fullUrl"):
+                entry["fullUrl"] = f"urn:uuid:{uuid.uuid4()}"
+        
+        self.fhir_resources.all().delete()
+        PatientFHIRResource.objects.bulk_create([
+            PatientFHIRResource(patient=self, position=position, **fhir_resource_row_fields(entry))
+            for position, entry in enumerate(entries)
+        ], batch_size=500)
+        self.fhir_resources_version = (bundle.get("meta") or {}).get("versionId") or str(uuid.uuid4())
+    
+    def _write_fhir_resource_rows(self, existing_rows, existing_entries, new_entries, merged_entries):
+        """
+        Write the outcome of a merge to the PatientFHIRResource rows.
+        
+        ``existing_entries`` are the bundle entries of ``existing_rows`` (same
+        order) and ``merged_entries`` the deduplicated result. Rows whose entry
+        was merged away are deleted, rows whose entry was refreshed with merge
+        provenance are updated, and surviving new entries are inserted after
+        the last row. Untouched rows are not written.
+        
+        Runs under the patient row lock taken by _lock_for_fhir_write(), so
+        Max('position') can't be read by two merges at once.
+        """
+        merged_by_url = {entry["fullUrl"]: entry for entry in merged_entries}
+        
+        dropped_pks = []
+        for row, entry in zip(existing_rows, existing_entries):
+            survivor = merged_by_url.get(entry["fullUrl"])
+            if survivor is None:
+                dropped_pks.append(row.pk)
+            elif survivor is not entry or not row.full_url:
+                PatientFHIRResource.objects.filter(pk=row.pk).update(
+                    updated_at=timezone.now(), **fhir_resource_row_fields(survivor)
+                )
+        if dropped_pks:
+            PatientFHIRResource.objects.filter(pk__in=dropped_pks).delete()
+        
+        new_urls = {entry["fullUrl"] for entry in new_entries}
+        top = self.fhir_resources.aggregate(top=models.Max('position'))['top']
+        next_position = 0 if top is None else top + 1
+        PatientFHIRResource.objects.bulk_create([
+            PatientFHIRResource(patient=self, position=next_position + offset, **fhir_resource_row_fields(entry))
+            for offset, entry in enumerate(e for e in merged_entries if e["fullUrl"] in new_urls)
+        ])
+    
+    def _stamp_fhir_resources_version(self):
+        """
+        Mark the rows as the patient's current FHIR data after a write.
+        
+        Stamps a new version, rebuilds the non-PHI fhir_bundle_index from the
+        row columns (nothing is decrypted) and empties encrypted_fhir_bundle:
+        once the rows are written the bundle is assembled from them on read.
+        """
+        version = str(uuid.uuid4())
+        sources = {}
+        type_counts = (
+            self.fhir_resources.order_by()
+            .values('source', 'resource_type')
+            .annotate(count=models.Count('pk'))
+        )
+        for row in type_counts:
+            sources.setdefault(row['source'], {})[row['resource_type']] = row['count']
+        
+        self.fhir_resources_version = version
+        self.fhir_bundle_index = {
+            "versionId": version,
+            "lastUpdated": timezone.now().isoformat(),
+            "sources": sources,
+        }
+        self.encrypted_fhir_bundle = {}
+    
+    def fhir_resources_in_sync(self):
+        """
+        True when the per-resource rows hold the patient's FHIR data (no decryption needed).
+        
+        False for bundles that predate the rows or were written directly to
+        encrypted_fhir_bundle; the next merge or rollback splits those into rows.
+        """
+        return bool(self.fhir_resources_version)
+    
+    def get_fhir_resources(self, resource_types=None, source=None):
+        """
+        Return FHIR resource dicts, decrypting only the resources asked for.
+        
+        Reads the per-resource rows when they are in sync, otherwise falls back
+        to filtering the not yet split encrypted bundle.
+        
+        Args:
+            resource_types (iterable, optional): Limit to these resourceTypes
+            source (str, optional): Limit to one meta.source tag, e.g. "document_12"
+            
+        Returns:
+            list: Resource dicts in bundle order
+        """
+        if self.fhir_resources_in_sync():
+            rows = self.fhir_resources.all()
+            if resource_types is not None:
+                rows = rows.filter(resource_type__in=list(resource_types))
+            if source is not None:
+                rows = rows.filter(source=source)
+            return [row.resource for row in rows.order_by('position').only('resource')]
+        
+        types = set(resource_types) if resource_types is not None else None
+        resources = []
+        for entry in self.fhir_bundle.get("entry") or []:
+            resource = entry.get("resource") if isinstance(entry, dict) else None
+            if not isinstance(resource, dict):
+                continue
+            if types is not None and resource.get("resourceType") not in types:
+                continue
+            if source is not None and (resource.get("meta") or {}).get("source") != source:
+                continue
+            resources.append(resource)
+        return resources
+    
+    def get_fhir_bundle(self):
+        """
+        Compatibility accessor returning the bundle as a dict.
+        
+        Reassembled from the per-resource rows when they are in sync, else the
+        encrypted bundle itself. Readers should prefer ``fhir_bundle``, which
+        shares one assembled bundle per request.
+        """
+        if not self.fhir_resources_in_sync():
+            return self.fhir_bundle
+        index = self.fhir_bundle_index or {}
+        meta = {"versionId": index.get("versionId") or self.fhir_resources_version}
+        if index.get("lastUpdated"):
+            meta["lastUpdated"] = index["lastUpdated"]
+        return {
+            "resourceType": "Bundle",
+            "meta": meta,
+            "entry": [
+                {"resource": row.resource, "fullUrl": row.full_url}
+                for row in self.fhir_resources.order_by('position').only('resource', 'full_url')
+            ],
+        }
+    
     @staticmethod
     def _json_safe(obj):
         """Recursively convert non-serializable types (datetime, date, UUID) to strings."""
@@ -460,47 +749,37 @@ class Patient(MedicalRecord):
         try:
             # Use atomic transaction for data integrity
             with transaction.atomic():
-                # Get current encrypted bundle
-                current_bundle = self.encrypted_fhir_bundle or {"resourceType": "Bundle", "entry": []}
-                
-                # Handle malformed bundle gracefully
-                if "entry" not in current_bundle:
-                    logger.warning(f"Patient {self.mrn} has malformed FHIR bundle - no 'entry' field")
-                    return 0
-                
-                if not isinstance(current_bundle["entry"], list):
-                    logger.error(f"Patient {self.mrn} has corrupted FHIR bundle - 'entry' is not a list")
-                    raise ValueError("FHIR bundle 'entry' field is corrupted")
+                self._lock_for_fhir_write()
+                if not self.fhir_resources_in_sync():
+                    # Get current encrypted bundle
+                    current_bundle = self.encrypted_fhir_bundle or {"resourceType": "Bundle", "entry": []}
+                    
+                    # Handle malformed bundle gracefully
+                    if "entry" not in current_bundle:
+                        logger.warning(f"Patient {self.mrn} has malformed FHIR bundle - no 'entry' field")
+                        return 0
+                    
+                    if not isinstance(current_bundle["entry"], list):
+                        logger.error(f"Patient {self.mrn} has corrupted FHIR bundle - 'entry' is not a list")
+                        raise ValueError("FHIR bundle 'entry' field is corrupted")
+                    
+                    self._split_bundle_into_rows()
                 
                 # Build source identifier for filtering
                 source_identifier = f"document_{document_id}"
+                target_rows = self.fhir_resources.filter(source=source_identifier)
                 
-                # Track removed resources for audit trail
+                # Track removed resources for audit trail (sanitized from the
+                # unencrypted row columns - no PHI, nothing decrypted)
                 removed_resources = []
                 resource_type_counts = {}
-                
-                # Filter: keep all resources EXCEPT those from target document
-                filtered_entries = []
-                for entry in current_bundle["entry"]:
-                    resource = entry.get("resource", {})
-                    meta = resource.get("meta", {})
-                    source = meta.get("source", "")
-                    
-                    # Check if this resource belongs to the target document
-                    if source == source_identifier:
-                        # This resource should be removed
-                        resource_type = resource.get("resourceType", "Unknown")
-                        resource_type_counts[resource_type] = resource_type_counts.get(resource_type, 0) + 1
-                        
-                        # Store sanitized summary for audit (no PHI)
-                        removed_resources.append({
-                            "resourceType": resource_type,
-                            "id": resource.get("id"),
-                            "source": source
-                        })
-                    else:
-                        # Keep this resource (it's from a different document or has no source)
-                        filtered_entries.append(entry)
+                for resource_type, resource_id in target_rows.values_list('resource_type', 'resource_id'):
+                    resource_type_counts[resource_type] = resource_type_counts.get(resource_type, 0) + 1
+                    removed_resources.append({
+                        "resourceType": resource_type,
+                        "id": resource_id or None,
+                        "source": source_identifier
+                    })
                 
                 # Count removed resources
                 removed_count = len(removed_resources)
@@ -510,20 +789,12 @@ class Patient(MedicalRecord):
                     logger.info(f"No resources found for document {document_id} in patient {self.mrn} - idempotent rollback")
                     return 0
                 
-                # Update bundle with filtered entries
-                current_bundle["entry"] = filtered_entries
-                
-                # Update bundle metadata
-                current_bundle["meta"] = {
-                    "lastUpdated": timezone.now().isoformat(),
-                    "versionId": str(uuid.uuid4())
-                }
-                
-                # Store the updated encrypted bundle
-                self.encrypted_fhir_bundle = current_bundle
+                target_rows.delete()
+                self._stamp_fhir_resources_version()
                 
                 # Save the patient record
                 self.save()
+                self._schedule_report_rebuild()
                 
                 # Create HIPAA-compliant audit trail
                 self._create_rollback_audit_record(
@@ -1258,9 +1529,136 @@ class Patient(MedicalRecord):
             }
 
     def get_comprehensive_report(self):
+        """
+        Return the comprehensive patient report.
+        
+        Served from the materialized PatientComprehensiveReport when it was
+        built from the current bundle version; otherwise the report is built
+        inline and stored for the next read. Demographics and the primary
+        diagnosis are always taken from the live record, so a profile edit
+        or a new primary condition never needs a rebuild, and generated_at
+        is stamped when the report is served.
+        
+        Returns:
+            dict: Comprehensive patient report (a private copy - safe to mutate)
+        """
+        from apps.patients import bundle_cache
+        version = bundle_cache.bundle_version(self)
+        if version and self.pk is not None:
+            snapshot = (
+                PatientComprehensiveReport.objects
+                .filter(patient_id=self.pk, bundle_version=version)
+                .only('report')
+                .first()
+            )
+            if snapshot is not None:
+                report = PatientComprehensiveReport.decode_report(snapshot.report)
+                report['patient_info'].update(self._report_patient_info())
+                report['patient_info'].update(
+                    self._report_diagnosis_info(report['clinical_summary']['conditions'])
+                )
+                report['report_metadata']['generated_at'] = timezone.now().isoformat()
+                self._create_fhir_audit_record(resources=[], document_id=None)
+                return report
+        
+        report = self.build_comprehensive_report()
+        if version and self.pk is not None:
+            self._store_comprehensive_report(report, version)
+        return report
+    
+    def refresh_comprehensive_report(self):
+        """
+        Rebuild the materialized report unless it already matches the bundle.
+        
+        Called by the rebuild_patient_report task after a merge or rollback.
+        Nobody reads the report here, so no access audit record is written.
+        
+        Returns:
+            bool: True if a report was built and stored
+        """
+        from apps.patients import bundle_cache
+        version = bundle_cache.bundle_version(self)
+        if not version:
+            return False
+        if PatientComprehensiveReport.objects.filter(
+            patient_id=self.pk, bundle_version=version
+        ).exists():
+            return False
+        report = self.build_comprehensive_report(audit=False)
+        return self._store_comprehensive_report(report, version)
+    
+    def _store_comprehensive_report(self, report, version):
+        """Store a successfully built report as the snapshot for ``version``."""
+        if report.get('report_metadata', {}).get('status') == 'error':
+            return False
+        PatientComprehensiveReport.objects.update_or_create(
+            patient_id=self.pk,
+            defaults={
+                'bundle_version': version,
+                'report': PatientComprehensiveReport.encode_report(report),
+            },
+        )
+        return True
+    
+    def _schedule_report_rebuild(self):
+        """Queue a rebuild of the materialized report once the merge commits."""
+        patient_id = str(self.pk)
+        
+        def enqueue():
+            try:
+                from apps.patients.tasks import rebuild_patient_report
+                rebuild_patient_report.delay(patient_id)
+            except Exception as e:
+                # The next read rebuilds inline, so a broker outage must not
+                # surface as a failed merge.
+                import logging
+                logging.getLogger(__name__).warning(
+                    f"Could not queue report rebuild for patient {self.mrn}: {e}"
+                )
+        
+        transaction.on_commit(enqueue)
+    
+    def _report_patient_info(self):
+        """Demographic part of ``patient_info``, read from the live record."""
+        return {
+            'mrn': self.mrn,
+            'name': self.full_name,
+            # Date object (not the raw string) so the PDF's |date filter
+            # renders it; JsonResponse(default=str) serialises it to an
+            # ISO string for the web panel, which fmtDate() handles.
+            'date_of_birth': self.get_date_of_birth(),
+            'age': self.age if self.age is not None else 'Unknown',
+            'gender': self.get_gender_display() if self.gender else 'Unknown',
+            'living_setting': self.get_living_setting_display() if self.living_setting else 'Not specified',
+            'contact': {
+                'address': self.address or '',
+                'phone': self.phone or '',
+                'email': self.email or ''
+            }
+        }
+    
+    def _report_diagnosis_info(self, conditions):
+        """Diagnosis part of ``patient_info``, following the live primary_condition_id."""
+        primary_diagnosis = self.get_primary_diagnosis_from_conditions(conditions)
+        return {
+            'primary_diagnosis': primary_diagnosis,
+            'comorbidities': self.get_comorbidities_from_conditions(conditions),
+            # Clinical onset only -- recorded_date is the document-processing
+            # timestamp (often "today") and would misrepresent the diagnosis date.
+            'initial_diagnosis_date': primary_diagnosis.get('onset_date') if primary_diagnosis else None,
+        }
+
+    def build_comprehensive_report(self, audit=True):
         """
         Generate a comprehensive patient report from encrypted FHIR data.
         
+        Walks the whole bundle; readers should call get_comprehensive_report,
+        which serves the materialized copy when it is current.
+        
+        Args:
+            audit: Record the report access in PatientHistory. Background
+                rebuilds pass False since no user is reading the report.
+        
         Returns a structured report containing:
         - Patient demographics (decrypted)
         - Medical conditions and diagnoses
@@ -1276,22 +1674,7 @@ class Patient(MedicalRecord):
         try:
             # Initialize the report structure
             report = {
-                'patient_info': {
-                    'mrn': self.mrn,
-                    'name': self.full_name,
-                    # Date object (not the raw string) so the PDF's |date filter
-                    # renders it; JsonResponse(default=str) serialises it to an
-                    # ISO string for the web panel, which fmtDate() handles.
-                    'date_of_birth': self.get_date_of_birth(),
-                    'age': self.age if self.age is not None else 'Unknown',
-                    'gender': self.get_gender_display() if self.gender else 'Unknown',
-                    'living_setting': self.get_living_setting_display() if self.living_setting else 'Not specified',
-                    'contact': {
-                        'address': self.address or '',
-                        'phone': self.phone or '',
-                        'email': self.email or ''
-                    }
-                },
+                'patient_info': self._report_patient_info(),
                 'clinical_summary': {
                     'conditions': [],
                     'procedures': [],
@@ -1316,8 +1699,9 @@ class Patient(MedicalRecord):
                 }
             }
             
-            # Access encrypted FHIR bundle
-            if not self.encrypted_fhir_bundle:
+            # Access encrypted FHIR bundle (decrypted once per request via the bundle cache)
+            fhir_bundle = self.fhir_bundle
+            if not fhir_bundle:
                 report['report_metadata']['status'] = 'no_data'
                 report['report_metadata']['message'] = 'No FHIR data available for this patient'
                 return report
@@ -1326,7 +1710,7 @@ class Patient(MedicalRecord):
             total_resources = 0
             
             # The encrypted_fhir_bundle is a FHIR Bundle with entry array
-            bundle_entries = self.encrypted_fhir_bundle.get('entry', [])
+            bundle_entries = fhir_bundle.get('entry', [])
             # Normalize non-JSON-native types (datetime, Decimal, UUID) that can
             # survive encrypt/decrypt so extraction never hits TypeError on [:10].
             bundle_entries = json.loads(json.dumps(bundle_entries, default=str))
@@ -1412,17 +1796,7 @@ class Patient(MedicalRecord):
             conditions = report['clinical_summary']['conditions']
             observations = report['clinical_summary']['observations']
             
-            primary_diagnosis = self.get_primary_diagnosis_from_conditions(conditions)
-            report['patient_info']['primary_diagnosis'] = primary_diagnosis
-            report['patient_info']['comorbidities'] = self.get_comorbidities_from_conditions(conditions)
-            
-            # Calculate initial diagnosis date from primary diagnosis.
-            # Use clinical onset only -- recorded_date is the document-processing
-            # timestamp (often "today") and would misrepresent the diagnosis date.
-            if primary_diagnosis:
-                report['patient_info']['initial_diagnosis_date'] = primary_diagnosis.get('onset_date')
-            else:
-                report['patient_info']['initial_diagnosis_date'] = None
+            report['patient_info'].update(self._report_diagnosis_info(conditions))
             
             # Add weight timeline to clinical summary
             report['clinical_summary']['weight_timeline'] = self.get_weight_timeline_from_observations(observations)
@@ -1432,10 +1806,11 @@ class Patient(MedicalRecord):
             self._add_wp3_presentation(report)
             
             # Create audit record for report generation
-            self._create_fhir_audit_record(
-                resources=[],
-                document_id=None
-            )
+            if audit:
+                self._create_fhir_audit_record(
+                    resources=[],
+                    document_id=None
+                )
             
             return report
             
@@ -2767,6 +3142,159 @@ class Patient(MedicalRecord):
             logger.warning(f"Failed to sort clinical data: {str(e)}")
 
 
+# Resource fields carrying the clinically relevant date, in order of preference
+CLINICAL_DATE_FIELDS = (
+    'effectiveDateTime', 'effectivePeriod', 'onsetDateTime', 'onsetPeriod',
+    'performedDateTime', 'performedPeriod', 'occurrenceDateTime', 'authoredOn',
+    'recordedDate', 'period', 'date', 'issued',
+)
+
+
+def fhir_resource_row_fields(entry):
+    """
+    Column values for the PatientFHIRResource row holding a bundle entry.
+    """
+    from datetime import date
+    
+    resource = entry.get("resource") or {}
+    meta = resource.get("meta") or {}
+    
+    clinical_date = None
+    for field in CLINICAL_DATE_FIELDS:
+        value = resource.get(field)
+        if isinstance(value, dict):
+            value = value.get("start")
+        if not value:
+            continue
+        try:
+            clinical_date = date.fromisoformat(str(value)[:10])
+            break
+        except ValueError:
+            continue
+    
+    return {
+        "full_url": entry.get("fullUrl") or "",
+        "resource_type": resource.get("resourceType", "Unknown"),
+        "resource_id": str(resource.get("id") or ""),
+        "source": meta.get("source") or "",
+        "clinical_date": clinical_date,
+        "last_updated": str(meta.get("lastUpdated") or ""),
+        "resource": json.loads(json.dumps(resource, default=str)),
+    }
+
+
+class PatientFHIRResource(BaseModel):
+    """
+    One encrypted FHIR resource from a patient's bundle.
+    
+    The rows are the patient's FHIR storage: merges and rollbacks read and
+    write only the resources involved, and readers load and decrypt only the
+    resources they need. Routing columns (type, source document, clinical
+    date) are unencrypted for indexing; the resource itself is encrypted.
+    Written by Patient.add_fhir_resources and Patient.rollback_document_merge;
+    read through Patient.get_fhir_resources or Patient.fhir_bundle.
+    """
+    patient = models.ForeignKey(
+        Patient,
+        on_delete=models.CASCADE,
+        related_name='fhir_resources'
+    )
+    full_url = models.CharField(max_length=255, blank=True, help_text="Bundle entry fullUrl")
+    resource_type = models.CharField(max_length=64)
+    resource_id = models.CharField(max_length=255, blank=True)
+    source = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="meta.source of the resource, e.g. document_12"
+    )
+    clinical_date = models.DateField(null=True, blank=True)
+    last_updated = models.CharField(max_length=40, blank=True, help_text="meta.lastUpdated")
+    position = models.PositiveIntegerField(help_text="Order of the entry within the bundle")
+    resource = encrypt(models.JSONField(default=dict, help_text="FHIR resource with PHI (encrypted)"))
+    
+    class Meta:
+        db_table = 'patient_fhir_resources'
+        indexes = [
+            models.Index(fields=['patient', 'resource_type']),
+            models.Index(fields=['patient', 'source']),
+            models.Index(fields=['patient', 'clinical_date']),
+            models.Index(fields=['patient', 'full_url']),
+        ]
+        ordering = ['position']
+        verbose_name = "Patient FHIR Resource"
+        verbose_name_plural = "Patient FHIR Resources"
+    
+    def __str__(self):
+        return f"{self.resource_type} for patient {self.patient_id}"
+
+
+class PatientComprehensiveReport(BaseModel):
+    """
+    Materialized Patient.get_comprehensive_report() output.
+    
+    Building the report walks and re-extracts the whole bundle, so it is
+    built once per bundle version - by the rebuild_patient_report task after
+    a merge or rollback, or inline on the first read of a new version - and
+    stored encrypted. bundle_version holds the bundle meta.versionId the
+    report was built from; a mismatch marks the snapshot stale.
+    """
+    patient = models.OneToOneField(
+        Patient,
+        on_delete=models.CASCADE,
+        related_name='report_snapshot'
+    )
+    bundle_version = models.CharField(
+        max_length=64,
+        help_text="Bundle meta.versionId the report was built from"
+    )
+    report = encrypt(models.JSONField(default=dict, help_text="Comprehensive report with PHI (encrypted)"))
+    
+    # Tags for values JSON cannot hold; the PDF templates need real dates
+    DATE_TAG = '__date__'
+    DATETIME_TAG = '__datetime__'
+    
+    class Meta:
+        db_table = 'patient_comprehensive_reports'
+        verbose_name = "Patient Comprehensive Report"
+        verbose_name_plural = "Patient Comprehensive Reports"
+    
+    def __str__(self):
+        return f"Comprehensive report for patient {self.patient_id}"
+    
+    @classmethod
+    def encode_report(cls, value):
+        """
+        JSON-storable copy of a report. date/datetime values are tagged so
+        decode_report restores them; other non-JSON values become strings,
+        as they would in the JSON summary endpoint.
+        """
+        if isinstance(value, dict):
+            return {str(key): cls.encode_report(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [cls.encode_report(item) for item in value]
+        if isinstance(value, datetime):
+            return {cls.DATETIME_TAG: value.isoformat()}
+        if isinstance(value, date):
+            return {cls.DATE_TAG: value.isoformat()}
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        return str(value)
+    
+    @classmethod
+    def decode_report(cls, value):
+        """Inverse of encode_report."""
+        if isinstance(value, dict):
+            if len(value) == 1:
+                if cls.DATE_TAG in value:
+                    return date.fromisoformat(value[cls.DATE_TAG])
+                if cls.DATETIME_TAG in value:
+                    return datetime.fromisoformat(value[cls.DATETIME_TAG])
+            return {key: cls.decode_report(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [cls.decode_report(item) for item in value]
+        return value
+
+
 class PatientHistory(BaseModel):
     """
     Audit trail for patient record changes.
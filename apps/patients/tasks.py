@@ -0,0 +1,42 @@
+"""
+Celery tasks for patient records.
+Keeps the materialized comprehensive report in step with the FHIR bundle.
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, name="apps.patients.tasks.rebuild_patient_report", acks_late=True,
+             max_retries=3, default_retry_delay=30)
+def rebuild_patient_report(self, patient_id):
+    """
+    Rebuild a patient's materialized comprehensive report.
+    
+    Queued on commit by Patient.add_fhir_resources and
+    Patient.rollback_document_merge. A report that already matches the
+    current bundle version is left alone, so back-to-back merges build once.
+    
+    Args:
+        patient_id: Patient primary key (UUID string)
+    
+    Returns:
+        dict: Whether a report was rebuilt
+    """
+    from .models import Patient
+    
+    patient = Patient.objects.defer('encrypted_fhir_bundle').filter(pk=patient_id).first()
+    if patient is None:
+        logger.info(f"Skipping report rebuild: patient {patient_id} no longer exists")
+        return {'success': False, 'rebuilt': False, 'patient_id': str(patient_id)}
+    
+    try:
+        rebuilt = patient.refresh_comprehensive_report()
+    except Exception as exc:
+        logger.error(f"Report rebuild failed for patient {patient_id}: {exc}")
+        raise self.retry(exc=exc)
+    
+    return {'success': True, 'rebuilt': rebuilt, 'patient_id': str(patient_id)}
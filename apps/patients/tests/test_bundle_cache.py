@@ -0,0 +1,102 @@
+"""
+Tests for the decrypted FHIR bundle cache (apps.patients.bundle_cache).
+"""
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from apps.patients import bundle_cache
+from apps.patients.middleware import FHIRBundleCacheMiddleware
+from apps.patients.models import Patient
+
+
+class FHIRBundleCacheTests(TestCase):
+    """One decryption per patient and bundle version per request."""
+
+    def setUp(self):
+        bundle_cache.clear()
+        self.patient = Patient.objects.create(
+            first_name='Cache',
+            last_name='Patient',
+            date_of_birth='1970-02-02',
+            mrn='CACHE-001'
+        )
+        self.patient.add_fhir_resources(
+            [{'resourceType': 'Condition', 'code': {'text': 'Asthma'}}], document_id=1
+        )
+
+    def _deferred_patient(self):
+        return Patient.objects.defer('encrypted_fhir_bundle').get(pk=self.patient.pk)
+
+    def _load_spy(self):
+        return patch.object(bundle_cache, '_load_bundle', wraps=bundle_cache._load_bundle)
+
+    def test_consumers_in_one_request_share_one_decryption(self):
+        def view(request):
+            first = self._deferred_patient().fhir_bundle
+            report = self._deferred_patient().get_comprehensive_report()
+            return first, report
+
+        with self._load_spy() as load_spy:
+            first, report = FHIRBundleCacheMiddleware(view)(request=None)
+
+        self.assertEqual(load_spy.call_count, 1)
+        self.assertEqual(first['entry'][0]['resource']['code']['text'], 'Asthma')
+        self.assertEqual(report['report_metadata']['total_resources'], 1)
+
+    def test_no_sharing_outside_a_request_without_lru(self):
+        with self._load_spy() as load_spy:
+            self._deferred_patient().fhir_bundle
+            self._deferred_patient().fhir_bundle
+
+        self.assertEqual(load_spy.call_count, 2)
+
+    def test_add_and_rollback_invalidate_within_request(self):
+        def view(request):
+            seen = [len(self._deferred_patient().fhir_bundle['entry'])]
+            patient = Patient.objects.get(pk=self.patient.pk)
+            patient.add_fhir_resources(
+                [{'resourceType': 'Condition', 'code': {'text': 'Gout'}}], document_id=2
+            )
+            seen.append(len(self._deferred_patient().fhir_bundle['entry']))
+            patient.rollback_document_merge(2)
+            seen.append(len(self._deferred_patient().fhir_bundle['entry']))
+            return seen
+
+        self.assertEqual(FHIRBundleCacheMiddleware(view)(request=None), [1, 2, 1])
+
+    @override_settings(FHIR_BUNDLE_CACHE_SIZE=2, FHIR_BUNDLE_CACHE_TTL=60)
+    def test_lru_shares_across_requests_until_invalidated(self):
+        with self._load_spy() as load_spy:
+            FHIRBundleCacheMiddleware(lambda r: self._deferred_patient().fhir_bundle)(None)
+            FHIRBundleCacheMiddleware(lambda r: self._deferred_patient().fhir_bundle)(None)
+            self.assertEqual(load_spy.call_count, 1)
+
+            self.patient.refresh_from_db()
+            self.patient.add_fhir_resources(
+                [{'resourceType': 'Condition', 'code': {'text': 'Gout'}}], document_id=2
+            )
+            bundle = FHIRBundleCacheMiddleware(lambda r: self._deferred_patient().fhir_bundle)(None)
+
+        self.assertEqual(load_spy.call_count, 2)
+        self.assertEqual(len(bundle['entry']), 2)
+
+    @override_settings(FHIR_BUNDLE_CACHE_SIZE=1, FHIR_BUNDLE_CACHE_TTL=0)
+    def test_lru_entries_expire(self):
+        with self._load_spy() as load_spy:
+            self._deferred_patient().fhir_bundle
+            self._deferred_patient().fhir_bundle
+
+        self.assertEqual(load_spy.call_count, 2)
+
+    def test_lru_evicts_least_recently_used(self):
+        lru = bundle_cache.BundleLRUCache(max_size=2, ttl_seconds=60)
+        lru.put(('a', '1'), {'id': 'a'})
+        lru.put(('b', '1'), {'id': 'b'})
+        lru.get(('a', '1'))
+        lru.put(('c', '1'), {'id': 'c'})
+
+        self.assertIsNone(lru.get(('b', '1')))
+        self.assertEqual(lru.get(('a', '1')), {'id': 'a'})
+        lru.invalidate_patient('a')
+        self.assertIsNone(lru.get(('a', '1')))
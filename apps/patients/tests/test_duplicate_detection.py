@@ -0,0 +1,106 @@
+"""
+Tests for blind-index duplicate patient detection.
+
+Covers Soundex phonetic keys, blind index population on save, and
+duplicate grouping from DOB buckets without a pairwise scan.
+"""
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.patients.blind_index import (
+    dob_blind_index,
+    find_duplicate_patient_groups,
+    name_phonetic_index,
+    soundex,
+)
+from apps.patients.models import Patient
+
+User = get_user_model()
+
+
+class SoundexTest(SimpleTestCase):
+    """Standard American Soundex codes."""
+
+    def test_known_codes(self):
+        self.assertEqual(soundex('Robert'), 'R163')
+        self.assertEqual(soundex('Rupert'), 'R163')
+        self.assertEqual(soundex('Ashcraft'), 'A261')
+        self.assertEqual(soundex('Tymczak'), 'T522')
+        self.assertEqual(soundex('Pfister'), 'P236')
+        self.assertEqual(soundex("O'Brien"), 'O165')
+        self.assertEqual(soundex(''), '')
+
+    def test_indexes_are_keyed(self):
+        """Digests depend on the key, so they can't be precomputed from a dump."""
+        with override_settings(PATIENT_BLIND_INDEX_KEY='key-one'):
+            first = dob_blind_index('1980-01-01')
+        with override_settings(PATIENT_BLIND_INDEX_KEY='key-two'):
+            second = dob_blind_index('1980-01-01')
+        self.assertNotEqual(first, second)
+        self.assertEqual(name_phonetic_index('Jon', 'Smyth'), name_phonetic_index('John', 'Smith'))
+
+
+class DuplicatePatientDetectionTest(TestCase):
+    """Duplicate groups come from DOB buckets plus name matching."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='dupfinder',
+            email='dupfinder@example.com',
+            password='testpass123'
+        )
+
+    def _patient(self, mrn, first_name, last_name, date_of_birth):
+        return Patient.objects.create(
+            mrn=mrn,
+            first_name=first_name,
+            last_name=last_name,
+            date_of_birth=date_of_birth,
+            created_by=self.user
+        )
+
+    def test_save_populates_blind_indexes(self):
+        patient = self._patient('DUP-001', 'John', 'Smith', '1980-01-01')
+
+        self.assertEqual(patient.dob_blind_index, dob_blind_index('1980-01-01'))
+        self.assertEqual(patient.name_phonetic_index, name_phonetic_index('John', 'Smith'))
+        self.assertNotIn('1980', patient.dob_blind_index)
+
+    def test_update_fields_refreshes_blind_indexes(self):
+        patient = self._patient('DUP-002', 'John', 'Smith', '1980-01-01')
+        patient.date_of_birth = '1981-02-02'
+        patient.save(update_fields=['date_of_birth'])
+
+        patient.refresh_from_db()
+        self.assertEqual(patient.dob_blind_index, dob_blind_index('1981-02-02'))
+
+    def test_groups_similar_names_with_same_dob(self):
+        john = self._patient('DUP-010', 'John', 'Smith', '1980-01-01')
+        jon = self._patient('DUP-011', 'Jon', 'Smith', '1980-01-01')
+        self._patient('DUP-012', 'Mary', 'Jones', '1980-01-01')
+        self._patient('DUP-013', 'John', 'Smith', '1990-05-05')
+
+        groups = find_duplicate_patient_groups()
+
+        self.assertEqual(len(groups), 1)
+        self.assertEqual({p.mrn for p in groups[0]}, {john.mrn, jon.mrn})
+
+    def test_phonetic_match_catches_spelling_variants(self):
+        """Short names spelled differently still collide on Soundex."""
+        self._patient('DUP-020', 'Bo', 'Li', '1975-07-07')
+        self._patient('DUP-021', 'Beau', 'Lee', '1975-07-07')
+
+        groups = find_duplicate_patient_groups()
+
+        self.assertEqual([{p.mrn for p in group} for group in groups], [{'DUP-020', 'DUP-021'}])
+
+    def test_candidates_loaded_in_one_query(self):
+        for index in range(5):
+            self._patient(f'DUP-03{index}', f'Person{index}', 'Unique', f'196{index}-01-01')
+        self._patient('DUP-040', 'Ann', 'Lee', '1970-01-01')
+        self._patient('DUP-041', 'Anne', 'Lee', '1970-01-01')
+
+        with self.assertNumQueries(1):
+            groups = find_duplicate_patient_groups()
+
+        self.assertEqual(len(groups), 1)
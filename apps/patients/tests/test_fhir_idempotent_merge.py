@@ -35,7 +35,7 @@ class IdempotentFHIRMergeTests(TestCase):
         self.patient.add_fhir_resources(resources_v1, document_id=1)
         
         # Verify 1 resource added
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 1)
         self.assertEqual(bundle['entry'][0]['resource']['version'], 1)
         
@@ -48,7 +48,7 @@ class IdempotentFHIRMergeTests(TestCase):
         
         # Verify still only 1 resource (updated, not duplicated)
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 1)
         
         # Verify it's the updated version
@@ -72,7 +72,7 @@ class IdempotentFHIRMergeTests(TestCase):
         
         # Both should exist (different documents, different sources)
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 2)
     
     def test_same_document_multiple_resource_types_in_single_call(self):
@@ -84,7 +84,7 @@ class IdempotentFHIRMergeTests(TestCase):
         self.patient.add_fhir_resources(resources, document_id=1)
         
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 2)
         
         # Reprocess: updated Condition, same Observation
@@ -95,7 +95,7 @@ class IdempotentFHIRMergeTests(TestCase):
         self.patient.add_fhir_resources(resources_v2, document_id=1)
         
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 2)
         
         condition = [e['resource'] for e in bundle['entry'] if e['resource']['resourceType'] == 'Condition'][0]
@@ -112,7 +112,7 @@ class IdempotentFHIRMergeTests(TestCase):
         
         self.patient.add_fhir_resources(resources, document_id=42)
         
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         resource = bundle['entry'][0]['resource']
         
         # Verify composite key component
@@ -147,7 +147,7 @@ class IdempotentFHIRMergeTests(TestCase):
         self.assertTrue(result)
         
         # Verify resource added
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 1)
         
         # Meta.source should be 'direct_entry'
@@ -165,7 +165,7 @@ class IdempotentFHIRMergeTests(TestCase):
         
         # Should create duplicates (no composite key matching without document_id)
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 2)
     
     def test_reprocess_multiple_same_type_resources(self):
@@ -177,7 +177,7 @@ class IdempotentFHIRMergeTests(TestCase):
         self.patient.add_fhir_resources(conditions_v1, document_id=1)
         
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 5)
         
         # Reprocess with updated data
@@ -188,7 +188,7 @@ class IdempotentFHIRMergeTests(TestCase):
         self.patient.add_fhir_resources(conditions_v2, document_id=1)
         
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 5, "Reprocessing must not create duplicates")
         
         texts = sorted(e['resource']['code']['text'] for e in bundle['entry'])
@@ -205,7 +205,7 @@ class IdempotentFHIRMergeTests(TestCase):
         self.patient.add_fhir_resources(resources_v1, document_id=1)
         
         self.patient.refresh_from_db()
-        self.assertEqual(len(self.patient.encrypted_fhir_bundle['entry']), 3)
+        self.assertEqual(len(self.patient.get_fhir_bundle()['entry']), 3)
         
         # Reprocess: now 5 Conditions (AI found more on second pass)
         resources_v2 = [
@@ -215,7 +215,7 @@ class IdempotentFHIRMergeTests(TestCase):
         self.patient.add_fhir_resources(resources_v2, document_id=1)
         
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 5, "Count must match incoming set, not accumulate")
         
         texts = sorted(e['resource']['code']['text'] for e in bundle['entry'])
@@ -237,7 +237,7 @@ class IdempotentFHIRMergeTests(TestCase):
         self.patient.add_fhir_resources(doc2, document_id=2)
         
         self.patient.refresh_from_db()
-        self.assertEqual(len(self.patient.encrypted_fhir_bundle['entry']), 6)
+        self.assertEqual(len(self.patient.get_fhir_bundle()['entry']), 6)
         
         # Reprocess document 1: now 4 Conditions + 1 Observation
         doc1_v2 = [
@@ -248,7 +248,7 @@ class IdempotentFHIRMergeTests(TestCase):
         self.patient.add_fhir_resources(doc1_v2, document_id=1)
         
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         
         # 5 from doc 1 (replaced) + 1 from doc 2 (untouched) = 6
         self.assertEqual(len(bundle['entry']), 6)
@@ -294,3 +294,88 @@ class IdempotentFHIRMergeTests(TestCase):
         self.assertEqual(reprocess_audit.fhir_delta['added_count'], 3)
         self.assertEqual(reprocess_audit.fhir_delta['replaced_count'], 3)
 
+
+
+def _valid_condition(resource_id, text='Type 2 diabetes mellitus', code='E11.9'):
+    """A Condition that parses as a fhir.resources model (dedup-eligible)."""
+    return {
+        'resourceType': 'Condition',
+        'id': resource_id,
+        'clinicalStatus': {'coding': [{
+            'system': 'http://terminology.hl7.org/CodeSystem/condition-clinical',
+            'code': 'active',
+        }]},
+        'code': {
+            'text': text,
+            'coding': [{'system': 'http://hl7.org/fhir/sid/icd-10', 'code': code}],
+        },
+        'subject': {'reference': 'Patient/incremental'},
+    }
+
+
+class IncrementalMergeTests(TestCase):
+    """Merge cost follows the incoming document, not the accumulated bundle."""
+
+    def setUp(self):
+        self.patient = Patient.objects.create(
+            first_name='Jane',
+            last_name='Roe',
+            date_of_birth='1975-05-05',
+            mrn='TEST-INCR-001'
+        )
+
+    def test_incoming_duplicate_of_existing_entry_is_merged(self):
+        self.patient.add_fhir_resources([_valid_condition('cond-doc1')], document_id=1)
+        self.patient.add_fhir_resources([_valid_condition('cond-doc2')], document_id=2)
+
+        self.patient.refresh_from_db()
+        conditions = [
+            e['resource'] for e in self.patient.get_fhir_bundle()['entry']
+            if e['resource']['resourceType'] == 'Condition'
+        ]
+        self.assertEqual(len(conditions), 1)
+
+    def test_existing_entries_of_other_types_are_not_parsed(self):
+        from unittest.mock import patch
+        from apps.fhir.services import deduplication_service
+
+        history = [
+            {'resourceType': 'Observation', 'status': 'final', 'code': {'text': f'Obs {i}'}}
+            for i in range(5)
+        ]
+        self.patient.add_fhir_resources(history, document_id=1)
+
+        with patch.object(
+            deduplication_service, '_parse_resource_dict',
+            wraps=deduplication_service._parse_resource_dict,
+        ) as parse_spy:
+            self.patient.add_fhir_resources([_valid_condition('cond-new')], document_id=2)
+
+        parsed_types = {call.args[0]['resourceType'] for call in parse_spy.call_args_list}
+        self.assertNotIn('Observation', parsed_types)
+        self.assertEqual(len(self.patient.get_fhir_bundle()['entry']), 6)
+
+    def test_bundle_index_tracks_sources_and_types(self):
+        self.patient.add_fhir_resources([
+            {'resourceType': 'Condition', 'code': {'text': 'Diabetes'}},
+            {'resourceType': 'Observation', 'code': {'text': 'A1c'}},
+        ], document_id=1)
+        self.patient.add_fhir_resources([
+            {'resourceType': 'Condition', 'code': {'text': 'Asthma'}},
+        ], document_id=2)
+
+        self.patient.refresh_from_db()
+        index = self.patient.fhir_bundle_index
+        self.assertEqual(
+            index['versionId'], self.patient.get_fhir_bundle()['meta']['versionId']
+        )
+        self.assertEqual(index['sources'], {
+            'document_1': {'Condition': 1, 'Observation': 1},
+            'document_2': {'Condition': 1},
+        })
+
+        self.patient.rollback_document_merge(1)
+        self.patient.refresh_from_db()
+        self.assertEqual(
+            self.patient.fhir_bundle_index['sources'], {'document_2': {'Condition': 1}}
+        )
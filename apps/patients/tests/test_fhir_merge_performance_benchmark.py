@@ -57,7 +57,7 @@ class TestFHIRMergePerformanceBenchmarks:
         
         # Verify operation succeeded
         patient.refresh_from_db()
-        bundle = patient.encrypted_fhir_bundle
+        bundle = patient.get_fhir_bundle()
         assert len(bundle['entry']) == 10
     
     def test_merge_medium_dataset_50_resources(self, benchmark, patient):
@@ -81,7 +81,7 @@ class TestFHIRMergePerformanceBenchmarks:
         
         # Verify operation succeeded
         patient.refresh_from_db()
-        bundle = patient.encrypted_fhir_bundle
+        bundle = patient.get_fhir_bundle()
         assert len(bundle['entry']) == 50
     
     def test_merge_large_dataset_100_resources(self, benchmark, patient):
@@ -106,7 +106,7 @@ class TestFHIRMergePerformanceBenchmarks:
         
         # Verify operation succeeded
         patient.refresh_from_db()
-        bundle = patient.encrypted_fhir_bundle
+        bundle = patient.get_fhir_bundle()
         assert len(bundle['entry']) == 100
     
     def test_merge_idempotent_update_performance(self, benchmark, patient):
@@ -140,7 +140,7 @@ class TestFHIRMergePerformanceBenchmarks:
         
         # Verify update succeeded (should still have 1 resource, not 2)
         patient.refresh_from_db()
-        bundle = patient.encrypted_fhir_bundle
+        bundle = patient.get_fhir_bundle()
         assert len(bundle['entry']) == 1
     
     def test_rollback_small_dataset_10_resources(self, benchmark, patient):
@@ -284,7 +284,7 @@ class TestFHIRMergePerformanceBenchmarks:
         
         # Verify operation succeeded
         patient.refresh_from_db()
-        bundle = patient.encrypted_fhir_bundle
+        bundle = patient.get_fhir_bundle()
         assert len(bundle['entry']) == 20
 
 
@@ -66,7 +66,7 @@ class FHIRMergePerformanceTests(TestCase):
         
         # Verify all resources were added
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 100)
     
     def test_rollback_100_resources_completes_under_500ms(self):
@@ -90,7 +90,7 @@ class FHIRMergePerformanceTests(TestCase):
         # Verify all resources were removed
         self.assertEqual(removed_count, 100)
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle.get('entry', [])), 0)
     
     def test_idempotent_merge_performance_consistent(self):
@@ -185,7 +185,7 @@ class FHIROperationErrorHandlingTests(TransactionTestCase):
         
         # Verify original data is intact (transaction rolled back)
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         
         # Should still have only the initial resource
         self.assertEqual(len(bundle['entry']), 1)
@@ -210,7 +210,7 @@ class FHIROperationErrorHandlingTests(TransactionTestCase):
         
         # Verify original data is intact
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 1)
     
     def test_merge_with_malformed_resource_fails_gracefully(self):
@@ -223,7 +223,7 @@ class FHIROperationErrorHandlingTests(TransactionTestCase):
         
         # Verify initial state
         self.patient.refresh_from_db()
-        initial_entry_count = len(self.patient.encrypted_fhir_bundle['entry'])
+        initial_entry_count = len(self.patient.get_fhir_bundle()['entry'])
         self.assertEqual(initial_entry_count, 1)
         
         # Malformed resources (missing required fields or wrong structure)
@@ -245,7 +245,7 @@ class FHIROperationErrorHandlingTests(TransactionTestCase):
         
         # Verify original data is intact regardless of how malformed data was handled
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         
         # Should still have at least the original valid resource
         self.assertGreaterEqual(len(bundle['entry']), 1,
@@ -276,7 +276,7 @@ class FHIROperationErrorHandlingTests(TransactionTestCase):
         
         # Verify we have 3 resources
         self.patient.refresh_from_db()
-        self.assertEqual(len(self.patient.encrypted_fhir_bundle['entry']), 3)
+        self.assertEqual(len(self.patient.get_fhir_bundle()['entry']), 3)
         
         # Mock save to fail during rollback
         with patch.object(Patient, 'save', side_effect=DatabaseError("Simulated DB error")):
@@ -285,7 +285,7 @@ class FHIROperationErrorHandlingTests(TransactionTestCase):
         
         # Verify data is unchanged (transaction rolled back)
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 3, "Transaction should have rolled back")
         
         # Verify both documents still exist
@@ -319,7 +319,7 @@ class FHIRIntegrationWorkflowTests(TestCase):
         
         # Verify data was added
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 2)
         
         # Step 2: Error detected - typo in condition name
@@ -337,7 +337,7 @@ class FHIRIntegrationWorkflowTests(TestCase):
         
         # Verify data was removed
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle.get('entry', [])), 0)
         
         # Step 4: Re-add with corrected data
@@ -349,7 +349,7 @@ class FHIRIntegrationWorkflowTests(TestCase):
         
         # Verify corrected data was added
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 2)
         
         # Verify it's the corrected version
@@ -375,7 +375,7 @@ class FHIRIntegrationWorkflowTests(TestCase):
         
         # Verify we have 6 resources
         self.patient.refresh_from_db()
-        self.assertEqual(len(self.patient.encrypted_fhir_bundle['entry']), 6)
+        self.assertEqual(len(self.patient.get_fhir_bundle()['entry']), 6)
         
         # Rollback only document 2
         removed_count = self.patient.rollback_document_merge(document_id=2)
@@ -383,7 +383,7 @@ class FHIRIntegrationWorkflowTests(TestCase):
         
         # Verify we have 4 resources left (from docs 1 and 3)
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 4)
         
         # Verify remaining resources are only from docs 1 and 3
@@ -456,7 +456,7 @@ class FHIRIntegrationWorkflowTests(TestCase):
         
         # Verify all 10 resources were added
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 10)
         
         # Verify all documents are represented
@@ -513,7 +513,7 @@ class FHIROperationBoundaryTests(TestCase):
         
         # Verify it was added
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 1)
         
         # Verify content is preserved
@@ -561,7 +561,7 @@ class FHIROperationBoundaryTests(TestCase):
         
         # Verify structure is preserved
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         observation = bundle['entry'][0]['resource']
         
         # Navigate deep structure to verify preservation
@@ -583,7 +583,7 @@ class FHIROperationBoundaryTests(TestCase):
         
         # Verify we have 300 resources
         self.patient.refresh_from_db()
-        self.assertEqual(len(self.patient.encrypted_fhir_bundle['entry']), 300)
+        self.assertEqual(len(self.patient.get_fhir_bundle()['entry']), 300)
         
         # Rollback middle document (document 2)
         start_time = time.time()
@@ -599,7 +599,7 @@ class FHIROperationBoundaryTests(TestCase):
         
         # Verify we have 200 resources left
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 200)
         
         # Verify only document 2 was removed
@@ -641,7 +641,7 @@ class FHIROperationBoundaryTests(TestCase):
         
         # Verify all resources were added with correct content
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 4)
         
         # Verify special characters are preserved
@@ -690,7 +690,7 @@ class FHIROperationDataIntegrityTests(TransactionTestCase):
             
             # Verify bundle metadata is valid after each merge
             patient.refresh_from_db()
-            bundle = patient.encrypted_fhir_bundle
+            bundle = patient.get_fhir_bundle()
             
             # Should have meta section
             self.assertIn('meta', bundle)
@@ -748,7 +748,7 @@ class FHIROperationDataIntegrityTests(TransactionTestCase):
         
         # Verify document 2 resources and their references are intact
         patient.refresh_from_db()
-        bundle = patient.encrypted_fhir_bundle
+        bundle = patient.get_fhir_bundle()
         resources = [entry['resource'] for entry in bundle['entry']]
         
         # Should have 2 resources from document 2
@@ -784,7 +784,7 @@ class FHIROperationDataIntegrityTests(TransactionTestCase):
         
         # Verify we still have only 1 resource (idempotent updates)
         patient.refresh_from_db()
-        bundle = patient.encrypted_fhir_bundle
+        bundle = patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 1)
         
         # Verify it's the latest version
@@ -0,0 +1,245 @@
+"""
+Tests for per-resource encrypted FHIR storage (PatientFHIRResource).
+
+Covers the rows as the write path of add_fhir_resources /
+rollback_document_merge, the get_fhir_resources / get_fhir_bundle accessors,
+fallback to a bundle that has not been split yet, and the backfill migration.
+"""
+import importlib
+from datetime import date
+
+from django.apps import apps as django_apps
+from django.test import TestCase
+
+from apps.patients.models import Patient, PatientFHIRResource
+
+
+def _observation(text, when, value):
+    return {
+        'resourceType': 'Observation',
+        'status': 'final',
+        'code': {'text': text},
+        'effectiveDateTime': when,
+        'valueQuantity': {'value': value, 'unit': 'mg/dL'},
+    }
+
+
+class PatientFHIRResourceRowTests(TestCase):
+    """Rows mirror the bundle and only the resources involved are written."""
+
+    def setUp(self):
+        self.patient = Patient.objects.create(
+            first_name='Jane',
+            last_name='Roe',
+            date_of_birth='1975-05-05',
+            mrn='ROWS-001'
+        )
+
+    def _bundle_resources(self):
+        self.patient.refresh_from_db()
+        return [entry['resource'] for entry in self.patient.get_fhir_bundle()['entry']]
+
+    def test_merge_writes_one_row_per_resource(self):
+        self.patient.add_fhir_resources([
+            {'resourceType': 'Condition', 'code': {'text': 'Asthma'}, 'onsetDateTime': '2019-03-02'},
+            _observation('Glucose', '2024-01-10T08:00:00Z', 101),
+        ], document_id=1)
+
+        rows = list(PatientFHIRResource.objects.filter(patient=self.patient))
+        self.assertEqual([r.resource_type for r in rows], ['Condition', 'Observation'])
+        self.assertEqual({r.source for r in rows}, {'document_1'})
+        self.assertEqual(rows[0].clinical_date, date(2019, 3, 2))
+        self.assertEqual(rows[1].clinical_date, date(2024, 1, 10))
+        self.assertEqual([r.resource for r in rows], self._bundle_resources())
+        self.assertTrue(self.patient.fhir_resources_in_sync())
+        self.assertEqual(self.patient.encrypted_fhir_bundle, {})
+
+    def test_reprocessing_touches_only_that_documents_rows(self):
+        self.patient.add_fhir_resources(
+            [_observation('Glucose', '2024-01-10T08:00:00Z', 101)], document_id=1
+        )
+        self.patient.add_fhir_resources(
+            [{'resourceType': 'Condition', 'code': {'text': 'Asthma'}}], document_id=2
+        )
+        doc1_row = PatientFHIRResource.objects.get(patient=self.patient, source='document_1')
+
+        self.patient.add_fhir_resources(
+            [{'resourceType': 'Condition', 'code': {'text': 'Asthma, mild'}}], document_id=2
+        )
+
+        rows = PatientFHIRResource.objects.filter(patient=self.patient)
+        self.assertEqual(rows.count(), 2)
+        unchanged = rows.get(source='document_1')
+        self.assertEqual((unchanged.pk, unchanged.updated_at), (doc1_row.pk, doc1_row.updated_at))
+        self.assertEqual(rows.get(source='document_2').resource['code']['text'], 'Asthma, mild')
+        self.assertEqual([r.resource for r in rows], self._bundle_resources())
+
+    def test_rollback_deletes_document_rows(self):
+        self.patient.add_fhir_resources(
+            [_observation('Glucose', '2024-01-10T08:00:00Z', 101)], document_id=1
+        )
+        self.patient.add_fhir_resources(
+            [{'resourceType': 'Condition', 'code': {'text': 'Asthma'}}], document_id=2
+        )
+
+        self.patient.rollback_document_merge(1)
+
+        self.assertEqual(
+            list(self.patient.fhir_resources.values_list('source', flat=True)), ['document_2']
+        )
+        self.assertTrue(self.patient.fhir_resources_in_sync())
+
+    def test_get_fhir_resources_filters_by_type_and_source(self):
+        self.patient.add_fhir_resources([
+            {'resourceType': 'Condition', 'code': {'text': 'Asthma'}},
+            _observation('Glucose', '2024-01-10T08:00:00Z', 101),
+        ], document_id=1)
+        self.patient.add_fhir_resources(
+            [_observation('Sodium', '2024-02-10T08:00:00Z', 140)], document_id=2
+        )
+        self.patient.refresh_from_db()
+
+        observations = self.patient.get_fhir_resources(resource_types=['Observation'])
+        self.assertEqual([o['code']['text'] for o in observations], ['Glucose', 'Sodium'])
+        doc2 = self.patient.get_fhir_resources(source='document_2')
+        self.assertEqual([o['code']['text'] for o in doc2], ['Sodium'])
+
+        bundle = self.patient.get_fhir_bundle()
+        self.assertEqual(
+            [entry['resource'] for entry in bundle['entry']], self._bundle_resources()
+        )
+        self.assertEqual(
+            bundle['meta']['versionId'], self.patient.fhir_bundle_index['versionId']
+        )
+
+    def test_detail_summary_from_rows_matches_bundle_scan(self):
+        from apps.patients.views import PatientDetailView
+
+        self.patient.add_fhir_resources([
+            {'resourceType': 'Condition', 'code': {'text': 'Asthma'}},
+            _observation('Glucose', '2024-01-10T08:00:00Z', 101),
+            _observation('Body weight', '2024-01-10T08:00:00Z', 80),
+        ], document_id=1)
+        self.patient.refresh_from_db()
+        view = PatientDetailView()
+        view.object = self.patient
+
+        from_rows = view.get_fhir_summary()
+        # The same data as a legacy bundle that has not been split yet
+        self.patient.encrypted_fhir_bundle = self.patient.get_fhir_bundle()
+        self.patient.fhir_resources_version = ''
+        from_bundle = view.get_fhir_summary()
+
+        self.assertEqual(from_rows, from_bundle)
+        self.assertEqual(from_rows['VitalSign'], {'count': 1})
+        self.assertEqual(from_rows['LabResult'], {'count': 1})
+
+    def test_direct_bundle_write_falls_back_and_next_merge_rebuilds(self):
+        self.patient.add_fhir_resources(
+            [{'resourceType': 'Condition', 'code': {'text': 'Asthma'}}], document_id=1
+        )
+        self.patient.encrypted_fhir_bundle = {
+            'resourceType': 'Bundle',
+            'entry': [{'resource': {'resourceType': 'Condition', 'code': {'text': 'Gout'}}}],
+        }
+        self.patient.save()
+        self.patient.refresh_from_db()
+
+        self.assertFalse(self.patient.fhir_resources_in_sync())
+        self.assertEqual(
+            [c['code']['text'] for c in self.patient.get_fhir_resources()], ['Gout']
+        )
+
+        self.patient.add_fhir_resources(
+            [_observation('Glucose', '2024-01-10T08:00:00Z', 101)], document_id=2
+        )
+        self.assertTrue(self.patient.fhir_resources_in_sync())
+        self.assertEqual(
+            [r.resource for r in self.patient.fhir_resources.all()], self._bundle_resources()
+        )
+
+
+    def test_stale_instance_merges_after_the_locked_row(self):
+        """A copy loaded before another merge neither re-splits nor reuses positions."""
+        self.patient.encrypted_fhir_bundle = {
+            'resourceType': 'Bundle',
+            'entry': [{'resource': {'resourceType': 'Condition', 'code': {'text': 'Gout'}}}],
+        }
+        self.patient.save()
+        stale = Patient.objects.get(pk=self.patient.pk)
+
+        self.patient.add_fhir_resources([_observation('Glucose', '2024-01-10', 101)], document_id=1)
+        stale.add_fhir_resources([_observation('Sodium', '2024-02-10', 140)], document_id=2)
+
+        rows = list(PatientFHIRResource.objects.filter(patient=self.patient))
+        self.assertEqual(
+            [r.resource['code']['text'] for r in rows], ['Gout', 'Glucose', 'Sodium']
+        )
+        self.assertEqual([r.position for r in rows], [0, 1, 2])
+
+
+class BackfillFHIRResourceRowsTests(TestCase):
+    """The 0012 data migration splits existing bundles into rows and back."""
+
+    def test_backfill_splits_bundle_and_assigns_full_urls(self):
+        migration = importlib.import_module('apps.patients.migrations.0012_patient_fhir_resources')
+        patient = Patient.objects.create(
+            first_name='Old', last_name='Bundle', date_of_birth='1960-01-01', mrn='ROWS-002'
+        )
+        Patient.objects.filter(pk=patient.pk).update(encrypted_fhir_bundle={
+            'resourceType': 'Bundle',
+            'meta': {'versionId': 'v-legacy'},
+            'entry': [
+                {'resource': {'resourceType': 'Condition', 'code': {'text': 'Gout'}}},
+                {'resource': _observation('Glucose', '2023-06-01', 99), 'fullUrl': 'urn:uuid:obs'},
+            ],
+        })
+
+        migration.backfill_fhir_resource_rows(django_apps, None)
+
+        patient.refresh_from_db()
+        self.assertEqual(patient.fhir_resources_version, 'v-legacy')
+        self.assertEqual(patient.encrypted_fhir_bundle, {})
+        self.assertEqual(patient.fhir_bundle_index['versionId'], 'v-legacy')
+        self.assertEqual(patient.fhir_bundle_index['sources'], {'': {'Condition': 1, 'Observation': 1}})
+        self.assertTrue(patient.fhir_bundle_index['lastUpdated'])
+        rows = list(patient.fhir_resources.all())
+        self.assertTrue(rows[0].full_url.startswith('urn:uuid:'))
+        self.assertEqual(rows[1].full_url, 'urn:uuid:obs')
+        self.assertEqual(rows[1].clinical_date, date(2023, 6, 1))
+        self.assertEqual(
+            [e['resource']['resourceType'] for e in patient.get_fhir_bundle()['entry']],
+            ['Condition', 'Observation']
+        )
+
+    def test_backfill_versions_bundles_without_a_version_id(self):
+        migration = importlib.import_module('apps.patients.migrations.0012_patient_fhir_resources')
+        patient = Patient.objects.create(
+            first_name='No', last_name='Version', date_of_birth='1960-01-01', mrn='ROWS-004'
+        )
+        Patient.objects.filter(pk=patient.pk).update(encrypted_fhir_bundle={
+            'resourceType': 'Bundle',
+            'entry': [{'resource': {'resourceType': 'Condition', 'meta': {'source': 'document_7'}}}],
+        })
+
+        migration.backfill_fhir_resource_rows(django_apps, None)
+
+        patient.refresh_from_db()
+        self.assertTrue(patient.fhir_resources_version)
+        self.assertEqual(patient.fhir_bundle_index['versionId'], patient.fhir_resources_version)
+        self.assertEqual(patient.fhir_bundle_index['sources'], {'document_7': {'Condition': 1}})
+
+    def test_reverse_puts_rows_back_into_the_bundle(self):
+        migration = importlib.import_module('apps.patients.migrations.0012_patient_fhir_resources')
+        patient = Patient.objects.create(
+            first_name='New', last_name='Rows', date_of_birth='1960-01-01', mrn='ROWS-003'
+        )
+        patient.add_fhir_resources([{'resourceType': 'Condition', 'code': {'text': 'Gout'}}], document_id=1)
+
+        migration.clear_fhir_resource_rows(django_apps, None)
+
+        patient.refresh_from_db()
+        self.assertFalse(patient.fhir_resources.exists())
+        self.assertEqual(
+            [e['resource']['code']['text'] for e in patient.encrypted_fhir_bundle['entry']], ['Gout']
+        )
@@ -186,7 +186,7 @@ class PHIEncryptionTestCase(TestCase):
         self.patient.add_fhir_resources(test_fhir_resources)
         
         # Check that FHIR bundle contains the test data
-        fhir_bundle = self.patient.encrypted_fhir_bundle
+        fhir_bundle = self.patient.get_fhir_bundle()
         self.assertIsInstance(fhir_bundle, dict, "FHIR bundle should be a dict")
         self.assertIn("entry", fhir_bundle, "FHIR bundle should have entries")
         
@@ -423,7 +423,7 @@ class PHIEncryptionIntegrationTestCase(TransactionTestCase):
         
         # Retrieve again and verify FHIR data
         final_patient = Patient.objects.get(id=patient.id)
-        self.assertIn("entry", final_patient.encrypted_fhir_bundle)
+        self.assertIn("entry", final_patient.get_fhir_bundle())
         
         # Verify all original PHI is still intact
         for field, original_value in original_data.items():
@@ -0,0 +1,209 @@
+"""
+Tests for the materialized comprehensive report (PatientComprehensiveReport).
+
+Covers the rebuild task queued after merges and rollbacks, serving the stored
+report while it matches the bundle version, and live demographics and
+primary diagnosis on top of a stored report.
+"""
+from datetime import date, datetime, timezone as dt_timezone
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from apps.patients.models import Patient, PatientComprehensiveReport, PatientHistory
+from apps.patients.tasks import rebuild_patient_report
+
+
+CLINICAL_RESOURCES = [
+    {
+        'resourceType': 'Condition',
+        'code': {'coding': [{'system': 'http://snomed.info/sct', 'code': '44054006',
+                             'display': 'Type 2 diabetes mellitus'}]},
+        'clinicalStatus': {'coding': [{'code': 'active'}]},
+        'onsetDateTime': '2018-04-02',
+    },
+    {
+        'resourceType': 'Observation',
+        'status': 'final',
+        'code': {'text': 'Body weight'},
+        'category': [{'coding': [{'code': 'vital-signs'}]}],
+        'effectiveDateTime': '2024-01-10T08:00:00Z',
+        'valueQuantity': {'value': 82.5, 'unit': 'kg'},
+    },
+    {
+        'resourceType': 'Observation',
+        'status': 'final',
+        'code': {'text': 'Hemoglobin A1c'},
+        'category': [{'coding': [{'code': 'laboratory'}]}],
+        'effectiveDateTime': '2024-01-10T08:00:00Z',
+        'valueQuantity': {'value': 7.1, 'unit': '%'},
+    },
+    {
+        'resourceType': 'Encounter',
+        'status': 'finished',
+        'class': {'code': 'AMB'},
+        'period': {'start': '2024-01-10T08:00:00Z'},
+    },
+    {
+        'resourceType': 'MedicationStatement',
+        'status': 'active',
+        'medicationCodeableConcept': {'text': 'Metformin 500 mg'},
+    },
+]
+
+
+class MaterializedReportTests(TestCase):
+    """The report is built once per bundle version and served from storage."""
+
+    def setUp(self):
+        self.patient = Patient.objects.create(
+            first_name='Snap',
+            last_name='Shot',
+            date_of_birth='1962-07-14',
+            gender='F',
+            mrn='SNAP-001'
+        )
+
+    def _deferred_patient(self):
+        return Patient.objects.defer('encrypted_fhir_bundle').get(pk=self.patient.pk)
+
+    def _merge(self, resources, document_id):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.patient.add_fhir_resources(resources, document_id=document_id)
+
+    def _build_spy(self):
+        return patch.object(
+            Patient, 'build_comprehensive_report', autospec=True,
+            side_effect=Patient.build_comprehensive_report
+        )
+
+    @staticmethod
+    def _without_timestamp(report):
+        report['report_metadata'].pop('generated_at')
+        return report
+
+    def test_merge_queues_rebuild_and_reads_skip_the_build(self):
+        self._merge(CLINICAL_RESOURCES, document_id=1)
+
+        snapshot = PatientComprehensiveReport.objects.get(patient=self.patient)
+        self.assertEqual(snapshot.bundle_version, self.patient.fhir_bundle_index['versionId'])
+
+        with self._build_spy() as build_spy:
+            served = self._deferred_patient().get_comprehensive_report()
+        self.assertEqual(build_spy.call_count, 0)
+
+        built = self._deferred_patient().build_comprehensive_report()
+        self.assertEqual(self._without_timestamp(served), self._without_timestamp(built))
+        # Dates survive storage for the PDF template's |date filter
+        self.assertEqual(served['patient_info']['date_of_birth'], date(1962, 7, 14))
+        self.assertEqual(served['clinical_summary']['conditions'][0]['onset_date'], date(2018, 4, 2))
+        self.assertEqual(served['report_metadata']['total_resources'], len(CLINICAL_RESOURCES))
+
+    def test_served_snapshot_is_stamped_when_served(self):
+        self._merge(CLINICAL_RESOURCES, document_id=1)
+        served_at = datetime(2030, 5, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+        with patch('apps.patients.models.timezone.now', return_value=served_at), \
+                self._build_spy() as build_spy:
+            report = self._deferred_patient().get_comprehensive_report()
+
+        self.assertEqual(build_spy.call_count, 0)
+        self.assertEqual(report['report_metadata']['generated_at'], served_at.isoformat())
+
+    def test_stale_snapshot_is_rebuilt_inline_and_stored(self):
+        self._merge(CLINICAL_RESOURCES, document_id=1)
+        # A merge whose rebuild task never ran leaves the old version behind
+        self.patient.add_fhir_resources(
+            [{'resourceType': 'Condition', 'code': {'text': 'Gout'}}], document_id=2
+        )
+
+        with self._build_spy() as build_spy:
+            first = self._deferred_patient().get_comprehensive_report()
+            self._deferred_patient().get_comprehensive_report()
+        self.assertEqual(build_spy.call_count, 1)
+
+        self.assertEqual(first['report_metadata']['total_resources'], len(CLINICAL_RESOURCES) + 1)
+        self.assertEqual(
+            PatientComprehensiveReport.objects.get(patient=self.patient).bundle_version,
+            self.patient.fhir_bundle_index['versionId']
+        )
+
+    def test_rollback_rebuilds_snapshot(self):
+        self._merge(CLINICAL_RESOURCES, document_id=1)
+        self._merge([{'resourceType': 'Condition', 'code': {'text': 'Gout'}}], document_id=2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.patient.rollback_document_merge(2)
+
+        with self._build_spy() as build_spy:
+            report = self._deferred_patient().get_comprehensive_report()
+        self.assertEqual(build_spy.call_count, 0)
+        self.assertEqual(report['report_metadata']['total_resources'], len(CLINICAL_RESOURCES))
+
+    def test_demographics_come_from_the_live_record(self):
+        self._merge(CLINICAL_RESOURCES, document_id=1)
+        self.patient.refresh_from_db()
+        self.patient.phone = '555-0100'
+        self.patient.save()
+
+        report = self._deferred_patient().get_comprehensive_report()
+
+        self.assertEqual(report['patient_info']['contact']['phone'], '555-0100')
+        self.assertIn('primary_diagnosis', report['patient_info'])
+
+    def test_primary_diagnosis_follows_the_live_record(self):
+        self._merge(CLINICAL_RESOURCES, document_id=1)
+        self._merge([{
+            'resourceType': 'Condition',
+            'id': 'condition-htn',
+            'code': {'text': 'Essential hypertension'},
+            'clinicalStatus': {'coding': [{'code': 'active'}]},
+            'onsetDateTime': '2020-09-15',
+        }], document_id=2)
+        self._deferred_patient().get_comprehensive_report()
+
+        self.patient.refresh_from_db()
+        self.patient.primary_condition_id = 'condition-htn'
+        self.patient.save()
+
+        with self._build_spy() as build_spy:
+            report = self._deferred_patient().get_comprehensive_report()
+        self.assertEqual(build_spy.call_count, 0)
+
+        patient_info = report['patient_info']
+        self.assertEqual(patient_info['primary_diagnosis']['display_name'], 'Essential hypertension')
+        self.assertEqual(patient_info['initial_diagnosis_date'], date(2020, 9, 15))
+        self.assertEqual(
+            [c['display_name'] for c in patient_info['comorbidities']], ['Type 2 diabetes mellitus']
+        )
+
+    def test_background_rebuild_writes_no_access_audit(self):
+        self._merge(CLINICAL_RESOURCES, document_id=1)
+        PatientComprehensiveReport.objects.all().delete()
+        history_count = PatientHistory.objects.filter(patient=self.patient).count()
+
+        result = rebuild_patient_report.delay(str(self.patient.pk)).get()
+
+        self.assertTrue(result['rebuilt'])
+        self.assertEqual(PatientHistory.objects.filter(patient=self.patient).count(), history_count)
+
+    def test_task_skips_current_snapshot_and_missing_patient(self):
+        self._merge(CLINICAL_RESOURCES, document_id=1)
+
+        result = rebuild_patient_report.delay(str(self.patient.pk)).get()
+        self.assertEqual(result, {'success': True, 'rebuilt': False, 'patient_id': str(self.patient.pk)})
+
+        missing = rebuild_patient_report.delay('00000000-0000-0000-0000-000000000000').get()
+        self.assertFalse(missing['success'])
+
+    def test_bundles_without_version_are_not_materialized(self):
+        self.patient.encrypted_fhir_bundle = {
+            'resourceType': 'Bundle',
+            'entry': [{'resource': {'resourceType': 'Condition', 'code': {'text': 'Gout'}}}],
+        }
+        self.patient.save()
+
+        report = self.patient.get_comprehensive_report()
+
+        self.assertEqual(report['report_metadata']['total_resources'], 1)
+        self.assertFalse(PatientComprehensiveReport.objects.exists())
@@ -66,7 +66,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify we have 4 total resources
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 4)
         
         # Rollback document 1
@@ -77,7 +77,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify document 2 resources remain intact
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 2)
         
         # Verify remaining resources are from document 2
@@ -104,7 +104,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify bundle is empty
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 0)
     
     def test_rollback_nonexistent_document_returns_zero(self):
@@ -123,7 +123,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify document 1 resources still intact
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 1)
         self.assertEqual(bundle['entry'][0]['resource']['meta']['source'], 'document_1')
     
@@ -176,7 +176,7 @@ class RollbackDocumentMergeTests(TestCase):
     def test_rollback_handles_empty_bundle_gracefully(self):
         """Test that rollback handles patient with no FHIR data gracefully"""
         # Patient starts with empty bundle
-        self.assertEqual(self.patient.encrypted_fhir_bundle, {})
+        self.assertEqual(self.patient.get_fhir_bundle(), {})
         
         # Try to rollback (should handle gracefully)
         removed_count = self.patient.rollback_document_merge(document_id=1)
@@ -218,7 +218,7 @@ class RollbackDocumentMergeTests(TestCase):
         self.patient.add_fhir_resources(resources_with_source, document_id=1)
         
         # Manually add resource without source metadata
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         bundle['entry'].append({
             'resource': {
                 'resourceType': 'Patient',
@@ -231,7 +231,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify we have 2 resources
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 2)
         
         # Rollback document 1
@@ -242,7 +242,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify orphan resource is preserved
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 1)
         self.assertEqual(bundle['entry'][0]['resource']['id'], 'orphan-resource')
     
@@ -256,7 +256,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Get initial metadata
         self.patient.refresh_from_db()
-        initial_bundle = self.patient.encrypted_fhir_bundle
+        initial_bundle = self.patient.get_fhir_bundle()
         initial_version = initial_bundle.get('meta', {}).get('versionId')
         initial_updated = initial_bundle.get('meta', {}).get('lastUpdated')
         
@@ -265,7 +265,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify metadata was updated
         self.patient.refresh_from_db()
-        updated_bundle = self.patient.encrypted_fhir_bundle
+        updated_bundle = self.patient.get_fhir_bundle()
         self.assertIn('meta', updated_bundle)
         self.assertIn('lastUpdated', updated_bundle['meta'])
         self.assertIn('versionId', updated_bundle['meta'])
@@ -300,7 +300,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify data integrity - no partial updates
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 0)
         
         # Verify audit trail exists (would be rolled back if transaction failed)
@@ -331,7 +331,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify total
         self.patient.refresh_from_db()
-        self.assertEqual(len(self.patient.encrypted_fhir_bundle['entry']), 7)
+        self.assertEqual(len(self.patient.get_fhir_bundle()['entry']), 7)
         
         # Rollback document 1 (5 diverse resource types)
         removed_count = self.patient.rollback_document_merge(document_id=1)
@@ -339,7 +339,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify only document 2 resources remain
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 2)
         
         # Verify remaining are all from document 2
@@ -362,7 +362,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify original data intact
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 1)
     
     def test_rollback_return_value_matches_actual_removed_count(self):
@@ -398,7 +398,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify added
         self.patient.refresh_from_db()
-        self.assertEqual(len(self.patient.encrypted_fhir_bundle['entry']), 1)
+        self.assertEqual(len(self.patient.get_fhir_bundle()['entry']), 1)
         
         # Rollback document 1
         removed = self.patient.rollback_document_merge(document_id=1)
@@ -406,7 +406,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify removed
         self.patient.refresh_from_db()
-        self.assertEqual(len(self.patient.encrypted_fhir_bundle['entry']), 0)
+        self.assertEqual(len(self.patient.get_fhir_bundle()['entry']), 0)
         
         # Re-add document 1 with updated data
         resources_v2 = [
@@ -416,7 +416,7 @@ class RollbackDocumentMergeTests(TestCase):
         
         # Verify re-added
         self.patient.refresh_from_db()
-        bundle = self.patient.encrypted_fhir_bundle
+        bundle = self.patient.get_fhir_bundle()
         self.assertEqual(len(bundle['entry']), 1)
         
         # Verify it's the new version
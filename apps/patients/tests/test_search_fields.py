@@ -362,3 +362,70 @@ class PatientSearchEdgeCasesTest(TestCase):
         empty_search_fields = bulk_created.filter(first_name_search='')
         self.assertEqual(empty_search_fields.count(), 5)
 
+
+class PatientMedicalSearchTextTest(TestCase):
+    """
+    Test suite for the maintained medical_search_text column and the
+    text search built on it.
+    """
+    
+    def setUp(self):
+        """Set up a user and two patients with different medical codes."""
+        self.user = User.objects.create_user(
+            username='medsearch',
+            email='medsearch@example.com',
+            password='testpass123'
+        )
+        self.diabetic = Patient.objects.create(
+            mrn='MED-001',
+            first_name='Ada',
+            last_name='Sugar',
+            date_of_birth='1960-01-01',
+            created_by=self.user,
+            searchable_medical_codes={
+                'conditions': [{'system': 'http://snomed.info/sct', 'code': '44054006',
+                                'display': 'Type 2 Diabetes Mellitus'}],
+                'medications': [{'system': 'http://www.nlm.nih.gov/research/umls/rxnorm',
+                                 'code': '860975', 'display': 'Metformin 500 MG Oral Tablet'}],
+            },
+        )
+        self.cardiac = Patient.objects.create(
+            mrn='MED-002',
+            first_name='Bo',
+            last_name='Heart',
+            date_of_birth='1955-01-01',
+            created_by=self.user,
+            searchable_medical_codes={
+                'conditions': [{'code': 'I10', 'display': 'Essential hypertension'}],
+            },
+        )
+    
+    def test_save_populates_medical_search_text(self):
+        """Codes and displays are flattened, lowercased and deduplicated."""
+        self.assertEqual(
+            self.diabetic.medical_search_text.split('\n'),
+            ['44054006', '860975', 'metformin 500 mg oral tablet', 'type 2 diabetes mellitus'],
+        )
+    
+    def test_update_fields_keeps_search_text_in_sync(self):
+        """Saving only searchable_medical_codes also rewrites the search column."""
+        self.cardiac.searchable_medical_codes['medications'] = [{'code': '197361', 'display': 'Amlodipine 5 MG'}]
+        self.cardiac.save(update_fields=['searchable_medical_codes'])
+        
+        self.cardiac.refresh_from_db()
+        self.assertIn('amlodipine 5 mg', self.cardiac.medical_search_text)
+    
+    def test_text_query_matches_displays_and_medication_names(self):
+        """Condition displays, medication names and codes are all searchable."""
+        from apps.patients.utils import search_patients_by_text_query
+        
+        self.assertEqual(list(search_patients_by_text_query('Diabetes')), [self.diabetic])
+        self.assertEqual(list(search_patients_by_text_query('metformin')), [self.diabetic])
+        self.assertEqual(list(search_patients_by_text_query('i10')), [self.cardiac])
+        self.assertEqual(list(search_patients_by_text_query('x')), [])
+    
+    def test_text_query_does_not_match_code_system_urls(self):
+        """Only codes and displays are indexed, not the rest of the JSON."""
+        from apps.patients.utils import search_patients_by_text_query
+        
+        self.assertEqual(list(search_patients_by_text_query('snomed')), [])
@@ -6,6 +6,8 @@ unencrypted searchable fields while maintaining HIPAA compliance.
 
 from typing import List, Optional, Union, Dict, Any
 from datetime import datetime, date
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection
 from django.db.models import QuerySet, Q
 from django.utils.dateparse import parse_date
 from django.utils import timezone
@@ -414,8 +416,11 @@ def search_patients_by_text_query(query: str, limit: int = 50) -> QuerySet[Patie
     """
     Full-text search across searchable medical metadata.
     
-    Searches through medical code displays and descriptions without
-    accessing encrypted PHI fields.
+    Searches the maintained medical_search_text column (medical code
+    displays and codes, including medication names) without accessing
+    encrypted PHI fields. On PostgreSQL the substring match is served by
+    the pg_trgm GIN index and results are ranked by trigram word similarity,
+    so the best matching patients come first.
     
     Args:
         query: Search query string
@@ -436,23 +441,14 @@ def search_patients_by_text_query(query: str, limit: int = 50) -> QuerySet[Patie
     
     query = query.strip().lower()
     
-    # Use PostgreSQL's JSONB text search capabilities
-    # Search in the display text of all medical codes
-    return Patient.objects.extra(
-        where=[
-            """
-            (
-                searchable_medical_codes->'conditions' @> '[{"display": ""}]'::jsonb OR
-                searchable_medical_codes->'procedures' @> '[{"display": ""}]'::jsonb OR
-                searchable_medical_codes->'medications' @> '[{"display": ""}]'::jsonb OR
-                searchable_medical_codes->'observations' @> '[{"display": ""}]'::jsonb
-            ) AND (
-                LOWER(searchable_medical_codes::text) LIKE %s
-            )
-            """
-        ],
-        params=[f'%{query}%']
-    ).distinct()[:limit]
+    patients = Patient.objects.filter(medical_search_text__contains=query)
+    if connection.vendor == 'postgresql':
+        patients = patients.annotate(
+            search_rank=TrigramWordSimilarity(query, 'medical_search_text')
+        ).order_by('-search_rank', 'mrn')
+    else:
+        patients = patients.order_by('mrn')
+    return patients[:limit]
 
 
 def get_patients_with_multiple_conditions(
@@ -739,6 +735,14 @@ VITAL_SIGN_KEYWORDS = (
     'height', 'body height', 'head circumference',
 )
 
+# The three vocabularies as one prioritized (keyword, category) list, so the
+# heuristic scans an observation's text once.
+_OBSERVATION_KEYWORD_CATEGORIES = (
+    tuple((kw, OBS_CATEGORY_SOCIAL_HISTORY) for kw in SOCIAL_HISTORY_KEYWORDS)
+    + tuple((kw, OBS_CATEGORY_VITAL_SIGNS) for kw in VITAL_SIGN_KEYWORDS)
+    + tuple((kw, OBS_CATEGORY_EXAM) for kw in PHYSICAL_EXAM_KEYWORDS)
+)
+
 
 def categorize_observation(observation: Dict[str, Any]) -> str:
     """
@@ -757,7 +761,7 @@ def categorize_observation(observation: Dict[str, Any]) -> str:
     Returns:
         One of: 'laboratory', 'vital-signs', 'exam', 'social-history'.
     """
-    from apps.fhir.services.keyword_matching import contains_any_keyword
+    from apps.fhir.services.keyword_matching import get_keyword_matcher
 
     # Priority 1: explicit FHIR category code (fall back to display string).
     raw = (observation.get('category_code') or observation.get('category') or '')
@@ -772,15 +776,11 @@ def categorize_observation(observation: Dict[str, Any]) -> str:
             haystack_parts.append(code['display'])
     haystack = ' '.join(haystack_parts)
 
-    if contains_any_keyword(haystack, SOCIAL_HISTORY_KEYWORDS):
-        return OBS_CATEGORY_SOCIAL_HISTORY
-    if contains_any_keyword(haystack, VITAL_SIGN_KEYWORDS):
-        return OBS_CATEGORY_VITAL_SIGNS
-    if contains_any_keyword(haystack, PHYSICAL_EXAM_KEYWORDS):
-        return OBS_CATEGORY_EXAM
-
-    # Default
-    return OBS_CATEGORY_LABORATORY
+    # One pass: social history wins over vital signs over physical exam;
+    # default to laboratory.
+    return get_keyword_matcher(_OBSERVATION_KEYWORD_CATEGORIES).classify(
+        haystack, default=OBS_CATEGORY_LABORATORY
+    )
 
 
 def build_observations_by_category(
@@ -862,6 +862,12 @@ _INPATIENT_KEYWORDS = ('inpatient', 'admitted', 'admission', 'hospitalization',
                        'hospitalisation', 'hospital stay', 'discharge')
 _AMBULATORY_KEYWORDS = ('outpatient', 'office visit', 'clinic', 'ambulatory',
                         'office', 'consult', 'follow-up', 'follow up')
+# Emergency beats inpatient beats ambulatory when several match.
+_ENCOUNTER_KEYWORD_TYPES = (
+    tuple((kw, 'emergency') for kw in _EMERGENCY_KEYWORDS)
+    + tuple((kw, 'inpatient') for kw in _INPATIENT_KEYWORDS)
+    + tuple((kw, 'ambulatory') for kw in _AMBULATORY_KEYWORDS)
+)
 
 
 def classify_encounter_type(encounter: Dict[str, Any]) -> Dict[str, str]:
@@ -879,7 +885,7 @@ def classify_encounter_type(encounter: Dict[str, Any]) -> Dict[str, str]:
     Returns:
         Dict with 'code' (inpatient|ambulatory|emergency) and human 'label'.
     """
-    from apps.fhir.services.keyword_matching import contains_any_keyword
+    from apps.fhir.services.keyword_matching import get_keyword_matcher
 
     # Priority 1: explicit FHIR class code.
     class_code = (encounter.get('class_code') or '')
@@ -901,15 +907,10 @@ def classify_encounter_type(encounter: Dict[str, Any]) -> Dict[str, str]:
         haystack_parts.extend(str(loc) for loc in locations)
     haystack = ' '.join(part for part in haystack_parts if part)
 
-    if contains_any_keyword(haystack, _EMERGENCY_KEYWORDS):
-        return {'code': 'emergency', 'label': ENCOUNTER_TYPE_LABELS['emergency']}
-    if contains_any_keyword(haystack, _INPATIENT_KEYWORDS):
-        return {'code': 'inpatient', 'label': ENCOUNTER_TYPE_LABELS['inpatient']}
-    if contains_any_keyword(haystack, _AMBULATORY_KEYWORDS):
-        return {'code': 'ambulatory', 'label': ENCOUNTER_TYPE_LABELS['ambulatory']}
-
-    # Default: ambulatory visit.
-    return {'code': 'ambulatory', 'label': ENCOUNTER_TYPE_LABELS['ambulatory']}
+    # One pass: emergency wins over inpatient over ambulatory; default to an
+    # ambulatory visit.
+    code = get_keyword_matcher(_ENCOUNTER_KEYWORD_TYPES).classify(haystack, default='ambulatory')
+    return {'code': code, 'label': ENCOUNTER_TYPE_LABELS[code]}
 
 
 def _resource_primary_date(resource: Dict[str, Any], resource_type: str) -> Any:
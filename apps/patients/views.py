@@ -15,8 +15,8 @@ from django.utils import timezone
 import logging
 import json
 import uuid
-from difflib import SequenceMatcher
 
+from .blind_index import find_duplicate_patient_groups
 from .models import Patient, PatientHistory
 from .forms import PatientForm
 from django.contrib.auth.decorators import login_required
@@ -90,6 +90,10 @@ class PatientDetailView(OwnedPatientMixin, LoginRequiredMixin, DetailView):
     template_name = 'patients/patient_detail.html'
     context_object_name = 'patient'
     
+    def get_queryset(self):
+        # The bundle is read through patient.fhir_bundle (request cache)
+        return super().get_queryset().defer('encrypted_fhir_bundle')
+    
     def get_patient_history(self):
         """
         Get patient history records with related data for efficient display.
@@ -106,6 +110,16 @@ class PatientDetailView(OwnedPatientMixin, LoginRequiredMixin, DetailView):
             messages.warning(self.request, "Some patient history may not be available.")
             return PatientHistory.objects.none()
     
+    # Observation code keywords that mark a vital sign rather than a lab
+    VITAL_KEYWORDS = [
+        'blood pressure', 'systolic', 'diastolic', 
+        'heart rate', 'pulse', 
+        'temperature', 
+        'respiratory', 'breathing rate',
+        'oxygen saturation', 'o2 sat',
+        'height', 'weight', 'bmi', 'body mass'
+    ]
+    
     def get_fhir_summary(self):
         """
         Get FHIR data summary with resource counts.
@@ -114,8 +128,11 @@ class PatientDetailView(OwnedPatientMixin, LoginRequiredMixin, DetailView):
             dict: FHIR resource summary with counts and last updated info
         """
         try:
+            if self.object.fhir_resources_in_sync():
+                return self._get_fhir_summary_from_rows()
+            
             # Access the encrypted FHIR bundle (current field, not legacy cumulative_fhir_json)
-            fhir_bundle = self.object.encrypted_fhir_bundle
+            fhir_bundle = self.object.fhir_bundle
             if not fhir_bundle or not fhir_bundle.get('entry'):
                 return {}
             
@@ -140,28 +157,7 @@ class PatientDetailView(OwnedPatientMixin, LoginRequiredMixin, DetailView):
                     
                     # Check if it's a Lab or Vital (for separate counts)
                     if resource_type == 'Observation':
-                        is_vital = False
-                        code_text = ""
-                        
-                        # Try to determine from code
-                        if 'code' in resource:
-                            code_obj = resource['code']
-                            if 'text' in code_obj:
-                                code_text = code_obj['text'].lower()
-                            elif 'coding' in code_obj and code_obj['coding']:
-                                code_text = (code_obj['coding'][0].get('display') or '').lower()
-                        
-                        # Vital keywords
-                        vital_keywords = [
-                            'blood pressure', 'systolic', 'diastolic', 
-                            'heart rate', 'pulse', 
-                            'temperature', 
-                            'respiratory', 'breathing rate',
-                            'oxygen saturation', 'o2 sat',
-                            'height', 'weight', 'bmi', 'body mass'
-                        ]
-                        
-                        if any(k in code_text for k in vital_keywords):
+                        if self._is_vital_observation(resource):
                             vital_count += 1
                         else:
                             # If it's an Observation but not a Vital, count as Lab
@@ -182,6 +178,49 @@ class PatientDetailView(OwnedPatientMixin, LoginRequiredMixin, DetailView):
             logger.error(f"Error processing FHIR data for patient {self.object.id}: {fhir_error}")
             return {}
     
+    def _get_fhir_summary_from_rows(self):
+        """
+        Build the FHIR summary from the per-resource rows.
+        
+        Counts and last-updated dates come from unencrypted columns; only
+        Observations are decrypted, to split labs from vitals.
+        """
+        from django.db.models import Max, Min
+        
+        # Ordered by first appearance in the bundle, like the bundle scan
+        type_stats = self.object.fhir_resources.values('resource_type').annotate(
+            count=Count('id'), last_updated=Max('last_updated'), first_position=Min('position')
+        ).order_by('first_position')
+        summary = {
+            row['resource_type']: {'count': row['count'], 'last_updated': row['last_updated'] or None}
+            for row in type_stats
+        }
+        if not summary:
+            return {}
+        
+        vital_count = sum(
+            1 for resource in self.object.get_fhir_resources(resource_types=['Observation'])
+            if self._is_vital_observation(resource)
+        )
+        observation_count = summary.get('Observation', {}).get('count', 0)
+        summary['LabResult'] = {'count': observation_count - vital_count}
+        summary['VitalSign'] = {'count': vital_count}
+        return summary
+    
+    def _is_vital_observation(self, resource):
+        """True if the Observation's code text names a vital sign."""
+        code_text = ""
+        
+        # Try to determine from code
+        if 'code' in resource:
+            code_obj = resource['code']
+            if 'text' in code_obj:
+                code_text = code_obj['text'].lower()
+            elif 'coding' in code_obj and code_obj['coding']:
+                code_text = (code_obj['coding'][0].get('display') or '').lower()
+        
+        return any(k in code_text for k in self.VITAL_KEYWORDS)
+    
     def get_latest_resource_date(self, resources):
         """
         Get the latest update date from FHIR resources.
@@ -253,7 +292,7 @@ class PatientDetailView(OwnedPatientMixin, LoginRequiredMixin, DetailView):
             
             # JSON-serialized FHIR bundle for client-side JavaScript (valid JS, not Python repr)
             context['fhir_data_json'] = json.dumps(
-                self.object.encrypted_fhir_bundle or {},
+                self.object.fhir_bundle,
                 default=str
             )
             
@@ -453,7 +492,7 @@ class SetPrimaryDiagnosisView(LoginRequiredMixin, View):
         Returns:
             JsonResponse: Success or error message
         """
-        patient = get_object_or_404(Patient, pk=pk)
+        patient = get_object_or_404(Patient.objects.defer('encrypted_fhir_bundle'), pk=pk)
         try:
             condition_id = request.POST.get('condition_id')
             
@@ -465,7 +504,7 @@ class SetPrimaryDiagnosisView(LoginRequiredMixin, View):
             
             # Validate that condition exists in patient's FHIR data
             condition_found = False
-            for entry in patient.encrypted_fhir_bundle.get('entry', []):
+            for entry in patient.fhir_bundle.get('entry', []):
                 resource = entry.get('resource', {})
                 if (resource.get('resourceType') == 'Condition' and 
                     resource.get('id') == condition_id):
@@ -522,7 +561,7 @@ class PatientFHIRExportView(LoginRequiredMixin, View):
         Returns:
             HttpResponse: JSON file download
         """
-        patient = get_object_or_404(Patient, pk=pk)
+        patient = get_object_or_404(Patient.objects.defer('encrypted_fhir_bundle'), pk=pk)
         try:
             # Create FHIR bundle
             fhir_bundle = self.create_fhir_bundle(patient)
@@ -601,8 +640,9 @@ class PatientFHIRExportView(LoginRequiredMixin, View):
         bundle["entry"].append(patient_resource)
         
         # Add existing FHIR data from encrypted bundle
-        if patient.encrypted_fhir_bundle and patient.encrypted_fhir_bundle.get('entry'):
-            for entry in patient.encrypted_fhir_bundle.get('entry', []):
+        fhir_bundle = patient.fhir_bundle
+        if fhir_bundle and fhir_bundle.get('entry'):
+            for entry in fhir_bundle.get('entry', []):
                 if 'resource' in entry:
                     bundle["entry"].append({"resource": entry["resource"]})
         
@@ -635,7 +675,7 @@ class PatientSummaryDataView(LoginRequiredMixin, View):
 
     def get(self, request, pk):
         """Return comprehensive report data as JSON."""
-        patient = get_object_or_404(Patient, pk=pk)
+        patient = get_object_or_404(Patient.objects.defer('encrypted_fhir_bundle'), pk=pk)
         try:
             report_data = patient.get_comprehensive_report()
             report_data.setdefault('report_metadata', {})['report_type'] = 'patient_summary'
@@ -658,7 +698,7 @@ class PatientSummaryPDFView(LoginRequiredMixin, View):
         import os
         from apps.reports.generators import PDFGenerator
 
-        patient = get_object_or_404(Patient, pk=pk)
+        patient = get_object_or_404(Patient.objects.defer('encrypted_fhir_bundle'), pk=pk)
         try:
             report_data = patient.get_comprehensive_report()
             report_data.setdefault('report_metadata', {})['report_type'] = 'patient_summary'
@@ -818,12 +858,12 @@ class PatientFHIRJSONView(LoginRequiredMixin, View):
         Returns:
             JsonResponse: FHIR data
         """
-        patient = get_object_or_404(Patient, pk=pk)
+        patient = get_object_or_404(Patient.objects.defer('encrypted_fhir_bundle'), pk=pk)
         try:
             return JsonResponse({
                 'patient_id': str(patient.id),
                 'mrn': patient.mrn,
-                'fhir_data': patient.encrypted_fhir_bundle,
+                'fhir_data': patient.fhir_bundle,
                 'last_updated': patient.updated_at.isoformat()
             })
             
@@ -1133,72 +1173,13 @@ class FindDuplicatePatientsView(LoginRequiredMixin, TemplateView):
         """
         Find potential duplicate patients based on name and DOB similarity.
         
-        Returns:
-            list: Groups of potential duplicates
-        """
-        patients = Patient.objects.all().order_by('last_name', 'first_name')
-        duplicate_groups = []
-        processed_ids = set()
+        Candidates come from the dob_blind_index buckets, so only patients
+        sharing a date of birth with someone are loaded and compared.
         
-        for patient in patients:
-            if patient.id in processed_ids:
-                continue
-            
-            similar_patients = self.find_similar_patients(patient, patients, processed_ids)
-            
-            if similar_patients:
-                duplicate_groups.append(similar_patients)
-                for similar_patient in similar_patients:
-                    processed_ids.add(similar_patient.id)
-        
-        return duplicate_groups
-    
-    def find_similar_patients(self, target_patient, all_patients, processed_ids):
-        """
-        Find patients similar to the target patient.
-        
-        Args:
-            target_patient: Patient to find duplicates for
-            all_patients: All patients to search through
-            processed_ids: IDs already processed
-            
         Returns:
-            list: Similar patients (including target if matches found)
-        """
-        similar_patients = [target_patient]
-        
-        for patient in all_patients:
-            if patient.id == target_patient.id or patient.id in processed_ids:
-                continue
-            
-            # Check name similarity
-            name_similarity = self.calculate_name_similarity(target_patient, patient)
-            
-            # Check if same DOB (using helper method for encrypted date field)
-            same_dob = target_patient.get_date_of_birth() == patient.get_date_of_birth()
-            
-            # Consider as duplicate if high name similarity and same DOB
-            if name_similarity > 0.8 and same_dob:
-                similar_patients.append(patient)
-        
-        # Only return if we found actual duplicates
-        return similar_patients if len(similar_patients) > 1 else []
-    
-    def calculate_name_similarity(self, patient1, patient2):
-        """
-        Calculate similarity score between two patients' names.
-        
-        Args:
-            patient1: First patient
-            patient2: Second patient
-            
-        Returns:
-            float: Similarity score (0.0 to 1.0)
+            list: Groups of potential duplicates
         """
-        name1 = f"{patient1.first_name.lower()} {patient1.last_name.lower()}"
-        name2 = f"{patient2.first_name.lower()} {patient2.last_name.lower()}"
-        
-        return SequenceMatcher(None, name1, name2).ratio()
+        return find_duplicate_patient_groups()
 
 
 @method_decorator([moritrac_admin_required], name='dispatch')
@@ -40,20 +40,20 @@ class ReportConfigurationAdmin(admin.ModelAdmin):
 class GeneratedReportAdmin(admin.ModelAdmin):
     """Admin interface for generated reports."""
     
-    list_display = ['id', 'configuration', 'format', 'status', 'file_size_mb', 'generation_time', 'created_at']
-    list_filter = ['format', 'status', 'created_at']
+    list_display = ['id', 'configuration', 'report_type', 'format', 'status', 'progress', 'file_size_mb', 'generation_time', 'created_at']
+    list_filter = ['report_type', 'format', 'status', 'created_at']
     search_fields = ['configuration__name', 'error_message']
     readonly_fields = ['created_at', 'updated_at', 'created_by', 'updated_by', 'file_size_mb']
     
     fieldsets = (
         ('Report Information', {
-            'fields': ('configuration', 'format', 'status')
+            'fields': ('configuration', 'report_type', 'format', 'status', 'progress')
         }),
         ('File Details', {
             'fields': ('file_path', 'file_size', 'file_size_mb')
         }),
         ('Generation Details', {
-            'fields': ('generation_time', 'parameters_snapshot', 'error_message')
+            'fields': ('generation_time', 'task_id', 'cache_key', 'parameters_snapshot', 'error_message')
         }),
         ('Metadata', {
             'fields': ('created_by', 'created_at', 'updated_by', 'updated_at'),
@@ -150,8 +150,9 @@ class DocumentAuditParametersForm(BaseReportParametersForm):
     
     status = forms.MultipleChoiceField(
         choices=[
-            ('uploaded', 'Uploaded'),
+            ('pending', 'Pending'),
             ('processing', 'Processing'),
+            ('ocr_pending', 'OCR Pending'),
             ('completed', 'Completed'),
             ('failed', 'Failed'),
         ],
@@ -10,9 +10,10 @@ import csv
 import json
 from datetime import datetime
 from io import BytesIO, StringIO
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 from django.conf import settings
+from django.db.models import Avg, Count, Max, OuterRef, Q, Subquery, Sum
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -28,7 +29,10 @@ except (ImportError, OSError):
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
     from reportlab.lib import colors
 
+from apps.core.models import APIUsageLog
+from apps.documents.models import Document
 from apps.patients.models import Patient
+from apps.providers.models import Provider
 
 
 class ReportGenerator:
@@ -645,20 +649,30 @@ class CSVGenerator:
             ])
     
     def _write_provider_activity_csv(self, data: Dict[str, Any], writer):
-        """Write provider activity data as CSV."""
-        writer.writerow(['Provider Activity Report'])
-        writer.writerow(['Generated:', data.get('report_metadata', {}).get('generated_at', '')])
-        writer.writerow([])
-        # Implementation for provider activity
-        pass
+        """Write provider activity summary as CSV."""
+        self._write_operational_summary_csv(data, writer, 'Provider Activity Report')
     
     def _write_document_audit_csv(self, data: Dict[str, Any], writer):
-        """Write document audit data as CSV."""
-        writer.writerow(['Document Processing Audit'])
-        writer.writerow(['Generated:', data.get('report_metadata', {}).get('generated_at', '')])
+        """Write document audit summary as CSV."""
+        self._write_operational_summary_csv(data, writer, 'Document Processing Audit')
+    
+    def _write_operational_summary_csv(self, data: Dict[str, Any], writer, title: str):
+        """Write the summary metrics and breakdown tables of an operational report."""
+        metadata = data.get('report_metadata', {})
+        writer.writerow([title])
+        writer.writerow(['Generated:', metadata.get('generated_at', '')])
+        writer.writerow(['Date Range:', f"{metadata.get('date_from') or 'Beginning'} to {metadata.get('date_to') or 'Today'}"])
         writer.writerow([])
-        # Implementation for document audit
-        pass
+        
+        writer.writerow(['Summary'])
+        for label, value in data.get('summary', {}).items():
+            writer.writerow([label, value])
+        
+        for table in data.get('breakdowns', []):
+            writer.writerow([])
+            writer.writerow([table['title']])
+            writer.writerow(table['columns'])
+            writer.writerows(table['rows'])
 
 
 class PatientReportTemplate(ReportGenerator):
@@ -696,7 +710,7 @@ class PatientReportTemplate(ReportGenerator):
             raise ValueError("patient_id is required in parameters")
         
         try:
-            patient = Patient.objects.get(pk=patient_id)
+            patient = Patient.objects.defer('encrypted_fhir_bundle').get(pk=patient_id)
         except Patient.DoesNotExist:
             raise ValueError(f"Patient with ID {patient_id} not found")
         
@@ -804,7 +818,102 @@ class PatientReportTemplate(ReportGenerator):
         return True
 
 
-class ProviderReportTemplate(ReportGenerator):
+class StreamingReportGenerator(ReportGenerator):
+    """
+    Base class for operational reports over large tables.
+    
+    generate() returns only aggregates computed in the database (summary
+    metrics and small breakdown tables). Per-row detail comes from
+    iter_sections(), whose rows are values_list() iterators - server-side
+    cursors on PostgreSQL - that to_csv() and to_json() write out as they
+    are read, so memory stays flat regardless of the date range. PDFs show
+    the summary only.
+    """
+    
+    chunk_size = 2000
+    pdf_template = 'reports/pdf/operational_summary.html'
+    
+    def iter_sections(self) -> Iterator[Tuple[str, str, List[str], Iterator]]:
+        """
+        Yield (key, title, columns, rows) for each detail section.
+        
+        Must be implemented by subclasses; rows should be lazy iterators.
+        """
+        raise NotImplementedError("Subclasses must implement iter_sections()")
+    
+    def to_pdf(self, output_path: str) -> str:
+        """Render the summary (not the detail rows) to PDF."""
+        if not self.data:
+            self.data = self.generate()
+        
+        generator = PDFGenerator(template=self.pdf_template)
+        return generator.generate(self.data, output_path, self.title)
+    
+    def to_csv(self, output_path: str) -> str:
+        """Write the summary, then each detail section row by row."""
+        if not self.data:
+            self.data = self.generate()
+        
+        CSVGenerator().generate(self.data, output_path)
+        with open(output_path, 'a', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            for _key, title, columns, rows in self.iter_sections():
+                writer.writerow([])
+                writer.writerow([title])
+                writer.writerow(columns)
+                writer.writerows(rows)
+        
+        return output_path
+    
+    def to_json(self, output_path: str) -> str:
+        """
+        Write the summary keys plus one array per detail section.
+        
+        Rows are serialized one at a time, so the document is built in
+        pieces instead of with a single json.dump().
+        """
+        if not self.data:
+            self.data = self.generate()
+        
+        with open(output_path, 'w', encoding='utf-8') as f:
+            # Summary object without its closing brace; sections follow as extra keys
+            f.write(json.dumps(self.data, indent=2, default=str)[:-1].rstrip())
+            for key, _title, columns, rows in self.iter_sections():
+                f.write(f',\n  {json.dumps(key)}: [')
+                separator = '\n    '
+                for row in rows:
+                    f.write(separator + json.dumps(dict(zip(columns, row)), default=str))
+                    separator = ',\n    '
+                f.write('\n  ]')
+            f.write('\n}\n')
+        
+        return output_path
+    
+    def _metadata(self, report_type: str) -> Dict[str, Any]:
+        return {
+            'report_type': report_type,
+            'title': self.title,
+            'generated_at': timezone.now().isoformat(),
+            'date_from': self.parameters.get('date_from'),
+            'date_to': self.parameters.get('date_to'),
+            'parameters': self.parameters,
+        }
+    
+    def _uploaded_in_range(self, prefix: str = '') -> Optional[Q]:
+        """Q for documents uploaded within date_from/date_to, or None for no bounds."""
+        conditions = {}
+        if self.parameters.get('date_from'):
+            conditions[f'{prefix}uploaded_at__date__gte'] = self.parameters['date_from']
+        if self.parameters.get('date_to'):
+            conditions[f'{prefix}uploaded_at__date__lte'] = self.parameters['date_to']
+        return Q(**conditions) if conditions else None
+    
+    @staticmethod
+    def _round(value, digits: int = 1):
+        return round(value, digits) if value is not None else None
+
+
+class ProviderReportTemplate(StreamingReportGenerator):
     """
     Generate provider activity reports.
     
@@ -817,37 +926,249 @@ class ProviderReportTemplate(ReportGenerator):
         self.description = "Provider statistics and patient activity"
     
     def generate(self) -> Dict[str, Any]:
-        """Generate provider activity report data."""
-        # TODO: Implement in next phase
+        """Generate provider activity summary (aggregates only)."""
+        documents = Document.objects.filter(providers__in=self._providers())
+        in_range = self._uploaded_in_range()
+        if in_range is not None:
+            documents = documents.filter(in_range)
+        
+        totals = documents.aggregate(
+            documents=Count('id', distinct=True),
+            patients=Count('patient', distinct=True),
+        )
+        by_specialty = (
+            documents.order_by()
+            .values('providers__specialty')
+            .annotate(document_count=Count('id', distinct=True), provider_count=Count('providers', distinct=True))
+            .order_by('-document_count', 'providers__specialty')
+        )
+        
         return {
-            'report_metadata': {
-                'report_type': 'provider_activity',
-                'status': 'not_implemented',
-                'message': 'Provider reports coming soon'
-            }
+            'report_metadata': self._metadata('provider_activity'),
+            'summary': {
+                'Active Providers': self._activity().count(),
+                'Documents': totals['documents'],
+                'Patients': totals['patients'],
+            },
+            'breakdowns': [
+                {
+                    'title': 'Documents by Specialty',
+                    'columns': ['Specialty', 'Providers', 'Documents'],
+                    'rows': [
+                        [row['providers__specialty'] or 'Unspecified', row['provider_count'], row['document_count']]
+                        for row in by_specialty
+                    ],
+                },
+            ],
         }
+    
+    def iter_sections(self):
+        """Per-provider activity rows, then (optionally) each provider's patients."""
+        columns = [
+            'Provider ID', 'NPI', 'Last Name', 'First Name', 'Specialty', 'Organization',
+            'Documents', 'Patients', 'Completed', 'Failed', 'Avg Processing (ms)',
+            'Last Document', 'API Tokens', 'API Cost (USD)',
+        ]
+        rows = (
+            self._activity()
+            .order_by('last_name', 'first_name', 'pk')
+            .values_list(
+                'pk', 'npi', 'last_name', 'first_name', 'specialty', 'organization',
+                'document_count', 'patient_count', 'completed_count', 'failed_count',
+                'avg_processing_ms', 'last_document_at', 'api_tokens', 'api_cost',
+            )
+            .iterator(chunk_size=self.chunk_size)
+        )
+        yield 'providers', 'Provider Activity', columns, (
+            row[:10] + (self._round(row[10]),) + row[11:] for row in rows
+        )
+        
+        if self.parameters.get('include_patient_list', True):
+            patients = (
+                self._providers()
+                .values_list('npi', 'documents__patient__mrn')
+                .annotate(
+                    document_count=Count('documents', filter=self._uploaded_in_range('documents__')),
+                    last_document_at=Max('documents__uploaded_at', filter=self._uploaded_in_range('documents__')),
+                )
+                .filter(document_count__gt=0)
+                .order_by('npi', 'documents__patient__mrn')
+                .iterator(chunk_size=self.chunk_size)
+            )
+            yield 'patients', 'Patients Seen', ['NPI', 'Patient MRN', 'Documents', 'Last Document'], patients
+    
+    def _providers(self):
+        providers = Provider.objects.all()
+        if self.parameters.get('provider_id'):
+            providers = providers.filter(pk=self.parameters['provider_id'])
+        if self.parameters.get('specialty'):
+            providers = providers.filter(specialty__icontains=self.parameters['specialty'])
+        return providers
+    
+    def _activity(self):
+        """Providers with documents in range, annotated with per-provider aggregates."""
+        in_range = self._uploaded_in_range('documents__')
+        
+        def within(condition=None):
+            if in_range is None:
+                return condition
+            return in_range & condition if condition is not None else in_range
+        
+        usage = APIUsageLog.objects.filter(document__providers=OuterRef('pk'))
+        document_range = self._uploaded_in_range('document__')
+        if document_range is not None:
+            usage = usage.filter(document_range)
+        usage = usage.order_by().values('document__providers')
+        
+        return self._providers().annotate(
+            document_count=Count('documents', filter=within(), distinct=True),
+            patient_count=Count('documents__patient', filter=within(), distinct=True),
+            completed_count=Count('documents', filter=within(Q(documents__status='completed')), distinct=True),
+            failed_count=Count('documents', filter=within(Q(documents__status='failed')), distinct=True),
+            avg_processing_ms=Avg('documents__processing_time_ms', filter=within()),
+            last_document_at=Max('documents__uploaded_at', filter=within()),
+            api_tokens=Subquery(usage.annotate(total=Sum('total_tokens')).values('total')[:1]),
+            api_cost=Subquery(usage.annotate(total=Sum('cost_usd')).values('total')[:1]),
+        ).filter(document_count__gt=0)
 
 
-class DocumentAuditTemplate(ReportGenerator):
+class DocumentAuditTemplate(StreamingReportGenerator):
     """
     Generate document processing audit reports.
     
     Shows document processing stats, errors, and performance metrics.
     """
     
+    # (label, Document field) for each timed pipeline stage
+    TIMING_FIELDS = [
+        ('Queue Wait', 'queue_wait_time_ms'),
+        ('PDF Extraction', 'pdf_extraction_time_ms'),
+        ('AI Extraction', 'ai_extraction_time_ms'),
+        ('FHIR Conversion', 'fhir_conversion_time_ms'),
+        ('Total Processing', 'processing_time_ms'),
+    ]
+    
     def __init__(self, parameters: Optional[Dict[str, Any]] = None):
         super().__init__(parameters)
         self.title = "Document Processing Audit"
         self.description = "Document processing metrics and audit trail"
     
     def generate(self) -> Dict[str, Any]:
-        """Generate document audit report data."""
-        # TODO: Implement in next phase
+        """Generate document audit summary (aggregates only)."""
+        documents = self._documents()
+        
+        totals = documents.aggregate(
+            documents=Count('id'),
+            failed=Count('id', filter=Q(status='failed')),
+            retried=Count('id', filter=Q(processing_attempts__gt=1)),
+            total_bytes=Sum('file_size'),
+        )
+        usage = APIUsageLog.objects.filter(document__in=documents.values('pk'))
+        usage_totals = usage.aggregate(
+            calls=Count('id'),
+            failed_calls=Count('id', filter=Q(success=False)),
+            tokens=Sum('total_tokens'),
+            cost=Sum('cost_usd'),
+        )
+        
+        breakdowns = [
+            {
+                'title': 'Documents by Status',
+                'columns': ['Status', 'Documents'],
+                'rows': [
+                    [row['status'], row['count']]
+                    for row in documents.order_by().values('status').annotate(count=Count('id')).order_by('status')
+                ],
+            },
+            {
+                'title': 'API Usage by Model',
+                'columns': ['Provider', 'Model', 'Calls', 'Failed Calls', 'Tokens', 'Cost (USD)'],
+                'rows': [
+                    [row['provider'], row['model'], row['calls'], row['failed_calls'], row['tokens'], row['cost']]
+                    for row in usage.order_by().values('provider', 'model').annotate(
+                        calls=Count('id'),
+                        failed_calls=Count('id', filter=Q(success=False)),
+                        tokens=Sum('total_tokens'),
+                        cost=Sum('cost_usd'),
+                    ).order_by('provider', 'model')
+                ],
+            },
+        ]
+        
+        if self.parameters.get('include_performance_metrics', True):
+            timing = documents.aggregate(**{
+                f'{aggregate}_{field}': function(field)
+                for _label, field in self.TIMING_FIELDS
+                for aggregate, function in (('avg', Avg), ('max', Max))
+            })
+            breakdowns.append({
+                'title': 'Processing Time by Stage (ms)',
+                'columns': ['Stage', 'Average', 'Maximum'],
+                'rows': [
+                    [label, self._round(timing[f'avg_{field}']), timing[f'max_{field}']]
+                    for label, field in self.TIMING_FIELDS
+                ],
+            })
+        
         return {
-            'report_metadata': {
-                'report_type': 'document_audit',
-                'status': 'not_implemented',
-                'message': 'Document audit reports coming soon'
-            }
+            'report_metadata': self._metadata('document_audit'),
+            'summary': {
+                'Documents': totals['documents'],
+                'Failed': totals['failed'],
+                'Retried': totals['retried'],
+                'Total Size (bytes)': totals['total_bytes'] or 0,
+                'API Calls': usage_totals['calls'],
+                'Failed API Calls': usage_totals['failed_calls'],
+                'API Tokens': usage_totals['tokens'] or 0,
+                'API Cost (USD)': usage_totals['cost'] or 0,
+            },
+            'breakdowns': breakdowns,
         }
+    
+    def iter_sections(self):
+        """One row per document with its timings, API usage and errors."""
+        columns = ['Document ID', 'Patient MRN', 'Filename', 'Status', 'Uploaded', 'Processing Started',
+                   'Processed', 'Attempts']
+        fields = ['pk', 'patient__mrn', 'filename', 'status', 'uploaded_at', 'processing_started_at',
+                  'processed_at', 'processing_attempts']
+        
+        if self.parameters.get('include_performance_metrics', True):
+            columns += [f'{label} (ms)' for label, _field in self.TIMING_FIELDS]
+            fields += [field for _label, field in self.TIMING_FIELDS]
+        
+        columns += ['API Calls', 'API Tokens', 'API Cost (USD)']
+        fields += ['api_calls', 'api_tokens', 'api_cost']
+        
+        if self.parameters.get('include_error_details', True):
+            columns.append('Error Message')
+            fields.append('error_message')
+        
+        rows = (
+            self._documents()
+            .annotate(
+                api_calls=Count('api_usage_logs'),
+                api_tokens=Sum('api_usage_logs__total_tokens'),
+                api_cost=Sum('api_usage_logs__cost_usd'),
+            )
+            .order_by('uploaded_at', 'pk')
+            .values_list(*fields)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        yield 'documents', 'Documents', columns, rows
+    
+    def _documents(self):
+        documents = Document.objects.all()
+        in_range = self._uploaded_in_range()
+        if in_range is not None:
+            documents = documents.filter(in_range)
+        if self.parameters.get('status'):
+            documents = documents.filter(status__in=self.parameters['status'])
+        return documents
+
 
+# Generator class for each GeneratedReport.report_type
+REPORT_GENERATORS = {
+    'patient_summary': PatientReportTemplate,
+    'provider_activity': ProviderReportTemplate,
+    'document_audit': DocumentAuditTemplate,
+}
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.3 on 2026-10-17 01:10
+
+from django.db import migrations, models
+
+
+def backfill_job_fields(apps, schema_editor):
+    """
+    Map the old pending/generating statuses onto queued/running and fill
+    report_type from the configuration or the file name.
+    """
+    GeneratedReport = apps.get_model('reports', 'GeneratedReport')
+
+    GeneratedReport.objects.filter(status='pending').update(status='queued')
+    GeneratedReport.objects.filter(status='generating').update(status='running')
+    GeneratedReport.objects.filter(status='completed').update(progress=100)
+
+    for report in GeneratedReport.objects.filter(report_type='').select_related('configuration'):
+        if report.configuration_id:
+            report.report_type = report.configuration.report_type
+        else:
+            filename = report.file_path.rsplit('/', 1)[-1]
+            report.report_type = next(
+                (key for key in ('patient_summary', 'provider_activity', 'document_audit') if key in filename),
+                '',
+            )
+        if report.report_type:
+            report.save(update_fields=['report_type'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0002_alter_generatedreport_configuration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generatedreport',
+            name='report_type',
+            field=models.CharField(blank=True, choices=[('patient_summary', 'Patient Summary Report'), ('provider_activity', 'Provider Activity Report'), ('document_audit', 'Document Processing Audit')], help_text='Type of report generated', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='generatedreport',
+            name='file_path',
+            field=models.CharField(blank=True, help_text='Path to generated report file (set when generation completes)', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='generatedreport',
+            name='progress',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Generation progress (0-100) reported by the Celery job'),
+        ),
+        migrations.AddField(
+            model_name='generatedreport',
+            name='task_id',
+            field=models.CharField(blank=True, help_text='Celery task ID of the generation job', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='generatedreport',
+            name='cache_key',
+            field=models.CharField(blank=True, help_text='Hash of bundle version, parameters and format (blank = not cacheable)', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='generatedreport',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', help_text='Current status of report generation', max_length=20),
+        ),
+        migrations.RunPython(backfill_job_fields, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='generatedreport',
+            index=models.Index(fields=['created_by', 'cache_key', 'status'], name='generated_r_created_9726d5_idx'),
+        ),
+    ]
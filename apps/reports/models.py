@@ -9,10 +9,21 @@ This module handles:
 
 from django.db import models
 from django.conf import settings
+import hashlib
+import json
 import os
 from django.utils import timezone
 from apps.core.models import BaseModel
 
+REPORT_TYPES = [
+    ('patient_summary', 'Patient Summary Report'),
+    ('provider_activity', 'Provider Activity Report'),
+    ('document_audit', 'Document Processing Audit'),
+]
+
+# Parameters that only label a report and don't change its content
+UNCACHED_PARAMETERS = {'patient_name', 'format'}
+
 
 class ReportConfiguration(BaseModel):
     """
@@ -28,11 +39,7 @@ class ReportConfiguration(BaseModel):
     
     report_type = models.CharField(
         max_length=50,
-        choices=[
-            ('patient_summary', 'Patient Summary Report'),
-            ('provider_activity', 'Provider Activity Report'),
-            ('document_audit', 'Document Processing Audit'),
-        ],
+        choices=REPORT_TYPES,
         help_text="Type of report to generate"
     )
     
@@ -85,9 +92,17 @@ class GeneratedReport(BaseModel):
         help_text="Configuration used to generate this report (optional for ad-hoc reports)"
     )
     
+    report_type = models.CharField(
+        max_length=50,
+        choices=REPORT_TYPES,
+        blank=True,
+        help_text="Type of report generated"
+    )
+    
     file_path = models.CharField(
         max_length=255,
-        help_text="Path to generated report file"
+        blank=True,
+        help_text="Path to generated report file (set when generation completes)"
     )
     
     format = models.CharField(
@@ -126,19 +141,37 @@ class GeneratedReport(BaseModel):
     status = models.CharField(
         max_length=20,
         choices=[
-            ('pending', 'Pending'),
-            ('generating', 'Generating'),
+            ('queued', 'Queued'),
+            ('running', 'Running'),
             ('completed', 'Completed'),
             ('failed', 'Failed'),
         ],
-        default='pending',
+        default='queued',
         help_text="Current status of report generation"
     )
     
+    progress = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Generation progress (0-100) reported by the Celery job"
+    )
+    
+    task_id = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Celery task ID of the generation job"
+    )
+    
+    cache_key = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Hash of bundle version, parameters and format (blank = not cacheable)"
+    )
+    
     class Meta:
         db_table = 'generated_reports'
         indexes = [
             models.Index(fields=['created_by', 'status']),
+            models.Index(fields=['created_by', 'cache_key', 'status']),
             models.Index(fields=['configuration', '-created_at']),
             models.Index(fields=['-created_at']),
         ]
@@ -174,6 +207,42 @@ class GeneratedReport(BaseModel):
         # 3. Fallback to the generic type
         return self.get_type_label()
 
+    @property
+    def is_finished(self):
+        """Whether the generation job has stopped (completed or failed)."""
+        return self.status in ('completed', 'failed')
+    
+    @staticmethod
+    def build_cache_key(report_type, parameters, output_format):
+        """
+        Cache key for a report's output, or '' when it can't be cached.
+        
+        Patient summaries are keyed by the patient's bundle versionId and
+        updated_at (demographics come from the live record), the parameters
+        that affect content, and the format. Other report types read live
+        tables with no version to key on, so they are always regenerated.
+        """
+        patient_id = parameters.get('patient_id')
+        if report_type != 'patient_summary' or not patient_id:
+            return ''
+        
+        from apps.patients import bundle_cache
+        from apps.patients.models import Patient
+        
+        patient = Patient.objects.only('id', 'updated_at', 'fhir_bundle_index').filter(pk=patient_id).first()
+        version = bundle_cache.bundle_version(patient) if patient else None
+        if not version:
+            return ''
+        
+        content_parameters = {
+            key: value for key, value in parameters.items() if key not in UNCACHED_PARAMETERS
+        }
+        payload = json.dumps(
+            [report_type, version, patient.updated_at.isoformat(), content_parameters, output_format],
+            sort_keys=True, default=str,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
     def get_type_label(self):
         """Helper to get clean type label from config or filename."""
         if self.configuration:
@@ -185,6 +254,8 @@ class GeneratedReport(BaseModel):
             'provider_activity': 'Provider Activity',
             'document_audit': 'Document Audit',
         }
+        if self.report_type in type_map:
+            return type_map[self.report_type]
         # Try to find the key in the file path or default to generic
         for key, label in type_map.items():
             if key in self.file_path:
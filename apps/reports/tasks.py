@@ -0,0 +1,91 @@
+"""
+Celery tasks for report generation.
+Renders GeneratedReport jobs (WeasyPrint PDFs, CSV, JSON) off the request path.
+"""
+
+import logging
+import os
+import time
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _update_report(report_id, **fields):
+    """Write status/progress without clobbering fields saved elsewhere."""
+    from .models import GeneratedReport
+    
+    GeneratedReport.objects.filter(pk=report_id).update(updated_at=timezone.now(), **fields)
+
+
+@shared_task(bind=True, name="apps.reports.tasks.generate_report", acks_late=True)
+def generate_report(self, report_id):
+    """
+    Generate the file for a queued GeneratedReport.
+    
+    Moves the report through queued -> running -> completed (or failed),
+    updating progress as the data is built and rendered, so the status
+    endpoint can follow along. A redelivered job for a report that has
+    already finished does nothing.
+    
+    Args:
+        report_id: GeneratedReport primary key
+    
+    Returns:
+        dict: Outcome and report ID
+    """
+    from .generators import PatientReportTemplate, REPORT_GENERATORS
+    from .models import GeneratedReport
+    
+    report = GeneratedReport.objects.filter(pk=report_id).first()
+    if report is None:
+        logger.info(f"Skipping report generation: report {report_id} no longer exists")
+        return {'success': False, 'report_id': report_id}
+    if report.is_finished:
+        return {'success': report.status == 'completed', 'report_id': report_id, 'skipped': True}
+    
+    _update_report(report_id, status='running', progress=10, task_id=self.request.id or '')
+    start_time = time.time()
+    
+    try:
+        generator_class = REPORT_GENERATORS.get(report.report_type, PatientReportTemplate)
+        generator = generator_class(report.parameters_snapshot)
+        generator.data = generator.generate()
+        _update_report(report_id, progress=50)
+        
+        report_dir = os.path.join(settings.MEDIA_ROOT, 'reports', str(report.created_by_id))
+        os.makedirs(report_dir, exist_ok=True)
+        timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
+        filename = f'{report.report_type or "report"}_{timestamp}_{report.pk}.{report.format}'
+        file_path = os.path.join(report_dir, filename)
+        
+        if report.format == 'pdf':
+            generator.to_pdf(file_path)
+        elif report.format == 'csv':
+            generator.to_csv(file_path)
+        else:
+            generator.to_json(file_path)
+        
+        _update_report(
+            report_id,
+            status='completed',
+            progress=100,
+            file_path=os.path.relpath(file_path, settings.MEDIA_ROOT),
+            file_size=os.path.getsize(file_path),
+            generation_time=time.time() - start_time,
+            error_message='',
+        )
+    except Exception as exc:
+        logger.error(f"Report generation failed for report {report_id}: {exc}", exc_info=True)
+        _update_report(
+            report_id,
+            status='failed',
+            error_message=str(exc),
+            generation_time=time.time() - start_time,
+        )
+        return {'success': False, 'report_id': report_id, 'error': str(exc)}
+    
+    return {'success': True, 'report_id': report_id}
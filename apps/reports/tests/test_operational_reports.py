@@ -0,0 +1,176 @@
+"""
+Tests for the streaming provider activity and document audit reports.
+"""
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.core.models import APIUsageLog
+from apps.documents.models import Document
+from apps.patients.models import Patient
+from apps.providers.models import Provider
+from apps.reports.generators import DocumentAuditTemplate, ProviderReportTemplate
+
+
+class OperationalReportTestCase(TestCase):
+    """Two patients, three documents, API usage on one of them."""
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+
+        self.user = User.objects.create_user(username='ops', password='testpass123')
+        self.patient_a = self._patient('OPS-A')
+        self.patient_b = self._patient('OPS-B')
+        self.cardiologist = Provider.objects.create(
+            npi='1111111111', first_name='Ada', last_name='Heart',
+            specialty='Cardiology', organization='General Hospital',
+        )
+        self.idle_provider = Provider.objects.create(
+            npi='2222222222', first_name='Ida', last_name='Idle',
+            specialty='Dermatology', organization='General Hospital',
+        )
+
+        self.doc_a = self._document(self.patient_a, 'completed', processing_time_ms=1200, ai_extraction_time_ms=900)
+        self.doc_b = self._document(self.patient_b, 'completed', processing_time_ms=800, ai_extraction_time_ms=500)
+        self.doc_failed = self._document(self.patient_b, 'failed', error_message='OCR timed out', processing_attempts=3)
+        self.doc_a.providers.add(self.cardiologist)
+        self.doc_b.providers.add(self.cardiologist)
+
+        for tokens, cost in ((1000, Decimal('0.010000')), (500, Decimal('0.005000'))):
+            self._usage(self.doc_a, tokens, cost)
+
+    def _patient(self, mrn):
+        return Patient.objects.create(
+            mrn=mrn, first_name='Ops', last_name=mrn, date_of_birth='1980-01-01', created_by=self.user,
+        )
+
+    def _document(self, patient, status, **fields):
+        return Document.objects.create(
+            filename=f'{patient.mrn}-{status}.pdf',
+            file=SimpleUploadedFile('ops.pdf', b'%PDF-1.4 ops', content_type='application/pdf'),
+            patient=patient,
+            status=status,
+            created_by=self.user,
+            uploaded_by=self.user,
+            **fields,
+        )
+
+    def _usage(self, document, tokens, cost):
+        now = timezone.now()
+        APIUsageLog.objects.create(
+            document=document, patient=document.patient, processing_session=uuid.uuid4(),
+            provider='anthropic', model='claude-sonnet', input_tokens=tokens - 100, output_tokens=100,
+            total_tokens=tokens, cost_usd=cost, processing_started=now, processing_completed=now,
+            processing_duration_ms=1000,
+        )
+
+    def _section_rows(self, path, header_first_cell):
+        """Data rows following the header row that starts with header_first_cell."""
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        start = next(i for i, row in enumerate(rows) if row and row[0] == header_first_cell)
+        section = []
+        for row in rows[start + 1:]:
+            if not row:
+                break
+            section.append(row)
+        return rows[start], section
+
+
+class DocumentAuditTemplateTests(OperationalReportTestCase):
+
+    def test_summary_is_aggregated(self):
+        data = DocumentAuditTemplate({}).generate()
+
+        self.assertEqual(data['summary']['Documents'], 3)
+        self.assertEqual(data['summary']['Failed'], 1)
+        self.assertEqual(data['summary']['Retried'], 1)
+        self.assertEqual(data['summary']['API Calls'], 2)
+        self.assertEqual(data['summary']['API Tokens'], 1500)
+        self.assertEqual(data['summary']['API Cost (USD)'], Decimal('0.015'))
+        timing = next(t for t in data['breakdowns'] if t['title'].startswith('Processing Time'))
+        self.assertIn(['AI Extraction', 700.0, 900], timing['rows'])
+        self.assertNotIn('documents', data)
+
+    def test_csv_streams_one_row_per_document(self):
+        path = DocumentAuditTemplate({}).to_csv(os.path.join(self.output_dir, 'audit.csv'))
+
+        header, rows = self._section_rows(path, 'Document ID')
+        self.assertEqual(len(rows), 3)
+        by_id = {row[0]: dict(zip(header, row)) for row in rows}
+        self.assertEqual(by_id[str(self.doc_a.pk)]['API Calls'], '2')
+        self.assertEqual(by_id[str(self.doc_failed.pk)]['Error Message'], 'OCR timed out')
+        self.assertEqual(by_id[str(self.doc_a.pk)]['Patient MRN'], 'OPS-A')
+
+    def test_json_has_summary_and_document_rows(self):
+        path = DocumentAuditTemplate({'status': ['failed']}).to_json(os.path.join(self.output_dir, 'audit.json'))
+
+        with open(path, encoding='utf-8') as f:
+            report = json.load(f)
+        self.assertEqual(report['summary']['Documents'], 1)
+        self.assertEqual([row['Document ID'] for row in report['documents']], [self.doc_failed.pk])
+
+    def test_optional_columns(self):
+        template = DocumentAuditTemplate({'include_error_details': False, 'include_performance_metrics': False})
+
+        (_key, _title, columns, rows), = template.iter_sections()
+
+        self.assertNotIn('Error Message', columns)
+        self.assertNotIn('Total Processing (ms)', columns)
+        self.assertNotIsInstance(rows, list)
+        self.assertEqual(len(next(rows)), len(columns))
+
+
+class ProviderReportTemplateTests(OperationalReportTestCase):
+
+    def test_summary_counts_active_providers(self):
+        data = ProviderReportTemplate({}).generate()
+
+        self.assertEqual(data['summary'], {'Active Providers': 1, 'Documents': 2, 'Patients': 2})
+        specialties = data['breakdowns'][0]['rows']
+        self.assertEqual(specialties, [['Cardiology', 1, 2]])
+
+    def test_csv_provider_and_patient_sections(self):
+        path = ProviderReportTemplate({'include_patient_list': True}).to_csv(
+            os.path.join(self.output_dir, 'providers.csv')
+        )
+
+        header, providers = self._section_rows(path, 'Provider ID')
+        self.assertEqual(len(providers), 1)
+        activity = dict(zip(header, providers[0]))
+        self.assertEqual(activity['NPI'], '1111111111')
+        self.assertEqual(activity['Documents'], '2')
+        self.assertEqual(activity['Patients'], '2')
+        self.assertEqual(activity['Completed'], '2')
+        self.assertEqual(activity['Avg Processing (ms)'], '1000.0')
+        self.assertEqual(activity['API Tokens'], '1500')
+
+        _header, patients = self._section_rows(path, 'NPI')
+        self.assertEqual([row[:3] for row in patients], [
+            ['1111111111', 'OPS-A', '1'],
+            ['1111111111', 'OPS-B', '1'],
+        ])
+
+    def test_date_range_filters_documents(self):
+        tomorrow = (timezone.now() + timedelta(days=1)).date().isoformat()
+        template = ProviderReportTemplate({'date_from': tomorrow, 'include_patient_list': False})
+
+        path = template.to_json(os.path.join(self.output_dir, 'providers.json'))
+
+        with open(path, encoding='utf-8') as f:
+            report = json.load(f)
+        self.assertEqual(report['summary']['Active Providers'], 0)
+        self.assertEqual(report['providers'], [])
+        self.assertNotIn('patients', report)
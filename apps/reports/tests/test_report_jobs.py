@@ -0,0 +1,201 @@
+"""
+Tests for asynchronous report generation.
+
+Covers the generate_report job lifecycle, the status endpoint, and reuse of
+unchanged reports keyed by bundle version, parameters and format.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.patients.models import Patient
+from apps.reports.generators import PatientReportTemplate
+from apps.reports.models import GeneratedReport
+from apps.reports.tasks import generate_report
+
+REPORT_DATA = {
+    'report_metadata': {'report_type': 'patient_summary'},
+    'patient_info': {'mrn': 'RPT-001'},
+    'clinical_summary': {},
+}
+
+
+class ReportJobTestCase(TestCase):
+    """Shared user, patient and temporary MEDIA_ROOT."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        self.user = User.objects.create_user(username='reporter', password='testpass123')
+        self.patient = Patient.objects.create(
+            mrn='RPT-001',
+            first_name='Report',
+            last_name='Patient',
+            date_of_birth='1970-01-01',
+            created_by=self.user,
+        )
+        self._set_bundle_version('v1')
+
+    def _set_bundle_version(self, version):
+        Patient.objects.filter(pk=self.patient.pk).update(fhir_bundle_index={'versionId': version})
+
+    def _parameters(self, **extra):
+        parameters = {'patient_id': str(self.patient.pk), 'patient_name': 'Report Patient'}
+        parameters.update(extra)
+        return parameters
+
+
+class ReportCacheKeyTests(ReportJobTestCase):
+    """Cache keys follow bundle version, content parameters and format."""
+
+    def test_same_inputs_same_key(self):
+        key = GeneratedReport.build_cache_key('patient_summary', self._parameters(), 'pdf')
+
+        self.assertEqual(len(key), 64)
+        self.assertEqual(
+            key,
+            GeneratedReport.build_cache_key('patient_summary', self._parameters(patient_name='Renamed'), 'pdf'),
+        )
+
+    def test_format_parameters_and_bundle_change_key(self):
+        key = GeneratedReport.build_cache_key('patient_summary', self._parameters(), 'pdf')
+
+        self.assertNotEqual(key, GeneratedReport.build_cache_key('patient_summary', self._parameters(), 'json'))
+        self.assertNotEqual(
+            key,
+            GeneratedReport.build_cache_key('patient_summary', self._parameters(date_from='2020-01-01'), 'pdf'),
+        )
+        self._set_bundle_version('v2')
+        self.assertNotEqual(key, GeneratedReport.build_cache_key('patient_summary', self._parameters(), 'pdf'))
+
+    def test_uncacheable_reports(self):
+        self.assertEqual(GeneratedReport.build_cache_key('provider_activity', {}, 'pdf'), '')
+        Patient.objects.filter(pk=self.patient.pk).update(fhir_bundle_index={})
+        self.assertEqual(GeneratedReport.build_cache_key('patient_summary', self._parameters(), 'pdf'), '')
+
+
+@patch.object(PatientReportTemplate, 'generate', return_value=REPORT_DATA)
+class GenerateReportTaskTests(ReportJobTestCase):
+    """The job moves a report from queued to completed or failed."""
+
+    def _queued_report(self):
+        return GeneratedReport.objects.create(
+            report_type='patient_summary',
+            format='json',
+            parameters_snapshot=self._parameters(),
+            created_by=self.user,
+        )
+
+    def test_completes_and_writes_file(self, _generate):
+        report = self._queued_report()
+        self.assertEqual(report.status, 'queued')
+
+        result = generate_report.apply(args=[report.pk]).get()
+
+        report.refresh_from_db()
+        self.assertTrue(result['success'])
+        self.assertEqual(report.status, 'completed')
+        self.assertEqual(report.progress, 100)
+        self.assertTrue(report.task_id)
+        self.assertTrue(os.path.exists(os.path.join(settings.MEDIA_ROOT, report.file_path)))
+        self.assertEqual(report.file_size, os.path.getsize(os.path.join(settings.MEDIA_ROOT, report.file_path)))
+
+    def test_failure_is_recorded(self, generate):
+        generate.side_effect = ValueError('Patient with ID missing not found')
+        report = self._queued_report()
+
+        result = generate_report.apply(args=[report.pk]).get()
+
+        report.refresh_from_db()
+        self.assertFalse(result['success'])
+        self.assertEqual(report.status, 'failed')
+        self.assertIn('not found', report.error_message)
+
+    def test_finished_report_is_not_regenerated(self, generate):
+        report = self._queued_report()
+        GeneratedReport.objects.filter(pk=report.pk).update(status='completed', file_path='reports/x.json')
+
+        result = generate_report.apply(args=[report.pk]).get()
+
+        self.assertTrue(result['skipped'])
+        generate.assert_not_called()
+
+
+@patch.object(PatientReportTemplate, 'generate', return_value=REPORT_DATA)
+class GenerateReportViewTests(ReportJobTestCase):
+    """The view queues a job, or reuses an unchanged report."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.url = reverse('reports:generate') + '?type=patient_summary'
+
+    def _post(self, output_format='json'):
+        return self.client.post(self.url, {'patient': str(self.patient.pk), 'format': output_format})
+
+    def test_queues_job_and_redirects_to_status_page(self, _generate):
+        response = self._post()
+
+        report = GeneratedReport.objects.get()
+        self.assertRedirects(response, reverse('reports:detail', kwargs={'pk': report.pk}))
+        self.assertEqual(report.report_type, 'patient_summary')
+        self.assertTrue(report.cache_key)
+        # CELERY_TASK_ALWAYS_EAGER runs the job inline in tests
+        self.assertEqual(report.status, 'completed')
+
+    def test_unchanged_report_is_reused(self, generate):
+        self._post()
+        first = GeneratedReport.objects.get()
+
+        response = self._post()
+
+        self.assertRedirects(response, reverse('reports:detail', kwargs={'pk': first.pk}))
+        self.assertEqual(GeneratedReport.objects.count(), 1)
+        self.assertEqual(generate.call_count, 1)
+
+    def test_new_bundle_version_or_format_regenerates(self, generate):
+        self._post()
+        self._post(output_format='csv')
+        self._set_bundle_version('v2')
+        self._post()
+
+        self.assertEqual(GeneratedReport.objects.count(), 3)
+        self.assertEqual(generate.call_count, 3)
+
+    def test_status_endpoint(self, _generate):
+        report = GeneratedReport.objects.create(
+            report_type='patient_summary',
+            format='pdf',
+            status='running',
+            progress=50,
+            created_by=self.user,
+        )
+
+        data = self.client.get(reverse('reports:status', kwargs={'pk': report.pk})).json()
+
+        self.assertEqual(data['status'], 'running')
+        self.assertEqual(data['progress'], 50)
+        self.assertFalse(data['finished'])
+        self.assertIsNone(data['download_url'])
+
+    def test_download_waits_for_completion(self, _generate):
+        report = GeneratedReport.objects.create(
+            report_type='patient_summary',
+            format='pdf',
+            created_by=self.user,
+        )
+
+        response = self.client.get(reverse('reports:download', kwargs={'pk': report.pk}))
+
+        self.assertRedirects(response, reverse('reports:detail', kwargs={'pk': report.pk}))
@@ -17,6 +17,9 @@ urlpatterns = [
     # View report details
     path('<int:pk>/', views.ReportDetailView.as_view(), name='detail'),
     
+    # Generation job status (polled while queued/running)
+    path('<int:pk>/status/', views.ReportStatusView.as_view(), name='status'),
+    
     # Preview report in browser
     path('<int:pk>/preview/', views.ReportPreviewView.as_view(), name='preview'),
     
@@ -110,6 +110,10 @@ THERAPEUTIC_CLASSES = {
 }
 
 
+# (keyword, class) pairs in priority order for the compiled matcher
+_THERAPEUTIC_CLASS_KEYWORDS = tuple(THERAPEUTIC_CLASSES.items())
+
+
 # Status display names
 STATUS_DISPLAY = {
     'active': 'Active',
@@ -161,14 +165,15 @@ def get_therapeutic_class(medication_name: str) -> str:
     Returns:
         Therapeutic class name, or "Other" if not found
     """
+    from apps.fhir.services.keyword_matching import get_keyword_matcher
+
     normalized = normalize_medication_name(medication_name)
     
-    # Check if any known medication is in the normalized name
-    for med_key, class_name in THERAPEUTIC_CLASSES.items():
-        if med_key in normalized:
-            return class_name
-    
-    return 'Other'
+    # One pass for every known medication appearing anywhere in the normalized
+    # name (substring match, so "humalog75/25" still counts); the first
+    # THERAPEUTIC_CLASSES entry found wins.
+    matcher = get_keyword_matcher(_THERAPEUTIC_CLASS_KEYWORDS, word_boundary=False)
+    return matcher.classify(normalized, default='Other')
 
 
 def parse_dosage_text(dosage_text: str) -> Dict[str, Any]:
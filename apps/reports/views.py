@@ -4,13 +4,14 @@ Views for the reports module.
 Handles report configuration, generation, and download functionality.
 """
 
+import logging
 import os
-import time
+from datetime import timedelta
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import ListView, DetailView, FormView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.http import HttpResponse, FileResponse, Http404
+from django.http import HttpResponse, FileResponse, Http404, JsonResponse
 from django.urls import reverse_lazy, reverse
 from django.conf import settings
 from django.utils import timezone
@@ -22,13 +23,13 @@ from .forms import (
     DocumentAuditParametersForm,
     ReportConfigurationForm
 )
-from .generators import (
-    PatientReportTemplate,
-    ProviderReportTemplate,
-    DocumentAuditTemplate
-)
 from apps.core.utils import log_user_activity, ActivityTypes
 
+logger = logging.getLogger(__name__)
+
+# A queued/running job older than this is assumed lost and doesn't block a new one
+REPORT_JOB_STALE_AFTER = timedelta(minutes=15)
+
 
 class ReportDashboardView(LoginRequiredMixin, ListView):
     """
@@ -68,14 +69,12 @@ class ReportDashboardView(LoginRequiredMixin, ListView):
                 'label': 'Provider Activity',
                 'description': 'Provider statistics and patient list',
                 'icon': 'briefcase',
-                'disabled': True,
             },
             {
                 'value': 'document_audit',
                 'label': 'Document Audit',
                 'description': 'Document processing metrics and audit trail',
                 'icon': 'document-text',
-                'disabled': True,
             },
         ]
         
@@ -132,7 +131,7 @@ class GenerateReportView(LoginRequiredMixin, FormView):
         return context
     
     def form_valid(self, form):
-        """Generate report when form is valid."""
+        """Queue a report generation job when form is valid."""
         report_type = self.request.GET.get('type', 'patient_summary')
         parameters = form.cleaned_data.copy()  # Make a copy to modify
         output_format = parameters.get('format', 'pdf')
@@ -159,102 +158,88 @@ class GenerateReportView(LoginRequiredMixin, FormView):
         if 'date_to' in parameters and parameters['date_to']:
             parameters['date_to'] = parameters['date_to'].isoformat()
         
+        # Create configuration if requested
+        config = self._create_configuration_if_requested(report_type, parameters)
+        
+        # An unchanged report (same bundle version, parameters and format)
+        # that is already built or being built is reused instead of queued again
+        cache_key = GeneratedReport.build_cache_key(report_type, parameters, output_format)
+        existing_report = self._find_reusable_report(cache_key)
+        if existing_report:
+            if existing_report.status == 'completed':
+                messages.info(self.request, 'This report is already up to date.')
+            else:
+                messages.info(self.request, 'This report is already being generated.')
+            return redirect('reports:detail', pk=existing_report.pk)
+        
+        generated_report = GeneratedReport.objects.create(
+            configuration=config if config else None,
+            report_type=report_type,
+            format=output_format,
+            parameters_snapshot=parameters,
+            cache_key=cache_key,
+            status='queued',
+            created_by=self.request.user
+        )
+        
         try:
-            # Generate report
-            start_time = time.time()
-            report_data, file_path, file_size = self._generate_report(
-                report_type, parameters, output_format
-            )
-            generation_time = time.time() - start_time
-            
-            # Create configuration if requested
-            config = self._create_configuration_if_requested(report_type, parameters)
-            
-            # Save generated report record
-            generated_report = GeneratedReport.objects.create(
-                configuration=config if config else None,
-                file_path=file_path,
-                format=output_format,
-                file_size=file_size,
-                generation_time=generation_time,
-                parameters_snapshot=parameters,
-                status='completed',
-                created_by=self.request.user
-            )
-            
-            # Log report generation
-            log_desc = f"Generated {report_type} report"
-            if patient_obj:
-                log_desc = f"{patient_obj.first_name} {patient_obj.last_name} - Report generated"
-            
-            log_user_activity(
-                user=self.request.user,
-                activity_type=ActivityTypes.REPORT_GENERATE,
-                description=log_desc,
-                request=self.request,
-                related_object_type='generatedreport',
-                related_object_id=generated_report.id
-            )
-            
-            messages.success(
-                self.request,
-                f'Report generated successfully in {generation_time:.2f} seconds!'
-            )
-            
-            # Redirect to download
-            return redirect('reports:download', pk=generated_report.pk)
-            
+            from .tasks import generate_report
+            generate_report.delay(generated_report.pk)
         except Exception as e:
+            logger.error(f"Could not queue report {generated_report.pk}: {e}")
+            GeneratedReport.objects.filter(pk=generated_report.pk).update(
+                status='failed', error_message=f"Could not queue report generation: {e}"
+            )
             messages.error(
                 self.request,
                 f'Error generating report: {str(e)}'
             )
             return self.form_invalid(form)
-    
-    def _generate_report(self, report_type: str, parameters: dict, output_format: str):
-        """
-        Generate report file and return data, path, and size.
         
-        Returns:
-            Tuple of (report_data, file_path, file_size)
-        """
-        # Select appropriate generator
-        generators = {
-            'patient_summary': PatientReportTemplate,
-            'provider_activity': ProviderReportTemplate,
-            'document_audit': DocumentAuditTemplate,
-        }
+        # Log report generation
+        log_desc = f"Generated {report_type} report"
+        if patient_obj:
+            log_desc = f"{patient_obj.first_name} {patient_obj.last_name} - Report generated"
         
-        generator_class = generators.get(report_type, PatientReportTemplate)
-        generator = generator_class(parameters)
-        
-        # Create output directory
-        report_dir = os.path.join(settings.MEDIA_ROOT, 'reports', str(self.request.user.id))
-        os.makedirs(report_dir, exist_ok=True)
-        
-        # Generate filename
-        timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'{report_type}_{timestamp}.{output_format}'
-        file_path = os.path.join(report_dir, filename)
-        
-        # Generate report in requested format
-        if output_format == 'pdf':
-            generator.to_pdf(file_path)
-        elif output_format == 'csv':
-            generator.to_csv(file_path)
-        elif output_format == 'json':
-            generator.to_json(file_path)
+        log_user_activity(
+            user=self.request.user,
+            activity_type=ActivityTypes.REPORT_GENERATE,
+            description=log_desc,
+            request=self.request,
+            related_object_type='generatedreport',
+            related_object_id=generated_report.id
+        )
         
-        # Get file size
-        file_size = os.path.getsize(file_path)
+        messages.success(
+            self.request,
+            'Report queued. This page will update when it is ready to download.'
+        )
         
-        # Get report data
-        report_data = generator.data
+        # Status page polls the job and links the download
+        return redirect('reports:detail', pk=generated_report.pk)
+    
+    def _find_reusable_report(self, cache_key: str):
+        """
+        Latest report with the same cache key that is finished or in flight.
         
-        # Return relative path from MEDIA_ROOT
-        relative_path = os.path.relpath(file_path, settings.MEDIA_ROOT)
+        Completed reports only count while their file still exists.
+        """
+        if not cache_key:
+            return None
         
-        return report_data, relative_path, file_size
+        candidates = GeneratedReport.objects.filter(
+            created_by=self.request.user,
+            cache_key=cache_key,
+            status__in=['queued', 'running', 'completed'],
+        ).order_by('-created_at')
+        stale_before = timezone.now() - REPORT_JOB_STALE_AFTER
+        for report in candidates[:5]:
+            if report.status == 'completed':
+                if report.file_path and os.path.exists(os.path.join(settings.MEDIA_ROOT, report.file_path)):
+                    return report
+            elif report.updated_at >= stale_before:
+                return report
+        return None
     
     def _create_configuration_if_requested(self, report_type: str, parameters: dict):
         """Create configuration if user wants to save it."""
@@ -287,6 +272,28 @@ class ReportDetailView(LoginRequiredMixin, DetailView):
         return GeneratedReport.objects.filter(created_by=self.request.user)
 
 
+class ReportStatusView(LoginRequiredMixin, View):
+    """
+    JSON status of a report generation job, polled by the detail page.
+    """
+    
+    def get(self, request, pk):
+        """Return status, progress and, once completed, the download URL."""
+        report = get_object_or_404(
+            GeneratedReport.objects.filter(created_by=request.user),
+            pk=pk
+        )
+        
+        return JsonResponse({
+            'id': report.pk,
+            'status': report.status,
+            'progress': report.progress,
+            'finished': report.is_finished,
+            'error_message': report.error_message,
+            'download_url': reverse('reports:download', kwargs={'pk': report.pk}) if report.status == 'completed' else None,
+        })
+
+
 class ReportPreviewView(LoginRequiredMixin, View):
     """
     View for previewing reports in the browser before downloading.
@@ -336,6 +343,10 @@ class ReportDownloadView(LoginRequiredMixin, View):
             pk=pk
         )
         
+        # Still queued/running (or failed): the detail page shows the status
+        if report.status != 'completed' or not report.file_path:
+            return redirect('reports:detail', pk=report.pk)
+        
         # Construct full file path
         file_path = os.path.join(settings.MEDIA_ROOT, report.file_path)
         
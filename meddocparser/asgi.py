@@ -3,6 +3,11 @@ ASGI config for meddocparser project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Production serves the monitor's SSE stream (/core/monitor/api/events/) from
+this application under uvicorn, so open dashboards are coroutines sharing one
+Redis subscription instead of pinning gunicorn's sync workers. Everything
+else keeps going through meddocparser.wsgi.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -13,4 +18,21 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'meddocparser.settings.production')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+
+async def application(scope, receive, send):
+    """Django's ASGI app plus lifespan handling for the SSE broadcaster."""
+    if scope['type'] != 'lifespan':
+        return await django_application(scope, receive, send)
+
+    from apps.core.monitor_stream import shutdown_broadcaster
+
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await shutdown_broadcaster()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
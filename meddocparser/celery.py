@@ -25,6 +25,7 @@ app.autodiscover_tasks([
     'apps.documents',
     'apps.fhir',
     'apps.core',
+    'apps.patients',
 ])
 
 # Configure Celery for medical document processing
@@ -33,6 +34,7 @@ app.conf.update(
     task_routes={
         'apps.documents.tasks.*': {'queue': 'document_processing'},
         'apps.fhir.tasks.*': {'queue': 'fhir_processing'},
+        'apps.patients.tasks.*': {'queue': 'fhir_processing'},
     },
     
     # Task time limits for safety (medical documents can be large)
@@ -72,6 +72,7 @@ MIDDLEWARE = [
     'axes.middleware.AxesMiddleware',                   # Failed login monitoring
     'apps.documents.middleware.StructuredDataValidationMiddleware',  # Document validation middleware
     'apps.core.middleware.AuditLoggingMiddleware',     # HIPAA audit logging
+    'apps.patients.middleware.FHIRBundleCacheMiddleware',  # Request-scoped decrypted bundle cache
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django_htmx.middleware.HtmxMiddleware',
@@ -225,6 +226,17 @@ AUDIT_LOG_ENABLED = True
 AUDIT_LOG_DB_TABLE = 'audit_logs'
 AUDIT_LOG_RETENTION_DAYS = 2555  # 7 years as per HIPAA requirements
 
+# Buffered audit writes (apps/core/audit_buffer.py): request audit events are
+# spooled to a local file and bulk-inserted in batches instead of one INSERT
+# per request. Spool segments left by a crash are replayed on the next start
+# (or with `manage.py replay_audit_spool`).
+AUDIT_BUFFER_ENABLED = config('AUDIT_BUFFER_ENABLED', default=True, cast=bool)
+AUDIT_BUFFER_MAX_EVENTS = config('AUDIT_BUFFER_MAX_EVENTS', default=500, cast=int)
+AUDIT_FLUSH_INTERVAL_SECONDS = config('AUDIT_FLUSH_INTERVAL_SECONDS', default=2.0, cast=float)
+AUDIT_SPOOL_DIR = config('AUDIT_SPOOL_DIR', default=str(BASE_DIR / 'logs' / 'audit_spool'))
+AUDIT_SPOOL_FSYNC = config('AUDIT_SPOOL_FSYNC', default=True, cast=bool)  # fsync each event (survives power loss)
+AUDIT_HASH_CHAIN = config('AUDIT_HASH_CHAIN', default=False, cast=bool)  # Tamper-evident SHA-256 chain per writer
+
 # User Activity Monitoring
 TRACK_USER_ACTIVITY = True
 FAILED_LOGIN_ATTEMPTS_LIMIT = 5
@@ -311,6 +323,17 @@ FIELD_ENCRYPTION_KEYS = [
     ),
 ]
 
+# HMAC key for the Patient duplicate-detection blind indexes
+# (apps.patients.blind_index). Falls back to SECRET_KEY when unset; patients
+# must be re-indexed after changing it.
+PATIENT_BLIND_INDEX_KEY = config('PATIENT_BLIND_INDEX_KEY', default='')
+
+# Decrypted FHIR bundle cache (apps.patients.bundle_cache). Bundles are always
+# shared within a request; a size > 0 also keeps the most recently used
+# bundles decrypted in process memory for FHIR_BUNDLE_CACHE_TTL seconds.
+FHIR_BUNDLE_CACHE_SIZE = config('FHIR_BUNDLE_CACHE_SIZE', default=0, cast=int)
+FHIR_BUNDLE_CACHE_TTL = config('FHIR_BUNDLE_CACHE_TTL', default=30, cast=int)
+
 # Argon2 password hashing (HIPAA-compliant)
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.Argon2PasswordHasher',
@@ -346,6 +369,8 @@ CELERY_RESULT_EXPIRES = 3600  # 1 hour
 CELERY_TASK_ROUTES = {
     'apps.documents.tasks.*': {'queue': 'document_processing'},
     'apps.fhir.tasks.*': {'queue': 'fhir_processing'},
+    'apps.patients.tasks.*': {'queue': 'fhir_processing'},
+    'apps.reports.tasks.*': {'queue': 'fhir_processing'},
     'apps.core.tasks.*': {'queue': 'general'},
 }
 
@@ -355,6 +380,18 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'apps.documents.tasks.cleanup_old_documents',
         'schedule': 300.0,  # Every 5 minutes — stuck document watchdog
     },
+    'poll-extraction-batches': {
+        'task': 'apps.documents.tasks.poll_extraction_batches',
+        'schedule': 120.0,  # Every 2 minutes — ingest finished AI batch jobs
+    },
+    'evict-extraction-cache': {
+        'task': 'apps.documents.tasks.evict_extraction_cache',
+        'schedule': 3600.0,  # Hourly — expire and LRU-trim the chunk extraction cache
+    },
+    'keep-prompt-cache-warm': {
+        'task': 'apps.documents.tasks.keep_prompt_cache_warm',
+        'schedule': 120.0,  # Every 2 minutes — must stay under AI_PROMPT_CACHE_TTL_SECONDS / 2
+    },
 }
 
 # Worker configuration for medical document processing
@@ -475,6 +512,31 @@ AI_CHUNK_PARTIAL_THRESHOLD = config('AI_CHUNK_PARTIAL_THRESHOLD', default=0.85,
 # How many times a soft-time-limited task may re-enqueue itself to resume
 # from the chunk ledger before giving up.
 LARGE_DOCUMENT_MAX_RESUMES = config('LARGE_DOCUMENT_MAX_RESUMES', default=2, cast=int)
+# Max concurrent chunk API calls per document in _process_chunks_streaming.
+# 1 keeps the original sequential behaviour; raise to 4-6 to cut wall-clock
+# on large documents roughly N-fold (watch the Anthropic rate limit).
+AI_CHUNK_CONCURRENCY = config('AI_CHUNK_CONCURRENCY', default=1, cast=int)
+# Batch extraction for bulk reprocessing (`--batch` on the reprocess commands).
+# Chunks go to the provider's batch API instead of synchronous calls and are
+# ingested by the poll_extraction_batches beat task. 'local' is an in-memory
+# fake for tests and development. Batch usage is costed at AI_BATCH_COST_FACTOR
+# of the synchronous price (Anthropic Message Batches bill at 50%).
+AI_BATCH_PROVIDER = config('AI_BATCH_PROVIDER', default='anthropic')
+AI_BATCH_MAX_REQUESTS = config('AI_BATCH_MAX_REQUESTS', default=1000, cast=int)  # requests per batch job
+AI_BATCH_COST_FACTOR = config('AI_BATCH_COST_FACTOR', default=0.5, cast=float)
+# Cross-document chunk extraction cache (ChunkExtractionCacheEntry). Chunks are
+# keyed by normalized text + prompt/schema version + model, so identical pages in
+# different documents are extracted once. Entries expire after the TTL; the
+# evict-extraction-cache beat task also trims least recently used entries.
+AI_EXTRACTION_CACHE_ENABLED = config('AI_EXTRACTION_CACHE_ENABLED', default=True, cast=bool)
+AI_EXTRACTION_CACHE_TTL_DAYS = config('AI_EXTRACTION_CACHE_TTL_DAYS', default=30, cast=int)
+AI_EXTRACTION_CACHE_MAX_ENTRIES = config('AI_EXTRACTION_CACHE_MAX_ENTRIES', default=50000, cast=int)
+# Anthropic prompt cache coordination (PromptCacheScheduler). A cold prefix is
+# warmed by one call while others wait up to AI_PROMPT_CACHE_WARMUP_WAIT_SECONDS;
+# the keep-prompt-cache-warm beat task refreshes it while documents are waiting.
+AI_PROMPT_CACHE_TTL_SECONDS = config('AI_PROMPT_CACHE_TTL_SECONDS', default=300, cast=int)  # ephemeral cache lifetime
+AI_PROMPT_CACHE_WARMUP_WAIT_SECONDS = config('AI_PROMPT_CACHE_WARMUP_WAIT_SECONDS', default=15, cast=int)
+AI_PROMPT_CACHE_KEEPALIVE = config('AI_PROMPT_CACHE_KEEPALIVE', default=True, cast=bool)
 
 # Request Timeouts and Retry Configuration
 # 120s read timeout accommodates large structured JSON responses from Sonnet
@@ -502,6 +564,13 @@ LARGE_DOCUMENT_FILE_SIZE_BYTES = config('LARGE_DOCUMENT_FILE_SIZE_BYTES', defaul
 FHIR_VALIDATION_ENABLED = config('FHIR_VALIDATION_ENABLED', default=True, cast=bool)
 FHIR_STRICT_MODE = config('FHIR_STRICT_MODE', default=False, cast=bool)
 
+# Local terminology index (apps/fhir/terminology.py), built with
+# `manage.py import_terminology`. Memory-mapped read-only, so all web and
+# Celery worker processes share one copy. Code mapping works without it.
+FHIR_TERMINOLOGY_INDEX_PATH = config(
+    'FHIR_TERMINOLOGY_INDEX_PATH', default=str(BASE_DIR / 'data' / 'terminology' / 'terminology.idx')
+)
+
 # ============================================================================
 # AWS TEXTRACT OCR CONFIGURATION
 # ============================================================================
@@ -540,6 +609,27 @@ TEXTRACT_FEATURE_TYPES = config(
 TEXTRACT_ASYNC_POLL_INTERVAL = config('TEXTRACT_ASYNC_POLL_INTERVAL', default=10, cast=int)  # seconds
 TEXTRACT_ASYNC_MAX_WAIT = config('TEXTRACT_ASYNC_MAX_WAIT', default=300, cast=int)  # 5 minutes max
 
+# Async completion notifications: Textract publishes to SNS, which fans into the
+# SQS queue read by `manage.py textract_notification_listener`. With both ARNs set,
+# polling drops to a fallback that starts after TEXTRACT_NOTIFICATION_FALLBACK_POLL_DELAY.
+TEXTRACT_SNS_TOPIC_ARN = config('TEXTRACT_SNS_TOPIC_ARN', default=None)
+TEXTRACT_SNS_ROLE_ARN = config('TEXTRACT_SNS_ROLE_ARN', default=None)  # role Textract assumes to publish
+TEXTRACT_SQS_QUEUE_URL = config('TEXTRACT_SQS_QUEUE_URL', default=None)
+TEXTRACT_NOTIFICATION_FALLBACK_POLL_DELAY = config(
+    'TEXTRACT_NOTIFICATION_FALLBACK_POLL_DELAY', default=120, cast=int
+)  # seconds
+
+# Page-parallel extraction (PDFTextExtractor)
+# pdfplumber runs on a process pool of PDF_PAGE_WORKERS for PDFs with at least
+# PDF_PARALLEL_MIN_PAGES pages (0 or 1 = parse serially in the worker)
+PDF_PAGE_WORKERS = config('PDF_PAGE_WORKERS', default=0, cast=int)
+PDF_PARALLEL_MIN_PAGES = config('PDF_PARALLEL_MIN_PAGES', default=20, cast=int)
+PDF_PAGE_BATCH_SIZE = config('PDF_PAGE_BATCH_SIZE', default=10, cast=int)  # pages per pool task
+PDF_PAGE_WORKER_MEMORY_MB = config('PDF_PAGE_WORKER_MEMORY_MB', default=1024, cast=int)  # 0 = no cap
+# Scanned pages of multi-page PDFs go to the Textract sync API page by page on
+# this many threads instead of the async S3 workflow (0 = always use async)
+OCR_SYNC_PAGE_WORKERS = config('OCR_SYNC_PAGE_WORKERS', default=0, cast=int)
+
 # ============================================================================
 # REST FRAMEWORK CONFIGURATION
 # ============================================================================
@@ -98,6 +98,7 @@ EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
 # These should be mocked in tests, but provide fallbacks
 ANTHROPIC_API_KEY = 'test-key-not-real'
 OPENAI_API_KEY = 'test-key-not-real'
+AI_BATCH_PROVIDER = 'local'
 PERPLEXITY_API_KEY = 'test-key-not-real'
 
 # Test-specific AI settings
@@ -124,10 +125,12 @@ TEST_DOCUMENTS_DIR = TEST_DATA_DIR / 'documents'
 # Security Testing Configuration
 AUDIT_LOG_ENABLED = True
 AUDIT_LOG_SENSITIVE_FIELDS = ['ssn', 'date_of_birth', 'phone']
+AUDIT_BUFFER_ENABLED = False  # Write audit rows synchronously so tests can assert on them
 
 # FHIR Testing Configuration
 FHIR_VALIDATION_ENABLED = True
 FHIR_BUNDLE_MAX_RESOURCES = 1000  # Limit for testing
+FHIR_TERMINOLOGY_INDEX_PATH = ''  # Tests build their own index; ignore any local one
 
 # Frontend Testing Configuration (for Selenium tests)
 SELENIUM_WEBDRIVER = 'chrome'  # or 'firefox'